@@ -0,0 +1,105 @@
+"""
+端到端事件循环基准: Mock tick -> 策略 -> 下单 -> 撮合成交 -> 回报
+
+对每种事件循环实现 (asyncio / uvloop) 运行同一场景并报告:
+- 吞吐: 每秒处理的 tick 数 / 成交数
+- tick 延迟: Mock 生成 tick -> 策略 on_tick
+- 订单延迟: 策略发单 -> 收到 FILLED 回报
+Mock 配置 latency_ms=0, tick_interval=0，测量的是框架自身开销。
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import Dict, List
+
+from benchmarks.common import summarize, print_table
+from quant_system.core.event import EventEngine
+from quant_system.core.types import OrderData, OrderStatus, TickData
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.strategy.base import BaseStrategy
+from quant_system.utils.loop import run as run_loop, select_loop, POLICIES
+
+class FlipStrategy(BaseStrategy):
+    """无挂单时在 0 / 1 之间翻转目标仓位，保证持续有订单在撮合"""
+    def __init__(self, engine, exchange, symbols):
+        super().__init__(engine, exchange, symbols)
+        self.tick_lat: List[int] = []
+        self.fill_lat: List[int] = []
+        self.sent_at: Dict[str, int] = {}
+        self.ticks = 0
+        self.fills = 0
+
+    def on_tick(self, tick: TickData):
+        self.ticks += 1
+        self.tick_lat.append(int((time.time() - tick.timestamp) * 1e9))
+        if self.active_orders or self._inflight:
+            return
+        target = 0.0 if self.get_pos(tick.symbol) > 0 else 1.0
+        price = tick.last_price * (1.01 if target > 0 else 0.99)
+        self.request_target_position(target, tick.symbol, price)
+
+    async def _send_orders(self, reqs):
+        t0 = time.perf_counter_ns()
+        ids = await super()._send_orders(reqs)
+        for oid in ids:
+            if oid:
+                self.sent_at[oid] = t0
+        return ids
+
+    def on_order_status(self, order: OrderData):
+        if order.status == OrderStatus.FILLED:
+            self.fills += 1
+            t0 = self.sent_at.pop(order.order_id, None)
+            if t0 is not None:
+                self.fill_lat.append(time.perf_counter_ns() - t0)
+
+async def scenario(duration: float, n_symbols: int) -> Dict:
+    engine = EventEngine()
+    engine.start()
+    mock = MockExchangeAdapter(engine, {"latency_ms": 0, "tick_interval": 0})
+    await mock.connect()
+    symbols = [f"SYM{i}-USDT-SWAP" for i in range(n_symbols)]
+    strategy = FlipStrategy(engine, mock, symbols)
+    await strategy.start()
+
+    await asyncio.sleep(duration)
+
+    await strategy.stop()
+    await mock.close()
+    engine.stop()
+    return {
+        "ticks_per_sec": strategy.ticks / duration,
+        "fills_per_sec": strategy.fills / duration,
+        "tick": summarize(strategy.tick_lat) if strategy.tick_lat else None,
+        "fill": summarize(strategy.fill_lat) if strategy.fill_lat else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end mock loop benchmark per event loop policy")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per policy")
+    parser.add_argument("--symbols", type=int, default=4, help="Number of simulated symbols")
+    parser.add_argument("--policy", action="append", choices=POLICIES, help="Policies to run (default: all available)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    rows, throughput = {}, []
+    for policy in args.policy or POLICIES:
+        name, _ = select_loop(policy)
+        if name != policy:
+            print(f"skip {policy}: not available")
+            continue
+        result = run_loop(scenario(args.duration, args.symbols), policy)
+        throughput.append((policy, result["ticks_per_sec"], result["fills_per_sec"]))
+        if result["tick"]:
+            rows[f"{policy} tick->strategy"] = result["tick"]
+        if result["fill"]:
+            rows[f"{policy} order->fill"] = result["fill"]
+
+    print(f"\n== Throughput ({args.symbols} symbols, {args.duration}s each) ==")
+    for policy, tps, fps in throughput:
+        print(f"{policy:<10} {tps:>12.0f} ticks/s {fps:>10.0f} fills/s")
+    print_table("Latency", rows)
+
+if __name__ == "__main__":
+    main()
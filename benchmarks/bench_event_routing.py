@@ -0,0 +1,72 @@
+"""
+TICK 分发耗时: 全量广播 vs 按 symbol 路由
+
+M 个策略各持有 S/M 个互不重叠的合约 (默认 50 x 500):
+- broadcast: 每个策略注册全部 TICK，回调内用 `symbol in list` 过滤 (旧的 BaseStrategy 行为)
+- routed:    每个策略按 (TICK, symbol) 注册，总线只唤醒该合约的订阅者
+直接调用 EventEngine._process 测量单个 tick 的同步分发耗时 (不含队列调度)。
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import summarize, print_table
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.types import TickData, Exchange
+
+class _Strategy:
+    def __init__(self, symbols):
+        self.symbols = list(symbols)
+        self.ticks = 0
+
+    def on_tick_filtered(self, event: Event):
+        if event.data.symbol in self.symbols:
+            self.ticks += 1
+
+    def on_tick(self, event: Event):
+        self.ticks += 1
+
+def _build(mode: str, n_strategies: int, symbols):
+    engine = EventEngine()
+    per = len(symbols) // n_strategies
+    strategies = [_Strategy(symbols[i * per:(i + 1) * per]) for i in range(n_strategies)]
+    for s in strategies:
+        if mode == "broadcast":
+            engine.register(EventType.TICK, s.on_tick_filtered)
+        else:
+            for symbol in s.symbols:
+                engine.register(EventType.TICK, s.on_tick, symbol)
+    return engine, strategies
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick dispatch: broadcast vs symbol routing")
+    parser.add_argument("-n", type=int, default=50000, help="Ticks per scenario")
+    parser.add_argument("--strategies", type=int, default=50)
+    parser.add_argument("--symbols", type=int, default=500)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i}-USDT-SWAP" for i in range(args.symbols)]
+    rng = random.Random(7)
+    events = [
+        Event(EventType.TICK, TickData(
+            symbol=rng.choice(symbols), exchange=Exchange.MOCK, timestamp=0.0,
+            last_price=100.0, volume=1.0, bid_price_1=99.5, ask_price_1=100.5
+        ))
+        for _ in range(args.n)
+    ]
+
+    rows = {}
+    for mode in ("broadcast", "routed"):
+        engine, strategies = _build(mode, args.strategies, symbols)
+        process = engine._process
+        samples = []
+        for event in events:
+            t0 = time.perf_counter_ns()
+            process(event)
+            samples.append(time.perf_counter_ns() - t0)
+        assert sum(s.ticks for s in strategies) == args.n
+        rows[mode] = summarize(samples)
+    print_table(f"EventEngine._process per tick ({args.strategies} strategies x {args.symbols} symbols)", rows)
+
+if __name__ == "__main__":
+    main()
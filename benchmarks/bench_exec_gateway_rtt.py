@@ -0,0 +1,97 @@
+"""
+执行网关往返延迟 (request -> ack)
+
+对比:
+- direct:  进程内直接调用 MockExchangeAdapter.send_orders
+- gateway: GatewayExchangeAdapter -> Unix Socket -> ExecutionGateway -> Mock -> ack
+- gateway(pipelined): 同时在途 N 个请求时的单请求延迟
+
+网关与客户端在同一事件循环中运行时，两端的调度开销叠加在测量结果中;
+--process 在独立子进程中启动网关，更接近生产部署。
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.common import summarize, print_table
+from quant_system.core.event import EventEngine
+from quant_system.core.types import OrderRequest, Exchange, Direction, OrderType, Offset
+from quant_system.exchange.gateway_adapter import GatewayExchangeAdapter
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.ipc.exec_gateway import ExecutionGateway
+
+MOCK_CONF = {"name": "mock", "latency_ms": 0}
+
+def _request() -> OrderRequest:
+    return OrderRequest(
+        symbol="BTC-USDT-SWAP", exchange=Exchange.MOCK, direction=Direction.LONG,
+        type=OrderType.LIMIT, volume=1.0, price=1.0, offset=Offset.OPEN
+    )
+
+async def _measure(exchange, n: int, concurrency: int = 1):
+    samples = []
+
+    async def one():
+        t0 = time.perf_counter_ns()
+        await exchange.send_orders([_request()])
+        samples.append(time.perf_counter_ns() - t0)
+
+    for _ in range(n // concurrency):
+        await asyncio.gather(*[one() for _ in range(concurrency)])
+    return samples
+
+def _serve(path: str):
+    async def run():
+        gateway = ExecutionGateway(MOCK_CONF, path)
+        await gateway.run()
+    asyncio.run(run())
+
+async def main(n: int, pipeline: int, in_process: bool):
+    results = {}
+    engine = EventEngine()
+    engine.start()
+
+    direct = MockExchangeAdapter(engine, MOCK_CONF)
+    await direct.connect()
+    await _measure(direct, 200)
+    results["direct"] = summarize(await _measure(direct, n))
+    await direct.close()
+
+    path = os.path.join(tempfile.mkdtemp(), "exec.sock")
+    proc = gateway = None
+    if in_process:
+        gateway = ExecutionGateway(MOCK_CONF, path)
+        await gateway.start()
+    else:
+        proc = multiprocessing.get_context("spawn").Process(target=_serve, args=(path,), daemon=True)
+        proc.start()
+
+    client = GatewayExchangeAdapter(engine, {"path": path})
+    await client.connect()
+    await _measure(client, 200)
+    results["gateway"] = summarize(await _measure(client, n))
+    results[f"gateway(pipelined x{pipeline})"] = summarize(await _measure(client, n, pipeline))
+    await client.close()
+
+    if gateway:
+        await gateway.stop()
+    if proc:
+        proc.terminate()
+        proc.join()
+    engine.stop()
+
+    mode = "in-process" if in_process else "separate process"
+    print_table(f"Order request -> ack round trip ({mode} gateway, mock exchange)", results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=5000, help="Requests per scenario")
+    parser.add_argument("--pipeline", type=int, default=16, help="Concurrent in-flight requests")
+    parser.add_argument("--in-process", action="store_true", help="Run gateway in the same event loop")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(args.n, args.pipeline, args.in_process))
@@ -0,0 +1,114 @@
+"""
+日志开销对 tick 分发延迟的影响
+
+每个 tick 的处理函数记录一条 INFO 日志 (模拟下单/回报路径)，测量 put -> handler 的分发延迟:
+- off:   日志级别 WARNING (记录被过滤)
+- sync:  原 FileHandler (事件循环线程上同步格式化 + 写盘)
+- async: 队列 + 后台写线程 (quant_system.utils.logger)
+- async+jsonl: 额外输出结构化 JSONL
+--stall-ms 模拟磁盘卡顿: 每 --stall-every 条写入阻塞一次
+"""
+import argparse
+import asyncio
+import logging
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import summarize, print_table
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.types import TickData, Exchange
+from quant_system.utils import logger as log_mod
+
+class _Stall:
+    """每 every 次调用 sleep 一次"""
+    def __init__(self, ms: float, every: int):
+        self.seconds, self.every, self.n = ms / 1000.0, every, 0
+
+    def __call__(self):
+        self.n += 1
+        if self.seconds and self.n % self.every == 0:
+            time.sleep(self.seconds)
+
+def _install_sync(log_dir: str, stall: _Stall):
+    class StallingFileHandler(logging.FileHandler):
+        def emit(self, record):
+            stall()
+            super().emit(record)
+
+    handler = StallingFileHandler(f"{log_dir}/sync.log")
+    handler.setFormatter(logging.Formatter(log_mod.LOG_FORMAT))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(logging.INFO)
+    return lambda: handler.close()
+
+def _install_async(log_dir: str, stall: _Stall, jsonl: bool):
+    pipeline = log_mod.setup_logging({"log_dir": log_dir, "log_jsonl": jsonl}, prefix="bench")
+    for handler in pipeline.writer.handlers:
+        emit_batch = handler.emit_batch
+
+        def stalled(records, emit_batch=emit_batch):
+            for _ in records:
+                stall()
+            emit_batch(records)
+        handler.emit_batch = stalled
+    return lambda: pipeline.stop()
+
+async def _dispatch(n: int, rate: int):
+    engine = EventEngine()
+    engine.start()
+    log = logging.getLogger("Bench")
+    samples = []
+
+    def on_tick(event: Event):
+        tick = event.data
+        log.info("Order Update: %s %s %s/%s", tick.symbol, "FILLED", tick.volume, tick.last_price)
+        samples.append(time.perf_counter_ns() - int(tick.timestamp))
+
+    engine.register(EventType.TICK, on_tick)
+    interval = 1.0 / rate if rate else 0
+    for i in range(n):
+        engine.put(Event(EventType.TICK, TickData(
+            symbol="BTC-USDT-SWAP", exchange=Exchange.MOCK, timestamp=time.perf_counter_ns(),
+            last_price=10000.0 + i, volume=1.0, bid_price_1=9999.5, ask_price_1=10000.5
+        )))
+        await asyncio.sleep(interval)
+    while len(samples) < n:
+        await asyncio.sleep(0.01)
+    engine.stop()
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick dispatch latency with logging on/off")
+    parser.add_argument("-n", type=int, default=5000, help="Ticks per scenario")
+    parser.add_argument("--rate", type=int, default=5000, help="Ticks per second (0 = yield once between ticks)")
+    parser.add_argument("--stall-ms", type=float, default=0.0, help="Simulated disk stall duration")
+    parser.add_argument("--stall-every", type=int, default=1000, help="Records between stalls")
+    args = parser.parse_args()
+
+    rows = {}
+    for name in ("off", "sync", "async", "async+jsonl"):
+        log_dir = tempfile.mkdtemp()
+        stall = _Stall(args.stall_ms, args.stall_every)
+        if name == "off":
+            logging.getLogger().handlers[:] = [logging.NullHandler()]
+            logging.getLogger().setLevel(logging.WARNING)
+            cleanup = lambda: None
+        elif name == "sync":
+            cleanup = _install_sync(log_dir, stall)
+        else:
+            cleanup = _install_async(log_dir, stall, jsonl=name.endswith("jsonl"))
+        try:
+            rows[name] = summarize(asyncio.run(_dispatch(args.n, args.rate)))
+        finally:
+            cleanup()
+            shutil.rmtree(log_dir, ignore_errors=True)
+
+    title = "put -> handler latency, one INFO log per tick"
+    if args.stall_ms:
+        title += f" (disk stall {args.stall_ms}ms every {args.stall_every} records)"
+    print_table(title, rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+OKX WS 帧解析耗时 (每条消息)
+
+在录制的 tickers / orders 帧上 (tests/fixtures/okx_ws_frames.json) 对比:
+- ccxt: ccxt.pro.okx.handle_message (parse_ticker / parse_order / order_to_trade + 缓存) + 适配器转换为 TickData/OrderData/TradeData
+- fast: FastOkx.handle_message -> OkxFrameParser 直接生成同样的对象
+完全离线运行 (markets 由录制的 instruments 构造)。
+"""
+import argparse
+import json
+import os
+import time
+
+import ccxt.pro as ccxt
+
+from benchmarks.common import summarize, print_table
+from quant_system.core.event import EventEngine
+from quant_system.exchange.okx_adapter import OkxExchangeAdapter
+from quant_system.exchange.okx_fast import FastOkx
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "okx_ws_frames.json")
+
+class _ConvertingClient:
+    """CCXT 路径: 在 resolve 时把本条消息的新结果转换为内部类型 (即 watch_* 返回后适配器做的事)"""
+    def __init__(self, adapter: OkxExchangeAdapter):
+        self.adapter = adapter
+        self.rows = 0
+        self.out = []
+
+    def resolve(self, result, message_hash):
+        adapter, out = self.adapter, self.out
+        if message_hash.startswith("tickers::"):
+            out.extend(adapter._parse_tick_data(t) for t in result.values())
+        elif message_hash == "orders::myTrades":
+            out.extend(adapter._parse_trade_data(t) for t in result[-self.rows:])
+        elif message_hash == "orders":
+            out.extend(adapter._parse_order_data(o) for o in result[-self.rows:])
+
+class _NullClient:
+    def resolve(self, result, message_hash):
+        pass
+
+def _run(api, client, messages, n: int):
+    samples = []
+    handle = api.handle_message
+    for i in range(n):
+        message = messages[i % len(messages)]
+        if isinstance(client, _ConvertingClient):
+            client.rows = len(message["data"])
+            client.out.clear()
+        t0 = time.perf_counter_ns()
+        handle(client, message)
+        samples.append(time.perf_counter_ns() - t0)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-message OKX frame parse time: ccxt vs fast path")
+    parser.add_argument("-n", type=int, default=20000, help="Messages per scenario")
+    args = parser.parse_args()
+
+    with open(FIXTURE, encoding="utf-8") as f:
+        frames = json.load(f)
+
+    adapter = OkxExchangeAdapter(EventEngine(), {})
+    plain = ccxt.okx({"options": {"defaultType": "swap"}})
+    plain.set_markets([plain.parse_market(raw) for raw in frames["instruments"]])
+
+    fast_adapter = OkxExchangeAdapter(EventEngine(), {"fast_parse": True})
+    fast = fast_adapter.api
+    assert isinstance(fast, FastOkx)
+    fast.set_markets(plain.markets, plain.currencies)
+    fast_adapter._install_fast_parser()
+    sink = []
+    fast.on_ticks = sink.extend
+    fast.on_orders = lambda orders, trades: sink.extend(trades + orders)
+
+    rows = {}
+    for channel in ("tickers", "orders"):
+        messages = frames[channel]
+        rows[f"ccxt {channel}"] = summarize(_run(plain, _ConvertingClient(adapter), messages, args.n))
+        sink.clear()
+        rows[f"fast {channel}"] = summarize(_run(fast, _NullClient(), messages, args.n))
+    print_table(f"handle_message -> TickData/OrderData/TradeData ({len(frames['tickers'])} ticker + {len(frames['orders'])} order frames)", rows)
+
+if __name__ == "__main__":
+    main()
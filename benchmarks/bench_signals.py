@@ -0,0 +1,81 @@
+"""
+指标计算耗时: 每个策略各自计算 vs 共享指标 DAG
+
+M 个策略在同一 symbol 上使用相同的一组指标 (DualMA(5, 20) + ZScore(20)):
+- private: 每个策略各持有 DualMASignal，并用 numpy 按窗口计算 z-score (旧写法)
+- shared:  所有策略从 SignalRegistry 获取句柄，每个 tick 只求值一次 (6 个节点)
+直接调用 EventEngine._process 测量单个 tick 的同步耗时 (含各策略读取信号值)。
+"""
+import argparse
+import collections
+import random
+import time
+
+import numpy as np
+
+from benchmarks.common import summarize, print_table
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.signal import SignalRegistry, DualMASignal, DualMA, ZScore
+from quant_system.core.types import TickData, Exchange
+
+class _PrivateStrategy:
+    def __init__(self):
+        self.dual = DualMASignal(5, 20)
+        self.prices = collections.deque(maxlen=20)
+        self.acc = 0.0
+
+    def on_tick(self, event: Event):
+        tick = event.data
+        self.prices.append(tick.last_price)
+        window = np.fromiter(self.prices, dtype=np.float64)
+        std = window.std()
+        z = (tick.last_price - window.mean()) / std if std > 0 else 0.0
+        self.acc += self.dual.on_tick(tick) + z
+
+class _SharedStrategy:
+    def __init__(self, registry: SignalRegistry):
+        self.dual = registry.acquire(DualMA, "BTC", 5, 20)
+        self.z = registry.acquire(ZScore, "BTC", 20)
+        self.acc = 0.0
+
+    def on_tick(self, event: Event):
+        self.acc += self.dual.value + self.z.value
+
+def main():
+    parser = argparse.ArgumentParser(description="Indicator cost: per-strategy vs shared DAG")
+    parser.add_argument("-n", type=int, default=20000, help="Ticks per scenario")
+    parser.add_argument("--strategies", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    price = 50000.0
+    events = []
+    for _ in range(args.n):
+        price += rng.gauss(0, 25)
+        events.append(Event(EventType.TICK, TickData(
+            symbol="BTC", exchange=Exchange.MOCK, timestamp=0.0,
+            last_price=price, volume=1.0, bid_price_1=price, ask_price_1=price
+        )))
+
+    rows = {}
+    for m in sorted({1, 3, args.strategies}):
+        for mode in ("private", "shared"):
+            engine = EventEngine()
+            if mode == "private":
+                strategies = [_PrivateStrategy() for _ in range(m)]
+            else:
+                registry = SignalRegistry(engine)
+                strategies = [_SharedStrategy(registry) for _ in range(m)]
+            for s in strategies:
+                engine.register(EventType.TICK, s.on_tick, "BTC")
+            process = engine._process
+            samples = []
+            for event in events:
+                t0 = time.perf_counter_ns()
+                process(event)
+                samples.append(time.perf_counter_ns() - t0)
+            rows[f"{mode} x{m}"] = summarize(samples)
+    print_table("EventEngine._process per tick (DualMA(5, 20) + ZScore(20) per strategy)", rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+冷启动基准
+
+1. import 耗时: 子进程 `python -X importtime -c "import quant_system.main"`，按累计耗时列出最重的模块
+2. `python -m quant_system.main --help` 墙钟时间
+3. 启动到首个 Tick (time-to-first-tick): 子进程以 Mock 配置启动 TradingSystem，
+   从进程创建到策略收到第一个 Tick 的时间，并检查是否加载了 ccxt / numpy
+每项在全新子进程中重复多次取中位数。
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_TICK_SCRIPT = """
+import sys
+from quant_system.core.event import EventType
+from quant_system.main import TradingSystem
+from quant_system.utils.loop import run
+
+system = TradingSystem(sys.argv[1], "bench")
+
+def on_first_tick(event):
+    print("FIRST_TICK", "ccxt" in sys.modules, "numpy" in sys.modules, flush=True)
+    system.stop_signal()
+
+system.event_engine.register(EventType.TICK, on_first_tick)
+run(system.run())
+"""
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+def import_report(top: int):
+    """返回 (总耗时 ms, [(模块, 累计 ms)])"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import quant_system.main"],
+        capture_output=True, text=True, env=_env(), cwd=ROOT, check=True
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((name.strip(), int(cumulative) / 1000.0))
+    total = next(ms for name, ms in rows if name == "quant_system.main")
+    heavy = sorted(rows, key=lambda r: -r[1])[:top]
+    return total, heavy
+
+def wall_time(cmd, cwd, marker=None):
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=_env(), cwd=cwd)
+    line = ""
+    if marker:
+        for line in proc.stdout:
+            if line.startswith(marker):
+                break
+        elapsed = time.perf_counter() - t0
+    proc.communicate(timeout=30)
+    if not marker:
+        elapsed = time.perf_counter() - t0
+    return elapsed * 1000.0, line.strip()
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("--top", type=int, default=12, help="Heaviest imports to list")
+    args = parser.parse_args()
+
+    total, heavy = import_report(args.top)
+    print(f"\n== import quant_system.main: {total:.1f} ms (cumulative, -X importtime) ==")
+    for name, ms in heavy:
+        print(f"{ms:>10.1f} ms  {name}")
+
+    help_ms = statistics.median(
+        wall_time([sys.executable, "-m", "quant_system.main", "--help"], ROOT)[0] for _ in range(args.repeat)
+    )
+
+    workdir = tempfile.mkdtemp()
+    config_path = os.path.join(workdir, "config.json")
+    with open(config_path, "w") as f:
+        json.dump({
+            "system": {"log_level": "WARNING"},
+            "accounts": {"bench": {
+                "exchange": {"name": "mock", "latency_ms": 0, "tick_interval": 0.001},
+                "strategy": {"name": "DualMA", "symbols": ["BTC-USDT-SWAP"]},
+            }},
+        }, f)
+    runs = [wall_time([sys.executable, "-c", FIRST_TICK_SCRIPT, config_path], workdir, "FIRST_TICK")
+            for _ in range(args.repeat)]
+    ttft_ms = statistics.median(r[0] for r in runs)
+    _, ccxt_loaded, numpy_loaded = runs[-1][1].split()
+
+    print(f"\n== wall time (median of {args.repeat}) ==")
+    print(f"{'main --help':<24}{help_ms:>10.1f} ms")
+    print(f"{'time-to-first-tick':<24}{ttft_ms:>10.1f} ms  (mock, ccxt loaded={ccxt_loaded}, numpy loaded={numpy_loaded})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+基准测试公共工具
+运行方式: python -m benchmarks.<name> (在仓库根目录)
+"""
+import statistics
+from typing import Dict, List
+
+def summarize(samples_ns: List[int]) -> Dict[str, float]:
+    """纳秒样本 -> 微秒统计 (mean / p50 / p90 / p99 / max)"""
+    data = sorted(samples_ns)
+    n = len(data)
+
+    def pct(q: float) -> float:
+        return data[min(n - 1, int(q * n))] / 1000.0
+
+    return {
+        "n": n,
+        "mean_us": statistics.fmean(data) / 1000.0,
+        "p50_us": pct(0.50),
+        "p90_us": pct(0.90),
+        "p99_us": pct(0.99),
+        "max_us": data[-1] / 1000.0,
+    }
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    """按行打印统计结果"""
+    print(f"\n== {title} ==")
+    cols = ["n", "mean_us", "p50_us", "p90_us", "p99_us", "max_us"]
+    width = max(len(name) for name in rows) + 2
+    print("".ljust(width) + "".join(c.rjust(11) for c in cols))
+    for name, stats in rows.items():
+        cells = "".join(
+            (f"{stats[c]:d}" if c == "n" else f"{stats[c]:.1f}").rjust(11) for c in cols
+        )
+        print(name.ljust(width) + cells)
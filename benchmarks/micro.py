@@ -0,0 +1,304 @@
+"""
+核心热路径微基准 (Micro Benchmarks) 与回归基线
+
+每个用例测一次热路径调用的耗时 (ns/op): 自动确定每轮调用次数 (每轮约 --min-time 秒)，重复多轮取最小值。
+机器差异通过校准归一: 每个用例与一段固定的纯 Python 负载交替计时，对比时使用 "用例耗时 / 校准耗时" 的比值，
+基线可以在另一台机器上生成 (--raw 改为直接比较 ns/op)。完全离线运行 (OKX 用例使用录制的帧)。
+
+用法 (仓库根目录):
+    python -m benchmarks.micro run [-k event] [-o results.json]     运行并打印
+    python -m benchmarks.micro save                                  运行并更新基线 benchmarks/baselines/micro.json
+    python -m benchmarks.micro compare [results.json] [--threshold 0.25]
+        与基线对比 (未给出结果文件时现场运行)，任一用例慢于基线超过阈值则退出码为 1
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.types import (
+    Direction, Exchange, Instrument, Offset, OrderData, OrderStatus, OrderType, ProductType, TickData
+)
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "okx_ws_frames.json")
+
+def _tick(price: float, symbol: str = "BTC-USDT-SWAP") -> TickData:
+    return TickData(symbol=symbol, exchange=Exchange.MOCK, timestamp=0.0, last_price=price,
+                    volume=1.0, bid_price_1=price - 0.5, ask_price_1=price + 0.5)
+
+def _cycle(items: List) -> Callable[[], object]:
+    """按顺序循环取值 (每个用例的输入轮换使用)"""
+    state = [0]
+    n = len(items)
+
+    def take():
+        i = state[0]
+        state[0] = i + 1 if i + 1 < n else 0
+        return items[i]
+    return take
+
+# --- 用例: 每个函数完成准备工作，返回单次操作 (无参数) ---
+
+def case_event_put() -> Callable[[], None]:
+    """EventEngine.put + 出队 (队列保持为空)"""
+    engine = EventEngine()
+    engine._queue = asyncio.Queue()
+    event = Event(EventType.TICK, _tick(100.0))
+    put, get = engine.put, engine._queue.get_nowait
+
+    def op():
+        put(event)
+        get()
+    return op
+
+def case_event_process() -> Callable[[], None]:
+    """EventEngine._process: 1 个全量订阅 + 100 个 symbol 中本 symbol 的 1 个订阅"""
+    engine = EventEngine()
+    engine.register(EventType.TICK, lambda e: None)
+    for i in range(100):
+        engine.register(EventType.TICK, lambda e: None, f"SYM{i}")
+    event = Event(EventType.TICK, _tick(100.0, "SYM7"))
+    process = engine._process
+    return lambda: process(event)
+
+def case_dual_ma_on_tick() -> Callable[[], None]:
+    """DualMASignal(5, 20).on_tick"""
+    from quant_system.core.signal import DualMASignal
+    signal = DualMASignal(5, 20)
+    ticks = [_tick(100.0 + (i % 37) * 0.5 - (i % 11)) for i in range(1000)]
+    for t in ticks[:20]:
+        signal.on_tick(t)
+    take, on_tick = _cycle(ticks), signal.on_tick
+    return lambda: on_tick(take())
+
+def case_round_price() -> Callable[[], None]:
+    """Instrument.round_price (price_tick 0.1)"""
+    inst = Instrument(symbol="BTC-USDT-SWAP", exchange=Exchange.OKX, product_type=ProductType.PERP,
+                      contract_size=0.01, price_tick=0.1, min_volume=0.01, volume_tick=0.01)
+    take, round_price = _cycle([95000.0 + i * 0.037 for i in range(1000)]), inst.round_price
+    return lambda: round_price(take())
+
+def case_state_transition() -> Callable[[], None]:
+    """OrderStateMachine.transition (合法流转)"""
+    from quant_system.core.state import OrderStateMachine
+    pairs = _cycle([
+        (OrderStatus.CREATED, OrderStatus.SUBMITTED),
+        (OrderStatus.SUBMITTED, OrderStatus.PARTIALLY_FILLED),
+        (OrderStatus.PARTIALLY_FILLED, OrderStatus.FILLED),
+        (OrderStatus.SUBMITTED, OrderStatus.CANCELLED),
+    ])
+    transition = OrderStateMachine.transition
+    return lambda: transition(*pairs())
+
+def case_okx_parse_order() -> Callable[[], None]:
+    """OkxExchangeAdapter._parse_order_data (录制的订单帧经 CCXT 解析后的统一格式字典)"""
+    import ccxt.pro as ccxt
+    from quant_system.exchange.okx_adapter import OkxExchangeAdapter
+    with open(FIXTURE, encoding="utf-8") as f:
+        frames = json.load(f)
+    api = ccxt.okx({"options": {"defaultType": "swap"}})
+    api.set_markets([api.parse_market(raw) for raw in frames["instruments"]])
+    orders = [api.parse_order(raw) for msg in frames["orders"] for raw in msg["data"]]
+    adapter = OkxExchangeAdapter(EventEngine(), {})
+    take, parse = _cycle(orders), adapter._parse_order_data
+    return lambda: parse(take())
+
+def case_mock_match_orders() -> Callable[[], None]:
+    """MockExchangeAdapter._match_orders: 1000 个未触价的限价挂单 (10 个 symbol)"""
+    from quant_system.exchange.mock_adapter import MockExchangeAdapter
+    mock = MockExchangeAdapter(EventEngine(), {"market_data": False})
+    for i in range(1000):
+        long = i % 2 == 0
+        mock._active_orders[f"o{i}"] = OrderData(
+            symbol=f"SYM{i % 10}", exchange=Exchange.MOCK, order_id=f"o{i}", exchange_order_id=f"x{i}",
+            direction=Direction.LONG if long else Direction.SHORT, offset=Offset.OPEN, type=OrderType.LIMIT,
+            price=90.0 if long else 110.0, volume=1.0, traded=0.0, status=OrderStatus.SUBMITTED, timestamp=0.0,
+        )
+    tick, match = _tick(100.0, "SYM3"), mock._match_orders
+    return lambda: match(tick)
+
+def case_strategy_order_status() -> Callable[[], None]:
+    """BaseStrategy._on_order_status_wrapper: 100 个挂单的部分成交回报"""
+    from quant_system.exchange.mock_adapter import MockExchangeAdapter
+    from quant_system.strategy.base import BaseStrategy
+    class _Strategy(BaseStrategy):
+        def on_tick(self, tick):
+            pass
+
+    engine = EventEngine()
+    strategy = _Strategy(engine, MockExchangeAdapter(engine, {"market_data": False}), ["BTC-USDT-SWAP"])
+    events = []
+    for i in range(100):
+        order = OrderData(
+            symbol="BTC-USDT-SWAP", exchange=Exchange.MOCK, order_id=f"o{i}", exchange_order_id=f"x{i}",
+            direction=Direction.LONG, offset=Offset.OPEN, type=OrderType.LIMIT, price=100.0, volume=10.0,
+            traded=1.0, status=OrderStatus.PARTIALLY_FILLED, timestamp=0.0,
+        )
+        strategy._on_order_status_wrapper(Event(EventType.ORDER_STATUS, order))
+        events.append(Event(EventType.ORDER_STATUS, order))
+    take, handle = _cycle(events), strategy._on_order_status_wrapper
+    return lambda: handle(take())
+
+CASES: Dict[str, Callable[[], Callable[[], None]]] = {
+    "event.put": case_event_put,
+    "event.process": case_event_process,
+    "signal.dual_ma_on_tick": case_dual_ma_on_tick,
+    "instrument.round_price": case_round_price,
+    "state.transition": case_state_transition,
+    "okx.parse_order_data": case_okx_parse_order,
+    "mock.match_orders_1000": case_mock_match_orders,
+    "strategy.order_status": case_strategy_order_status,
+}
+
+# --- 计时 ---
+
+def _calibration_op() -> Callable[[], None]:
+    """校准负载: 固定的纯 Python 字典/浮点运算 (与被测代码的解释器开销同类)"""
+    d = {i: float(i) for i in range(64)}
+
+    def op():
+        acc = 0.0
+        for i in range(64):
+            acc += d[i] * 1.5
+        d[-1] = acc
+    return op
+
+def _number(op: Callable[[], None], min_time: float) -> int:
+    """每轮调用次数: 使一轮耗时不少于 min_time 秒"""
+    number = 1
+    while True:
+        t0 = time.perf_counter_ns()
+        for _ in range(number):
+            op()
+        elapsed = time.perf_counter_ns() - t0
+        if elapsed >= min_time * 1e9:
+            return number
+        number *= 2 if elapsed > min_time * 1e8 else 10
+
+def _round(op: Callable[[], None], number: int) -> float:
+    t0 = time.perf_counter_ns()
+    for _ in range(number):
+        op()
+    return (time.perf_counter_ns() - t0) / number
+
+def measure(op: Callable[[], None], min_time: float = 0.02, repeat: int = 15) -> Tuple[float, float]:
+    """
+    单次操作耗时与校准负载耗时 (ns)
+    两者逐轮交替计时，各取多轮最小值 (调度/中断等干扰只会让耗时变长)，同一时段的机器负载同时作用于两者
+    """
+    reference = _calibration_op()
+    n_op, n_ref = _number(op, min_time), _number(reference, min_time)
+    op_ns, ref_ns = [], []
+    for _ in range(repeat):
+        ref_ns.append(_round(reference, n_ref))
+        op_ns.append(_round(op, n_op))
+    return min(op_ns), min(ref_ns)
+
+def run_suite(pattern: Optional[str] = None, min_time: float = 0.02, repeat: int = 15) -> Dict:
+    """运行 (名称包含 pattern 的) 用例"""
+    results, calibration = {}, {}
+    for name, setup in CASES.items():
+        if pattern and pattern not in name:
+            continue
+        op_ns, ref_ns = measure(setup(), min_time, repeat)
+        results[name] = round(op_ns, 1)
+        calibration[name] = round(ref_ns, 1)
+    return {
+        "host": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results_ns": results,
+        "calibration_ns": calibration,
+    }
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.25, raw: bool = False) -> List[Dict]:
+    """
+    逐用例对比 (默认比较 用例耗时 / 同时测得的校准耗时)
+    :return: [{name, baseline_ns, current_ns, ratio, status}]，ratio > 1 + threshold 为 REGRESSION，
+             < 1 - threshold 为 IMPROVED; 基线中没有的用例为 NEW
+    """
+    rows = []
+    for name, ns in current["results_ns"].items():
+        base = baseline["results_ns"].get(name)
+        if base is None:
+            rows.append({"name": name, "baseline_ns": None, "current_ns": ns, "ratio": None, "status": "NEW"})
+            continue
+        scale = 1.0 if raw else baseline["calibration_ns"][name] / current["calibration_ns"][name]
+        ratio = ns * scale / base
+        status = "REGRESSION" if ratio > 1 + threshold else "IMPROVED" if ratio < 1 - threshold else "ok"
+        rows.append({"name": name, "baseline_ns": base, "current_ns": ns, "ratio": round(ratio, 3), "status": status})
+    return rows
+
+def print_results(data: Dict) -> None:
+    print("\n== Micro benchmarks (ns/op) ==")
+    print(f"{'':<28}{'ns/op':>12}{'calibration':>13}")
+    for name, ns in data["results_ns"].items():
+        print(f"{name:<28}{ns:>12.1f}{data['calibration_ns'][name]:>13.1f}")
+
+def print_comparison(rows: List[Dict], raw: bool) -> None:
+    print(f"\n== vs baseline ({'raw ns' if raw else 'calibration-normalized'}) ==")
+    print(f"{'':<28}{'baseline':>12}{'current':>12}{'ratio':>9}")
+    for r in rows:
+        base = f"{r['baseline_ns']:.1f}" if r["baseline_ns"] is not None else "-"
+        ratio = f"{r['ratio']:.2f}" if r["ratio"] is not None else "-"
+        print(f"{r['name']:<28}{base:>12}{r['current_ns']:>12.1f}{ratio:>9}  {r['status']}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Core hot-path micro benchmarks with regression baselines")
+    parser.add_argument("command", choices=["run", "save", "compare"])
+    parser.add_argument("results", nargs="?", help="compare: results JSON from `run -o` (default: run now)")
+    parser.add_argument("-k", dest="pattern", help="Only cases whose name contains this string")
+    parser.add_argument("-o", "--output", help="run: also write results JSON here")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline JSON path")
+    parser.add_argument("--threshold", type=float, default=0.25, help="compare: allowed slowdown (0.25 = +25%%)")
+    parser.add_argument("--raw", action="store_true", help="compare: absolute ns/op, no calibration normalization")
+    parser.add_argument("--min-time", type=float, default=0.02, help="Seconds per timing round")
+    parser.add_argument("--repeat", type=int, default=15, help="Timing rounds per case (minimum)")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare" and args.results:
+        with open(args.results, encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        data = run_suite(args.pattern, args.min_time, args.repeat)
+        print_results(data)
+
+    if args.command == "run" and args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    elif args.command == "save":
+        if args.pattern and os.path.exists(args.baseline):
+            # 只更新选中的用例，保留其余基线
+            with open(args.baseline, encoding="utf-8") as f:
+                merged = json.load(f)
+            merged["results_ns"].update(data["results_ns"])
+            merged["calibration_ns"].update(data["calibration_ns"])
+            merged["host"] = data["host"]
+            data = merged
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written: {args.baseline}")
+    elif args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(data, baseline, args.threshold, args.raw)
+        print_comparison(rows, args.raw)
+        regressions = [r["name"] for r in rows if r["status"] == "REGRESSION"]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond +{args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+import asyncio
+import collections
+import logging
+import time
+import weakref
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Tuple
+
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.types import BarData, Exchange
+
+if TYPE_CHECKING:
+    from quant_system.exchange.base import BaseExchange
+
+# 周期种类
+TIME = 0    # 按时间 (区间按 Unix 时间对齐: 1m 的区间为 [hh:mm:00, hh:mm+1:00))
+TICKS = 1   # 按 tick 数
+VOLUME = 2  # 按成交量
+
+_TIME_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+def parse_timeframe(timeframe: str) -> Tuple[int, float]:
+    """
+    周期字符串 -> (种类, 大小)
+    "30s" / "1m" / "4h" / "1d" -> (TIME, 秒数); "100t" -> (TICKS, 100); "50v" / "0.5v" -> (VOLUME, 成交量)
+    """
+    unit = timeframe[-1:]
+    try:
+        size = float(timeframe[:-1])
+    except ValueError:
+        size = 0.0
+    if size > 0:
+        if unit in _TIME_UNITS:
+            return TIME, size * _TIME_UNITS[unit]
+        if unit == "t":
+            return TICKS, size
+        if unit == "v":
+            return VOLUME, size
+    raise ValueError(f"Invalid timeframe: {timeframe!r}")
+
+class BarAggregator:
+    """
+    增量 K 线合成 (Bar Aggregation Service)
+    每个事件引擎一个 (for_engine)，同一 (symbol, timeframe) 只计算一次，无论有多少策略使用;
+    收盘的 K 线作为 EventType.BAR 推送 (按 symbol 路由，同一 symbol 的各周期共用一个订阅)。
+
+    - 状态: 每个 (symbol, timeframe) 一个 series slot，未收盘 K 线的 OHLCV 按 slot 存放在 list 中，
+      tick 路径只做下标读写与浮点比较，不创建对象; 只有收盘时才生成一个 BarData
+    - 收盘: 时间 K 线在下一区间的首个 tick 到达时收盘，无 tick 时由定时器在区间结束 grace 秒后收盘;
+      tick / 成交量 K 线在达到阈值的 tick 上收盘 (该 tick 计入本根)
+    - 无成交的时间区间不生成 K 线
+    - 成交量: 交易所推送的是 24h 累计量时 (exchange.tick_volume_cumulative)，按相邻 tick 的正增量计
+    - 历史: 每个 series 保留最近 history 根已收盘 K 线，启动时可由交易所历史数据回填 (backfill)
+    """
+
+    grace: float = 1.0           # 时间 K 线区间结束后等待迟到 tick 的秒数
+    sweep_interval: float = 1.0  # 定时收盘检查间隔 (秒)
+
+    _instances: "weakref.WeakKeyDictionary[EventEngine, BarAggregator]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, engine: EventEngine, cumulative_volume: bool = False, history: int = 500,
+                 clock: Callable[[], float] = time.time):
+        self.engine = engine
+        self.cumulative_volume = cumulative_volume
+        self.history_size = history
+        self.clock = clock
+        self.logger = logging.getLogger("BarAggregator")
+
+        # series: (symbol, timeframe) -> slot
+        self._series: Dict[Tuple[str, str], int] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._kind: List[int] = []
+        self._size: List[float] = []
+        self._refs: List[int] = []
+        self._history: List[Deque[BarData]] = []
+
+        # 未收盘 K 线 (按 slot)
+        self._open: List[float] = []
+        self._high: List[float] = []
+        self._low: List[float] = []
+        self._close: List[float] = []
+        self._volume: List[float] = []
+        self._start: List[float] = []
+        self._end: List[float] = []
+        self._count: List[int] = []
+        self._last_end: List[float] = []      # 上一根已收盘 K 线的终点 (时间 K 线判断迟到 tick)
+        self._exchange: List[Exchange] = []
+        self._iid: List[int] = []
+
+        self._routes: Dict[str, List[int]] = {}   # symbol -> 活跃 series slots
+        self._last_cum: Dict[str, float] = {}     # symbol -> 上一个 tick 的累计成交量
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.bars_emitted = 0
+        self.late_ticks = 0 # 时间戳落在已收盘区间内的 tick (计入当前区间)
+
+    @classmethod
+    def for_engine(cls, engine: EventEngine, exchange: Optional["BaseExchange"] = None) -> "BarAggregator":
+        """获取 (或创建) 事件引擎对应的共享合成器"""
+        aggregator = cls._instances.get(engine)
+        if aggregator is None:
+            aggregator = cls(engine, cumulative_volume=getattr(exchange, "tick_volume_cumulative", False))
+            cls._instances[engine] = aggregator
+        return aggregator
+
+    # --- 订阅 ---
+
+    def acquire(self, symbol: str, timeframe: str) -> int:
+        """登记对 (symbol, timeframe) 的使用 (引用计数; 首次使用时开始合成)，返回 series slot"""
+        key = (symbol, timeframe)
+        i = self._series.get(key)
+        if i is None:
+            kind, size = parse_timeframe(timeframe)
+            i = len(self._keys)
+            self._series[key] = i
+            self._keys.append(key)
+            self._kind.append(kind)
+            self._size.append(size)
+            self._refs.append(0)
+            self._history.append(collections.deque(maxlen=self.history_size))
+            for arr in (self._open, self._high, self._low, self._close, self._volume,
+                        self._start, self._end, self._last_end):
+                arr.append(0.0)
+            self._count.append(0)
+            self._exchange.append(Exchange.OKX)
+            self._iid.append(-1)
+
+        self._refs[i] += 1
+        if self._refs[i] == 1:
+            slots = self._routes.get(symbol)
+            if slots is None:
+                slots = self._routes[symbol] = []
+                self.engine.register(EventType.TICK, self._on_tick, symbol)
+            slots.append(i)
+            if self._kind[i] == TIME:
+                self._schedule()
+        return i
+
+    def release(self, symbol: str, timeframe: str) -> None:
+        """注销一次使用; 引用归零时停止合成 (已收盘的历史保留)"""
+        i = self._series.get((symbol, timeframe))
+        if i is None or self._refs[i] == 0:
+            return
+        self._refs[i] -= 1
+        if self._refs[i]:
+            return
+        self._count[i] = 0 # 丢弃未收盘的 K 线
+        slots = self._routes[symbol]
+        slots.remove(i)
+        if not slots:
+            del self._routes[symbol]
+            self._last_cum.pop(symbol, None)
+            self.engine.unregister(EventType.TICK, self._on_tick, symbol)
+        if self._timer and not any(self._kind[j] == TIME for s in self._routes.values() for j in s):
+            self._timer.cancel()
+            self._timer = None
+
+    # --- 查询 ---
+
+    def history(self, symbol: str, timeframe: str) -> List[BarData]:
+        """已收盘的 K 线 (旧 -> 新)"""
+        i = self._series.get((symbol, timeframe))
+        return list(self._history[i]) if i is not None else []
+
+    def current(self, symbol: str, timeframe: str) -> Optional[BarData]:
+        """未收盘 K 线的快照 (尚无 tick 时为 None)"""
+        i = self._series.get((symbol, timeframe))
+        if i is None or not self._count[i]:
+            return None
+        return self._make_bar(i)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "series": sum(1 for r in self._refs if r),
+            "bars": self.bars_emitted,
+            "late_ticks": self.late_ticks,
+        }
+
+    # --- 回填 ---
+
+    async def backfill(self, exchange: "BaseExchange", limit: int = 100) -> int:
+        """
+        用交易所历史 K 线回填尚无历史的时间周期 series (只取已结束的区间)，并发查询
+        :return: 回填的 K 线数
+        """
+        targets = [i for i, r in enumerate(self._refs) if r and self._kind[i] == TIME and not self._history[i]]
+        if not targets:
+            return 0
+        results = await asyncio.gather(
+            *[exchange.query_bars(*self._keys[i], limit=limit) for i in targets], return_exceptions=True
+        )
+        now = self.clock()
+        total = 0
+        for i, bars in zip(targets, results):
+            if isinstance(bars, BaseException):
+                self.logger.error("Backfill failed for %s %s: %r", *self._keys[i], bars)
+                continue
+            if self._history[i]:
+                continue # 回填期间已有 tick 合成的 K 线收盘
+            done = [b for b in bars if b.end <= now]
+            if self._count[i]:
+                done = [b for b in done if b.end <= self._start[i]]
+            self._history[i].extend(done)
+            if done:
+                self._last_end[i] = max(self._last_end[i], done[-1].end)
+            total += len(done)
+        self.logger.info("Backfilled %d bars for %d series", total, len(targets))
+        return total
+
+    # --- 合成 ---
+
+    def _on_tick(self, event: Event) -> None:
+        tick = event.data
+        slots = self._routes.get(tick.symbol)
+        if not slots:
+            return
+        price = tick.last_price
+        ts = tick.timestamp
+        if self.cumulative_volume:
+            prev = self._last_cum.get(tick.symbol)
+            self._last_cum[tick.symbol] = tick.volume
+            dv = tick.volume - prev if prev is not None and tick.volume > prev else 0.0
+        else:
+            dv = tick.volume
+
+        kinds, sizes, counts = self._kind, self._size, self._count
+        for i in slots:
+            kind = kinds[i]
+            if kind == TIME:
+                start = ts - ts % sizes[i]
+                if counts[i] and start >= self._end[i]:
+                    self._emit(i)
+                if not counts[i]:
+                    if start < self._last_end[i]:
+                        self.late_ticks += 1
+                        start = self._last_end[i]
+                    self._open_bar(i, tick, price, start, start + sizes[i])
+                elif start < self._start[i]:
+                    self.late_ticks += 1
+            elif not counts[i]:
+                self._open_bar(i, tick, price, ts, ts)
+            else:
+                self._end[i] = ts
+
+            if price > self._high[i]:
+                self._high[i] = price
+            elif price < self._low[i]:
+                self._low[i] = price
+            self._close[i] = price
+            self._volume[i] += dv
+            counts[i] += 1
+
+            if kind == TICKS:
+                if counts[i] >= sizes[i]:
+                    self._emit(i)
+            elif kind == VOLUME:
+                if self._volume[i] >= sizes[i]:
+                    self._emit(i)
+
+    def _open_bar(self, i: int, tick, price: float, start: float, end: float) -> None:
+        self._open[i] = self._high[i] = self._low[i] = price
+        self._volume[i] = 0.0
+        self._start[i] = start
+        self._end[i] = end
+        self._exchange[i] = tick.exchange
+        self._iid[i] = tick.instrument_id
+
+    def _make_bar(self, i: int) -> BarData:
+        symbol, timeframe = self._keys[i]
+        return BarData(
+            symbol=symbol,
+            exchange=self._exchange[i],
+            timeframe=timeframe,
+            start=self._start[i],
+            end=self._end[i],
+            open=self._open[i],
+            high=self._high[i],
+            low=self._low[i],
+            close=self._close[i],
+            volume=self._volume[i],
+            count=self._count[i],
+            instrument_id=self._iid[i],
+        )
+
+    def _emit(self, i: int) -> None:
+        bar = self._make_bar(i)
+        self._count[i] = 0
+        self._last_end[i] = bar.end
+        self._history[i].append(bar)
+        self.bars_emitted += 1
+        self.engine.put(Event(EventType.BAR, bar))
+
+    # --- 定时收盘 ---
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """收盘所有已过 (区间终点 + grace) 的时间 K 线，返回收盘数"""
+        deadline = (self.clock() if now is None else now) - self.grace
+        closed = 0
+        for slots in self._routes.values():
+            for i in slots:
+                if self._count[i] and self._kind[i] == TIME and self._end[i] <= deadline:
+                    self._emit(i)
+                    closed += 1
+        return closed
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return # 无事件循环 (同步调用/测试): 只在 tick 上收盘
+        self._timer = loop.call_later(self.sweep_interval, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        try:
+            self.sweep()
+        except Exception as e:
+            self.logger.error("Bar sweep failed: %r", e, exc_info=True)
+        self._schedule()
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+class Checkpoint:
+    """
+    策略状态检查点 (Periodic State Checkpoint)
+    定期把策略自定义状态 (BaseStrategy.get_state) 与指标状态 (窗口缓冲等) 写成一个紧凑的 JSON 文件，
+    重启时先于行情订阅恢复，策略不必等待指标窗口重新填满。
+
+    - 与 Journal 互补: Journal 负责订单/成交/持仓 (每条记录落盘)，检查点负责策略与信号的计算状态 (按时间间隔落盘)
+    - 写入: 事件循环线程只生成状态副本，序列化与写盘在线程池完成; 临时文件 + fsync + 原子替换，崩溃时保留上一份
+    - 过期: 指标状态超过 max_age 秒的检查点只恢复策略状态 (行情已变化，指标改由预热重建)
+
+    文件: {directory}/{name}.checkpoint.json
+    """
+    def __init__(self, directory: str, name: str, interval: float = 60.0, max_age: float = 300.0):
+        self.directory = directory
+        self.name = name
+        self.interval = interval
+        self.max_age = max_age
+        self.logger = logging.getLogger("Checkpoint")
+        os.makedirs(directory, exist_ok=True)
+
+        self._task: Optional[asyncio.Task] = None
+        self.saves = 0
+
+    @classmethod
+    def from_config(cls, system_config: Dict[str, Any], name: str) -> Optional["Checkpoint"]:
+        """
+        按 system 配置创建 (未配置 checkpoint_dir 时返回 None，即不启用)
+        - checkpoint_dir: 检查点目录
+        - checkpoint_interval: 写入间隔秒数 (默认 60)
+        - checkpoint_max_age: 指标状态的最长有效期秒数 (默认 300)
+        """
+        directory = system_config.get("checkpoint_dir")
+        if not directory:
+            return None
+        return cls(
+            directory, name,
+            interval=float(system_config.get("checkpoint_interval", 60.0)),
+            max_age=float(system_config.get("checkpoint_max_age", 300.0)),
+        )
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"{self.name}.checkpoint.json")
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        读取检查点
+        :return: {"ts": 写入时间, "state": 状态} 或 None (不存在/已损坏)
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            return {"ts": float(snap["ts"]), "state": snap["state"]}
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Checkpoint {self.path} unreadable, ignored: {e}")
+            return None
+
+    def is_fresh(self, snap: Dict[str, Any]) -> bool:
+        return time.time() - snap["ts"] <= self.max_age
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """同步写入 (原子替换)"""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"ts": time.time(), "state": state}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.saves += 1
+
+    def start(self, provider: Callable[[], Dict[str, Any]]) -> None:
+        """开始定期写入 (provider 在事件循环线程中调用，须返回独立副本)"""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run(provider))
+
+    async def _run(self, provider: Callable[[], Dict[str, Any]]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await loop.run_in_executor(None, self.save, provider())
+            except Exception as e:
+                self.logger.error(f"Checkpoint save failed: {e}", exc_info=True)
+
+    def stop(self, state: Optional[Dict[str, Any]] = None) -> None:
+        """停止定期写入; 提供 state 时同步写入最终状态"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if state is not None:
+            self.save(state)
@@ -2,7 +2,7 @@ import asyncio
 import logging
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any, Callable, Coroutine, Dict, List, Union
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple, Union
 
 # Define Handler Type: Can be a regular function or an async coroutine
 HandlerType = Union[Callable[["Event"], Any], Callable[["Event"], Coroutine[Any, Any, Any]]]
@@ -12,6 +12,7 @@ class EventType:
     系统事件总线 Topic 定义 (集中式管理)
     """
     TICK = "eTick"             # 行情更新 -> Payload: TickData
+    BAR = "eBar"               # K 线收盘 -> Payload: BarData
     ORDER_REQ = "eOrderReq"    # 发单请求 -> Payload: OrderRequest
     ORDER_STATUS = "eOrder"    # 订单状态与回报 -> Payload: OrderData
     TRADE = "eTrade"           # 成交回报 -> Payload: TradeData
@@ -26,15 +27,24 @@ class Event:
     """
     type: str       # 事件类型 (Topic)
     data: Any = None # 事件载荷 (Payload)
+    extra: Any = None # 附加数据 (可选，如宿主模式下随 Tick 转发的共享指标值)
 
 class EventEngine:
     """
     核心事件引擎 (Blind Bus)
     负责将事件分发给注册的回调函数，不包含任何业务逻辑。
+
+    两级订阅:
+    - register(type, handler): 接收该类型的全部事件
+    - register(type, handler, symbol): 只接收 event.data.symbol == symbol 的事件 (按 (type, symbol) 建索引，
+      每个 tick 只唤醒订阅了该 symbol 的回调，与策略/合约总数无关)
+    回调是否为协程在注册时判定并缓存，分发时不再检查。
     """
     def __init__(self) -> None:
         self._queue: Optional[asyncio.Queue[Event]] = None
-        self._handlers: Dict[str, List[HandlerType]] = defaultdict(list)
+        self._handlers: Dict[str, List[Tuple[HandlerType, bool]]] = defaultdict(list)
+        self._symbol_handlers: Dict[Tuple[str, str], List[Tuple[HandlerType, bool]]] = {}
+        self._routed_types: Set[str] = set() # 存在按 symbol 订阅的事件类型
         self._active: bool = False
         self._task: Union[asyncio.Task[Any], None] = None
         self.logger = logging.getLogger("EventEngine")
@@ -58,19 +68,35 @@ class EventEngine:
             self._task.cancel()
         self.logger.info("EventEngine stopped")
 
-    def register(self, type: str, handler: HandlerType) -> None:
-        """注册事件回调"""
+    def register(self, type: str, handler: HandlerType, symbol: Optional[str] = None) -> None:
+        """注册事件回调 (指定 symbol 时只接收该 symbol 的事件)"""
+        if symbol is None:
+            handlers = self._handlers[type]
+        else:
+            handlers = self._symbol_handlers.setdefault((type, symbol), [])
+            self._routed_types.add(type)
         # 防止重复注册
-        if handler not in self._handlers[type]:
-            self._handlers[type].append(handler)
-            self.logger.debug(f"Registered handler {handler} for {type}")
+        if all(h != handler for h, _ in handlers):
+            handlers.append((handler, asyncio.iscoroutinefunction(handler)))
+            self.logger.debug(f"Registered handler {handler} for {type} {symbol or ''}")
 
-    def unregister(self, type: str, handler: HandlerType) -> None:
+    def unregister(self, type: str, handler: HandlerType, symbol: Optional[str] = None) -> None:
         """注销事件回调"""
-        if type in self._handlers:
-            if handler in self._handlers[type]:
-                self._handlers[type].remove(handler)
-                self.logger.debug(f"Unregistered handler {handler} for {type}")
+        if symbol is None:
+            handlers = self._handlers.get(type)
+        else:
+            handlers = self._symbol_handlers.get((type, symbol))
+        if not handlers:
+            return
+        for i, (h, _) in enumerate(handlers):
+            if h == handler:
+                del handlers[i]
+                self.logger.debug(f"Unregistered handler {handler} for {type} {symbol or ''}")
+                break
+        if symbol is not None and not handlers:
+            del self._symbol_handlers[(type, symbol)]
+            if not any(t == type for t, _ in self._symbol_handlers):
+                self._routed_types.discard(type)
 
     def put(self, event: Event) -> None:
         """
@@ -82,6 +108,10 @@ class EventEngine:
         if self._queue is not None:
             self._queue.put_nowait(event)
 
+    def qsize(self) -> int:
+        """队列中待处理的事件数 (负载观测)"""
+        return self._queue.qsize() if self._queue is not None else 0
+
     async def _run(self) -> None:
         """事件处理主循环"""
         while self._active:
@@ -96,15 +126,23 @@ class EventEngine:
                 self.logger.error(f"EventEngine run error: {e}", exc_info=True)
 
     def _process(self, event: Event) -> None:
-        """触发回调"""
-        if event.type in self._handlers:
-            for handler in self._handlers[event.type]:
-                try:
-                    # 如果是协程函数，创建一个 Task 去执行，不阻塞总线分发
-                    if asyncio.iscoroutinefunction(handler):
-                        asyncio.create_task(handler(event))
-                    else:
-                        # 同步函数直接执行
-                        handler(event) # type: ignore
-                except Exception as e:
-                    self.logger.error(f"Handler error for {event.type}: {e}", exc_info=True)
+        """触发回调: 先全量订阅者，再该 symbol 的订阅者"""
+        handlers = self._handlers.get(event.type)
+        if handlers:
+            self._dispatch(event, handlers)
+        if event.type in self._routed_types:
+            routed = self._symbol_handlers.get((event.type, getattr(event.data, "symbol", None)))
+            if routed:
+                self._dispatch(event, routed)
+
+    def _dispatch(self, event: Event, handlers: List[Tuple[HandlerType, bool]]) -> None:
+        for handler, is_coro in handlers:
+            try:
+                # 如果是协程函数，创建一个 Task 去执行，不阻塞总线分发
+                if is_coro:
+                    asyncio.create_task(handler(event))
+                else:
+                    # 同步函数直接执行
+                    handler(event) # type: ignore
+            except Exception as e:
+                self.logger.error(f"Handler error for {event.type}: {e}", exc_info=True)
@@ -0,0 +1,71 @@
+"""
+定点数换算 (整数 tick)
+
+步长按其十进制表示精确分解为 units / scale (如 0.1 -> 1/10, 0.25 -> 25/100, 5 -> 5/1)，
+价格/数量 <-> 整数 tick:
+- to_ticks:   round(value * scale / units)，四舍六入五成双 (与内置 round 一致)，按 value 的十进制表示判定
+- from_ticks: n * units / scale，两个整数相除由 IEEE 754 保证正确舍入，
+              结果恰为十进制值 n * tick 最接近的 float (不会出现 0.30000000000000004)
+
+常规路径只有一次浮点乘除与 round; 只有落在半格附近 (浮点误差可能影响舍入方向) 时才用 Decimal 精确判定。
+"""
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import TYPE_CHECKING, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# 判定 "接近半格" 的相对容差 (远大于双精度舍入误差，远小于任何真实的非半格偏差)
+_TIE_EPS = 1e-9
+
+def tick_fraction(tick: float) -> Tuple[int, int]:
+    """步长 -> (units, scale)，tick == units / scale; tick <= 0 返回 (0, 1) 表示不取整"""
+    if not tick or tick <= 0:
+        return 0, 1
+    d = Decimal(repr(float(tick))).normalize()
+    exp = d.as_tuple().exponent
+    if exp >= 0:
+        return int(d), 1
+    scale = 10 ** -exp
+    return int(d * scale), scale
+
+def _exact_ticks(value: float, units: int, scale: int) -> int:
+    return int((Decimal(repr(float(value))) * scale / units).to_integral_value(ROUND_HALF_EVEN))
+
+def to_ticks(value: float, units: int, scale: int) -> int:
+    """数值 -> 最近的整数 tick 数"""
+    q = value * scale / units
+    n = round(q)
+    if abs(abs(q - n) - 0.5) <= _TIE_EPS * max(1.0, abs(q)):
+        return _exact_ticks(value, units, scale)
+    return n
+
+def from_ticks(n: int, units: int, scale: int) -> float:
+    """整数 tick 数 -> 数值 (正确舍入)"""
+    return n * units / scale
+
+def to_ticks_array(values: "np.ndarray", units: Union[int, "np.ndarray"], scale: Union[int, "np.ndarray"]) -> "np.ndarray":
+    """
+    批量换算 (units / scale 可为逐元素数组，用于多合约订单批次)
+    units 为 0 的元素 (不取整) 返回 0，调用方需自行屏蔽
+    """
+    import numpy as np
+    values = np.asarray(values, dtype=np.float64)
+    units = np.asarray(units, dtype=np.float64)
+    scale = np.asarray(scale, dtype=np.float64)
+    q = values * scale / np.where(units > 0, units, 1.0)
+    n = np.rint(q) # 五成双
+    ties = np.abs(np.abs(q - n) - 0.5) <= _TIE_EPS * np.maximum(1.0, np.abs(q))
+    ties &= units > 0
+    if ties.any():
+        u = np.broadcast_to(units, q.shape)
+        s = np.broadcast_to(scale, q.shape)
+        v = np.broadcast_to(values, q.shape)
+        for idx in zip(*np.nonzero(ties)):
+            n[idx] = _exact_ticks(v[idx], int(u[idx]), int(s[idx]))
+    return np.where(units > 0, n, 0.0).astype(np.int64)
+
+def from_ticks_array(n: "np.ndarray", units: Union[int, "np.ndarray"], scale: Union[int, "np.ndarray"]) -> "np.ndarray":
+    """批量 tick 数 -> 数值 (逐元素正确舍入)"""
+    import numpy as np
+    return np.asarray(n, dtype=np.float64) * np.asarray(units, dtype=np.float64) / np.asarray(scale, dtype=np.float64)
@@ -0,0 +1,68 @@
+from typing import Dict, List, Optional
+
+from quant_system.core.types import Instrument
+
+class InstrumentRegistry(dict):
+    """
+    合约注册表 (symbol -> Instrument，附带稠密整数 ID)
+
+    每个出现过的 symbol 分配一个从 0 开始连续的 instrument_id (分配后不变)，适配器在解析行情/回报时
+    写入 TickData/OrderData/TradeData.instrument_id，下游按 ID 做数组下标访问 (见 SlotIndex)，
+    字符串 symbol 仍保留用于日志与交易所接口。
+
+    仍是普通 dict (symbol -> Instrument)，原有 .get / in / [] 用法不变; 通过 [] 赋值写入时自动分配 ID。
+    同进程多账户通过 BaseExchange.share_instruments 共享同一个实例，ID 因此在这些连接之间一致;
+    ID 只在进程内有效，不进入跨进程协议与日志。
+    """
+    def __init__(self):
+        super().__init__()
+        self.ids: Dict[str, int] = {}
+        self.symbols: List[str] = []                  # id -> symbol
+        self._by_id: List[Optional[Instrument]] = []  # id -> Instrument (未加载元数据时为 None)
+
+    def intern(self, symbol: str) -> int:
+        """symbol -> instrument_id (首次出现时分配)"""
+        iid = self.ids.get(symbol)
+        if iid is None:
+            iid = len(self.symbols)
+            self.ids[symbol] = iid
+            self.symbols.append(symbol)
+            self._by_id.append(None)
+        return iid
+
+    def __setitem__(self, symbol: str, inst: Instrument) -> None:
+        super().__setitem__(symbol, inst)
+        self._by_id[self.intern(symbol)] = inst
+
+    def add(self, inst: Instrument) -> int:
+        """写入合约元数据，返回其 ID"""
+        self[inst.symbol] = inst
+        return self.ids[inst.symbol]
+
+    def symbol_of(self, instrument_id: int) -> str:
+        return self.symbols[instrument_id]
+
+    def by_id(self, instrument_id: int) -> Optional[Instrument]:
+        return self._by_id[instrument_id]
+
+class SlotIndex:
+    """
+    instrument_id -> 本地 slot 的映射 (list 下标查找，不做字符串哈希)
+    持仓簿/风控等按 slot 存放状态的组件各持有一个; 未绑定的 ID 返回 -1。
+    """
+    __slots__ = ("_slots",)
+
+    def __init__(self):
+        self._slots: List[int] = []
+
+    def bind(self, instrument_id: int, slot: int) -> None:
+        if instrument_id < 0:
+            return
+        missing = instrument_id + 1 - len(self._slots)
+        if missing > 0:
+            self._slots.extend([-1] * missing)
+        self._slots[instrument_id] = slot
+
+    def get(self, instrument_id: int) -> int:
+        slots = self._slots
+        return slots[instrument_id] if 0 <= instrument_id < len(slots) else -1
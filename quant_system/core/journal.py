@@ -0,0 +1,342 @@
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from quant_system.core.types import (
+    OrderRequest, OrderData, TradeData,
+    Exchange, Direction, Offset, OrderType, OrderStatus
+)
+from quant_system.ipc import protocol as P
+from quant_system.ipc.protocol import Packer, Unpacker
+
+class RecordType:
+    """日志记录类型 (1 字节)"""
+    REQUEST = 1   # (order_id, OrderRequest) 已被交易所接受的发单请求
+    ORDER = 2     # OrderData 状态变化
+    TRADE = 3     # TradeData 成交明细
+
+# 记录头: body 长度 | crc32(类型 + 时间戳 + body) | 类型 | 写入时间
+_HEADER = struct.Struct("<IIBd")
+_KIND_TS = struct.Struct("<Bd")
+
+_STOP = object()
+
+# --- 记录编解码 ---
+
+def encode_record(kind: int, obj: Any, ts: Optional[float] = None) -> bytes:
+    p = Packer()
+    if kind == RecordType.REQUEST:
+        order_id, req = obj
+        p.text(order_id)
+        P.pack_request(p, req)
+    elif kind == RecordType.ORDER:
+        P.pack_order(p, obj)
+    elif kind == RecordType.TRADE:
+        P.pack_trade(p, obj)
+    else:
+        raise ValueError(f"Unknown journal record type: {kind}")
+    body = bytes(p.buf)
+    ts = time.time() if ts is None else ts
+    crc = zlib.crc32(body, zlib.crc32(_KIND_TS.pack(kind, ts)))
+    return _HEADER.pack(len(body), crc, kind, ts) + body
+
+def _decode_body(kind: int, body: bytes) -> Any:
+    u = Unpacker(body)
+    if kind == RecordType.REQUEST:
+        return u.text(), P.unpack_request(u)
+    if kind == RecordType.ORDER:
+        return P.unpack_order(u)
+    if kind == RecordType.TRADE:
+        return P.unpack_trade(u)
+    raise ValueError(f"Unknown journal record type: {kind}")
+
+def decode_records(data: bytes) -> Tuple[List[Tuple[int, Any]], int]:
+    """
+    解码一个段文件的内容
+    :return: ([(类型, 对象)], 有效字节数)
+    遇到不完整或校验失败的记录即停止 (崩溃时写了一半的尾部)，其后的内容视为无效。
+    """
+    records: List[Tuple[int, Any]] = []
+    pos, size = 0, len(data)
+    while pos + _HEADER.size <= size:
+        length, crc, kind, ts = _HEADER.unpack_from(data, pos)
+        end = pos + _HEADER.size + length
+        if end > size:
+            break
+        body = data[pos + _HEADER.size:end]
+        if zlib.crc32(body, zlib.crc32(_KIND_TS.pack(kind, ts))) != crc:
+            break
+        try:
+            records.append((kind, _decode_body(kind, body)))
+        except (ValueError, IndexError, KeyError, struct.error):
+            break
+        pos = end
+    return records, pos
+
+# --- 快照中的订单 (JSON) ---
+
+def order_to_dict(o: OrderData) -> Dict[str, Any]:
+    return {
+        "symbol": o.symbol, "exchange": o.exchange.value, "order_id": o.order_id,
+        "exchange_order_id": o.exchange_order_id, "direction": o.direction.value,
+        "offset": o.offset.value, "type": o.type.value, "price": o.price, "volume": o.volume,
+        "traded": o.traded, "status": o.status.value, "timestamp": o.timestamp, "avg_price": o.avg_price,
+    }
+
+def order_from_dict(d: Dict[str, Any]) -> OrderData:
+    return OrderData(
+        symbol=d["symbol"], exchange=Exchange(d["exchange"]), order_id=d["order_id"],
+        exchange_order_id=d["exchange_order_id"], direction=Direction(d["direction"]),
+        offset=Offset(d["offset"]), type=OrderType(d["type"]), price=d["price"], volume=d["volume"],
+        traded=d["traded"], status=OrderStatus(d["status"]), timestamp=d["timestamp"],
+        avg_price=d.get("avg_price", 0.0),
+    )
+
+class JournalWriter(threading.Thread):
+    """
+    后台写线程: 阻塞等待第一条记录，再非阻塞取尽 (最多 batch_size 条) 后一次写入、一次 fsync
+    """
+    def __init__(self, journal: "Journal", batch_size: int = 256):
+        super().__init__(name=f"Journal[{journal.name}]", daemon=True)
+        self.journal = journal
+        self.queue = journal._queue
+        self.batch_size = batch_size
+
+    def run(self) -> None:
+        q = self.queue
+        stopping = False
+        while not stopping:
+            item = q.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+
+    def _write(self, batch: List[Any]) -> None:
+        journal = self.journal
+        buf = bytearray()
+        for item in batch:
+            if isinstance(item, bytes):
+                buf += item
+                journal.written += 1
+            else:
+                # 快照: 先落盘之前的记录，再切换到新段
+                if buf:
+                    journal._file.write(buf)
+                    buf = bytearray()
+                journal._write_snapshot(item)
+        if buf:
+            journal._file.write(buf)
+        journal._file.flush()
+        os.fsync(journal._file.fileno())
+        journal.syncs += 1
+
+class Journal:
+    """
+    订单/成交日志 (Append-only Trade Journal)
+    把已发出的请求、订单状态变化与成交按顺序追加写入本地段文件，重启时先于连接交易所重建策略状态，
+    REST 对账只需覆盖停机期间的增量。
+
+    - 调用方 (事件循环线程) 只做二进制编码并入队; 写盘与 fsync 在后台线程按批完成
+    - 每条记录带长度与 CRC，崩溃时写了一半的尾部在恢复时被截掉
+    - 每 snapshot_every 条记录由策略写一次状态快照，之后切换新段并删除旧段 (恢复 = 快照 + 尾部)
+
+    目录结构: {directory}/{name}.snapshot.json, {directory}/{name}.{segment:06d}.journal
+    """
+    def __init__(self, directory: str, name: str, batch_size: int = 256, snapshot_every: int = 10000):
+        self.directory = directory
+        self.name = name
+        self.batch_size = batch_size
+        self.snapshot_every = snapshot_every
+        self.logger = logging.getLogger("Journal")
+        os.makedirs(directory, exist_ok=True)
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._writer: Optional[JournalWriter] = None
+        self._file = None
+        self._segment: Optional[int] = None
+        self._since_snapshot = 0
+
+        self.appended = 0   # 已入队
+        self.written = 0    # 已写盘 (写线程更新)
+        self.syncs = 0
+        self.snapshots = 0
+
+    @classmethod
+    def from_config(cls, system_config: Dict[str, Any], name: str) -> Optional["Journal"]:
+        """
+        按 system 配置创建 (未配置 journal_dir 时返回 None，即不启用)
+        - journal_dir: 日志目录
+        - journal_batch_size: 写线程单批最大条数 (默认 256)
+        - journal_snapshot_every: 快照间隔记录数 (默认 10000, 0 表示仅在停止时快照)
+        """
+        directory = system_config.get("journal_dir")
+        if not directory:
+            return None
+        return cls(
+            directory, name,
+            batch_size=int(system_config.get("journal_batch_size", 256)),
+            snapshot_every=int(system_config.get("journal_snapshot_every", 10000)),
+        )
+
+    # --- 文件 ---
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, f"{self.name}.snapshot.json")
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{self.name}.{segment:06d}.journal")
+
+    def _segments(self) -> List[int]:
+        prefix, suffix = f"{self.name}.", ".journal"
+        segments = []
+        for fname in os.listdir(self.directory):
+            if fname.startswith(prefix) and fname.endswith(suffix):
+                seq = fname[len(prefix):-len(suffix)]
+                if seq.isdigit():
+                    segments.append(int(seq))
+        return sorted(segments)
+
+    def _remove_segments_before(self, segment: int) -> None:
+        for seg in self._segments():
+            if seg < segment:
+                os.unlink(self._segment_path(seg))
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    # --- 恢复 ---
+
+    def recover(self) -> Tuple[Optional[Dict[str, Any]], List[Tuple[int, Any]]]:
+        """
+        读取快照与其后的全部记录 (在 open() 之前调用)
+        :return: (快照中的策略状态或 None, [(RecordType, 对象)])
+        """
+        state = None
+        base = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            state = snap["state"]
+            base = snap["segment"]
+            # 快照已替换但旧段尚未删除时崩溃
+            self._remove_segments_before(base)
+
+        records: List[Tuple[int, Any]] = []
+        segments = [s for s in self._segments() if s >= base]
+        for seg in segments:
+            path = self._segment_path(seg)
+            with open(path, "rb") as f:
+                data = f.read()
+            items, valid = decode_records(data)
+            if valid < len(data):
+                self.logger.warning(f"Journal {path}: truncating {len(data) - valid} bytes of torn tail")
+                with open(path, "r+b") as f:
+                    f.truncate(valid)
+            records.extend(items)
+
+        # 新的写入总是进入新段 (不在可能被截断过的文件后追加)
+        self._segment = max(segments + [base - 1]) + 1
+        return state, records
+
+    # --- 写入 ---
+
+    def open(self) -> None:
+        """打开新段并启动写线程"""
+        if self._writer is not None:
+            return
+        if self._segment is None:
+            segments = self._segments()
+            self._segment = segments[-1] + 1 if segments else 0
+        self._file = open(self._segment_path(self._segment), "ab")
+        self._writer = JournalWriter(self, self.batch_size)
+        self._writer.start()
+
+    def _put(self, record: bytes) -> None:
+        if self._writer is None:
+            raise RuntimeError(f"Journal {self.name} is not open")
+        self._queue.put(record)
+        self.appended += 1
+        self._since_snapshot += 1
+
+    def record_request(self, order_id: str, req: OrderRequest) -> None:
+        self._put(encode_record(RecordType.REQUEST, (order_id, req)))
+
+    def record_order(self, order: OrderData) -> None:
+        self._put(encode_record(RecordType.ORDER, order))
+
+    def record_trade(self, trade: TradeData) -> None:
+        self._put(encode_record(RecordType.TRADE, trade))
+
+    @property
+    def needs_snapshot(self) -> bool:
+        return self.snapshot_every > 0 and self._since_snapshot >= self.snapshot_every
+
+    def snapshot(self, state: Dict[str, Any]) -> None:
+        """
+        写入状态快照 (异步)
+        state 必须是此刻状态的独立副本; 队列中排在它之前的记录已包含在快照内，之后的记录进入新段。
+        """
+        if self._writer is None:
+            raise RuntimeError(f"Journal {self.name} is not open")
+        self._queue.put(state)
+        self._since_snapshot = 0
+
+    def _write_snapshot(self, state: Dict[str, Any]) -> None:
+        """写线程内执行: 落盘当前段 -> 打开新段 -> 原子替换快照 -> 删除旧段"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._segment += 1
+        self._file = open(self._segment_path(self._segment), "ab")
+
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"segment": self._segment, "ts": time.time(), "state": state}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        self._remove_segments_before(self._segment)
+        self.snapshots += 1
+
+    def close(self) -> None:
+        """写完队列中剩余记录后停止写线程 (幂等)"""
+        if self._writer is None:
+            return
+        self._queue.put(_STOP)
+        self._writer.join(timeout=10)
+        self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "records": self.appended,
+            "written": self.written,
+            "syncs": self.syncs,
+            "snapshots": self.snapshots,
+        }
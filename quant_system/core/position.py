@@ -0,0 +1,245 @@
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from quant_system.core.instruments import SlotIndex
+from quant_system.core.types import Direction, Offset, PositionData, Exchange, Instrument
+
+class PositionBook:
+    """
+    多合约持仓簿 (Per-Symbol Position Book)
+
+    每个 symbol 分配一个 slot，所有字段按 slot 存放在定长 numpy 数组中:
+    - 多/空两条腿独立记账 (Hedge Mode)，各自维护数量与开仓均价
+    - 已实现盈亏 (平仓时结算) / 浮动盈亏 (按最新价标记)
+    - 冻结数量 (平仓挂单未成交部分) / 在途开仓数量 (开仓挂单未成交部分)
+
+    单笔成交与行情标记均为 O(1)；整簿的净仓位/浮盈可直接做向量运算。
+    """
+    # 按 slot 存储的字段 (字段名 -> 初始值)
+    _FIELDS = {
+        "long_volume": 0.0, "long_price": 0.0, "long_frozen": 0.0, "long_pending": 0.0,
+        "short_volume": 0.0, "short_price": 0.0, "short_frozen": 0.0, "short_pending": 0.0,
+        "realized_pnl": 0.0, "unrealized_pnl": 0.0,
+        "last_price": 0.0,
+        # 合约规格 (来自 Instrument)
+        "contract_size": 1.0, "volume_tick": 0.0, "min_volume": 0.0,
+        # volume_tick 的精确分数 (units / scale，见 quant_system.core.fixed)，units = 0 表示不取整
+        "volume_units": 0.0, "volume_scale": 1.0,
+    }
+
+    def __init__(self, symbols: Iterable[str] = (), capacity: int = 16, exchange: Exchange = Exchange.OKX):
+        self.exchange = exchange
+        self._slots: Dict[str, int] = {}
+        self._id_slots = SlotIndex() # instrument_id -> slot (行情热路径按 ID 定位)
+        self.symbols: List[str] = []
+        self._capacity = 0
+        self._alloc(max(capacity, 1))
+        for s in symbols:
+            self.slot(s)
+
+    def _alloc(self, capacity: int) -> None:
+        """分配/扩容数组 (容量翻倍，摊还 O(1))"""
+        for name, fill in self._FIELDS.items():
+            arr = np.full(capacity, fill, dtype=np.float64)
+            old = getattr(self, name, None)
+            if old is not None:
+                arr[:len(old)] = old
+            setattr(self, name, arr)
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._slots
+
+    def slot(self, symbol: str) -> int:
+        """获取 symbol 的 slot (不存在则分配)"""
+        idx = self._slots.get(symbol)
+        if idx is None:
+            idx = len(self.symbols)
+            if idx >= self._capacity:
+                self._alloc(self._capacity * 2)
+            self._slots[symbol] = idx
+            self.symbols.append(symbol)
+        return idx
+
+    def find(self, symbol: str) -> int:
+        """获取 symbol 的 slot (不分配); 不在簿内返回 -1"""
+        return self._slots.get(symbol, -1)
+
+    def bind_id(self, symbol: str, instrument_id: int) -> int:
+        """登记 symbol 的 instrument_id (之后可用 locate 按 ID 定位 slot)"""
+        idx = self.slot(symbol)
+        self._id_slots.bind(instrument_id, idx)
+        return idx
+
+    def locate(self, instrument_id: int, symbol: str) -> int:
+        """按 instrument_id 定位 slot，未登记的 ID 退回按 symbol 查找; 不在簿内返回 -1"""
+        idx = self._id_slots.get(instrument_id)
+        if idx < 0:
+            idx = self._slots.get(symbol, -1)
+        return idx
+
+    def set_contract_size(self, symbol: str, contract_size: float) -> None:
+        """设置合约乘数 (用于盈亏计算)"""
+        self.contract_size[self.slot(symbol)] = contract_size
+
+    def set_instrument(self, inst: Instrument) -> None:
+        """写入合约规格 (乘数 / 下单步长 / 最小下单量)"""
+        idx = self.slot(inst.symbol)
+        self.contract_size[idx] = inst.contract_size
+        self.volume_tick[idx] = inst.volume_tick
+        self.volume_units[idx], self.volume_scale[idx] = inst.volume_fraction
+        self.min_volume[idx] = inst.min_volume
+
+    # --- 查询 ---
+
+    def net(self, symbol: str) -> float:
+        """净仓位 (Long - Short)"""
+        idx = self._slots.get(symbol)
+        if idx is None:
+            return 0.0
+        return float(self.long_volume[idx] - self.short_volume[idx])
+
+    def projected(self, symbol: str) -> float:
+        """预期净仓位 (所有挂单/在途订单全部成交后)"""
+        idx = self._slots.get(symbol)
+        if idx is None:
+            return 0.0
+        return float(
+            (self.long_volume[idx] + self.long_pending[idx] - self.long_frozen[idx])
+            - (self.short_volume[idx] + self.short_pending[idx] - self.short_frozen[idx])
+        )
+
+    def nets(self) -> np.ndarray:
+        """全部 slot 的净仓位 (向量)"""
+        n = len(self.symbols)
+        return self.long_volume[:n] - self.short_volume[:n]
+
+    def get(self, symbol: str) -> List[PositionData]:
+        """导出持仓快照 (每条非零腿一条 PositionData)"""
+        idx = self._slots.get(symbol)
+        if idx is None:
+            return []
+
+        results = []
+        for leg, vols, prices, frozen, sign in (
+            (Direction.LONG, self.long_volume, self.long_price, self.long_frozen, 1.0),
+            (Direction.SHORT, self.short_volume, self.short_price, self.short_frozen, -1.0),
+        ):
+            if vols[idx] <= 0:
+                continue
+            last = self.last_price[idx]
+            pnl = sign * (last - prices[idx]) * vols[idx] * self.contract_size[idx] if last > 0 else 0.0
+            results.append(PositionData(
+                symbol=symbol, exchange=self.exchange, direction=leg,
+                volume=float(vols[idx]), price=float(prices[idx]),
+                pnl=float(pnl), frozen=float(frozen[idx])
+            ))
+        return results
+
+    # --- 更新 ---
+
+    def on_fill(self, symbol: str, direction: Direction, offset: Offset, volume: float, price: float) -> float:
+        """
+        按单笔成交更新持仓 (O(1))
+        - LONG/OPEN 加多; SHORT/CLOSE 平多
+        - SHORT/OPEN 加空; LONG/CLOSE 平空
+        - Offset.NONE (单向持仓): 先平反向腿，剩余部分开仓
+        :return: 实际净仓位变化量 (超出持仓的平仓部分不计)
+        """
+        idx = self.slot(symbol)
+        before = self.long_volume[idx] - self.short_volume[idx]
+        if offset == Offset.OPEN:
+            self._open(idx, direction, volume, price)
+        elif offset == Offset.CLOSE:
+            # 平仓方向与腿相反: 卖出平多 / 买入平空
+            leg = Direction.SHORT if direction == Direction.LONG else Direction.LONG
+            self._close(idx, leg, volume, price)
+        else:
+            leg = Direction.SHORT if direction == Direction.LONG else Direction.LONG
+            rest = volume - self._close(idx, leg, volume, price)
+            if rest > 0:
+                self._open(idx, direction, rest, price)
+
+        self._mark(idx)
+        return float(self.long_volume[idx] - self.short_volume[idx] - before)
+
+    def _open(self, idx: int, leg: Direction, volume: float, price: float) -> None:
+        if leg == Direction.LONG:
+            vols, prices = self.long_volume, self.long_price
+        else:
+            vols, prices = self.short_volume, self.short_price
+        total = vols[idx] + volume
+        prices[idx] = (prices[idx] * vols[idx] + price * volume) / total
+        vols[idx] = total
+
+    def _close(self, idx: int, leg: Direction, volume: float, price: float) -> float:
+        """平掉某条腿 (超出持仓部分忽略)，返回实际平仓量"""
+        if leg == Direction.LONG:
+            vols, prices, sign = self.long_volume, self.long_price, 1.0
+        else:
+            vols, prices, sign = self.short_volume, self.short_price, -1.0
+        closed = min(volume, vols[idx])
+        if closed <= 0:
+            return 0.0
+        self.realized_pnl[idx] += sign * (price - prices[idx]) * closed * self.contract_size[idx]
+        vols[idx] -= closed
+        if vols[idx] <= 0:
+            vols[idx] = 0.0
+            prices[idx] = 0.0
+        return float(closed)
+
+    def set_leg(self, symbol: str, leg: Direction, volume: float, price: float) -> None:
+        """强制覆盖一条腿 (对账用)"""
+        idx = self.slot(symbol)
+        if leg == Direction.LONG:
+            self.long_volume[idx] = volume
+            self.long_price[idx] = price if volume > 0 else 0.0
+        else:
+            self.short_volume[idx] = volume
+            self.short_price[idx] = price if volume > 0 else 0.0
+        self._mark(idx)
+
+    def freeze(self, symbol: str, leg: Direction, delta: float) -> None:
+        """调整某条腿的冻结数量 (平仓挂单剩余量变化)"""
+        idx = self.slot(symbol)
+        frozen = self.long_frozen if leg == Direction.LONG else self.short_frozen
+        frozen[idx] = max(frozen[idx] + delta, 0.0)
+
+    def add_pending(self, symbol: str, leg: Direction, delta: float) -> None:
+        """调整某条腿的在途开仓数量 (开仓挂单剩余量变化)"""
+        idx = self.slot(symbol)
+        pending = self.long_pending if leg == Direction.LONG else self.short_pending
+        pending[idx] = max(pending[idx] + delta, 0.0)
+
+    def clear_working(self, symbol: str) -> None:
+        """清空冻结/在途数量 (对账后按挂单重建)"""
+        idx = self.slot(symbol)
+        self.long_frozen[idx] = 0.0
+        self.short_frozen[idx] = 0.0
+        self.long_pending[idx] = 0.0
+        self.short_pending[idx] = 0.0
+
+    def mark(self, symbol: str, price: float) -> None:
+        """按最新价标记浮动盈亏 (O(1))"""
+        idx = self._slots.get(symbol)
+        if idx is None:
+            return
+        self.mark_slot(idx, price)
+
+    def mark_slot(self, idx: int, price: float) -> None:
+        """按 slot 标记 (调用方已通过 locate 定位)"""
+        self.last_price[idx] = price
+        self._mark(idx)
+
+    def _mark(self, idx: int) -> None:
+        last = self.last_price[idx]
+        if last <= 0:
+            return
+        self.unrealized_pnl[idx] = (
+            (last - self.long_price[idx]) * self.long_volume[idx]
+            + (self.short_price[idx] - last) * self.short_volume[idx]
+        ) * self.contract_size[idx]
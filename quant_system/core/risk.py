@@ -0,0 +1,191 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.instruments import SlotIndex
+from quant_system.core.types import Direction, Instrument, TickData
+
+INF = float("inf")
+
+class RiskEngine:
+    """
+    事前风控 (Pre-trade Risk Gate)
+    位于策略与交易所之间，每笔订单发出前同步检查，返回整数拒单原因 (0 = 通过)。
+
+    检查项 (按顺序):
+    1. 总开关 (Kill Switch)
+    2. 单笔最大数量
+    3. 单 symbol 最大净持仓 (减仓方向的订单不受限)
+    4. 单笔最大名义价值 (volume * price * contract_size)
+    5. 下单频率 (令牌桶，全局)
+    6. 价格带 (相对最新成交价的偏离比例)
+
+    性能: 限额在配置时按 slot 预先展开为 list[float] (未配置即 +inf)，
+    检查路径只有下标访问与浮点比较，不创建任何容器对象。
+    """
+
+    # 拒单原因码
+    OK = 0
+    KILL_SWITCH = 1
+    ORDER_SIZE = 2
+    POSITION = 3
+    NOTIONAL = 4
+    RATE = 5
+    PRICE_BAND = 6
+    REASONS = ("OK", "KILL_SWITCH", "ORDER_SIZE", "POSITION", "NOTIONAL", "RATE", "PRICE_BAND")
+
+    # 配置项 -> 内部限额数组
+    _LIMITS = {
+        "max_order_volume": "_max_order",
+        "max_position": "_max_pos",
+        "max_notional": "_max_notional",
+        "price_band": "_band",
+    }
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.logger = logging.getLogger("RiskEngine")
+
+        # 默认限额 (未在 symbols 中单独配置的合约使用)
+        self._defaults: Dict[str, float] = {
+            key: float(config.get(key) or INF) for key in self._LIMITS
+        }
+        self._symbol_config: Dict[str, Dict[str, Any]] = config.get("symbols", {})
+
+        self._slots: Dict[str, int] = {}
+        self._id_slots = SlotIndex()
+        self._max_order: List[float] = []
+        self._max_pos: List[float] = []
+        self._max_notional: List[float] = []
+        self._band: List[float] = []
+        self._contract_size: List[float] = []
+        self._last_price: List[float] = []
+
+        # 令牌桶: 容量 = 每秒速率 (至少 1，否则小于 1 的速率永远攒不够一个令牌)
+        rate = float(config.get("max_orders_per_sec") or INF)
+        self._rate = rate
+        self._capacity = max(rate, 1.0)
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+
+        self.killed = False
+        self.passed = 0
+        self.rejects: List[int] = [0] * len(self.REASONS)
+
+        self._engine: Optional[EventEngine] = None
+
+    # --- 配置 ---
+
+    def slot(self, symbol: str) -> int:
+        """获取 symbol 的 slot (首次出现时按配置展开限额)"""
+        idx = self._slots.get(symbol)
+        if idx is None:
+            idx = len(self._max_order)
+            self._slots[symbol] = idx
+            override = self._symbol_config.get(symbol, {})
+            for key, attr in self._LIMITS.items():
+                value = override.get(key, self._defaults[key])
+                getattr(self, attr).append(float(value or INF))
+            self._contract_size.append(1.0)
+            self._last_price.append(0.0)
+        return idx
+
+    def set_limit(self, symbol: str, key: str, value: Optional[float]) -> None:
+        """运行时调整单个限额 (None/0 表示不限制)"""
+        getattr(self, self._LIMITS[key])[self.slot(symbol)] = float(value or INF)
+
+    def bind_id(self, symbol: str, instrument_id: int) -> None:
+        """登记 symbol 的 instrument_id (行情回调按 ID 定位 slot)"""
+        self._id_slots.bind(instrument_id, self.slot(symbol))
+
+    def set_instrument(self, inst: Instrument) -> None:
+        """写入合约乘数 (名义价值计算)"""
+        self._contract_size[self.slot(inst.symbol)] = inst.contract_size or 1.0
+
+    def attach(self, engine: EventEngine) -> None:
+        """监听行情以维护价格带基准"""
+        if self._engine is None:
+            self._engine = engine
+            engine.register(EventType.TICK, self._on_tick)
+
+    def detach(self) -> None:
+        if self._engine is not None:
+            self._engine.unregister(EventType.TICK, self._on_tick)
+            self._engine = None
+
+    def _on_tick(self, event: Event) -> None:
+        tick: TickData = event.data
+        idx = self._id_slots.get(tick.instrument_id)
+        if idx < 0:
+            idx = self._slots.get(tick.symbol, -1)
+        if idx >= 0:
+            self._last_price[idx] = tick.last_price
+
+    # --- 总开关 ---
+
+    def kill(self, reason: str = "") -> None:
+        """触发总开关: 之后所有订单一律拒绝"""
+        self.killed = True
+        self.logger.critical(f"Kill Switch Engaged: {reason}")
+
+    def resume(self) -> None:
+        self.killed = False
+        self.logger.warning("Kill Switch Released")
+
+    # --- 检查 ---
+
+    def check(self, symbol: str, direction: Direction, volume: float, price: float, position: float) -> int:
+        """
+        检查单笔订单
+        :param position: 发单前的预期净持仓 (含在途订单)
+        :return: 0 通过; 否则为拒单原因码 (见 REASONS)
+        """
+        code = self._check(symbol, direction, volume, price, position)
+        if code:
+            self.rejects[code] += 1
+        else:
+            self.passed += 1
+        return code
+
+    def _check(self, symbol: str, direction: Direction, volume: float, price: float, position: float) -> int:
+        if self.killed:
+            return self.KILL_SWITCH
+
+        idx = self._slots.get(symbol)
+        if idx is None:
+            idx = self.slot(symbol)
+
+        if volume > self._max_order[idx]:
+            return self.ORDER_SIZE
+
+        after = position + volume if direction == Direction.LONG else position - volume
+        if abs(after) > self._max_pos[idx] and abs(after) > abs(position):
+            return self.POSITION
+
+        if volume * price * self._contract_size[idx] > self._max_notional[idx]:
+            return self.NOTIONAL
+
+        last = self._last_price[idx]
+        if last > 0 and abs(price - last) > last * self._band[idx]:
+            return self.PRICE_BAND
+
+        # 频率检查放在最后: 被其他规则拒绝的订单不消耗令牌
+        if self._rate != INF:
+            now = time.monotonic()
+            tokens = self._tokens + (now - self._last_refill) * self._rate
+            self._tokens = tokens if tokens < self._capacity else self._capacity
+            self._last_refill = now
+            if self._tokens < 1.0:
+                return self.RATE
+            self._tokens -= 1.0
+
+        return self.OK
+
+    def stats(self) -> Dict[str, int]:
+        """拒单统计 (原因 -> 次数)"""
+        result = {"PASSED": self.passed}
+        for code, name in enumerate(self.REASONS):
+            if code:
+                result[name] = self.rejects[code]
+        return result
@@ -1,9 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Deque, List
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Type
 import collections
+import logging
+import math
+import weakref
 
+import numpy as np
+
+from quant_system.core.event import EventEngine, Event, EventType
 from quant_system.core.types import TickData
 
+NAN = float("nan")
+
 class BaseSignal(ABC):
     """
     信号基类 (Alpha Layer)
@@ -21,6 +29,22 @@ class BaseSignal(ABC):
         """
         pass
 
+    # --- 状态持久化与预热 ---
+
+    lookback: int = 0 # 预热所需的历史价格数 (0 表示不需要预热)
+
+    def get_state(self) -> Dict[str, Any]:
+        """导出可 JSON 序列化的状态 (写入检查点)"""
+        return {"value": self.value}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """由 get_state 的结果恢复"""
+        self.value = state["value"]
+
+    def warmup(self, closes: "np.ndarray") -> None:
+        """用历史价格 (旧 -> 新) 一次性填充状态，效果等同于逐个喂入最后 lookback 个价格"""
+        pass
+
 class DualMASignal(BaseSignal):
     """
     示例: 双均线信号
@@ -33,6 +57,7 @@ class DualMASignal(BaseSignal):
         super().__init__("DualMA")
         self.fast_window = fast_window
         self.slow_window = slow_window
+        self.lookback = slow_window
         
         # 使用 Deque 缓存价格历史
         self.prices: Deque[float] = collections.deque(maxlen=slow_window)
@@ -56,3 +81,431 @@ class DualMASignal(BaseSignal):
             self.value = -1.0
             
         return self.value
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"value": self.value, "prices": list(self.prices)}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.value = state["value"]
+        self.prices.clear()
+        self.prices.extend(state["prices"])
+
+    def warmup(self, closes: "np.ndarray") -> None:
+        self.prices.clear()
+        self.prices.extend(closes[-self.slow_window:].tolist())
+        self.value = _cross_signal(closes, self.fast_window, self.slow_window, self.value)
+
+def _rolling_mean(closes: "np.ndarray", window: int) -> "np.ndarray":
+    """完整窗口的滚动均值 (长度 len - window + 1)"""
+    c = np.cumsum(np.concatenate(([0.0], closes)))
+    return (c[window:] - c[:-window]) / window
+
+def _cross_signal(closes: "np.ndarray", fast: int, slow: int, default: float) -> float:
+    """
+    向量化计算双均线信号在最后一个价格处的值 (与逐 tick 计算一致: 相等时保持上一次的方向)
+    历史不足 slow 个价格时返回 default
+    """
+    if len(closes) < slow:
+        return default
+    diff = _rolling_mean(closes, fast)[slow - fast:] - _rolling_mean(closes, slow)
+    nonzero = np.flatnonzero(diff)
+    if not len(nonzero):
+        return default
+    return 1.0 if diff[nonzero[-1]] > 0 else -1.0
+
+# --- 共享指标 DAG (Shared Indicator Graph) ---
+
+class Indicator(BaseSignal):
+    """
+    指标节点 (由 SignalRegistry 管理)
+    按 (类, 参数, symbol) 去重，依赖由 requires 声明，注册表保证依赖先于本节点求值，
+    on_tick 时可直接读取依赖节点本 tick 的值。节点不能单独使用，只能通过注册表获取。
+    set_state / warmup 同样按拓扑序调用，派生节点 (如标准差、z-score) 直接由依赖重算，不需要保存状态。
+    """
+    def __init__(self, *params: Any):
+        super().__init__(f"{type(self).__name__}{params}")
+        self.params = params
+        self.value = NAN
+        self.ready = False # 数据足够 (预热完成)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"value": self.value, "ready": self.ready}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.value = state["value"]
+        self.ready = state["ready"]
+
+    @classmethod
+    def requires(cls, *params: Any) -> Sequence[Tuple[Type["Indicator"], tuple]]:
+        """依赖的节点: [(类, 参数), ...] (同一 symbol)"""
+        return ()
+
+    def bind(self, *inputs: "Indicator") -> None:
+        """接收依赖节点 (顺序同 requires)"""
+        pass
+
+class Price(Indicator):
+    """最新成交价 (源节点)"""
+    lookback = 1
+
+    def on_tick(self, tick: TickData) -> float:
+        self.value = tick.last_price
+        self.ready = True
+        return self.value
+
+    def warmup(self, closes: "np.ndarray") -> None:
+        if len(closes):
+            self.value = float(closes[-1])
+            self.ready = True
+
+class RollingMean(Indicator):
+    """滚动均值 (窗口内 O(1) 增量更新，每 window 次更新重算一次总和以消除累积误差)"""
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.window = window
+        self.lookback = window
+        self.values: Deque[float] = collections.deque(maxlen=window)
+        self.prev = NAN     # 本 tick 更新前的均值
+        self.dropped = NAN  # 本 tick 移出窗口的值 (窗口未满时为 NaN)
+        self._sum = 0.0
+        self._updates = 0
+
+    @classmethod
+    def requires(cls, window: int):
+        return [(Price, ())]
+
+    def bind(self, price: Indicator) -> None:
+        self.price = price
+
+    def on_tick(self, tick: TickData) -> float:
+        x = self.price.value
+        values = self.values
+        self.prev = self.value
+        if len(values) == self.window:
+            self.dropped = values[0]
+            self._sum += x - self.dropped
+        else:
+            self._sum += x
+        values.append(x)
+        self._updates += 1
+        if self._updates >= self.window:
+            self._updates = 0
+            self._sum = math.fsum(values)
+        self.value = self._sum / len(values)
+        self.ready = len(values) == self.window
+        return self.value
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"values": list(self.values)}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self._load(state["values"])
+
+    def warmup(self, closes: "np.ndarray") -> None:
+        self._load(closes[-self.window:].tolist())
+
+    def _load(self, values: List[float]) -> None:
+        self.values.clear()
+        self.values.extend(values)
+        self._sum = math.fsum(self.values)
+        self._updates = 0
+        self.prev = self.dropped = NAN
+        self.value = self._sum / len(self.values) if self.values else NAN
+        self.ready = len(self.values) == self.window
+
+class RollingStd(Indicator):
+    """滚动标准差 (总体)，复用同窗口 RollingMean 的窗口与均值，按 Welford 增量更新"""
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.window = window
+        self.lookback = window
+        self._m2 = 0.0
+        self._updates = 0
+
+    @classmethod
+    def requires(cls, window: int):
+        return [(RollingMean, (window,))]
+
+    def bind(self, mean: RollingMean) -> None:
+        self.mean = mean
+
+    def on_tick(self, tick: TickData) -> float:
+        mean = self.mean
+        values = mean.values
+        x = values[-1]
+        self._updates += 1
+        if self._updates >= self.window:
+            self._updates = 0
+            m = mean.value
+            self._m2 = math.fsum((v - m) ** 2 for v in values)
+        elif mean.dropped == mean.dropped: # 窗口已满: 替换一个值
+            old = mean.dropped
+            self._m2 += (x - old) * (x - mean.value + old - mean.prev)
+        elif len(values) > 1:
+            self._m2 += (x - mean.prev) * (x - mean.value)
+        else:
+            self._m2 = 0.0
+        self.value = math.sqrt(max(self._m2, 0.0) / len(values))
+        self.ready = mean.ready
+        return self.value
+
+    def get_state(self) -> Dict[str, Any]:
+        return {} # 由 RollingMean 的窗口重算
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self._recompute()
+
+    def warmup(self, closes: "np.ndarray") -> None:
+        self._recompute()
+
+    def _recompute(self) -> None:
+        mean = self.mean
+        values = mean.values
+        self._updates = 0
+        if not values:
+            self._m2, self.value, self.ready = 0.0, NAN, False
+            return
+        m = mean.value
+        self._m2 = math.fsum((v - m) ** 2 for v in values)
+        self.value = math.sqrt(self._m2 / len(values))
+        self.ready = mean.ready
+
+class ZScore(Indicator):
+    """(价格 - 滚动均值) / 滚动标准差，复用 RollingMean / RollingStd"""
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.lookback = window
+
+    @classmethod
+    def requires(cls, window: int):
+        return [(Price, ()), (RollingMean, (window,)), (RollingStd, (window,))]
+
+    def bind(self, price: Indicator, mean: Indicator, std: Indicator) -> None:
+        self.price, self.mean, self.std = price, mean, std
+
+    def on_tick(self, tick: TickData) -> float:
+        return self._recompute()
+
+    def _recompute(self) -> float:
+        """由依赖节点的当前值求值 (实时 tick、状态恢复与预热共用)"""
+        std = self.std.value
+        self.value = (self.price.value - self.mean.value) / std if std > 0 else 0.0
+        self.ready = self.std.ready
+        return self.value
+
+    def get_state(self) -> Dict[str, Any]:
+        return {} # 由依赖重算
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self._recompute()
+
+    def warmup(self, closes: "np.ndarray") -> None:
+        self._recompute()
+
+class DualMA(Indicator):
+    """双均线信号 (语义同 DualMASignal: 快线 > 慢线 -> 1.0，< -> -1.0，相等保持; 预热期为 0.0)"""
+    def __init__(self, fast_window: int, slow_window: int):
+        super().__init__(fast_window, slow_window)
+        self.fast_window = fast_window
+        self.slow_window = slow_window
+        self.lookback = slow_window
+        self.value = 0.0
+
+    @classmethod
+    def requires(cls, fast_window: int, slow_window: int):
+        return [(RollingMean, (fast_window,)), (RollingMean, (slow_window,))]
+
+    def bind(self, fast: Indicator, slow: Indicator) -> None:
+        self.fast, self.slow = fast, slow
+
+    def on_tick(self, tick: TickData) -> float:
+        if not self.slow.ready:
+            return self.value
+        self.ready = True
+        if self.fast.value > self.slow.value:
+            self.value = 1.0
+        elif self.fast.value < self.slow.value:
+            self.value = -1.0
+        return self.value
+
+    def warmup(self, closes: "np.ndarray") -> None:
+        self.value = _cross_signal(closes, self.fast_window, self.slow_window, self.value)
+        self.ready = len(closes) >= self.slow_window
+
+class SignalHandle:
+    """
+    共享指标的只读句柄 (策略持有，不能修改节点状态)
+    绑定了 SignalView 时 (宿主模式) 读的是视图中与当前 tick 对应的值，否则直接读节点
+    """
+    __slots__ = ("_node", "key", "_view")
+
+    def __init__(self, node: Indicator, key: Tuple[type, tuple, str], view: Optional["SignalView"] = None):
+        self._node = node
+        self.key = key
+        self._view = view
+
+    def _entry(self) -> Optional[Tuple[float, bool]]:
+        if self._view is None:
+            return None
+        frame = self._view.frames.get(self.key[2])
+        return frame.get(self._node) if frame else None
+
+    @property
+    def value(self) -> float:
+        entry = self._entry()
+        return self._node.value if entry is None else entry[0]
+
+    @property
+    def ready(self) -> bool:
+        entry = self._entry()
+        return self._node.ready if entry is None else entry[1]
+
+    @property
+    def name(self) -> str:
+        return self._node.name
+
+    def __repr__(self) -> str:
+        return f"SignalHandle({self._node.name} {self.key[2]}={self.value})"
+
+class SignalView:
+    """
+    共享指标在一个账户事件引擎上的视图 (宿主模式)
+    注册表在行情中心的引擎上求值，而各账户引擎稍后才处理转发来的 tick (行情中心成批处理 tick 时已算到更新的 tick)。
+    行情中心把本 tick 的指标值 (SignalRegistry.frame) 随事件转发 (Event.extra)，视图以全量订阅者身份
+    先于策略回调装入，策略在 on_tick 中经句柄读到的是与自己正在处理的 tick 对应的值。
+    """
+    def __init__(self, engine: EventEngine):
+        self.engine = engine
+        self.frames: Dict[str, Dict[Indicator, Tuple[float, bool]]] = {} # symbol -> 节点 -> (value, ready)
+        engine.register(EventType.TICK, self._on_tick)
+
+    def _on_tick(self, event: Event) -> None:
+        if event.extra is not None:
+            self.frames[event.data.symbol] = event.extra
+
+class SignalRegistry:
+    """
+    共享指标注册表 (Indicator DAG)
+    指标节点按 (类, 参数, symbol) 去重: 多个策略请求同一指标时共用一个节点，依赖 (如 ZScore 依赖的均值/标准差)
+    同样去重，形成 DAG。每个 tick 按拓扑序把该 symbol 的节点各求值一次，
+    CPU 开销与不同指标的数量相关，而与 "策略数 × 指标数" 无关。
+
+    - 节点按引用计数管理 (策略的句柄 + 下游节点)，归零时移除
+    - 以全量订阅者身份注册 TICK (先于按 symbol 订阅的策略回调执行)，策略在 on_tick 中读到的是本 tick 的值
+    - 每个事件引擎一个 (for_engine); 宿主模式下挂在行情中心的引擎上，所有账户共用，
+      本 tick 的值 (frame) 随转发的 tick 送到各账户引擎的 SignalView
+    """
+    _instances: "weakref.WeakKeyDictionary[EventEngine, SignalRegistry]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, engine: EventEngine):
+        self.engine = engine
+        self.logger = logging.getLogger("SignalRegistry")
+        self._nodes: Dict[Tuple[type, tuple, str], Indicator] = {}
+        self._refs: Dict[Tuple[type, tuple, str], int] = {}
+        self._inputs: Dict[Tuple[type, tuple, str], List[Tuple[type, tuple, str]]] = {}
+        self._order: Dict[str, List[Indicator]] = {} # symbol -> 拓扑序 (依赖在前)
+        self.evaluations = 0
+
+    @classmethod
+    def for_engine(cls, engine: EventEngine) -> "SignalRegistry":
+        """获取 (或创建) 事件引擎对应的共享注册表"""
+        registry = cls._instances.get(engine)
+        if registry is None:
+            registry = cls(engine)
+            cls._instances[engine] = registry
+        return registry
+
+    def acquire(self, cls: Type[Indicator], symbol: str, *params: Any,
+                view: Optional[SignalView] = None) -> SignalHandle:
+        """获取指标的只读句柄 (不存在则连同依赖一起创建); view 为句柄读值所用的账户视图 (宿主模式)"""
+        key = (cls, params, symbol)
+        self._node(key)
+        return SignalHandle(self._nodes[key], key, view)
+
+    def release(self, handle: SignalHandle) -> None:
+        """归还句柄; 无人使用的节点 (及其不再被依赖的上游) 被移除"""
+        self._decref(handle.key)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def frame(self, symbol: str) -> Optional[Dict[Indicator, Tuple[float, bool]]]:
+        """该 symbol 各节点当前的 (value, ready) 快照 (无节点时为 None)"""
+        nodes = self._order.get(symbol)
+        if not nodes:
+            return None
+        return {node: (node.value, node.ready) for node in nodes}
+
+    # --- 检查点与预热 ---
+
+    def snapshot(self, symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """导出指定 symbols 上全部节点的状态 ("节点名@symbol" -> state)"""
+        return {
+            f"{node.name}@{symbol}": node.get_state()
+            for symbol in symbols for node in self._order.get(symbol, ())
+        }
+
+    def restore(self, states: Dict[str, Dict[str, Any]]) -> int:
+        """按拓扑序恢复尚未就绪的节点 (已由其它策略恢复/预热的节点不覆盖)，返回恢复的节点数"""
+        restored = 0
+        for symbol, nodes in self._order.items():
+            for node in nodes:
+                state = states.get(f"{node.name}@{symbol}")
+                if state is not None and not node.ready:
+                    node.set_state(state)
+                    restored += 1
+        return restored
+
+    def lookback(self, symbol: str) -> int:
+        """该 symbol 上尚未就绪的节点需要的历史价格数 (全部就绪时为 0)"""
+        return max((node.lookback for node in self._order.get(symbol, ()) if not node.ready), default=0)
+
+    def warmup(self, symbol: str, closes: "np.ndarray") -> None:
+        """用历史价格 (旧 -> 新) 按拓扑序一次性填充该 symbol 的全部节点"""
+        for node in self._order.get(symbol, ()):
+            node.warmup(closes)
+
+    def _node(self, key: Tuple[type, tuple, str]) -> Indicator:
+        node = self._nodes.get(key)
+        if node is None:
+            cls, params, symbol = key
+            # 先创建依赖: 新节点总是排在其依赖之后，追加即保持拓扑序
+            inputs = [(dep_cls, tuple(dep_params), symbol) for dep_cls, dep_params in cls.requires(*params)]
+            deps = [self._node(k) for k in inputs]
+            node = cls(*params)
+            node.bind(*deps)
+            self._nodes[key] = node
+            self._refs[key] = 0
+            self._inputs[key] = inputs
+            if not self._order:
+                self.engine.register(EventType.TICK, self._on_tick)
+            self._order.setdefault(symbol, []).append(node)
+        self._refs[key] += 1
+        return node
+
+    def _decref(self, key: Tuple[type, tuple, str]) -> None:
+        refs = self._refs.get(key)
+        if not refs:
+            return
+        self._refs[key] = refs - 1
+        if refs > 1:
+            return
+        node = self._nodes.pop(key)
+        del self._refs[key]
+        symbol = key[2]
+        order = self._order[symbol]
+        order.remove(node)
+        if not order:
+            del self._order[symbol]
+            if not self._order:
+                self.engine.unregister(EventType.TICK, self._on_tick)
+        for dep in self._inputs.pop(key):
+            self._decref(dep)
+
+    def _on_tick(self, event: Event) -> None:
+        tick = event.data
+        nodes = self._order.get(tick.symbol)
+        if nodes:
+            for node in nodes:
+                node.on_tick(tick)
+            self.evaluations += len(nodes)
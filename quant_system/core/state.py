@@ -1,19 +1,40 @@
-from typing import Dict, Set
-from quant_system.core.types import OrderStatus
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Optional, Set, Tuple
+
+from quant_system.core.types import OrderData, OrderStatus
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class InvalidStateTransitionError(Exception):
     """非法状态流转异常"""
     pass
 
+# 状态 -> 小整数编码 (按 OrderStatus 定义顺序)
+STATES = tuple(OrderStatus)
+STATE_CODES: Dict[OrderStatus, int] = {s: i for i, s in enumerate(STATES)}
+
+def _build_table(transitions: Dict[OrderStatus, Set[OrderStatus]]) -> Tuple[Tuple[int, ...], int]:
+    """流转表 -> (每个状态的目标位掩码, 终态位掩码)"""
+    table = tuple(
+        (1 << STATE_CODES[s]) | sum(1 << STATE_CODES[t] for t in transitions[s])
+        for s in STATES
+    )
+    terminal = sum(1 << STATE_CODES[s] for s in STATES if not transitions[s])
+    return table, terminal
+
 class OrderStateMachine:
     """
     订单状态机 (Order Lifecycle Manager)
-    
+
     原则:
     1. 单向流动: 一般不可逆 (除了部分成交可能继续成交)。
     2. 终态锁定: 一旦进入 FILLED/CANCELLED/REJECTED，不可再变。
+
+    实现: 状态编码为小整数，每个状态允许到达的目标状态预先压成一个位掩码 (含自身，允许同状态更新)，
+    单次检查只是一次元组下标 + 移位，不分配对象; validate_many 对整批状态码做同样的查表。
     """
-    
+
     # 允许的状态流转表
     _transitions: Dict[OrderStatus, Set[OrderStatus]] = {
         # 起始状态
@@ -22,7 +43,7 @@ class OrderStateMachine:
             OrderStatus.REJECTED,       # 风控/预检拒绝
             OrderStatus.CANCELLED       # 还没发出去就撤单
         },
-        
+
         # 已提交 -> 等待回报
         OrderStatus.SUBMITTED: {
             OrderStatus.PARTIALLY_FILLED, # 部分成交
@@ -30,7 +51,7 @@ class OrderStateMachine:
             OrderStatus.CANCELLED,        # 成功撤单
             OrderStatus.REJECTED          # 交易所拒单
         },
-        
+
         # 部分成交 -> 可以继续成交或结束
         OrderStatus.PARTIALLY_FILLED: {
             OrderStatus.PARTIALLY_FILLED, # 继续部分成交 (数量增加)
@@ -38,22 +59,29 @@ class OrderStateMachine:
             OrderStatus.CANCELLED,        # 剩余部分撤销
             # 注意: 部分成交后一般不会变回 SUBMITTED
         },
-        
+
         # 终态 (Terminal States) -> 不允许流转到任何状态
         OrderStatus.FILLED: set(),
         OrderStatus.CANCELLED: set(),
         OrderStatus.REJECTED: set(),
     }
 
+    # 位掩码表: TABLE[from] 的第 to 位为 1 表示 from -> to 合法
+    TABLE, TERMINAL_MASK = _build_table(_transitions)
+    _table_np = None # numpy 版本 (批量检查时才导入 numpy，交易所适配器导入链保持轻量)
+
+    @staticmethod
+    def check_code(current: int, new_state: int) -> bool:
+        """按状态码检查 (热路径: 无字典查找、无分配)"""
+        return (OrderStateMachine.TABLE[current] >> new_state) & 1 == 1
+
     @classmethod
     def check_transition(cls, current: OrderStatus, new_state: OrderStatus) -> bool:
         """
         检查状态流转是否合法 (纯查询，不抛异常)
+        同状态更新 (例如部分成交数量变化，或者重复收到回报) 视为合法
         """
-        if current == new_state:
-            # 允许同状态更新 (例如部分成交数量变化，或者重复收到回报)
-            return True
-        return new_state in cls._transitions.get(current, set())
+        return (cls.TABLE[STATE_CODES[current]] >> STATE_CODES[new_state]) & 1 == 1
 
     @classmethod
     def transition(cls, current: OrderStatus, new_state: OrderStatus) -> OrderStatus:
@@ -64,7 +92,100 @@ class OrderStateMachine:
         """
         if cls.check_transition(current, new_state):
             return new_state
-        
+
         raise InvalidStateTransitionError(
             f"Invalid order state transition: {current} -> {new_state}"
         )
+
+    @classmethod
+    def validate_many(cls, current: "np.ndarray", new_state: "np.ndarray") -> "np.ndarray":
+        """批量检查: 两个等长的状态码数组 -> 布尔数组"""
+        if cls._table_np is None:
+            import numpy as np
+            cls._table_np = np.array(cls.TABLE, dtype=np.int64)
+        return ((cls._table_np[current] >> new_state) & 1).astype(bool)
+
+    @classmethod
+    def validate_streams(cls, keys: "np.ndarray", codes: "np.ndarray", traded: Optional["np.ndarray"] = None) -> "np.ndarray":
+        """
+        批量检查多个订单交错的回报流 (日志重放)
+        :param keys: 每条回报所属订单的整数编号
+        :param codes: 每条回报的状态码 (按到达顺序)
+        :param traded: 可选，累计成交量 (同一订单内不允许减少)
+        :return: 布尔数组 (与输入同序)，每个订单的首条回报视为合法
+        """
+        import numpy as np
+        n = len(keys)
+        valid = np.ones(n, dtype=bool)
+        if n < 2:
+            return valid
+        order = np.argsort(keys, kind="stable")
+        k, c = keys[order], codes[order]
+        same = k[1:] == k[:-1]
+        ok = cls.validate_many(c[:-1], c[1:])
+        if traded is not None:
+            t = traded[order]
+            ok &= t[1:] >= t[:-1]
+        valid[order[1:]] = ~same | ok
+        return valid
+
+class OrderTracker:
+    """
+    订单回报流跟踪 (每个交易所实例一个)
+    记录每个订单最近一次回报的 (状态码, 累计成交量, 价格, 数量)，逐条判定:
+    - ACCEPT: 合法的新状态，或同状态下的改单 (价格/数量变化，Amendment)
+    - DUPLICATE: 状态、成交量、价格与数量都未变化 (重复推送)
+    - OUT_OF_ORDER: 非法流转 (如终态之后又收到 SUBMITTED) 或成交量回退 (旧快照晚到)
+    只有 ACCEPT 的回报会被推送到事件总线。终态订单保留最近 max_terminal 个用于识别迟到的回报;
+    全部订单按最近更新时间 (LRU) 最多保留 max_orders 个，一直收不到终态回报的订单也不会无限堆积。
+    """
+    ACCEPT = 0
+    DUPLICATE = 1
+    OUT_OF_ORDER = 2
+
+    def __init__(self, max_terminal: int = 10000, max_orders: int = 100000):
+        self.max_terminal = max_terminal
+        self.max_orders = max_orders
+        # 插入顺序即最近更新顺序: 每次 ACCEPT 先删后插，最旧的在最前
+        self._last: Dict[str, Tuple[int, float, float, float]] = {}
+        self._terminal: Deque[str] = deque()
+        self.accepted = 0
+        self.duplicates = 0
+        self.out_of_order = 0
+
+    def on_update(self, order: OrderData) -> int:
+        code = STATE_CODES[order.status]
+        oid = order.order_id
+        last = self._last
+        prev = last.pop(oid, None)
+        if prev is not None:
+            prev_code, prev_traded, prev_price, prev_volume = prev
+            if (code == prev_code and order.traded == prev_traded
+                    and order.price == prev_price and order.volume == prev_volume):
+                last[oid] = prev
+                self.duplicates += 1
+                return self.DUPLICATE
+            if not (OrderStateMachine.TABLE[prev_code] >> code) & 1 or order.traded < prev_traded:
+                last[oid] = prev
+                self.out_of_order += 1
+                return self.OUT_OF_ORDER
+
+        last[oid] = (code, order.traded, order.price, order.volume)
+        if (OrderStateMachine.TERMINAL_MASK >> code) & 1 and (prev is None or prev[0] != code):
+            self._terminal.append(oid)
+            if len(self._terminal) > self.max_terminal:
+                last.pop(self._terminal.popleft(), None)
+        while len(last) > self.max_orders:
+            del last[next(iter(last))]
+        self.accepted += 1
+        return self.ACCEPT
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "out_of_order": self.out_of_order,
+        }
@@ -1,7 +1,9 @@
 from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
+
+from quant_system.core.fixed import tick_fraction, to_ticks, from_ticks
 
 # --- Enums ---
 
@@ -63,14 +65,60 @@ class Instrument:
     option_strike: Optional[float] = None   # 行权价 (仅期权)
     underlying: str = ""                    # 标的物代码
 
+    # 步长的精确分数表示 (units / scale)，由 __post_init__ 计算
+    _price_frac: Tuple[int, int] = field(init=False, repr=False, compare=False, default=(0, 1))
+    _volume_frac: Tuple[int, int] = field(init=False, repr=False, compare=False, default=(0, 1))
+
+    def __post_init__(self):
+        self._price_frac = tick_fraction(self.price_tick)
+        self._volume_frac = tick_fraction(self.volume_tick)
+
+    # --- 定点表示 (整数 tick / lot，见 quant_system.core.fixed) ---
+
+    @property
+    def price_fraction(self) -> Tuple[int, int]:
+        """price_tick == units / scale"""
+        return self._price_frac
+
+    @property
+    def volume_fraction(self) -> Tuple[int, int]:
+        """volume_tick == units / scale"""
+        return self._volume_frac
+
+    def price_to_ticks(self, price: float) -> int:
+        """价格 -> 整数 tick 数 (最近的 tick，五成双)"""
+        units, scale = self._price_frac
+        if not units:
+            raise ValueError(f"{self.symbol}: price_tick not set")
+        return to_ticks(price, units, scale)
+
+    def ticks_to_price(self, ticks: int) -> float:
+        units, scale = self._price_frac
+        if not units:
+            raise ValueError(f"{self.symbol}: price_tick not set")
+        return from_ticks(ticks, units, scale)
+
+    def volume_to_lots(self, volume: float) -> int:
+        """数量 -> 整数步长数"""
+        units, scale = self._volume_frac
+        if not units:
+            raise ValueError(f"{self.symbol}: volume_tick not set")
+        return to_ticks(volume, units, scale)
+
+    def lots_to_volume(self, lots: int) -> float:
+        units, scale = self._volume_frac
+        if not units:
+            raise ValueError(f"{self.symbol}: volume_tick not set")
+        return from_ticks(lots, units, scale)
+
     def round_price(self, price: float) -> float:
         """
-        价格修剪: 按照 price_tick 四舍五入
+        价格修剪: 按照 price_tick 四舍五入 (经整数 tick 换算，结果恰为网格上的十进制值)
         Example: price=95000.123, tick=0.1 -> 95000.1
         """
         if self.price_tick <= 0:
             return price
-        return round(price / self.price_tick) * self.price_tick
+        return self.ticks_to_price(self.price_to_ticks(price))
 
     def round_volume(self, volume: float) -> float:
         """
@@ -79,8 +127,7 @@ class Instrument:
         """
         if self.volume_tick <= 0:
             return volume
-        # 使用 round 确保最接近的合法 tick
-        return round(volume / self.volume_tick) * self.volume_tick
+        return self.lots_to_volume(self.volume_to_lots(volume))
 
 @dataclass
 class TickData:
@@ -93,11 +140,28 @@ class TickData:
     bid_price_1: float
     ask_price_1: float
     funding_rate: float = 0.0 # 资金费率 (Perp Feature)
+    instrument_id: int = field(default=-1, compare=False) # 进程内稠密 ID (InstrumentRegistry)，-1 表示未分配
 
     @property
     def datetime(self) -> datetime:
         return datetime.fromtimestamp(self.timestamp)
 
+@dataclass
+class BarData:
+    """K 线 (由 BarAggregator 从 Tick 合成，或由交易所历史数据回填)"""
+    symbol: str
+    exchange: Exchange
+    timeframe: str          # 周期: "1m" / "1h" (时间)，"100t" (每 100 个 tick)，"50v" (每 50 成交量)
+    start: float            # 起始时间 (Unix seconds): 时间 K 线为区间起点，其余为首个 tick 的时间
+    end: float              # 结束时间: 时间 K 线为区间终点，其余为最后一个 tick 的时间
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    count: int = 0          # 合成该 K 线的 tick 数 (回填的 K 线为 0)
+    instrument_id: int = field(default=-1, compare=False) # 同 TickData.instrument_id
+
 @dataclass
 class OrderRequest:
     """发单请求"""
@@ -127,6 +191,8 @@ class OrderData:
     status: OrderStatus
     
     timestamp: float        # Update timestamp
+    instrument_id: int = field(default=-1, compare=False) # 同 TickData.instrument_id
+    avg_price: float = 0.0  # 成交均价 (0 表示未知或尚未成交)
 
     def is_active(self) -> bool:
         """是否为活跃状态 (未终结)"""
@@ -148,6 +214,9 @@ class TradeData:
     price: float
     volume: float
     timestamp: float
+    fee: float = 0.0          # 手续费 (正数为支出)
+    fee_currency: str = ""
+    instrument_id: int = field(default=-1, compare=False) # 同 TickData.instrument_id
 
 @dataclass
 class PositionData:
@@ -1,22 +1,90 @@
+import asyncio
+import logging
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from quant_system.core.event import EventEngine
-from quant_system.core.types import OrderRequest, OrderData, PositionData
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.instruments import InstrumentRegistry
+from quant_system.core.state import OrderTracker
+from quant_system.core.types import OrderRequest, OrderData, TradeData, PositionData, Instrument, BarData
+from quant_system.utils.dedup import BoundedSet
+
+_tracker_logger = logging.getLogger("OrderTracker")
 
 class BaseExchange(ABC):
     """
     交易所抽象基类 (Interface)
     所有真实或模拟交易所都必须实现此接口。
     """
+    # 是否推送逐笔成交 (EventType.TRADE)；为 True 时策略按成交明细记账，订单回报只维护挂单状态
+    emits_trades: bool = False
+    # TickData.volume 是否为累计量 (如 24h 成交量)；为 True 时 K 线成交量按相邻 tick 的增量计算
+    tick_volume_cumulative: bool = False
+
+    TRADE_DEDUP_SIZE = 10000 # 成交去重窗口 (最近 N 个 trade_id)
+
     def __init__(self, event_engine: EventEngine):
         self.event_engine = event_engine
+        # 合约元数据缓存: symbol -> Instrument (连接后由各实现填充)，同时为每个 symbol 分配 instrument_id
+        self.instruments: InstrumentRegistry = InstrumentRegistry()
+        self._seen_trades = BoundedSet(self.TRADE_DEDUP_SIZE)
+        self.duplicate_trades = 0
+        # 订单回报流校验: 重复/乱序回报计数并丢弃，不推送到事件总线
+        self.order_tracker = OrderTracker()
+        self.order_updates_received = 0 # 收到的订单回报 (含被丢弃的)
+        self.order_updates_skipped = 0  # 解析前即识别为重复快照而跳过的 (由各实现计数)
 
     @abstractmethod
     async def connect(self) -> None:
         """连接交易所 (Websocket/REST)"""
         pass
 
+    async def check_login(self) -> bool:
+        """验证账户凭证 (默认无需登录)"""
+        return True
+
+    async def init_leverage(self, symbol: str, leverage: int) -> None:
+        """设置杠杆倍数 (默认不支持，忽略)"""
+        pass
+
+    def _emit_order(self, order: OrderData) -> bool:
+        """推送一条订单回报 (经 OrderTracker 校验，重复与乱序的回报被丢弃)"""
+        self.order_updates_received += 1
+        if order.instrument_id < 0:
+            order.instrument_id = self.instruments.intern(order.symbol)
+        verdict = self.order_tracker.on_update(order)
+        if verdict != OrderTracker.ACCEPT:
+            if verdict == OrderTracker.OUT_OF_ORDER:
+                _tracker_logger.warning("Out-of-order update dropped: %s %s traded=%s", order.order_id, order.status, order.traded)
+            return False
+        self.event_engine.put(Event(EventType.ORDER_STATUS, order))
+        return True
+
+    def order_stream_stats(self) -> Dict[str, int]:
+        """订单回报流统计: 收到 vs 推送到事件总线 (其余为跳过/重复/乱序)"""
+        stats = self.order_tracker.stats()
+        return {
+            "received": self.order_updates_received,
+            "dispatched": stats["accepted"],
+            "skipped": self.order_updates_skipped,
+            "duplicates": stats["duplicates"],
+            "out_of_order": stats["out_of_order"],
+        }
+
+    def _emit_trade(self, trade: TradeData) -> bool:
+        """推送一笔成交 (按 trade_id 去重: 重连后的重放/多个来源的同一笔成交只推送一次)"""
+        if not self._seen_trades.add(trade.trade_id):
+            self.duplicate_trades += 1
+            return False
+        if trade.instrument_id < 0:
+            trade.instrument_id = self.instruments.intern(trade.symbol)
+        self.event_engine.put(Event(EventType.TRADE, trade))
+        return True
+
+    def share_instruments(self, source: "BaseExchange") -> None:
+        """复用另一个实例已加载的合约元数据 (同进程多账户共享一份缓存)"""
+        self.instruments = source.instruments
+
     @abstractmethod
     async def close(self) -> None:
         """断开连接"""
@@ -35,17 +103,40 @@ class BaseExchange(ABC):
         """
         pass
 
+    async def send_orders(self, reqs: List[OrderRequest]) -> List[str]:
+        """
+        批量发单 (默认并发逐笔发送，交易所支持批量接口时应重写)
+        :return: 与 reqs 一一对应的 order_id (失败为空字符串)
+        """
+        return list(await asyncio.gather(*[self.send_order(r) for r in reqs]))
+
     @abstractmethod
     async def cancel_order(self, order_id: str, symbol: str) -> None:
         """撤销订单"""
         pass
 
     @abstractmethod
-    async def query_position(self) -> List[PositionData]:
-        """查询当前持仓 (全量)"""
+    async def query_position(self, symbols: Optional[List[str]] = None) -> List[PositionData]:
+        """
+        查询当前持仓
+        :param symbols: 仅查询指定合约; None 为全量
+        :raises Exception: 查询失败时抛出，不要返回空列表 (对账会把空列表当作真实状态)
+        """
         pass
 
+    async def query_bars(self, symbol: str, timeframe: str, limit: int = 100) -> List[BarData]:
+        """
+        查询历史 K 线 (用于 BarAggregator 回填，默认不支持)
+        :param timeframe: 时间周期 ("1m" / "1h" ...)
+        :return: 按时间升序，可能包含尚未结束的最新一根
+        """
+        return []
+
     @abstractmethod
-    async def query_open_orders(self) -> List[OrderData]:
-        """查询当前挂单 (全量)"""
+    async def query_open_orders(self, symbols: Optional[List[str]] = None) -> List[OrderData]:
+        """
+        查询当前挂单
+        :param symbols: 仅查询指定合约; None 为全量
+        :raises Exception: 查询失败时抛出，不要返回空列表 (对账会把空列表当作真实状态)
+        """
         pass
@@ -0,0 +1,27 @@
+from typing import Any, Dict
+
+from quant_system.core.event import EventEngine
+from quant_system.exchange.base import BaseExchange
+from quant_system.utils.registry import LazyRegistry
+
+# 交易所注册表: 配置中的 exchange.name -> 适配器类 (按需导入，mock 运行不会加载 ccxt)
+# - okx:  OKX (ccxt.pro)
+# - mock: 本地模拟
+# - shm:  行情来自共享内存网关，交易委托给 conf["trading"] 描述的交易所
+# - gateway: 交易请求经 Unix Socket 转发给执行网关进程 (无行情)
+EXCHANGES = LazyRegistry("exchange", {
+    "okx": "quant_system.exchange.okx_adapter:OkxExchangeAdapter",
+    "mock": "quant_system.exchange.mock_adapter:MockExchangeAdapter",
+    "shm": "quant_system.exchange.shm_adapter:ShmExchangeAdapter",
+    "gateway": "quant_system.exchange.gateway_adapter:GatewayExchangeAdapter",
+})
+
+def create_exchange(engine: EventEngine, conf: Dict[str, Any]) -> BaseExchange:
+    """按配置名创建交易所适配器"""
+    name = conf.get("name", "okx").lower()
+    cls = EXCHANGES.get(name)
+    if name == "shm":
+        trading_conf = conf.get("trading")
+        trading = create_exchange(engine, dict(trading_conf, market_data=False)) if trading_conf else None
+        return cls(engine, conf, trading)
+    return cls(engine, conf)
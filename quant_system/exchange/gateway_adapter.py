@@ -0,0 +1,226 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.types import OrderRequest, OrderData, PositionData
+from quant_system.exchange.base import BaseExchange
+from quant_system.ipc import protocol as P
+from quant_system.ipc.protocol import MsgType, Packer, Unpacker
+
+class GatewayError(Exception):
+    """执行网关返回的错误"""
+    pass
+
+class GatewayExchangeAdapter(BaseExchange):
+    """
+    执行网关客户端 (Execution Gateway Client)
+    通过本地 Unix Socket 把交易请求转发给独占账户会话的执行网关进程 (见 quant_system.ipc.exec_gateway)，
+    订单回报以 ORDER_STATUS 事件推送回本进程，对 BaseStrategy 透明。
+    本适配器不提供行情，通常作为 shm 适配器的 trading 使用。
+
+    配置:
+    - path: 网关 socket 路径
+    - connect_timeout: 等待网关就绪的最长时间 (秒)
+    - request_timeout: 单个请求超时 (秒)
+    - emits_trades: 网关侧交易所是否推送逐笔成交 (默认 True，与 OKX / Mock 一致)
+    - reconnect_delay / reconnect_max_delay: 断线重连的初始与最大退避间隔 (秒，默认 1 / 30)
+
+    与网关的连接断开时，进行中的请求立即失败，之后按指数退避重连;
+    重连成功后重新订阅已订阅的 symbols 并推送 RECOVERY (触发对账，补齐断线期间的回报)。
+    """
+    def __init__(self, event_engine: EventEngine, config: Dict = None):
+        super().__init__(event_engine)
+        self.config = config or {}
+        self.path = self.config["path"]
+        self.connect_timeout = self.config.get("connect_timeout", 10.0)
+        self.request_timeout = self.config.get("request_timeout", 10.0)
+        self.emits_trades = self.config.get("emits_trades", True)
+        self.reconnect_delay = self.config.get("reconnect_delay", 1.0)
+        self.reconnect_max_delay = self.config.get("reconnect_max_delay", 30.0)
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._active = False    # 适配器运行中 (close 前)
+        self._connected = False # 当前持有与网关的连接
+        self._symbols: Dict[str, None] = {} # 已订阅的 symbols (有序去重，重连后重新订阅)
+        self.reconnects = 0
+        self.logger = logging.getLogger("GatewayExchange")
+
+    async def connect(self) -> None:
+        """连接网关 (网关未就绪时等待)，并拉取合约元数据"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.connect_timeout
+        while True:
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if loop.time() > deadline:
+                    raise ConnectionError(f"Execution gateway not available: {self.path}")
+                await asyncio.sleep(0.1)
+
+        self._active = self._connected = True
+        self._task = asyncio.create_task(self._read_loop())
+
+        body = await self._request(MsgType.INSTRUMENTS, self._strs([]))
+        for inst in P.unpack_list(Unpacker(body), P.unpack_instrument):
+            self.instruments[inst.symbol] = inst
+        self.logger.info(f"Connected to execution gateway {self.path}. Instruments: {len(self.instruments)}")
+
+    async def close(self) -> None:
+        self._active = self._connected = False
+        if self._task:
+            self._task.cancel()
+        if self._writer:
+            self._writer.close()
+        self._fail_pending(ConnectionError("Gateway adapter closed"))
+        self.logger.info("Gateway Adapter Closed")
+
+    # --- 请求/响应 ---
+
+    @staticmethod
+    def _strs(items: List[str]) -> bytes:
+        p = Packer()
+        P.pack_strs(p, items)
+        return bytes(p.buf)
+
+    async def _request(self, msg_type: int, body: bytes = b"") -> bytes:
+        if not self._connected:
+            raise ConnectionError("Execution gateway not connected")
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF or 1
+        req_id = self._next_id
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = fut
+        self._writer.write(P.frame(msg_type, req_id, body))
+        try:
+            return await asyncio.wait_for(fut, self.request_timeout)
+        finally:
+            self._pending.pop(req_id, None)
+
+    async def _read_loop(self):
+        """读取网关推送与响应; 连接断开后重连，直到 close"""
+        while self._active:
+            try:
+                await self._read_frames()
+            except (asyncio.IncompleteReadError, ConnectionError) as e:
+                if not self._active:
+                    break
+                self.logger.error(f"Execution gateway connection lost: {e}")
+            self._connected = False
+            self._fail_pending(ConnectionError("Execution gateway connection lost"))
+            if self._writer:
+                self._writer.close()
+            if await self._reconnect():
+                asyncio.create_task(self._on_reconnected())
+
+    async def _read_frames(self):
+        put = self.event_engine.put
+        while self._active:
+            msg_type, req_id, body = await P.read_frame(self._reader)
+            if msg_type == MsgType.ORDER_UPDATE:
+                self._emit_order(P.unpack_order(Unpacker(body)))
+            elif msg_type == MsgType.TRADE_UPDATE:
+                self._emit_trade(P.unpack_trade(Unpacker(body)))
+            elif msg_type == MsgType.RECOVERY:
+                put(Event(EventType.RECOVERY, None))
+            else:
+                fut = self._pending.get(req_id)
+                if fut is None or fut.done():
+                    continue
+                if msg_type == MsgType.ERROR:
+                    fut.set_exception(GatewayError(Unpacker(body).text()))
+                else:
+                    fut.set_result(body)
+
+    async def _reconnect(self) -> bool:
+        """按指数退避重连网关，成功返回 True (close 后返回 False)"""
+        retry_delay = self.reconnect_delay
+        while self._active:
+            self.logger.warning(f"Reconnecting to execution gateway in {retry_delay}s...")
+            await asyncio.sleep(retry_delay)
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+            except OSError as e:
+                self.logger.warning(f"Execution gateway reconnect failed: {e}")
+                retry_delay = min(retry_delay * 2, self.reconnect_max_delay) # 指数退避
+                continue
+            self._connected = self._active
+            self.reconnects += 1
+            return self._active
+        return False
+
+    async def _on_reconnected(self):
+        """重连后恢复订单回报订阅，再推送 RECOVERY (对账时回报流已就绪)"""
+        try:
+            if self._symbols:
+                await self._request(MsgType.SUBSCRIBE, self._strs(list(self._symbols)))
+        except Exception as e:
+            self.logger.error(f"Resubscribe after reconnect failed: {e}")
+        self.logger.info(f"Execution gateway reconnected: {self.path}")
+        self.event_engine.put(Event(EventType.RECOVERY, None))
+
+    def _fail_pending(self, exc: Exception) -> None:
+        for fut in self._pending.values():
+            if not fut.done():
+                fut.set_exception(exc)
+        self._pending.clear()
+
+    # --- BaseExchange ---
+
+    async def subscribe(self, symbols: List[str]) -> None:
+        """订阅 symbols 的订单回报 (行情不经过执行网关)"""
+        self._symbols.update(dict.fromkeys(symbols))
+        await self._request(MsgType.SUBSCRIBE, self._strs(symbols))
+
+    async def init_leverage(self, symbol: str, leverage: int) -> None:
+        p = Packer()
+        P.pack_leverage(p, symbol, leverage)
+        await self._request(MsgType.LEVERAGE, bytes(p.buf))
+
+    async def send_order(self, req: OrderRequest) -> str:
+        return (await self.send_orders([req]))[0]
+
+    async def send_orders(self, reqs: List[OrderRequest]) -> List[str]:
+        p = Packer()
+        P.pack_list(p, reqs, P.pack_request)
+        try:
+            body = await self._request(MsgType.SEND_ORDERS, bytes(p.buf))
+        except Exception as e:
+            self.logger.error(f"Send Orders Failed: {e}")
+            return [""] * len(reqs)
+        return P.unpack_strs(Unpacker(body))
+
+    async def cancel_order(self, order_id: str, symbol: str) -> None:
+        p = Packer()
+        p.text(order_id)
+        p.text(symbol)
+        try:
+            await self._request(MsgType.CANCEL, bytes(p.buf))
+        except Exception as e:
+            self.logger.error(f"Cancel Order Failed: {e}")
+
+    async def query_position(self, symbols: Optional[List[str]] = None) -> List[PositionData]:
+        body = await self._query(MsgType.QUERY_POSITION, symbols, "Position")
+        return P.unpack_list(Unpacker(body), P.unpack_position)
+
+    async def query_open_orders(self, symbols: Optional[List[str]] = None) -> List[OrderData]:
+        body = await self._query(MsgType.QUERY_ORDERS, symbols, "Open Orders")
+        return P.unpack_list(Unpacker(body), P.unpack_order)
+
+    async def _query(self, msg_type: int, symbols: Optional[List[str]], name: str) -> bytes:
+        """
+        查询请求: 失败 (网关断开 / 超时 / 网关返回错误) 时记录日志并统一抛出 GatewayError，
+        不返回空列表 (对账会把空列表当作真实状态，由 Reconciler 跳过本轮)
+        """
+        try:
+            return await self._request(msg_type, self._strs(symbols or []))
+        except GatewayError as e:
+            self.logger.error(f"Query {name} Failed: {e}")
+            raise
+        except (ConnectionError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Query {name} Failed: {e!r}")
+            raise GatewayError(f"Query {name} failed: {e!r}") from e
@@ -1,34 +1,138 @@
-import random
 import time
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 from quant_system.core.types import TickData, Exchange
 
 class MarketDataGenerator:
     """
-    模拟行情生成器 (Random Walk)
+    模拟行情生成器 (Vectorized GBM + Jumps)
+    价格路径按 NumPy 块预先计算 (rows 步 × 全部 symbol 一次生成)，逐个 tick 只剩列表取值与 TickData 构造，
+    数千个 symbol、每秒数十万 tick 的压测负载也不会被生成器本身拖慢。
+
+    - 价格: 几何布朗运动叠加复合泊松跳跃，每步对数收益 = drift - volatility²/2 + volatility·Z (+ J，
+      以 jump_intensity 的概率发生，J ~ N(0, jump_scale))
+    - 盘口: 价差均值为价格的 spread_bps 个基点 (带随机扰动)，买一/卖一围绕最新价对称
+    - 成交量: 对数正态分布，均值 volume_mean
+    - 随机数: 指定 seed 时整条路径可复现
     """
-    def __init__(self):
-        self._prices = {}
-        self._volatility = 0.0002 # 0.02% 波动
+    def __init__(self, seed: Optional[int] = None, volatility: float = 0.0002, drift: float = 0.0,
+                 jump_intensity: float = 0.001, jump_scale: float = 0.005, spread_bps: float = 1.0,
+                 volume_mean: float = 1.0, block: int = 1024):
+        self.seed = seed
+        self.volatility = volatility         # 每步对数收益标准差 (默认 0.02%)
+        self.drift = drift                   # 每步对数收益漂移
+        self.jump_intensity = jump_intensity # 每步发生跳跃的概率
+        self.jump_scale = jump_scale         # 跳跃幅度 (对数收益标准差)
+        self.spread_bps = spread_bps
+        self.volume_mean = volume_mean
+        self.block = block                   # get_tick 单 symbol 预生成的步数
 
-    def get_tick(self, symbol: str) -> TickData:
+        self._rng = np.random.default_rng(seed)
+        self._prices: Dict[str, float] = {}
+        # get_tick 的预生成缓冲: symbol -> [最新价列表, 半价差列表, 成交量列表, 读取位置]
+        self._pending: Dict[str, list] = {}
+
+    def _price(self, symbol: str) -> float:
         # 初始化价格
         if symbol not in self._prices:
             self._prices[symbol] = 10000.0 if "BTC" in symbol else 2000.0
-            
-        # 随机游走
-        current = self._prices[symbol]
-        change = current * self._volatility * random.choice([-1, 1, 0.5, -0.5])
-        new_price = current + change
-        self._prices[symbol] = new_price
-        
+        return self._prices[symbol]
+
+    def _returns(self, rng: np.random.Generator, n: int, k: int) -> np.ndarray:
+        """(n, k) 的每步对数收益"""
+        returns = rng.standard_normal((n, k))
+        returns *= self.volatility
+        returns += self.drift - 0.5 * self.volatility ** 2
+        if self.jump_intensity > 0:
+            jumps = rng.random((n, k)) < self.jump_intensity
+            count = int(jumps.sum())
+            if count:
+                returns[jumps] += rng.normal(0.0, self.jump_scale, count)
+        return returns
+
+    def _paths(self, base: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """从 base (每列起始价格) 向后生成 n 步: (最新价, 半价差, 成交量)，形状均为 (n, k)"""
+        rng = self._rng
+        k = len(base)
+        last = np.exp(np.cumsum(self._returns(rng, n, k), axis=0))
+        last *= base
+        # 价差 = 价格 × spread_bps × (0.5 + Exp(0.5))，均值为 spread_bps，最小为其一半
+        half = rng.exponential(0.5, (n, k))
+        half += 0.5
+        half *= last
+        half *= 0.5e-4 * self.spread_bps
+        volume = rng.lognormal(np.log(self.volume_mean) - 0.5, 1.0, (n, k))
+        return last, half, volume
+
+    def tick_block(self, symbols: Sequence[str], rows: int, start: Optional[float] = None,
+                   interval: float = 0.0, instrument_ids: Optional[Sequence[int]] = None) -> List[TickData]:
+        """
+        批量生成 rows 步 × len(symbols) 个 tick (按时间步排列，同一步内按 symbols 顺序)
+        :param start: 首步的时间戳 (默认当前时间)
+        :param interval: 相邻两步的时间间隔 (秒)
+        :param instrument_ids: 与 symbols 对应的稠密 ID
+        """
+        k = len(symbols)
+        if not k or rows <= 0:
+            return []
+        base = np.fromiter((self._price(s) for s in symbols), dtype=np.float64, count=k)
+        last, half, volume = self._paths(base, rows)
+        bid = (last - half).tolist()
+        ask = (last + half).tolist()
+        volume = volume.tolist()
+        last = last.tolist()
+
+        prices = self._prices
+        for j, s in enumerate(symbols):
+            prices[s] = last[-1][j]
+            self._pending.pop(s, None) # 单 symbol 缓冲基于旧价格，作废
+
+        ids = list(instrument_ids) if instrument_ids is not None else [-1] * k
+        ts = time.time() if start is None else start
+        mock = Exchange.MOCK
+        ticks = []
+        append = ticks.append
+        for r in range(rows):
+            lr, br, ar, vr = last[r], bid[r], ask[r], volume[r]
+            for j in range(k):
+                append(TickData(symbols[j], mock, ts, lr[j], vr[j], br[j], ar[j], 0.0001, ids[j]))
+            ts += interval
+        return ticks
+
+    def history(self, symbol: str, n: int) -> List[float]:
+        """以当前价格结尾的 n 个历史价格 (旧 -> 新)，按同样的过程向前反推，同一 symbol 结果固定"""
+        current = self._price(symbol)
+        if n <= 1:
+            return [current] * max(n, 0)
+        rng = np.random.default_rng([zlib.crc32(symbol.encode()), self.seed or 0])
+        returns = self._returns(rng, n - 1, 1)[:, 0]
+        back = np.cumsum(returns[::-1])[::-1] # prices[i] = current / exp(returns[i:] 之和)
+        prices = (current * np.exp(-back)).tolist()
+        prices.append(current)
+        return prices
+
+    def get_tick(self, symbol: str) -> TickData:
+        """单个 tick (从该 symbol 预生成的 block 步中依次读取)"""
+        buf = self._pending.get(symbol)
+        if buf is None or buf[3] >= len(buf[0]):
+            last, half, volume = self._paths(np.array([self._price(symbol)]), self.block)
+            buf = self._pending[symbol] = [last[:, 0].tolist(), half[:, 0].tolist(), volume[:, 0].tolist(), 0]
+        i = buf[3]
+        buf[3] = i + 1
+        price = buf[0][i]
+        self._prices[symbol] = price
+
         # 构造 Tick
         return TickData(
             symbol=symbol,
             exchange=Exchange.MOCK,
             timestamp=time.time(),
-            last_price=new_price,
-            volume=random.uniform(0.1, 5.0),
-            bid_price_1=new_price - 0.5,
-            ask_price_1=new_price + 0.5,
+            last_price=price,
+            volume=buf[2][i],
+            bid_price_1=price - buf[1][i],
+            ask_price_1=price + buf[1][i],
             funding_rate=0.0001
         )
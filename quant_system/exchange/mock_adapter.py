@@ -1,13 +1,16 @@
 import asyncio
+import dataclasses
 import uuid
 import logging
 import random
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 
 from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.bar import parse_timeframe, TIME
 from quant_system.core.types import (
-    OrderRequest, OrderData, OrderStatus, 
-    Exchange, Direction, OrderType, TickData
+    OrderRequest, OrderData, TradeData, OrderStatus, PositionData, BarData,
+    Exchange, Direction, Offset, OrderType, TickData, Instrument, ProductType
 )
 from quant_system.core.state import OrderStateMachine, InvalidStateTransitionError
 from quant_system.exchange.base import BaseExchange
@@ -21,32 +24,72 @@ class MockExchangeAdapter(BaseExchange):
         super().__init__(event_engine)
         self.config = config or {}
         self.latency_ms = self.config.get("latency_ms", 100)
+        # 行情生成间隔 (秒)，0 表示每轮只让出一次执行权 (压测用)
+        self.tick_interval = self.config.get("tick_interval", 0.5)
+        # 压测负载: tick_rate 为全部 symbol 合计的 tick/s (设置后取代 tick_interval)，按块推送，每块最多 tick_batch 个;
+        # realtime=False 时不等待墙钟，尽快推送 (时间戳按 tick_rate 模拟推进)
+        self.tick_rate = float(self.config.get("tick_rate", 0.0))
+        self.tick_batch = int(self.config.get("tick_batch", 1000))
+        self.realtime = self.config.get("realtime", True)
+        # market_data=False: 不生成行情，按总线上的外部行情撮合 (多账户共享行情时使用)
+        self.market_data = self.config.get("market_data", True)
+        # 逐笔成交推送 (emit_trades=False 时只推送订单快照，策略按订单累计成交量记账)
+        self.emits_trades = self.config.get("emit_trades", True)
+        self.fee_rate = self.config.get("fee_rate", 0.0) # 按成交额收取的手续费率
         
         self._active = False
         self._task: Optional[asyncio.Task] = None
-        self._generator = MarketDataGenerator()
+        # 价格过程参数: {"seed", "volatility", "jump_intensity", "jump_scale", "spread_bps", "volume_mean"}
+        self._generator = MarketDataGenerator(**self.config.get("generator", {}))
+        self.ticks_generated = 0
+        self.ticks_dropped = 0 # 实时推送落后超过 1 秒而丢弃的 tick
         
         # 模拟挂单簿: order_id -> OrderData
         self._active_orders: Dict[str, OrderData] = {}
         self._subscribed: List[str] = []
+        # 模拟持仓 (Hedge Mode): (symbol, direction) -> PositionData
+        self._positions: Dict[Tuple[str, Direction], PositionData] = {}
+        
+        # 合约元数据 (可选): {"instruments": {symbol: {"price_tick": .., "volume_tick": .., ...}}}
+        for sym, spec in self.config.get("instruments", {}).items():
+            self.instruments[sym] = Instrument(
+                symbol=sym,
+                exchange=Exchange.MOCK,
+                product_type=ProductType.PERP,
+                contract_size=spec.get("contract_size", 1.0),
+                price_tick=spec.get("price_tick", 0.0),
+                min_volume=spec.get("min_volume", 0.0),
+                volume_tick=spec.get("volume_tick", 0.0),
+            )
         
         self.logger = logging.getLogger("MockExchange")
 
     async def connect(self) -> None:
         self._active = True
-        self._task = asyncio.create_task(self._run_simulation())
+        if self.market_data:
+            self._task = asyncio.create_task(self._run_simulation())
+        else:
+            self.event_engine.register(EventType.TICK, self._on_external_tick)
         self.logger.info(f"Mock Exchange Connected. Latency={self.latency_ms}ms")
 
     async def close(self) -> None:
         self._active = False
         if self._task:
             self._task.cancel()
+        if not self.market_data:
+            self.event_engine.unregister(EventType.TICK, self._on_external_tick)
         self.logger.info("Mock Exchange Closed")
 
     async def subscribe(self, symbols: List[str]) -> None:
-        self._subscribed.extend(symbols)
+        for s in symbols:
+            if s not in self._subscribed:
+                self._subscribed.append(s)
         self.logger.info(f"Subscribed: {symbols}")
 
+    def _on_external_tick(self, event: Event):
+        """仅交易模式: 用外部行情撮合"""
+        self._match_orders(event.data)
+
     async def send_order(self, req: OrderRequest) -> str:
         """
         模拟发单流程:
@@ -84,6 +127,39 @@ class MockExchangeAdapter(BaseExchange):
     async def cancel_order(self, order_id: str, symbol: str) -> None:
         asyncio.create_task(self._simulate_order_cancel(order_id))
 
+    async def query_position(self, symbols: Optional[List[str]] = None) -> List[PositionData]:
+        """查询模拟持仓"""
+        return [
+            p for p in self._positions.values()
+            if p.volume > 0 and (symbols is None or p.symbol in symbols)
+        ]
+
+    async def query_open_orders(self, symbols: Optional[List[str]] = None) -> List[OrderData]:
+        """查询模拟挂单"""
+        return [
+            dataclasses.replace(o) for o in self._active_orders.values()
+            if symbols is None or o.symbol in symbols
+        ]
+
+    async def query_bars(self, symbol: str, timeframe: str, limit: int = 100) -> List[BarData]:
+        """模拟历史 K 线: 收盘价为以当前模拟价格结尾的随机游走，最后一根为进行中的区间"""
+        kind, seconds = parse_timeframe(timeframe)
+        if kind != TIME or limit <= 0:
+            return []
+        closes = self._generator.history(symbol, limit + 1)
+        now = time.time()
+        first = now - now % seconds - (limit - 1) * seconds
+        iid = self.instruments.intern(symbol)
+        return [
+            BarData(
+                symbol=symbol, exchange=Exchange.MOCK, timeframe=timeframe,
+                start=first + i * seconds, end=first + (i + 1) * seconds,
+                open=closes[i], high=max(closes[i], closes[i + 1]), low=min(closes[i], closes[i + 1]),
+                close=closes[i + 1], instrument_id=iid,
+            )
+            for i in range(limit)
+        ]
+
     async def _simulate_order_submit(self, order: OrderData):
         """模拟网络延迟后提交成功"""
         delay = self.latency_ms / 1000.0
@@ -95,8 +171,8 @@ class MockExchangeAdapter(BaseExchange):
                 OrderStateMachine.transition(order.status, OrderStatus.SUBMITTED)
                 order.status = OrderStatus.SUBMITTED
                 # 推送事件
-                self.event_engine.put(Event(EventType.ORDER_STATUS, order))
-                self.logger.debug(f"Order Submitted: {order.order_id}")
+                self._emit_order(order)
+                self.logger.debug("Order Submitted: %s", order.order_id)
             except Exception as e:
                 self.logger.error(f"Mock submit failed: {e}")
 
@@ -110,24 +186,69 @@ class MockExchangeAdapter(BaseExchange):
             try:
                 OrderStateMachine.transition(order.status, OrderStatus.CANCELLED)
                 order.status = OrderStatus.CANCELLED
-                self.event_engine.put(Event(EventType.ORDER_STATUS, order))
+                self._emit_order(order)
                 del self._active_orders[order_id] # 移除撮合队列
             except Exception:
                 pass
 
+    def _emit_order(self, order: OrderData) -> bool:
+        """推送订单快照 (撮合队列中的对象会被继续修改，不能直接外发)"""
+        return super()._emit_order(dataclasses.replace(order))
+
     async def _run_simulation(self):
         """主循环: 生成行情 + 撮合"""
+        if self.tick_rate > 0:
+            await self._stream()
+            return
+        while self._active:
+            if self._subscribed:
+                self._publish(self._generator.tick_block(self._subscribed, 1, instrument_ids=self._instrument_ids()))
+            await asyncio.sleep(self.tick_interval)
+
+    async def _stream(self):
+        """按 tick_rate 成块推送; realtime 模式落后墙钟超过 1 秒时丢弃积压，不补发"""
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        scheduled = 0 # 实时模式: 已到期 (已推送或已丢弃) 的 tick 数
+        clock = time.time() # 非实时模式的模拟时钟
         while self._active:
-            for symbol in self._subscribed:
-                # 1. 生成 Tick
-                tick = self._generator.get_tick(symbol)
-                self.event_engine.put(Event(EventType.TICK, tick))
-                
-                # 2. 撮合 (简化版)
+            symbols = list(self._subscribed)
+            if not symbols:
+                await asyncio.sleep(0.01)
+                t0, scheduled = loop.time(), 0
+                continue
+            k = len(symbols)
+            step = k / self.tick_rate # 每步 (每个 symbol 各一个 tick) 的时长
+            rows = max(1, self.tick_batch // k)
+            if self.realtime:
+                due = int((loop.time() - t0) * self.tick_rate) - scheduled
+                if due > self.tick_rate:
+                    self.ticks_dropped += due - int(self.tick_rate)
+                    scheduled += due - int(self.tick_rate)
+                    due = int(self.tick_rate)
+                if due < k:
+                    await asyncio.sleep((k - due) / self.tick_rate)
+                    continue
+                rows = min(rows, due // k)
+                start = time.time() - (rows - 1) * step
+                scheduled += rows * k
+            else:
+                start = clock
+                clock += rows * step
+            self._publish(self._generator.tick_block(symbols, rows, start, step, self._instrument_ids(symbols)))
+            await asyncio.sleep(0) # 让出执行权，事件引擎处理完本块
+
+    def _instrument_ids(self, symbols: Optional[List[str]] = None) -> List[int]:
+        return [self.instruments.intern(s) for s in (symbols or self._subscribed)]
+
+    def _publish(self, ticks: List[TickData]):
+        """推送一批 tick; 有挂单时逐个 tick 撮合"""
+        put = self.event_engine.put
+        for tick in ticks:
+            put(Event(EventType.TICK, tick))
+            if self._active_orders:
                 self._match_orders(tick)
-            
-            # 500ms 一个 Tick
-            await asyncio.sleep(0.5)
+        self.ticks_generated += len(ticks)
 
     def _match_orders(self, tick: TickData):
         """
@@ -168,16 +289,53 @@ class MockExchangeAdapter(BaseExchange):
             # 简单假设成交价 = 委托价 (限价) 或 最新价 (市价)
             fill_price = order.price if order.type == OrderType.LIMIT else tick.last_price
             order.price = fill_price # Update to actual fill price for record
+            order.avg_price = fill_price
             
-            # 推送订单更新
-            self.event_engine.put(Event(EventType.ORDER_STATUS, order))
+            # 先推送成交明细，再推送订单终态 (策略收到 FILLED 时持仓已更新)
+            if self.emits_trades:
+                inst = self.instruments.get(order.symbol)
+                contract_size = inst.contract_size if inst else 1.0
+                self._emit_trade(TradeData(
+                    symbol=order.symbol,
+                    exchange=Exchange.MOCK,
+                    order_id=order.order_id,
+                    trade_id=uuid.uuid4().hex,
+                    direction=order.direction,
+                    offset=order.offset,
+                    price=fill_price,
+                    volume=order.volume,
+                    timestamp=tick.timestamp,
+                    fee=fill_price * order.volume * contract_size * self.fee_rate,
+                    fee_currency="USDT",
+                ))
+            self._emit_order(order)
             
-            # 推送成交明细 (Trade) - 可选
-            # ...
+            # 更新模拟持仓
+            self._update_position(order, fill_price)
             
             # 从活跃列表移除
             del self._active_orders[order.order_id]
-            self.logger.info(f"Order Filled: {order.order_id} @ {fill_price}")
+            self.logger.info("Order Filled: %s @ %s", order.order_id, fill_price)
             
         except InvalidStateTransitionError:
             pass
+
+    def _update_position(self, order: OrderData, fill_price: float):
+        """按成交更新模拟持仓 (Hedge Mode: 开仓加对应方向，平仓减反方向)"""
+        if order.offset == Offset.CLOSE:
+            leg = Direction.SHORT if order.direction == Direction.LONG else Direction.LONG
+        else:
+            leg = order.direction
+        
+        key = (order.symbol, leg)
+        pos = self._positions.get(key)
+        if pos is None:
+            pos = PositionData(symbol=order.symbol, exchange=Exchange.MOCK, direction=leg, volume=0.0, price=0.0)
+            self._positions[key] = pos
+        
+        if order.offset == Offset.CLOSE:
+            pos.volume = max(pos.volume - order.volume, 0.0)
+        else:
+            total = pos.volume + order.volume
+            pos.price = (pos.price * pos.volume + fill_price * order.volume) / total
+            pos.volume = total
@@ -6,33 +6,84 @@ import ccxt as ccxt_base # Base package for exceptions
 from typing import Dict, List, Optional
 
 from quant_system.core.event import EventEngine, Event, EventType
-from quant_system.core.types import OrderRequest, OrderData, TickData, Exchange, Direction, OrderType, Instrument, ProductType, OrderStatus, Offset, PositionData
+from quant_system.core.types import OrderRequest, OrderData, TradeData, TickData, BarData, Exchange, Direction, OrderType, Instrument, ProductType, OrderStatus, Offset, PositionData
 from quant_system.exchange.base import BaseExchange
+from quant_system.utils.dedup import BoundedSet
 
 class OkxExchangeAdapter(BaseExchange):
     """
     OKX 交易所适配器 (基于 CCXT Pro)
     """
+    BATCH_SIZE = 20 # OKX 批量下单单次上限
+    emits_trades = True # 私有成交流 (watch_my_trades) 推送逐笔成交
+    tick_volume_cumulative = True # tickers 频道的成交量为 24h 累计 (vol24h)
+    OHLCV_PAGE = 100 # 单次 K 线请求的根数上限
+    ORDERS_PAGE = 100 # 单次挂单查询的条数上限
+    ORDER_SNAPSHOT_DEDUP_SIZE = 10000 # 订单快照去重窗口
+    
     def __init__(self, event_engine: EventEngine, config: Dict):
         super().__init__(event_engine)
         self.config = config
         self.logger = logging.getLogger("OkxAdapter")
         
-        # 初始化 CCXT 实例
-        self.api = ccxt.okx({
-            'apiKey': config.get('api_key'),
-            'secret': config.get('secret'),
-            'password': config.get('passphrase'),
-            'options': {'defaultType': 'swap'},  # 默认为永续合约
-        })
+        # CCXT 实例在首次使用时创建 (见 api 属性)
+        self._api = None
         
-        self.instruments: Dict[str, Instrument] = {}
         self._active = False
         self._ws_task: Optional[asyncio.Task] = None
+        self._orders_task: Optional[asyncio.Task] = None
+        self._trades_task: Optional[asyncio.Task] = None
+        self._symbols: List[str] = [] # 已订阅行情的 symbols
+        self._markets_shared = False
+        
+        # market_data=False: 仅交易 (行情由共享的 MarketDataHub 提供，见 quant_system.host)
+        self.market_data = config.get('market_data', True)
+        # fast_parse=True: tickers/orders 原始帧直接解析 (quant_system.exchange.okx_fast)，跳过 CCXT 归一化
+        self.fast_parse = config.get('fast_parse', False)
+        # CCXT 订单/成交缓存上限 (ArrayCacheBySymbolById，按订单 ID 覆盖)
+        self.orders_cache_size = int(config.get('orders_cache_size', 1000))
+        # 已处理的订单快照 (id, status, filled, 更新时间)
+        self._seen_order_snapshots = BoundedSet(self.ORDER_SNAPSHOT_DEDUP_SIZE)
+
+    @property
+    def api(self):
+        """CCXT 实例 (延迟创建: 构造 okx 客户端需展开整份接口描述，推迟到连接/共享元数据时)"""
+        if self._api is None:
+            if self.fast_parse:
+                from quant_system.exchange.okx_fast import FastOkx
+                api_cls = FastOkx
+            else:
+                api_cls = ccxt.okx
+            self._api = api_cls({
+                'apiKey': self.config.get('api_key'),
+                'secret': self.config.get('secret'),
+                'password': self.config.get('passphrase'),
+                'options': {
+                    'defaultType': 'swap',  # 默认为永续合约
+                    'ordersLimit': self.orders_cache_size,
+                    'tradesLimit': self.orders_cache_size,
+                },
+                # watch_orders / watch_my_trades 只返回上次调用以来有变化的条目 (而不是整个缓存)
+                'newUpdates': True,
+            })
+        return self._api
+
+    def share_instruments(self, source: BaseExchange) -> None:
+        """
+        复用另一个 OKX 实例已加载的 markets 与 Instrument 缓存 (多账户同进程时只加载一次)
+        """
+        super().share_instruments(source)
+        if isinstance(source, OkxExchangeAdapter) and source.api.markets:
+            self.api.set_markets(source.api.markets, source.api.currencies)
+            self._markets_shared = True
 
     async def connect(self) -> None:
         """建立连接并启动监听循环"""
         self._active = True
+        if self._markets_shared:
+            self.logger.info(f"Markets shared. Cache Size: {len(self.instruments)}")
+            return
+        
         # Custom Market Loading (Memory Optimization)
         market_type = self.config.get('market_type')
         params = {}
@@ -88,7 +139,12 @@ class OkxExchangeAdapter(BaseExchange):
         self._active = False
         if self._ws_task:
             self._ws_task.cancel()
-        await self.api.close()
+        if self._orders_task:
+            self._orders_task.cancel()
+        if self._trades_task:
+            self._trades_task.cancel()
+        if self._api is not None:
+            await self._api.close()
         self.logger.info("OKX Adapter Closed")
 
     async def check_login(self) -> bool:
@@ -107,66 +163,113 @@ class OkxExchangeAdapter(BaseExchange):
     async def subscribe(self, symbols: List[str]) -> None:
         """
         订阅行情 (Loop)
+        多次调用时合并 symbols，只保留一个行情循环和一个私有订单循环
         """
         if not self._active:
             self.logger.warning("Adapter not connected, cannot subscribe")
             return
 
-        self.logger.info(f"Start watching tickers for: {symbols}")
+        if self.fast_parse:
+            self._install_fast_parser()
+
         # 1. Ticker Loop
-        self._ws_task = asyncio.create_task(self._watch_loop(symbols))
+        new_symbols = [s for s in symbols if s not in self._symbols]
+        if self.market_data and new_symbols:
+            self._symbols.extend(new_symbols)
+            self.logger.info(f"Start watching tickers for: {self._symbols}")
+            if self._ws_task:
+                self._ws_task.cancel()
+            self._ws_task = asyncio.create_task(self._watch_loop(list(self._symbols)))
         
-        # 2. Private Order Loop (如果配置了 Key)
-        if self.config.get('api_key'):
-             self.logger.info("Start watching private orders...")
-             asyncio.create_task(self._watch_orders_loop())
+        # 2. Private Order/Fill Loops (如果配置了 Key)
+        if self.config.get('api_key') and self._orders_task is None:
+             self.logger.info("Start watching private orders and fills...")
+             self._orders_task = asyncio.create_task(self._watch_orders_loop())
+             # 快速解析模式下成交直接取自 orders 频道 (与 CCXT watch_my_trades 同源)，不再单独监听
+             if not self.fast_parse:
+                 self._trades_task = asyncio.create_task(self._watch_trades_loop())
 
-    async def send_order(self, req: OrderRequest) -> str:
+    def _install_fast_parser(self) -> None:
+        """按已加载的 markets 构造原始帧解析器并挂到 CCXT 实例上 (只做一次)"""
+        api = self.api
+        if api.frame_parser is not None:
+            return
+        from quant_system.exchange.okx_fast import OkxFrameParser
+        api.frame_parser = OkxFrameParser.from_markets(api.markets, api.commonCurrencies, self.instruments)
+        api.on_ticks = self._on_fast_ticks
+        api.on_orders = self._on_fast_orders
+        self.logger.info(f"Fast frame parser installed ({len(api.frame_parser.symbols)} instruments)")
+
+    def _on_fast_ticks(self, ticks: List[TickData]) -> None:
+        for tick in ticks:
+            self.event_engine.put(Event(EventType.TICK, tick))
+
+    def _on_fast_orders(self, orders: List[OrderData], trades: List[TradeData]) -> None:
+        # 成交先于订单状态推送 (与 CCXT handle_orders 中先处理 myTrades 的顺序一致)
+        for trade in trades:
+            if self._emit_trade(trade):
+                self.logger.info("Trade: %s %s %s %s@%s fee=%s", trade.order_id, trade.trade_id, trade.direction, trade.volume, trade.price, trade.fee)
+        for order_data in orders:
+            if self._emit_order(order_data):
+                self.logger.info("Order Update: %s %s %s/%s", order_data.order_id, order_data.status, order_data.traded, order_data.volume)
+
+    def _build_order(self, req: OrderRequest) -> dict:
         """
-        发送订单 (自动修剪精度)
+        OrderRequest -> CCXT 下单参数 (自动修剪精度)
         """
-        if not self._active:
-            self.logger.warning("Adapter not connected")
-            return ""
-
         # 0. 自动修剪精度 (Auto Rounding)
         inst = self.instruments.get(req.symbol)
         if inst:
             original_price = req.price
             original_vol = req.volume
             
+            # 换算为整数 tick/步长再转回: 结果恰为网格上的十进制值 (不会出现 0.30000000000000004)
             req.price = inst.round_price(req.price)
             req.volume = inst.round_volume(req.volume)
             
+            # 网格上的值换算往返不变，因此这里的比较是精确的
             if req.price != original_price or req.volume != original_vol:
-                self.logger.info(f"Rounding: {req.symbol} P:{original_price}->{req.price} V:{original_vol}->{req.volume}")
+                self.logger.debug("Rounding: %s P:%s->%s V:%s->%s", req.symbol, original_price, req.price, original_vol, req.volume)
         else:
-            self.logger.warning(f"Instrument not found in cache: {req.symbol}, skip rounding")
+            self.logger.warning("Instrument not found in cache: %s, skip rounding", req.symbol)
 
         # 映射方向
         side = 'buy' if req.direction == Direction.LONG else 'sell'
         
-        # 映射类型 (目前仅支持 LIMIT)
-        order_type = 'limit'
-        
         # 映射 posSide (OKX 永续合约双向持仓模式下必填)
-        # LONG -> posSide='long', SHORT -> posSide='short'
-        pos_side = 'long' if req.direction == Direction.LONG else 'short'
+        # posSide 指向被操作的腿: 开仓与方向一致; 平仓与方向相反 (卖出平多 -> long, 买入平空 -> short)
+        if req.offset == Offset.CLOSE:
+            pos_side = 'short' if req.direction == Direction.LONG else 'long'
+        else:
+            pos_side = 'long' if req.direction == Direction.LONG else 'short'
+        
+        # 映射类型 (目前仅支持 LIMIT)
+        return {
+            'symbol': req.symbol,
+            'type': 'limit',
+            'side': side,
+            'amount': req.volume,
+            'price': req.price,
+            'params': {'posSide': pos_side},
+        }
+
+    async def send_order(self, req: OrderRequest) -> str:
+        """
+        发送订单 (自动修剪精度)
+        """
+        if not self._active:
+            self.logger.warning("Adapter not connected")
+            return ""
+
+        order_args = self._build_order(req)
         
         try:
-            self.logger.info(f"Sending Order: {req.symbol} {side} {req.price}@{req.volume} posSide={pos_side}")
+            self.logger.info("Sending Order: %s %s %s@%s posSide=%s", req.symbol, order_args['side'], req.price, req.volume, order_args['params']['posSide'])
             
             # 调用 CCXT create_order
-            order = await self.api.create_order(
-                symbol=req.symbol,
-                type=order_type,
-                side=side,
-                amount=req.volume,
-                price=req.price,
-                params={'posSide': pos_side} 
-            )
+            order = await self.api.create_order(**order_args)
             
-            self.logger.info(f"Order Placed. ID: {order['id']}")
+            self.logger.info("Order Placed. ID: %s", order['id'])
             return str(order['id'])
             
         except ccxt_base.InsufficientFunds as e:
@@ -179,12 +282,37 @@ class OkxExchangeAdapter(BaseExchange):
             self.logger.error(f"Order Failed: {e}")
             return ""
 
+    async def send_orders(self, reqs: List[OrderRequest]) -> List[str]:
+        """
+        批量发单 (OKX batch-orders，每批最多 20 笔，多批并发)
+        单笔失败时对应位置返回空字符串
+        """
+        if not self._active:
+            self.logger.warning("Adapter not connected")
+            return [""] * len(reqs)
+        if len(reqs) == 1:
+            return [await self.send_order(reqs[0])]
+
+        batches = [reqs[i:i + self.BATCH_SIZE] for i in range(0, len(reqs), self.BATCH_SIZE)]
+
+        async def send_batch(batch: List[OrderRequest]) -> List[str]:
+            try:
+                orders = await self.api.create_orders([self._build_order(r) for r in batch])
+                return [str(o.get('id') or "") for o in orders]
+            except Exception as e:
+                self.logger.error(f"Batch Order Failed ({len(batch)} orders): {e}")
+                return [""] * len(batch)
+
+        self.logger.info("Sending Batch: %d orders in %d requests", len(reqs), len(batches))
+        results = await asyncio.gather(*[send_batch(b) for b in batches])
+        return [oid for ids in results for oid in ids]
+
     async def cancel_order(self, order_id: str, symbol: str) -> None:
         """
         撤销订单
         """
         try:
-            self.logger.info(f"Cancelling Order: {order_id} ({symbol})")
+            self.logger.info("Cancelling Order: %s (%s)", order_id, symbol)
             await self.api.cancel_order(order_id, symbol)
             self.logger.info("Cancel Sent")
         except Exception as e:
@@ -201,32 +329,7 @@ class OkxExchangeAdapter(BaseExchange):
         elif o['status'] == 'open' and o['filled'] > 0:
             status = OrderStatus.PARTIALLY_FILLED
         
-        # 转换 Direction/Offset
-        direction = Direction.LONG
-        offset = Offset.NONE
-        
-        side = o['side'] # buy/sell
-        # info.posSide for Swap Hedge
-        raw_pos_side = o['info'].get('posSide')
-        
-        if raw_pos_side == 'long':
-            if side == 'buy':
-                direction = Direction.LONG
-                offset = Offset.OPEN
-            else:
-                direction = Direction.LONG
-                offset = Offset.CLOSE
-        elif raw_pos_side == 'short':
-            if side == 'sell':
-                direction = Direction.SHORT
-                offset = Offset.OPEN
-            else:
-                direction = Direction.SHORT
-                offset = Offset.CLOSE
-        else:
-            # Fallback
-            direction = Direction.LONG if side == 'buy' else Direction.SHORT
-            offset = Offset.NONE
+        direction, offset = self._parse_side(o['side'], o['info'].get('posSide'))
 
         return OrderData(
             symbol=o['symbol'],
@@ -240,13 +343,71 @@ class OkxExchangeAdapter(BaseExchange):
             volume=float(o['amount']),
             traded=float(o['filled']),
             status=status,
-            timestamp=o['timestamp'] / 1000.0
+            timestamp=o['timestamp'] / 1000.0,
+            avg_price=float(o.get('average') or 0.0)
         )
 
-    async def query_position(self) -> List[PositionData]:
-        """查询当前持仓 (REST API)"""
+    @staticmethod
+    def _parse_side(side: str, raw_pos_side: Optional[str]) -> tuple:
+        """
+        buy/sell + posSide (Hedge Mode) -> (Direction, Offset)，与 _build_order 的映射互逆:
+        方向即买卖方向; posSide 与方向一致为开仓，相反为平仓 (卖出平多 = SHORT/CLOSE)
+        """
+        direction = Direction.LONG if side == 'buy' else Direction.SHORT
+        if raw_pos_side == 'long':
+            offset = Offset.OPEN if direction == Direction.LONG else Offset.CLOSE
+        elif raw_pos_side == 'short':
+            offset = Offset.OPEN if direction == Direction.SHORT else Offset.CLOSE
+        else:
+            # 单向持仓 (net)
+            offset = Offset.NONE
+        return direction, offset
+
+    def _parse_tick_data(self, t: dict) -> TickData:
+        """统一解析 CCXT ticker 格式"""
+        return TickData(
+            symbol=t['symbol'],
+            exchange=Exchange.OKX,
+            timestamp=t['timestamp'] / 1000.0,
+            last_price=float(t['last']),
+            volume=float(t['baseVolume']),
+            bid_price_1=float(t['bid']),
+            ask_price_1=float(t['ask']),
+            funding_rate=0.0,
+            instrument_id=self.instruments.intern(t['symbol'])
+        )
+
+    def _parse_trade_data(self, t: dict) -> TradeData:
+        """统一解析 CCXT 成交格式 (实际成交价与逐笔手续费)"""
+        direction, offset = self._parse_side(t['side'], (t.get('info') or {}).get('posSide'))
+        fee = t.get('fee') or {}
+        return TradeData(
+            symbol=t['symbol'],
+            exchange=Exchange.OKX,
+            order_id=str(t['order']),
+            trade_id=str(t['id']),
+            direction=direction,
+            offset=offset,
+            price=float(t['price']),
+            volume=float(t['amount']),
+            timestamp=t['timestamp'] / 1000.0,
+            fee=float(fee.get('cost') or 0.0),
+            fee_currency=fee.get('currency') or "",
+        )
+
+    async def query_position(self, symbols: Optional[List[str]] = None) -> List[PositionData]:
+        """
+        查询当前持仓 (REST API)
+        指定 symbols 时按 instId 过滤 (OKX 单次最多 10 个，超出分批并发)
+        查询失败时抛出异常 (空列表会被对账当作 "没有持仓")
+        """
         try:
-            raw_positions = await self.api.fetch_positions()
+            if symbols:
+                batches = [symbols[i:i + 10] for i in range(0, len(symbols), 10)]
+                pages = await asyncio.gather(*[self.api.fetch_positions(b) for b in batches])
+                raw_positions = [p for page in pages for p in page]
+            else:
+                raw_positions = await self.api.fetch_positions()
             results = []
             
             for p in raw_positions:
@@ -272,21 +433,71 @@ class OkxExchangeAdapter(BaseExchange):
             return results
         except Exception as e:
             self.logger.error(f"Query Position Failed: {e}")
+            raise
+
+    async def query_bars(self, symbol: str, timeframe: str, limit: int = 100) -> List[BarData]:
+        """
+        查询最近 limit 根 K 线 (REST API)
+        超过单页上限 (OHLCV_PAGE) 时按 until 向前分页，页内顺序请求; 多个 symbol 由调用方并发
+        注意: 衍生品的 K 线成交量为 CCXT 统一的币数 (volCcy)，与 tickers 频道的张数单位不同
+        """
+        try:
+            rows: List[list] = []
+            while len(rows) < limit:
+                params = {"until": rows[0][0]} if rows else {}
+                page = await self.api.fetch_ohlcv(symbol, timeframe, limit=min(limit - len(rows), self.OHLCV_PAGE), params=params)
+                page = [r for r in page if not rows or r[0] < rows[0][0]]
+                if not page:
+                    break
+                rows = page + rows
+            seconds = self.api.parse_timeframe(timeframe)
+            iid = self.instruments.intern(symbol)
+            return [
+                BarData(
+                    symbol=symbol,
+                    exchange=Exchange.OKX,
+                    timeframe=timeframe,
+                    start=ts / 1000.0,
+                    end=ts / 1000.0 + seconds,
+                    open=float(o),
+                    high=float(h),
+                    low=float(l),
+                    close=float(c),
+                    volume=float(v or 0.0),
+                    instrument_id=iid,
+                )
+                for ts, o, h, l, c, v in rows
+            ]
+        except Exception as e:
+            self.logger.error(f"Query Bars Failed for {symbol} {timeframe}: {e}")
             return []
 
-    async def query_open_orders(self) -> List[OrderData]:
-        """查询当前挂单 (REST API)"""
+    async def query_open_orders(self, symbols: Optional[List[str]] = None) -> List[OrderData]:
+        """
+        查询当前挂单 (REST API)
+        整个账户一次查询 (按 ordId 游标翻页，每页 ORDERS_PAGE 条)，再按 symbols 本地过滤:
+        请求数只与挂单数量有关，不随 symbol 数量增长，不会因逐合约并发触发限频。
+        查询失败时抛出异常 (空列表会被对账当作 "没有挂单")
+        """
         try:
-            raw_orders = await self.api.fetch_open_orders()
-            results = []
-            for o in raw_orders:
-                 results.append(self._parse_order_data(o))
-            
-            self.logger.info(f"Query Open Orders Success: {len(results)} orders.")
-            return results
+            raw_orders: List[dict] = []
+            while True:
+                params = {"after": raw_orders[-1]['id']} if raw_orders else {}
+                page = await self.api.fetch_open_orders(limit=self.ORDERS_PAGE, params=params)
+                raw_orders.extend(page)
+                if len(page) < self.ORDERS_PAGE:
+                    break
         except Exception as e:
             self.logger.error(f"Query Open Orders Failed: {e}")
-            return []
+            raise
+
+        wanted = set(symbols) if symbols else None
+        results = [
+            self._parse_order_data(o) for o in raw_orders
+            if wanted is None or o['symbol'] in wanted
+        ]
+        self.logger.info(f"Query Open Orders Success: {len(results)} orders.")
+        return results
 
     async def _watch_loop(self, symbols: List[str]):
         """
@@ -296,8 +507,15 @@ class OkxExchangeAdapter(BaseExchange):
         while self._active:
             try:
                 # 这一步会挂起，直到收到交易所推送
-                symbol = symbols[0]
-                ccxt_ticker = await self.api.watch_ticker(symbol)
+                if self.fast_parse:
+                    # TickData 已在帧回调中推送，这里只维持订阅与断线恢复
+                    ccxt_tickers = []
+                    await self.api.watch_tickers(symbols)
+                elif len(symbols) == 1:
+                    ccxt_tickers = [await self.api.watch_ticker(symbols[0])]
+                else:
+                    # 多 symbol 共用一条连接，只返回本次更新的 tickers
+                    ccxt_tickers = list((await self.api.watch_tickers(symbols)).values())
                 
                 # 重置重连延迟
                 if retry_delay > 1:
@@ -307,18 +525,8 @@ class OkxExchangeAdapter(BaseExchange):
                     self.event_engine.put(Event(EventType.RECOVERY, None))
 
                 # 阶段 6.2: 解析并推送 TickData
-                tick = TickData(
-                    symbol=symbol,
-                    exchange=Exchange.OKX,
-                    timestamp=ccxt_ticker['timestamp'] / 1000.0,
-                    last_price=float(ccxt_ticker['last']),
-                    volume=float(ccxt_ticker['baseVolume']),
-                    bid_price_1=float(ccxt_ticker['bid']),
-                    ask_price_1=float(ccxt_ticker['ask']),
-                    funding_rate=0.0 
-                )
-                
-                self.event_engine.put(Event(EventType.TICK, tick))
+                for ccxt_ticker in ccxt_tickers:
+                    self.event_engine.put(Event(EventType.TICK, self._parse_tick_data(ccxt_ticker)))
                 
             except ccxt_base.NetworkError as e:
                 self.logger.warning(f"Ticker WS Network Error: {e}. Retrying in {retry_delay}s...")
@@ -336,17 +544,23 @@ class OkxExchangeAdapter(BaseExchange):
         retry_delay = 1
         while self._active:
             try:
-                # CCXT watch_orders return a list of orders
+                # CCXT watch_orders return a list of orders (快速解析模式下为空，回报已在帧回调中推送)
                 orders = await self.api.watch_orders()
                 
-                # 重置
+                # 重置 (私有流断开期间可能漏掉回报，同样触发对账)
                 if retry_delay > 1:
                     retry_delay = 1
+                    self.event_engine.put(Event(EventType.RECOVERY, None))
                 
                 for o in orders:
+                    # 同一快照重复出现 (缓存条目未变化) 时不再解析
+                    if not self._seen_order_snapshots.add((o['id'], o['status'], o['filled'], o.get('lastUpdateTimestamp'))):
+                        self.order_updates_received += 1
+                        self.order_updates_skipped += 1
+                        continue
                     order_data = self._parse_order_data(o)
-                    self.logger.info(f"Order Update: {order_data.order_id} {order_data.status} {order_data.traded}/{order_data.volume}")
-                    self.event_engine.put(Event(EventType.ORDER_STATUS, order_data))
+                    if self._emit_order(order_data):
+                        self.logger.info("Order Update: %s %s %s/%s", order_data.order_id, order_data.status, order_data.traded, order_data.volume)
 
             except ccxt_base.NetworkError as e:
                 self.logger.warning(f"Order WS Network Error: {e}. Retrying in {retry_delay}s...")
@@ -356,3 +570,30 @@ class OkxExchangeAdapter(BaseExchange):
             except Exception as e:
                 self.logger.error(f"Order Watch Error: {e}")
                 await asyncio.sleep(5)
+
+    async def _watch_trades_loop(self):
+        """
+        监听私有成交 (逐笔推送 TradeData，按 trade_id 去重)
+        """
+        retry_delay = 1
+        while self._active:
+            try:
+                trades = await self.api.watch_my_trades()
+                
+                if retry_delay > 1:
+                    retry_delay = 1
+                    self.event_engine.put(Event(EventType.RECOVERY, None))
+                
+                for t in trades:
+                    trade = self._parse_trade_data(t)
+                    if self._emit_trade(trade):
+                        self.logger.info("Trade: %s %s %s %s@%s fee=%s", trade.order_id, trade.trade_id, trade.direction, trade.volume, trade.price, trade.fee)
+
+            except ccxt_base.NetworkError as e:
+                self.logger.warning(f"Trade WS Network Error: {e}. Retrying in {retry_delay}s...")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 60)
+                
+            except Exception as e:
+                self.logger.error(f"Trade Watch Error: {e}")
+                await asyncio.sleep(5)
@@ -0,0 +1,177 @@
+import logging
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Tuple
+
+import ccxt.pro as ccxt
+from ccxt.async_support.base.ws.cache import ArrayCacheBySymbolById
+
+from quant_system.core.instruments import InstrumentRegistry
+from quant_system.core.types import TickData, OrderData, TradeData, Exchange, Direction, Offset, OrderType, OrderStatus
+
+# 预先构造的字段访问器 (一次 C 调用取出整行需要的字段)
+_TICK_FIELDS = itemgetter("instId", "ts", "last", "vol24h", "bidPx", "askPx")
+_ORDER_FIELDS = itemgetter("instId", "ordId", "side", "state", "sz", "accFillSz", "cTime")
+_FILL_FIELDS = itemgetter("fillPx", "fillSz", "fillTime")
+
+# OKX state -> OrderStatus (与 CCXT parse_order_status + _parse_order_data 的组合一致)
+# live / partially_filled / 其它未知状态按累计成交量区分 SUBMITTED / PARTIALLY_FILLED
+_FINAL_STATUS = {
+    "filled": OrderStatus.FILLED,
+    "effective": OrderStatus.FILLED,
+    "canceled": OrderStatus.CANCELLED,
+    "order_failed": OrderStatus.CANCELLED,
+}
+
+# (side, posSide) -> (Direction, Offset)，与 OkxExchangeAdapter._parse_side 相同
+_SIDES = {
+    ("buy", "long"): (Direction.LONG, Offset.OPEN),
+    ("buy", "short"): (Direction.LONG, Offset.CLOSE),
+    ("sell", "short"): (Direction.SHORT, Offset.OPEN),
+    ("sell", "long"): (Direction.SHORT, Offset.CLOSE),
+}
+_NET = {"buy": (Direction.LONG, Offset.NONE), "sell": (Direction.SHORT, Offset.NONE)}
+
+class OkxFrameParser:
+    """
+    OKX 原始 WS 帧解析 (tickers / orders 频道)
+    跳过 CCXT 的通用归一化 (safe_* 取值、字符串精度运算、构造统一结构再转换)，直接从原始 data 行生成
+    TickData / OrderData / TradeData; 输出与 CCXT 路径 + 适配器解析逐字段一致 (见 tests/unit/test_okx_fast.py)。
+    """
+    def __init__(self, symbols: Dict[str, str], currencies: Optional[Dict[str, str]] = None,
+                 registry: Optional[InstrumentRegistry] = None):
+        """
+        :param symbols: instId -> 统一 symbol (如 "BTC-USDT-SWAP" -> "BTC/USDT:USDT")
+        :param currencies: 交易所币种 ID -> 统一币种代码 (仅列出需要改名的，其余原样使用)
+        :param registry: 合约注册表，提供时输出对象带 instrument_id
+        """
+        self.symbols = symbols
+        self.currencies = currencies or {}
+        # instId -> (symbol, instrument_id): 每行只做一次字典查找
+        self._routes: Dict[str, Tuple[str, int]] = {
+            inst_id: (symbol, registry.intern(symbol) if registry is not None else -1)
+            for inst_id, symbol in symbols.items()
+        }
+        self.errors = 0
+        self.logger = logging.getLogger("OkxFrameParser")
+
+    @classmethod
+    def from_markets(cls, markets: Dict[str, dict], currencies: Optional[Dict[str, str]] = None,
+                     registry: Optional[InstrumentRegistry] = None) -> "OkxFrameParser":
+        """按 CCXT markets 构造 (symbol -> market，market['id'] 即 instId)"""
+        return cls({m["id"]: symbol for symbol, m in markets.items()}, currencies, registry)
+
+    def tickers(self, message: dict) -> List[TickData]:
+        """tickers 频道帧 -> [TickData] (未知合约与字段缺失的行被跳过)"""
+        ticks = []
+        routes = self._routes
+        for row in message.get("data") or ():
+            try:
+                inst_id, ts, last, volume, bid, ask = _TICK_FIELDS(row)
+                symbol, iid = routes[inst_id]
+                ticks.append(TickData(
+                    symbol=symbol,
+                    exchange=Exchange.OKX,
+                    timestamp=int(ts) / 1000.0,
+                    last_price=float(last),
+                    volume=float(volume),
+                    bid_price_1=float(bid),
+                    ask_price_1=float(ask),
+                    funding_rate=0.0,
+                    instrument_id=iid
+                ))
+            except (KeyError, ValueError, TypeError) as e:
+                self.errors += 1
+                self.logger.warning("Bad ticker row %s: %r", row.get("instId"), e)
+        return ticks
+
+    def orders(self, message: dict) -> Tuple[List[OrderData], List[TradeData]]:
+        """
+        orders 频道帧 -> ([OrderData], [TradeData])
+        OKX 的私有成交也在 orders 频道推送: 带 tradeId 的行同时生成一笔 TradeData (fillPx/fillSz/fillFee)
+        """
+        orders: List[OrderData] = []
+        trades: List[TradeData] = []
+        routes, currencies = self._routes, self.currencies
+        for row in message.get("data") or ():
+            try:
+                inst_id, order_id, side, state, size, acc_fill, ctime = _ORDER_FIELDS(row)
+                symbol, iid = routes[inst_id]
+                pos_side = row.get("posSide")
+                direction, offset = _SIDES.get((side, pos_side)) or _NET[side]
+                traded = float(acc_fill)
+                status = _FINAL_STATUS.get(state)
+                if status is None:
+                    status = OrderStatus.PARTIALLY_FILLED if traded > 0 else OrderStatus.SUBMITTED
+
+                trade_id = row.get("tradeId")
+                if trade_id:
+                    price, volume, fill_time = _FILL_FIELDS(row)
+                    fee_ccy = row.get("fillFeeCcy") or ""
+                    trades.append(TradeData(
+                        symbol=symbol,
+                        exchange=Exchange.OKX,
+                        order_id=order_id,
+                        trade_id=trade_id,
+                        direction=direction,
+                        offset=offset,
+                        price=float(price),
+                        volume=float(volume),
+                        timestamp=int(fill_time) / 1000.0,
+                        fee=float(row.get("fillFee") or 0.0),
+                        fee_currency=currencies.get(fee_ccy, fee_ccy),
+                        instrument_id=iid,
+                    ))
+
+                orders.append(OrderData(
+                    symbol=symbol,
+                    exchange=Exchange.OKX,
+                    order_id=order_id,
+                    exchange_order_id=order_id,
+                    direction=direction,
+                    offset=offset,
+                    type=OrderType.LIMIT,
+                    price=float(row.get("px") or 0.0),
+                    volume=float(size),
+                    traded=traded,
+                    status=status,
+                    timestamp=int(ctime) / 1000.0,
+                    instrument_id=iid,
+                    avg_price=float(row.get("avgPx") or 0.0)
+                ))
+            except (KeyError, ValueError, TypeError) as e:
+                self.errors += 1
+                self.logger.warning("Bad order row %s: %r", row.get("ordId"), e)
+        return orders, trades
+
+class FastOkx(ccxt.okx):
+    """
+    ccxt.pro.okx 子类: 设置 frame_parser 与回调后，tickers / orders 频道的帧不再经过 CCXT 归一化，
+    由 OkxFrameParser 解析后直接交给回调; watch_tickers / watch_orders 仍负责订阅、登录与重连，
+    但返回空结果 (仅用于唤醒监听循环感知断线恢复)。未设置时行为与父类完全相同。
+    """
+    frame_parser: Optional[OkxFrameParser] = None
+    on_ticks: Optional[Callable[[List[TickData]], None]] = None
+    on_orders: Optional[Callable[[List[OrderData], List[TradeData]], None]] = None
+
+    def handle_ticker(self, client, message):
+        parser = self.frame_parser
+        if parser is None or self.on_ticks is None:
+            return super().handle_ticker(client, message)
+        arg = message.get("arg") or {}
+        ticks = parser.tickers(message)
+        if ticks:
+            self.on_ticks(ticks)
+        symbol = parser.symbols.get(arg.get("instId"))
+        if symbol is not None:
+            client.resolve({}, f"{arg.get('channel')}::{symbol}")
+
+    def handle_orders(self, client, message, subscription=None):
+        parser = self.frame_parser
+        if parser is None or self.on_orders is None:
+            return super().handle_orders(client, message, subscription)
+        orders, trades = parser.orders(message)
+        if orders or trades:
+            self.on_orders(orders, trades)
+        channel = (message.get("arg") or {}).get("channel")
+        # watch_orders 需要一个 ArrayCache (getLimit)，这里只给空缓存
+        client.resolve(ArrayCacheBySymbolById(1), channel)
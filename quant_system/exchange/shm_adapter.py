@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set
+
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.instruments import SlotIndex
+from quant_system.core.state import OrderTracker
+from quant_system.core.types import OrderRequest, OrderData, PositionData, BarData
+from quant_system.exchange.base import BaseExchange
+from quant_system.ipc.tick_ring import TickRingReader, open_reader
+
+class ShmExchangeAdapter(BaseExchange):
+    """
+    共享内存行情适配器 (Market Data via Gateway)
+    行情来自独立网关进程写入的共享内存环 (见 quant_system.ipc.gateway)，本进程不建立行情连接;
+    交易类接口全部委托给内部的交易连接 (trading)，该连接应以 market_data=False 创建。
+
+    配置:
+    - ring: 共享内存名 (默认 "tws_ticks")
+    - poll_interval: 空闲时的轮询间隔 (秒)
+    - connect_timeout: 等待网关创建共享内存的最长时间 (秒)
+    - tick_volume_cumulative: 网关写入的成交量是否为累计量 (默认 True，与 OKX tickers 一致)
+    - reattach_interval: 无新行情时检查网关是否已重建共享内存的间隔 (秒，默认 1)
+    - stale_timeout: 行情停止前进超过该时长 (秒，默认 10) 时告警
+
+    网关重启后读端自动附加到新的共享内存 (按头部 generation 识别) 并推送 RECOVERY。
+    """
+    def __init__(self, event_engine: EventEngine, config: Dict = None, trading: Optional[BaseExchange] = None):
+        super().__init__(event_engine)
+        self.config = config or {}
+        self.trading = trading
+        self.ring_name = self.config.get("ring", "tws_ticks")
+        self.poll_interval = self.config.get("poll_interval", 0.001)
+        self.connect_timeout = self.config.get("connect_timeout", 10.0)
+        self.tick_volume_cumulative = self.config.get("tick_volume_cumulative", True)
+        self.reattach_interval = self.config.get("reattach_interval", 1.0)
+        self.stale_timeout = self.config.get("stale_timeout", 10.0)
+
+        self._reader: Optional[TickRingReader] = None
+        self._task: Optional[asyncio.Task] = None
+        self._active = False
+        self._symbols: Set[str] = set()
+        self._wanted = SlotIndex() # instrument_id -> 1 (已订阅)
+        self.logger = logging.getLogger("ShmExchange")
+
+    @property
+    def emits_trades(self) -> bool:
+        return self.trading.emits_trades if self.trading else False
+
+    @property
+    def order_tracker(self) -> OrderTracker:
+        """订单回报由交易连接接收与去重，跟踪器以其为准"""
+        return self.trading.order_tracker if self.trading else self._order_tracker
+
+    @order_tracker.setter
+    def order_tracker(self, tracker: OrderTracker) -> None:
+        self._order_tracker = tracker
+
+    def order_stream_stats(self) -> Dict[str, int]:
+        return self.trading.order_stream_stats() if self.trading else super().order_stream_stats()
+
+    def share_instruments(self, source: BaseExchange) -> None:
+        super().share_instruments(source)
+        if self.trading:
+            self.trading.share_instruments(source)
+
+    async def connect(self) -> None:
+        """附加到共享内存 (网关未启动时等待)，并连接交易通道"""
+        deadline = asyncio.get_running_loop().time() + self.connect_timeout
+        while (reader := open_reader(self.ring_name)) is None:
+            if asyncio.get_running_loop().time() > deadline:
+                raise ConnectionError(f"Tick ring not found: {self.ring_name} (is the gateway running?)")
+            await asyncio.sleep(0.1)
+        self._reader = reader
+
+        if self.trading:
+            await self.trading.connect()
+            self.instruments = self.trading.instruments
+
+        self._active = True
+        self._task = asyncio.create_task(self._poll_loop())
+        self.logger.info(f"Attached to shm://{self.ring_name} (capacity={reader.capacity})")
+
+    async def close(self) -> None:
+        self._active = False
+        if self._task:
+            self._task.cancel()
+        if self.trading:
+            await self.trading.close()
+        if self._reader:
+            self._reader.close()
+            self._reader = None
+        self.logger.info("Shm Adapter Closed")
+
+    async def subscribe(self, symbols: List[str]) -> None:
+        """行情订阅只是本地过滤 (网关已订阅)，同时打开交易通道的私有订阅"""
+        self._symbols.update(symbols)
+        for symbol in symbols:
+            self._wanted.bind(self.instruments.intern(symbol), 1)
+        if self.trading:
+            await self.trading.subscribe(symbols)
+
+    async def _poll_loop(self):
+        reader = self._reader
+        put = self.event_engine.put
+        wanted = self._wanted
+        overruns = 0
+        loop = asyncio.get_running_loop()
+        last_tick = last_check = loop.time()
+        stale = False
+        while self._active:
+            ticks = reader.poll()
+            if not ticks:
+                now = loop.time()
+                if now - last_check >= self.reattach_interval:
+                    last_check = now
+                    if reader.reattach():
+                        self.logger.warning(f"Tick ring recreated (gateway restarted), re-attached: shm://{self.ring_name}")
+                        overruns = reader.overruns
+                        put(Event(EventType.RECOVERY, None))
+                        continue
+                if not stale and now - last_tick > self.stale_timeout:
+                    stale = True
+                    self.logger.warning(f"Tick ring stalled: no new ticks for {now - last_tick:.0f}s (head={reader.head})")
+            else:
+                last_tick = loop.time()
+                if stale:
+                    stale = False
+                    self.logger.info("Tick ring resumed")
+            intern = self.instruments.intern
+            for tick in ticks:
+                tick.instrument_id = iid = intern(tick.symbol)
+                if wanted.get(iid) > 0:
+                    put(Event(EventType.TICK, tick))
+            if reader.overruns != overruns:
+                self.logger.warning(f"Tick ring overrun: {reader.overruns - overruns} ticks dropped")
+                overruns = reader.overruns
+            if not ticks:
+                await asyncio.sleep(self.poll_interval)
+            else:
+                # 让出执行权，避免行情洪峰饿死其他任务
+                await asyncio.sleep(0)
+
+    # --- 交易接口 (委托) ---
+
+    def _require_trading(self) -> BaseExchange:
+        if self.trading is None:
+            raise RuntimeError("ShmExchangeAdapter has no trading exchange configured")
+        return self.trading
+
+    async def check_login(self) -> bool:
+        return await self.trading.check_login() if self.trading else True
+
+    async def init_leverage(self, symbol: str, leverage: int) -> None:
+        if self.trading:
+            await self.trading.init_leverage(symbol, leverage)
+
+    async def send_order(self, req: OrderRequest) -> str:
+        return await self._require_trading().send_order(req)
+
+    async def send_orders(self, reqs: List[OrderRequest]) -> List[str]:
+        return await self._require_trading().send_orders(reqs)
+
+    async def cancel_order(self, order_id: str, symbol: str) -> None:
+        await self._require_trading().cancel_order(order_id, symbol)
+
+    async def query_position(self, symbols: Optional[List[str]] = None) -> List[PositionData]:
+        return await self._require_trading().query_position(symbols)
+
+    async def query_open_orders(self, symbols: Optional[List[str]] = None) -> List[OrderData]:
+        return await self._require_trading().query_open_orders(symbols)
+
+    async def query_bars(self, symbol: str, timeframe: str, limit: int = 100) -> List[BarData]:
+        if not self.trading:
+            return []
+        return await self.trading.query_bars(symbol, timeframe, limit)
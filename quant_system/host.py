@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from quant_system.core.bar import BarAggregator
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.checkpoint import Checkpoint
+from quant_system.core.journal import Journal
+from quant_system.core.risk import RiskEngine
+from quant_system.core.signal import SignalRegistry, SignalView
+from quant_system.exchange.base import BaseExchange
+from quant_system.exchange.factory import create_exchange
+from quant_system.strategy.base import BaseStrategy
+from quant_system.strategy.registry import STRATEGIES
+from quant_system.utils.config import ConfigLoader
+
+# 行情源不需要的私有字段
+_CREDENTIAL_KEYS = ("api_key", "secret", "passphrase")
+
+class MarketDataHub:
+    """
+    共享行情中心 (Market Data Fan-out)
+    进程内唯一持有公共行情连接的组件: 每个 symbol 只订阅一次，
+    Tick 按 symbol 转发到订阅了它的账户事件引擎。
+    共享指标注册表 (signals) 挂在行情引擎上，所有账户的策略共用同一份指标计算，
+    本 tick 的指标值随转发的 Tick 一起送到账户引擎 (账户引擎晚于行情引擎处理同一个 tick);
+    K 线 (bars) 同样只在行情引擎上合成一次，收盘的 BAR 按 symbol 像 Tick 一样转发到各账户引擎。
+    """
+    def __init__(self, config: Dict[str, Any]):
+        self.engine = EventEngine()
+        conf = {k: v for k, v in config.items() if k not in _CREDENTIAL_KEYS}
+        conf["market_data"] = True
+        self.exchange = create_exchange(self.engine, conf)
+        self.signals = SignalRegistry.for_engine(self.engine)
+        self.bars = BarAggregator.for_engine(self.engine, self.exchange)
+        self.logger = logging.getLogger("MarketDataHub")
+
+        # symbol -> 订阅该 symbol 的账户引擎
+        self._routes: Dict[str, List[EventEngine]] = defaultdict(list)
+        self._subscribers: List[EventEngine] = []
+
+    def add(self, engine: EventEngine, symbols: List[str]) -> None:
+        """登记一个账户引擎对一组 symbol 的订阅"""
+        if engine not in self._subscribers:
+            self._subscribers.append(engine)
+        for s in symbols:
+            if not self._routes[s]:
+                # 按 symbol 订阅: 排在指标注册表 (全量订阅者) 之后，转发时本 tick 的指标已求值
+                self.engine.register(EventType.TICK, self._on_tick, s)
+            if engine not in self._routes[s]:
+                self._routes[s].append(engine)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._routes)
+
+    async def start(self) -> None:
+        """启动行情引擎并连接行情源 (加载合约元数据)"""
+        self.engine.start()
+        self.engine.register(EventType.BAR, self._on_bar)
+        self.engine.register(EventType.RECOVERY, self._on_recovery)
+        await self.exchange.connect()
+
+    async def subscribe(self) -> None:
+        """按已登记的 symbols 并集订阅行情"""
+        self.logger.info(f"Subscribing {len(self._routes)} symbols for {len(self._subscribers)} accounts")
+        await self.exchange.subscribe(self.symbols)
+
+    async def stop(self) -> None:
+        await self.exchange.close()
+        self.engine.stop()
+
+    def _on_tick(self, event: Event) -> None:
+        tick = event.data
+        frame = self.signals.frame(tick.symbol)
+        if frame is not None:
+            event = Event(EventType.TICK, tick, frame)
+        for engine in self._routes.get(tick.symbol, ()):
+            engine.put(event)
+
+    def _on_bar(self, event: Event) -> None:
+        for engine in self._routes.get(event.data.symbol, ()):
+            engine.put(event)
+
+    def _on_recovery(self, event: Event) -> None:
+        # 行情连接恢复: 各账户都可能漏掉回报，统一触发对账 (对账器自带防抖)
+        for engine in self._subscribers:
+            engine.put(event)
+
+@dataclass
+class AccountRuntime:
+    """单个账户在宿主进程中的运行时"""
+    name: str
+    config: Dict[str, Any]
+    engine: EventEngine
+    exchange: BaseExchange
+    strategies: List[BaseStrategy] = field(default_factory=list)
+    strategy_configs: List[Dict[str, Any]] = field(default_factory=list)
+    risk: Optional[RiskEngine] = None
+    signal_view: Optional[SignalView] = None
+
+class TradingHost:
+    """
+    多账户 / 多策略宿主 (Host Mode)
+    一个进程、一个事件循环运行 config.json 中的多个账户:
+    - 每个账户一个 EventEngine (私有订单流互相隔离)，共用同一个 Loop
+    - 行情由 MarketDataHub 统一订阅后扇出，连接数与 symbol 数相关而与账户数无关
+    - 合约元数据只加载一次，所有账户共享
+    """
+    def __init__(self, config: Dict[str, Any], accounts: Optional[List[str]] = None):
+        self.full_config = config
+        self.system_config = config.get("system", {})
+        self.logger = logging.getLogger("Host")
+
+        all_accounts = config.get("accounts", {})
+        names = accounts or list(all_accounts)
+        missing = [n for n in names if n not in all_accounts]
+        if missing:
+            raise ValueError(f"Accounts not found in config: {missing}")
+
+        # 1. 共享行情源 (默认使用首个账户的交易所配置，去掉密钥)
+        md_conf = self.system_config.get("market_data") or all_accounts[names[0]]["exchange"]
+        self.hub = MarketDataHub(md_conf)
+
+        # 2. 账户运行时
+        self.accounts: List[AccountRuntime] = []
+        for name in names:
+            acc_conf = all_accounts[name]
+            engine = EventEngine()
+            exchange = create_exchange(engine, dict(acc_conf["exchange"], market_data=False))
+            runtime = AccountRuntime(name=name, config=acc_conf, engine=engine, exchange=exchange,
+                                     signal_view=SignalView(engine))
+            if acc_conf.get("risk"):
+                runtime.risk = RiskEngine(acc_conf["risk"])
+
+            for i, strat_conf in enumerate(acc_conf.get("strategies") or [acc_conf["strategy"]]):
+                strat_cls = STRATEGIES.get(strat_conf["name"])
+                strategy = strat_cls(engine, exchange, strat_conf["symbols"])
+                strategy.risk = runtime.risk
+                strategy.signal_registry = self.hub.signals
+                strategy.signal_view = runtime.signal_view
+                strategy.bars = self.hub.bars
+                strategy.journal = Journal.from_config(self.system_config, f"{name}.{i}.{strat_conf['name']}")
+                strategy.checkpoint = Checkpoint.from_config(self.system_config, f"{name}.{i}.{strat_conf['name']}")
+                runtime.strategies.append(strategy)
+                runtime.strategy_configs.append(strat_conf)
+
+            self.accounts.append(runtime)
+
+        self.is_running = True
+
+    @classmethod
+    def from_file(cls, config_path: str, accounts: Optional[List[str]] = None) -> "TradingHost":
+        return cls(ConfigLoader(config_path).load(), accounts)
+
+    async def start(self) -> None:
+        """启动顺序: 日志恢复 -> 行情源 (加载元数据) -> 各账户连接 -> 策略 -> 统一订阅行情"""
+        self.logger.info(f">>> Starting TWS Host: {len(self.accounts)} accounts <<<")
+        # 先由日志重建所有策略状态，再连接交易所
+        for acc in self.accounts:
+            for strategy in acc.strategies:
+                if strategy.journal:
+                    strategy.restore_from_journal()
+
+        await self.hub.start()
+
+        for acc in self.accounts:
+            acc.engine.start()
+            acc.exchange.share_instruments(self.hub.exchange)
+            await acc.exchange.connect()
+            if not await acc.exchange.check_login():
+                raise RuntimeError(f"Exchange Login Failed for account {acc.name}")
+
+            for strategy, strat_conf in zip(acc.strategies, acc.strategy_configs):
+                leverage = strat_conf.get("parameters", {}).get("leverage", 10)
+                for s in strategy.symbols:
+                    await acc.exchange.init_leverage(s, leverage)
+
+                await strategy.start()
+                self.hub.add(acc.engine, strategy.symbols)
+
+            self.logger.info(f"Account {acc.name} started with {len(acc.strategies)} strategies")
+
+        await self.hub.subscribe()
+
+    async def run(self) -> None:
+        """Main Loop"""
+        try:
+            await self.start()
+        except Exception as e:
+            self.logger.critical(f"Initialization Failed: {e}")
+            sys.exit(1)
+
+        while self.is_running:
+            await asyncio.sleep(1)
+
+        await self.shutdown()
+
+    async def shutdown(self) -> None:
+        self.logger.info("Shutting down host...")
+        for acc in self.accounts:
+            for strategy in acc.strategies:
+                await strategy.stop()
+                if strategy.journal:
+                    strategy.journal.close()
+            self.logger.info(f"Order Stream Stats [{acc.name}]: {acc.exchange.order_stream_stats()}")
+            await acc.exchange.close()
+            acc.engine.stop()
+            if acc.risk:
+                self.logger.info(f"Risk Stats [{acc.name}]: {acc.risk.stats()}")
+        await self.hub.stop()
+        self.logger.info("Host Shutdown Complete.")
+
+    def stop_signal(self) -> None:
+        self.is_running = False
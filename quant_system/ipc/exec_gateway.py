@@ -0,0 +1,242 @@
+import argparse
+import asyncio
+import logging
+import os
+import signal
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.types import OrderData, TradeData
+from quant_system.exchange.factory import create_exchange
+from quant_system.ipc import protocol as P
+from quant_system.ipc.protocol import MsgType, Packer, Unpacker
+from quant_system.utils.config import ConfigLoader
+from quant_system.utils.logger import setup_logging
+from quant_system.utils.loop import run as run_loop
+
+class _Client:
+    """一个策略进程的连接"""
+    __slots__ = ("writer", "symbols", "peer")
+
+    def __init__(self, writer: asyncio.StreamWriter, peer: str):
+        self.writer = writer
+        self.symbols: Set[str] = set()
+        self.peer = peer
+
+class ExecutionGateway:
+    """
+    执行网关 (Execution Gateway Process)
+    每个账户一个进程，独占该账户的已认证交易所会话:
+    - 下单/撤单/查询通过本地 Unix Socket 接收 (二进制协议，见 quant_system.ipc.protocol)
+    - 订单回报与逐笔成交按 symbol 推送给订阅了该 symbol 的客户端
+    - 交易所限频由唯一会话统一控制; 多个进程同时发起的相同查询合并为一次请求
+    """
+    def __init__(self, exchange_config: Dict[str, Any], path: str):
+        self.engine = EventEngine()
+        # 默认仅交易; 行情由行情网关提供 (Mock 可显式设置 market_data=True 以自行撮合)
+        self.exchange = create_exchange(self.engine, {"market_data": False, **exchange_config})
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: List[_Client] = []
+        # 进行中的查询: (类型, symbols) -> Future (合并并发的相同查询)
+        self._queries: Dict[tuple, asyncio.Future] = {}
+        self.requests = 0
+        self.is_running = True
+        self.logger = logging.getLogger("ExecGateway")
+
+        self._handlers: Dict[int, Callable[[_Client, Unpacker], Awaitable[tuple]]] = {
+            MsgType.SEND_ORDERS: self._on_send_orders,
+            MsgType.CANCEL: self._on_cancel,
+            MsgType.QUERY_POSITION: self._on_query_position,
+            MsgType.QUERY_ORDERS: self._on_query_orders,
+            MsgType.SUBSCRIBE: self._on_subscribe,
+            MsgType.INSTRUMENTS: self._on_instruments,
+            MsgType.LEVERAGE: self._on_leverage,
+        }
+
+    async def start(self) -> None:
+        self.engine.start()
+        self.engine.register(EventType.ORDER_STATUS, self._on_order_status)
+        self.engine.register(EventType.TRADE, self._on_trade)
+        self.engine.register(EventType.RECOVERY, self._on_recovery)
+        await self.exchange.connect()
+        if not await self.exchange.check_login():
+            raise RuntimeError("Exchange Login Failed")
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.path)
+        self.logger.info(f"Execution gateway listening on {self.path}")
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for client in list(self._clients):
+            client.writer.close()
+        await self.exchange.close()
+        self.engine.stop()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.logger.info(f"Execution gateway stopped. Requests: {self.requests}")
+
+    async def run(self) -> None:
+        await self.start()
+        try:
+            while self.is_running:
+                await asyncio.sleep(1)
+        finally:
+            await self.stop()
+
+    def stop_signal(self) -> None:
+        self.is_running = False
+
+    # --- 连接处理 ---
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = _Client(writer, str(writer.get_extra_info("peername") or id(writer)))
+        self._clients.append(client)
+        self.logger.info(f"Client connected: {client.peer}")
+        try:
+            while True:
+                msg_type, req_id, body = await P.read_frame(reader)
+                self.requests += 1
+                # 每个请求独立执行，响应以 req_id 关联 (允许流水线)
+                asyncio.create_task(self._dispatch(client, msg_type, req_id, body))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._clients.remove(client)
+            writer.close()
+            self.logger.info(f"Client disconnected: {client.peer}")
+
+    async def _dispatch(self, client: _Client, msg_type: int, req_id: int, body: bytes) -> None:
+        handler = self._handlers.get(msg_type)
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown message type: {msg_type}")
+            resp_type, resp_body = await handler(client, Unpacker(body))
+        except Exception as e:
+            self.logger.error(f"Request {msg_type} failed: {e}")
+            p = Packer()
+            p.text(str(e)[:255])
+            resp_type, resp_body = MsgType.ERROR, bytes(p.buf)
+        if not client.writer.is_closing():
+            client.writer.write(P.frame(resp_type, req_id, resp_body))
+
+    async def _coalesce(self, key: tuple, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """相同查询进行中时复用其结果"""
+        fut = self._queries.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(factory())
+            self._queries[key] = fut
+            fut.add_done_callback(lambda _: self._queries.pop(key, None))
+        return await asyncio.shield(fut)
+
+    # --- 请求处理: 返回 (响应类型, 响应体) ---
+
+    async def _on_send_orders(self, client: _Client, u: Unpacker) -> tuple:
+        reqs = P.unpack_list(u, P.unpack_request)
+        client.symbols.update(r.symbol for r in reqs)
+        ids = await self.exchange.send_orders(reqs)
+        p = Packer()
+        P.pack_strs(p, [i or "" for i in ids])
+        return MsgType.ORDER_IDS, bytes(p.buf)
+
+    async def _on_cancel(self, client: _Client, u: Unpacker) -> tuple:
+        order_id, symbol = u.text(), u.text()
+        await self.exchange.cancel_order(order_id, symbol)
+        return MsgType.OK, b""
+
+    async def _on_query_position(self, client: _Client, u: Unpacker) -> tuple:
+        symbols = P.unpack_strs(u) or None
+        key = (MsgType.QUERY_POSITION, tuple(sorted(symbols)) if symbols else None)
+        positions = await self._coalesce(key, lambda: self.exchange.query_position(symbols))
+        p = Packer()
+        P.pack_list(p, positions, P.pack_position)
+        return MsgType.POSITIONS, bytes(p.buf)
+
+    async def _on_query_orders(self, client: _Client, u: Unpacker) -> tuple:
+        symbols = P.unpack_strs(u) or None
+        key = (MsgType.QUERY_ORDERS, tuple(sorted(symbols)) if symbols else None)
+        orders = await self._coalesce(key, lambda: self.exchange.query_open_orders(symbols))
+        p = Packer()
+        P.pack_list(p, orders, P.pack_order)
+        return MsgType.ORDERS, bytes(p.buf)
+
+    async def _on_subscribe(self, client: _Client, u: Unpacker) -> tuple:
+        symbols = P.unpack_strs(u)
+        client.symbols.update(symbols)
+        await self.exchange.subscribe(symbols)
+        return MsgType.OK, b""
+
+    async def _on_instruments(self, client: _Client, u: Unpacker) -> tuple:
+        symbols = P.unpack_strs(u)
+        instruments = self.exchange.instruments
+        items = [instruments[s] for s in symbols if s in instruments] if symbols else list(instruments.values())
+        p = Packer()
+        P.pack_list(p, items, P.pack_instrument)
+        return MsgType.INSTRUMENT_LIST, bytes(p.buf)
+
+    async def _on_leverage(self, client: _Client, u: Unpacker) -> tuple:
+        symbol, leverage = P.unpack_leverage(u)
+        await self.exchange.init_leverage(symbol, leverage)
+        return MsgType.OK, b""
+
+    # --- 推送 ---
+
+    def _on_order_status(self, event: Event) -> None:
+        order: OrderData = event.data
+        data = None
+        for client in self._clients:
+            if order.symbol in client.symbols and not client.writer.is_closing():
+                if data is None:
+                    p = Packer()
+                    P.pack_order(p, order)
+                    data = P.frame(MsgType.ORDER_UPDATE, 0, bytes(p.buf))
+                client.writer.write(data)
+
+    def _on_trade(self, event: Event) -> None:
+        trade: TradeData = event.data
+        data = None
+        for client in self._clients:
+            if trade.symbol in client.symbols and not client.writer.is_closing():
+                if data is None:
+                    p = Packer()
+                    P.pack_trade(p, trade)
+                    data = P.frame(MsgType.TRADE_UPDATE, 0, bytes(p.buf))
+                client.writer.write(data)
+
+    def _on_recovery(self, event: Event) -> None:
+        data = P.frame(MsgType.RECOVERY, 0)
+        for client in self._clients:
+            if not client.writer.is_closing():
+                client.writer.write(data)
+
+def main():
+    parser = argparse.ArgumentParser(description="TWS Execution Gateway")
+    parser.add_argument("--config", default="config.json", help="Path to config file")
+    parser.add_argument("--account", required=True, help="Account whose exchange session this gateway owns")
+    parser.add_argument("--path", help="Unix socket path (default: /tmp/tws_exec_<account>.sock)")
+    args = parser.parse_args()
+
+    config = ConfigLoader(args.config).load()
+    system_config = config.get("system", {})
+
+    setup_logging(system_config)
+
+    exchange_config = config["accounts"][args.account]["exchange"]
+    gateway = ExecutionGateway(exchange_config, args.path or f"/tmp/tws_exec_{args.account}.sock")
+
+    def handle_sig(sig, frame):
+        print(f"\nReceived Signal {sig}, stopping...")
+        gateway.stop_signal()
+
+    signal.signal(signal.SIGINT, handle_sig)
+    signal.signal(signal.SIGTERM, handle_sig)
+
+    run_loop(gateway.run(), system_config.get("event_loop_policy"))
+
+if __name__ == "__main__":
+    main()
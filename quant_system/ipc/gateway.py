@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import logging
+import signal
+from typing import Any, Dict, List, Optional
+
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.exchange.factory import create_exchange
+from quant_system.ipc.tick_ring import TickRingWriter
+from quant_system.utils.config import ConfigLoader
+from quant_system.utils.logger import setup_logging
+from quant_system.utils.loop import run as run_loop
+
+DEFAULT_RING = "tws_ticks"
+
+def collect_symbols(config: Dict[str, Any]) -> List[str]:
+    """收集配置中所有账户策略的 symbols (去重，保持顺序)"""
+    symbols: List[str] = []
+    for acc in config.get("accounts", {}).values():
+        for strat in acc.get("strategies") or [acc.get("strategy", {})]:
+            for s in strat.get("symbols", []):
+                if s not in symbols:
+                    symbols.append(s)
+    return symbols
+
+class MarketDataGateway:
+    """
+    独立行情网关 (Market Data Gateway Process)
+    整个部署中唯一持有交易所公共行情连接的进程:
+    上游交易所的 TickData 写入共享内存环形缓冲区，
+    各策略进程通过 ShmExchangeAdapter 读取，不再各自建立 WebSocket。
+    """
+    def __init__(self, exchange_config: Dict[str, Any], symbols: List[str],
+                 ring_name: str = DEFAULT_RING, capacity: int = 4096):
+        self.engine = EventEngine()
+        conf = {k: v for k, v in exchange_config.items() if k not in ("api_key", "secret", "passphrase")}
+        conf["market_data"] = True
+        self.exchange = create_exchange(self.engine, conf)
+        self.symbols = symbols
+        self.ring_name = ring_name
+        self.capacity = capacity
+        self.writer: Optional[TickRingWriter] = None
+        self.published = 0
+        self.is_running = True
+        self.logger = logging.getLogger("MdGateway")
+
+    async def start(self) -> None:
+        self.writer = TickRingWriter(self.ring_name, self.capacity)
+        self.engine.start()
+        self.engine.register(EventType.TICK, self._on_tick)
+        await self.exchange.connect()
+        await self.exchange.subscribe(self.symbols)
+        self.logger.info(f"Publishing {len(self.symbols)} symbols to shm://{self.ring_name} (capacity={self.capacity})")
+
+    def _on_tick(self, event: Event) -> None:
+        self.writer.write(event.data)
+        self.published += 1
+
+    async def stop(self) -> None:
+        await self.exchange.close()
+        self.engine.stop()
+        if self.writer:
+            self.writer.close(unlink=True)
+            self.writer = None
+        self.logger.info(f"Gateway stopped. Published: {self.published}")
+
+    async def run(self) -> None:
+        await self.start()
+        try:
+            while self.is_running:
+                await asyncio.sleep(1)
+        finally:
+            await self.stop()
+
+    def stop_signal(self) -> None:
+        self.is_running = False
+
+def main():
+    parser = argparse.ArgumentParser(description="TWS Market Data Gateway")
+    parser.add_argument("--config", default="config.json", help="Path to config file")
+    parser.add_argument("--ring", default=DEFAULT_RING, help="Shared memory ring name")
+    parser.add_argument("--capacity", type=int, default=4096, help="Ring capacity (power of 2)")
+    parser.add_argument("--symbols", nargs="*", help="Symbols to publish (default: all strategy symbols in config)")
+    args = parser.parse_args()
+
+    config = ConfigLoader(args.config).load()
+    system_config = config.get("system", {})
+    md_conf = system_config.get("market_data") or next(iter(config["accounts"].values()))["exchange"]
+
+    setup_logging(system_config)
+
+    gateway = MarketDataGateway(md_conf, args.symbols or collect_symbols(config), args.ring, args.capacity)
+
+    def handle_sig(sig, frame):
+        print(f"\nReceived Signal {sig}, stopping...")
+        gateway.stop_signal()
+
+    signal.signal(signal.SIGINT, handle_sig)
+    signal.signal(signal.SIGTERM, handle_sig)
+
+    run_loop(gateway.run(), system_config.get("event_loop_policy"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import asyncio
+import struct
+from typing import Any, List, Tuple
+
+from quant_system.core.types import (
+    Direction, Offset, OrderType, OrderStatus, Exchange, ProductType,
+    OrderRequest, OrderData, TradeData, PositionData, Instrument
+)
+
+class MsgType:
+    """
+    执行网关消息类型 (1 字节)
+    请求/响应共用 req_id 关联; 推送消息 req_id = 0
+    """
+    # 客户端 -> 网关
+    SEND_ORDERS = 1      # [OrderRequest] -> ORDER_IDS
+    CANCEL = 2           # (order_id, symbol) -> OK
+    QUERY_POSITION = 3   # [symbol] -> POSITIONS
+    QUERY_ORDERS = 4     # [symbol] -> ORDERS
+    SUBSCRIBE = 5        # [symbol] -> OK
+    INSTRUMENTS = 6      # () -> INSTRUMENT_LIST
+    LEVERAGE = 7         # (symbol, leverage) -> OK
+
+    # 网关 -> 客户端 (响应)
+    OK = 64
+    ERROR = 65           # (message)
+    ORDER_IDS = 66
+    POSITIONS = 67
+    ORDERS = 68
+    INSTRUMENT_LIST = 69
+
+    # 网关 -> 客户端 (推送)
+    ORDER_UPDATE = 128   # OrderData
+    RECOVERY = 129
+    TRADE_UPDATE = 130   # TradeData
+
+# 帧头: 长度 (不含帧头) | 消息类型 | req_id
+FRAME = struct.Struct("<IBI")
+
+# 枚举 <-> 1 字节编码
+def _codes(enum_cls) -> Tuple[dict, list]:
+    members = list(enum_cls)
+    return {m: i for i, m in enumerate(members)}, members
+
+_DIR, _DIR_R = _codes(Direction)
+_OFF, _OFF_R = _codes(Offset)
+_TYPE, _TYPE_R = _codes(OrderType)
+_STATUS, _STATUS_R = _codes(OrderStatus)
+_EXCH, _EXCH_R = _codes(Exchange)
+_PROD, _PROD_R = _codes(ProductType)
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_REQ_BODY = struct.Struct("<BBBBdd")           # exchange, direction, type, offset, volume, price
+_ORDER_BODY = struct.Struct("<BBBBBddddd")     # exchange, direction, offset, type, status, price, volume, traded, timestamp, avg_price
+_TRADE_BODY = struct.Struct("<BBBdddd")        # exchange, direction, offset, price, volume, timestamp, fee
+_POS_BODY = struct.Struct("<BBdddd")           # exchange, direction, volume, price, pnl, frozen
+_INST_BODY = struct.Struct("<BBdddd")          # exchange, product_type, contract_size, price_tick, min_volume, volume_tick
+_LEVERAGE = struct.Struct("<I")
+
+class Packer:
+    """顺序写入的二进制缓冲"""
+    __slots__ = ("buf",)
+
+    def __init__(self):
+        self.buf = bytearray()
+
+    def text(self, value: str) -> None:
+        data = value.encode()
+        if len(data) > 255:
+            raise ValueError(f"String too long for protocol: {value[:32]}...")
+        self.buf += _U8.pack(len(data))
+        self.buf += data
+
+    def u16(self, value: int) -> None:
+        self.buf += _U16.pack(value)
+
+    def raw(self, st: struct.Struct, *values) -> None:
+        self.buf += st.pack(*values)
+
+class Unpacker:
+    """顺序读取的二进制缓冲"""
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, buf: bytes):
+        self.buf = buf
+        self.pos = 0
+
+    def text(self) -> str:
+        n = self.buf[self.pos]
+        start = self.pos + 1
+        self.pos = start + n
+        return self.buf[start:self.pos].decode()
+
+    def u16(self) -> int:
+        value = _U16.unpack_from(self.buf, self.pos)[0]
+        self.pos += 2
+        return value
+
+    def raw(self, st: struct.Struct) -> tuple:
+        values = st.unpack_from(self.buf, self.pos)
+        self.pos += st.size
+        return values
+
+# --- 对象编码 ---
+
+def pack_request(p: Packer, req: OrderRequest) -> None:
+    p.text(req.symbol)
+    p.text(req.client_order_id)
+    p.raw(_REQ_BODY, _EXCH[req.exchange], _DIR[req.direction], _TYPE[req.type], _OFF[req.offset],
+          req.volume, req.price)
+
+def unpack_request(u: Unpacker) -> OrderRequest:
+    symbol = u.text()
+    client_order_id = u.text()
+    exch, direction, otype, offset, volume, price = u.raw(_REQ_BODY)
+    return OrderRequest(
+        symbol=symbol, exchange=_EXCH_R[exch], direction=_DIR_R[direction], type=_TYPE_R[otype],
+        volume=volume, price=price, offset=_OFF_R[offset], client_order_id=client_order_id
+    )
+
+def pack_order(p: Packer, o: OrderData) -> None:
+    p.text(o.symbol)
+    p.text(o.order_id)
+    p.text(o.exchange_order_id or "")
+    p.raw(_ORDER_BODY, _EXCH[o.exchange], _DIR[o.direction], _OFF[o.offset], _TYPE[o.type], _STATUS[o.status],
+          o.price, o.volume, o.traded, o.timestamp, o.avg_price)
+
+def unpack_order(u: Unpacker) -> OrderData:
+    symbol = u.text()
+    order_id = u.text()
+    exchange_order_id = u.text()
+    exch, direction, offset, otype, status, price, volume, traded, ts, avg_price = u.raw(_ORDER_BODY)
+    return OrderData(
+        symbol=symbol, exchange=_EXCH_R[exch], order_id=order_id, exchange_order_id=exchange_order_id,
+        direction=_DIR_R[direction], offset=_OFF_R[offset], type=_TYPE_R[otype],
+        price=price, volume=volume, traded=traded, status=_STATUS_R[status], timestamp=ts, avg_price=avg_price
+    )
+
+def pack_trade(p: Packer, t: TradeData) -> None:
+    p.text(t.symbol)
+    p.text(t.order_id)
+    p.text(t.trade_id)
+    p.text(t.fee_currency)
+    p.raw(_TRADE_BODY, _EXCH[t.exchange], _DIR[t.direction], _OFF[t.offset], t.price, t.volume, t.timestamp, t.fee)
+
+def unpack_trade(u: Unpacker) -> TradeData:
+    symbol = u.text()
+    order_id = u.text()
+    trade_id = u.text()
+    fee_currency = u.text()
+    exch, direction, offset, price, volume, ts, fee = u.raw(_TRADE_BODY)
+    return TradeData(
+        symbol=symbol, exchange=_EXCH_R[exch], order_id=order_id, trade_id=trade_id,
+        direction=_DIR_R[direction], offset=_OFF_R[offset], price=price, volume=volume, timestamp=ts,
+        fee=fee, fee_currency=fee_currency
+    )
+
+def pack_position(p: Packer, pos: PositionData) -> None:
+    p.text(pos.symbol)
+    p.raw(_POS_BODY, _EXCH[pos.exchange], _DIR[pos.direction], pos.volume, pos.price, pos.pnl, pos.frozen)
+
+def unpack_position(u: Unpacker) -> PositionData:
+    symbol = u.text()
+    exch, direction, volume, price, pnl, frozen = u.raw(_POS_BODY)
+    return PositionData(
+        symbol=symbol, exchange=_EXCH_R[exch], direction=_DIR_R[direction],
+        volume=volume, price=price, pnl=pnl, frozen=frozen
+    )
+
+def pack_instrument(p: Packer, inst: Instrument) -> None:
+    p.text(inst.symbol)
+    p.raw(_INST_BODY, _EXCH[inst.exchange], _PROD[inst.product_type],
+          inst.contract_size, inst.price_tick, inst.min_volume, inst.volume_tick)
+
+def unpack_instrument(u: Unpacker) -> Instrument:
+    symbol = u.text()
+    exch, product, contract_size, price_tick, min_volume, volume_tick = u.raw(_INST_BODY)
+    return Instrument(
+        symbol=symbol, exchange=_EXCH_R[exch], product_type=_PROD_R[product],
+        contract_size=contract_size, price_tick=price_tick, min_volume=min_volume, volume_tick=volume_tick
+    )
+
+def pack_list(p: Packer, items: List[Any], pack_item) -> None:
+    p.u16(len(items))
+    for item in items:
+        pack_item(p, item)
+
+def unpack_list(u: Unpacker, unpack_item) -> list:
+    return [unpack_item(u) for _ in range(u.u16())]
+
+def pack_strs(p: Packer, items: List[str]) -> None:
+    pack_list(p, items, Packer.text)
+
+def unpack_strs(u: Unpacker) -> List[str]:
+    return unpack_list(u, Unpacker.text)
+
+def pack_leverage(p: Packer, symbol: str, leverage: int) -> None:
+    p.text(symbol)
+    p.raw(_LEVERAGE, leverage)
+
+def unpack_leverage(u: Unpacker) -> Tuple[str, int]:
+    return u.text(), u.raw(_LEVERAGE)[0]
+
+# --- 帧 ---
+
+def frame(msg_type: int, req_id: int, body: bytes = b"") -> bytes:
+    return FRAME.pack(len(body), msg_type, req_id) + body
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, int, bytes]:
+    """读取一帧: (msg_type, req_id, body)，连接关闭时抛出 IncompleteReadError"""
+    header = await reader.readexactly(FRAME.size)
+    length, msg_type, req_id = FRAME.unpack(header)
+    body = await reader.readexactly(length) if length else b""
+    return msg_type, req_id, body
@@ -0,0 +1,212 @@
+import logging
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+from quant_system.core.types import Exchange, TickData
+
+# 头部: magic | version | capacity | record_size | head (已写入总条数) | generation (写端创建时间, ns)
+_HEADER = struct.Struct("<4sIQQQQ")
+_HEADER_SIZE = 64 # 对齐到 cache line，head 单独占用
+_HEAD_OFFSET = 24
+_GEN_OFFSET = 32
+_MAGIC = b"TWSR"
+_VERSION = 2
+
+# 记录: seq | symbol | exchange | timestamp, last, volume, bid1, ask1, funding
+_RECORD = struct.Struct("<Q32s8s6d")
+_SEQ = struct.Struct("<Q")
+_U64 = struct.Struct("<Q")
+
+SYMBOL_WIDTH = 32
+
+logger = logging.getLogger("TickRing")
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    只读方附加到已存在的共享内存
+    Python < 3.13 的 resource_tracker 会在附加方退出时 unlink 共享内存，需要手动注销
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+class TickRingWriter:
+    """
+    行情共享内存环形缓冲区 (写端, 单写者)
+
+    布局: 64 字节头部 + capacity 条定长记录 (96 字节)。
+    每条记录带序号 (seqlock): 写入前置为奇数 2n+1，写完置为偶数 2n+2，
+    读端据此判断记录是否完整、是否已被覆盖，无需任何锁。
+    写端从不等待读端: 读端落后超过 capacity 时自动跳到最新位置 (丢弃旧行情)。
+
+    同名共享内存已存在 (上次写端崩溃未清理) 时将其删除后重建; 每次创建写入新的 generation，
+    读端据此发现写端已重启并重新附加 (见 TickRingReader.reattach)。
+    """
+    def __init__(self, name: str, capacity: int = 4096):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError(f"capacity must be a power of 2: {capacity}")
+        self.name = name
+        self.capacity = capacity
+        self._mask = capacity - 1
+        size = _HEADER_SIZE + capacity * _RECORD.size
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.unlink()
+            stale.close()
+            logger.warning(f"Removed stale tick ring: {name}")
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._buf = self._shm.buf
+        self.generation = time.time_ns()
+        _HEADER.pack_into(self._buf, 0, _MAGIC, _VERSION, capacity, _RECORD.size, 0, self.generation)
+        self._head = 0
+
+    def write(self, tick: TickData) -> int:
+        """写入一条行情，返回其序号"""
+        symbol = tick.symbol.encode()
+        if len(symbol) > SYMBOL_WIDTH:
+            raise ValueError(f"Symbol too long for ring record: {tick.symbol}")
+
+        n = self._head
+        offset = _HEADER_SIZE + (n & self._mask) * _RECORD.size
+        buf = self._buf
+        _SEQ.pack_into(buf, offset, 2 * n + 1)
+        _RECORD.pack_into(
+            buf, offset, 2 * n + 1, symbol, tick.exchange.value.encode(),
+            tick.timestamp, tick.last_price, tick.volume,
+            tick.bid_price_1, tick.ask_price_1, tick.funding_rate
+        )
+        _SEQ.pack_into(buf, offset, 2 * n + 2)
+
+        self._head = n + 1
+        _U64.pack_into(buf, _HEAD_OFFSET, self._head)
+        return n
+
+    def close(self, unlink: bool = True) -> None:
+        self._buf = None
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+
+class TickRingReader:
+    """
+    行情共享内存环形缓冲区 (读端, 任意多个进程)
+    每个读端维护自己的游标，互不影响; 默认从最新位置开始读。
+    写端重启会删除并重建同名共享内存，已附加的读端仍映射旧段 (head 不再前进)，
+    需调用 reattach 切换到新段。
+    """
+    def __init__(self, name: str, from_start: bool = False):
+        self.name = name
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._bind(_attach(name))
+        self._cursor = 0 if from_start else self.head
+        # 被写端覆盖而丢失的记录数
+        self.overruns = 0
+        # 重新附加 (写端重启) 的次数
+        self.reattaches = 0
+        # 定长字段 -> 已解码的 symbol / Exchange (同一合约复用同一个 str 对象，不重复解码)
+        self._names: Dict[bytes, str] = {}
+        self._exchanges: Dict[bytes, Exchange] = {}
+
+    def _bind(self, shm: shared_memory.SharedMemory) -> None:
+        """校验头部并切换到该共享内存段"""
+        magic, version, capacity, record_size, head, generation = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+            shm.close()
+            raise ValueError(f"Incompatible tick ring: {self.name}")
+        if self._shm is not None:
+            self.close()
+        self._shm = shm
+        self._buf = shm.buf
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self.generation = generation
+
+    @property
+    def head(self) -> int:
+        return _U64.unpack_from(self._buf, _HEAD_OFFSET)[0]
+
+    def reattach(self) -> bool:
+        """
+        检查同名共享内存是否已由新的写端重建 (generation 不同)，是则切换过去并从新段起点开始读
+        :return: 是否发生了切换; 共享内存不存在 (写端尚未重启) 或仍是同一段时返回 False
+        """
+        try:
+            shm = _attach(self.name)
+        except FileNotFoundError:
+            return False
+        generation = _U64.unpack_from(shm.buf, _GEN_OFFSET)[0]
+        if generation == self.generation:
+            shm.close()
+            return False
+        self._bind(shm)
+        self._cursor = 0
+        self.reattaches += 1
+        return True
+
+    def poll(self, max_items: int = 1024) -> List[TickData]:
+        """读取游标之后的新行情 (非阻塞)"""
+        ticks: List[TickData] = []
+        buf = self._buf
+        head = self.head
+        n = self._cursor
+        if head < n or _U64.unpack_from(buf, _GEN_OFFSET)[0] != self.generation:
+            # 写端原地重置了同一段 (head 回退 / generation 变化): 从头读取
+            self.generation = _U64.unpack_from(buf, _GEN_OFFSET)[0]
+            self.reattaches += 1
+            n = 0
+        if head - n > self.capacity:
+            self.overruns += head - self.capacity - n
+            n = head - self.capacity
+
+        end = min(head, n + max_items)
+        names, exchanges = self._names, self._exchanges
+        while n < end:
+            offset = _HEADER_SIZE + (n & self._mask) * _RECORD.size
+            expected = 2 * n + 2
+            seq, symbol, exchange, ts, last, volume, bid, ask, funding = _RECORD.unpack_from(buf, offset)
+            if seq != expected or _SEQ.unpack_from(buf, offset)[0] != expected:
+                # 读取期间被覆盖 (读端严重落后): 跳到当前可读的最早位置
+                head = self.head
+                skip_to = max(head - self.capacity + 1, n + 1)
+                self.overruns += skip_to - n
+                n = skip_to
+                end = min(head, n + max_items)
+                continue
+            name = names.get(symbol)
+            if name is None:
+                name = names[symbol] = symbol.rstrip(b"\0").decode()
+            exch = exchanges.get(exchange)
+            if exch is None:
+                exch = exchanges[exchange] = Exchange(exchange.rstrip(b"\0").decode())
+            ticks.append(TickData(
+                symbol=name,
+                exchange=exch,
+                timestamp=ts, last_price=last, volume=volume,
+                bid_price_1=bid, ask_price_1=ask, funding_rate=funding
+            ))
+            n += 1
+
+        self._cursor = n
+        return ticks
+
+    def close(self) -> None:
+        self._buf = None
+        self._shm.close()
+
+def open_reader(name: str, from_start: bool = False) -> Optional[TickRingReader]:
+    """附加到行情环，不存在时返回 None (网关尚未启动)"""
+    try:
+        return TickRingReader(name, from_start)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,253 @@
+"""
+端到端压测 (tws-bench)
+
+完整链路 (TradingHost): 合成行情 (MarketDataGenerator) -> 行情 EventEngine -> 各账户 EventEngine -> N 个策略
+-> 各账户的 MockExchangeAdapter 撮合 -> 回报。每个策略一个账户，订单流互相隔离。
+从 --start-rate 起按 --factor 逐级提高 tick 速率，每级新建一套系统并运行 --step-seconds 秒，
+直到系统跟不上 (排队发散) 为止，报告:
+- 最大可持续吞吐 (tick/s)
+- tick -> 策略 与 tick -> 发单 延迟的 p50 / p99 / p99.9 (从 tick 的计划时间起算，包含排队)
+- CPU 占用与 RSS
+
+一级判定为 "可持续" 须同时满足: 送达速率 >= 目标的 95%，行情源没有因落后而丢弃 tick，tick -> 策略 p99 <= --max-p99-ms。
+单线程事件循环里，过载表现为行情源落后墙钟 (积压在生成侧) 和延迟持续增长，而不一定是事件队列变长，
+因此以延迟与送达率判定，事件队列深度只作为参考输出。
+
+结果以 JSON 输出 (stdout 或 --output)，用于不同版本之间对比; 逐级进度打印到 stderr。
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from typing import Dict, List, Optional
+
+from quant_system.core.types import OrderData, OrderRequest, OrderStatus, TickData
+from quant_system.host import TradingHost
+from quant_system.strategy.base import BaseStrategy
+from quant_system.utils.loop import run as run_loop, select_loop, POLICIES
+
+class LoadStrategy(BaseStrategy):
+    """每个 symbol 每 order_every 个 tick 翻转一次目标仓位 (0 <-> 1)，记录 tick -> 策略 / tick -> 发单 延迟"""
+    order_every: int = 100
+    sample_ticks: bool = False # tick 延迟只需一个策略采样
+
+    def __init__(self, engine, exchange, symbols):
+        super().__init__(engine, exchange, symbols)
+        self._counts = {s: i for i, s in enumerate(symbols)} # 错开各 symbol 的发单时机，避免同一 tick 集中发单
+        self._decided: Dict[str, float] = {} # symbol -> 触发发单的 tick 时间戳
+        self.reset()
+
+    def reset(self):
+        self.ticks = self.orders_sent = self.fills = 0
+        self.tick_latency: List[float] = []
+        self.order_latency: List[float] = []
+
+    def on_tick(self, tick: TickData):
+        self.ticks += 1
+        if self.sample_ticks:
+            self.tick_latency.append(time.time() - tick.timestamp)
+        n = self._counts[tick.symbol] + 1
+        self._counts[tick.symbol] = n
+        if n % self.order_every:
+            return
+        target = 0.0 if self.get_pos(tick.symbol) > 0 else 1.0
+        price = tick.ask_price_1 * 1.01 if target > 0 else tick.bid_price_1 * 0.99
+        self._decided[tick.symbol] = tick.timestamp
+        self.request_target_position(target, tick.symbol, price)
+
+    async def _send_orders(self, reqs: List[OrderRequest]) -> List[str]:
+        now = time.time()
+        for r in reqs:
+            ts = self._decided.pop(r.symbol, None)
+            if ts is not None:
+                self.order_latency.append(now - ts)
+        self.orders_sent += len(reqs)
+        return await super()._send_orders(reqs)
+
+    def on_order_status(self, order: OrderData):
+        if order.status == OrderStatus.FILLED:
+            self.fills += 1
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """延迟样本 (秒) -> 微秒分位数"""
+    if not samples:
+        return {"n": 0}
+    data = sorted(samples)
+    n = len(data)
+
+    def pct(q: float) -> float:
+        return round(data[min(n - 1, int(q * n))] * 1e6, 1)
+
+    return {"n": n, "p50_us": pct(0.50), "p99_us": pct(0.99), "p999_us": pct(0.999), "max_us": round(data[-1] * 1e6, 1)}
+
+def rss_mb() -> float:
+    """当前进程 RSS (MB); 无 /proc 时取峰值 RSS"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+def host_config(rate: float, args: argparse.Namespace) -> Dict:
+    """TradingHost 配置: 一路共享 Mock 行情 (按 rate 推送)，每个策略一个账户 (独立的 EventEngine 与 Mock 交易所)"""
+    symbols = [f"SYM{i}-USDT-SWAP" for i in range(args.symbols)]
+    return {
+        "system": {
+            "market_data": {
+                "name": "mock",
+                "tick_rate": rate,
+                "tick_batch": max(1, int(rate * args.batch_ms / 1000)),
+                "generator": {"seed": args.seed},
+            },
+        },
+        "accounts": {
+            f"load{i}": {
+                "exchange": {"name": "mock", "latency_ms": args.latency_ms},
+                "strategy": {"name": "quant_system.loadtest:LoadStrategy", "symbols": symbols},
+            }
+            for i in range(args.strategies)
+        },
+    }
+
+async def run_step(rate: float, args: argparse.Namespace) -> Dict:
+    """以固定速率运行一级 (每级新建宿主)，返回该级的测量结果"""
+    host = TradingHost(host_config(rate, args))
+    strategies = [s for acc in host.accounts for s in acc.strategies]
+    for s in strategies:
+        s.order_every = args.order_every
+    strategies[0].sample_ticks = True
+    engines = [host.hub.engine] + [acc.engine for acc in host.accounts]
+    market = host.hub.exchange
+    await host.start()
+
+    await asyncio.sleep(args.warmup)
+    for s in strategies:
+        s.reset()
+    dropped = market.ticks_dropped
+    depth: List[int] = []
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    deadline = t0 + args.step_seconds
+    while time.perf_counter() < deadline:
+        depth.append(sum(e.qsize() for e in engines))
+        await asyncio.sleep(0.01)
+    wall = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+    dropped = market.ticks_dropped - dropped
+
+    first = strategies[0]
+    tick_latency = percentiles(first.tick_latency)
+    delivered = first.ticks / wall
+    result = {
+        "target_rate": rate,
+        "delivered_rate": round(delivered, 1),
+        "dropped_ticks": dropped,
+        "dispatches_per_sec": round(sum(s.ticks for s in strategies) / wall, 1),
+        "orders_per_sec": round(sum(s.orders_sent for s in strategies) / wall, 1),
+        "fills_per_sec": round(sum(s.fills for s in strategies) / wall, 1),
+        "tick_to_strategy": tick_latency,
+        "tick_to_order": percentiles([x for s in strategies for x in s.order_latency]),
+        "queue_depth_max": max(depth, default=0),
+        "queue_depth_mean": round(sum(depth) / len(depth), 1) if depth else 0.0,
+        "cpu_percent": round(cpu / wall * 100, 1),
+        "rss_mb": round(rss_mb(), 1),
+    }
+    result["sustained"] = (
+        delivered >= 0.95 * rate and not dropped
+        and tick_latency.get("p99_us", 0.0) <= args.max_p99_ms * 1000
+    )
+    await host.shutdown()
+    return result
+
+async def ramp(args: argparse.Namespace) -> Dict:
+    """逐级提高速率直到不可持续 (或达到 --max-rate)"""
+    steps: List[Dict] = []
+    best: Optional[Dict] = None
+    rate = args.start_rate
+    while rate <= args.max_rate:
+        step = await run_step(rate, args)
+        steps.append(step)
+        print(
+            f"{rate:>10.0f} tick/s -> {step['delivered_rate']:>10.0f} delivered, "
+            f"p99 tick {step['tick_to_strategy'].get('p99_us', 0) / 1000:.2f}ms "
+            f"order {step['tick_to_order'].get('p99_us', 0) / 1000:.2f}ms, "
+            f"cpu {step['cpu_percent']:.0f}% rss {step['rss_mb']:.0f}MB"
+            f"{'' if step['sustained'] else '  SATURATED'}",
+            file=sys.stderr,
+        )
+        if not step["sustained"]:
+            break
+        best = step
+        rate *= args.factor
+    return {
+        "max_sustainable_rate": best["target_rate"] if best else 0.0,
+        "throughput": best["delivered_rate"] if best else 0.0,
+        "tick_to_strategy": best["tick_to_strategy"] if best else {},
+        "tick_to_order": best["tick_to_order"] if best else {},
+        "saturated": bool(steps) and not steps[-1]["sustained"],
+        "steps": steps,
+    }
+
+def _version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("tws-quant")
+    except Exception:
+        return "unknown"
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="tws-bench", description="End-to-end load test: ramp tick rate until saturation")
+    parser.add_argument("--strategies", type=int, default=10, help="Number of strategies (each subscribes all symbols)")
+    parser.add_argument("--symbols", type=int, default=100, help="Number of simulated symbols")
+    parser.add_argument("--start-rate", type=float, default=5000, help="First step tick rate (ticks/s, all symbols)")
+    parser.add_argument("--factor", type=float, default=1.5, help="Rate multiplier between steps")
+    parser.add_argument("--max-rate", type=float, default=1e6, help="Stop ramping above this rate")
+    parser.add_argument("--step-seconds", type=float, default=3.0, help="Measured seconds per step")
+    parser.add_argument("--warmup", type=float, default=0.5, help="Unmeasured seconds at the start of each step")
+    parser.add_argument("--order-every", type=int, default=100, help="Each strategy flips a symbol's target every N ticks")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Mock exchange order latency")
+    parser.add_argument("--batch-ms", type=float, default=1.0, help="Ticks per generator batch, in ms of target rate")
+    parser.add_argument("--max-p99-ms", type=float, default=50.0, help="Tick->strategy p99 above this is saturation")
+    parser.add_argument("--seed", type=int, default=42, help="Market generator seed")
+    parser.add_argument("--policy", default="asyncio", choices=POLICIES, help="Event loop implementation")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file (default: stdout)")
+    return parser
+
+def run(argv: Optional[List[str]] = None) -> Dict:
+    """运行压测并输出 JSON，返回结果"""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    policy, _ = select_loop(args.policy)
+
+    report = {
+        "benchmark": "tws-bench",
+        "version": _version(),
+        "timestamp": time.time(),
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "event_loop": policy,
+        },
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+    }
+    report.update(run_loop(ramp(args), policy))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+def main():
+    run()
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,18 @@ import asyncio
 import signal
 import logging
 import sys
-from typing import Dict, Type
 
 from quant_system.core.event import EventEngine
-from quant_system.exchange.okx_adapter import OkxExchangeAdapter
+from quant_system.core.checkpoint import Checkpoint
+from quant_system.core.journal import Journal
+from quant_system.core.risk import RiskEngine
+from quant_system.exchange.factory import create_exchange
 from quant_system.utils.config import ConfigLoader
-from quant_system.strategy.base import BaseStrategy
+from quant_system.utils.logger import setup_logging
+from quant_system.utils.loop import run as run_loop
 
-# Strategy Registry
-from quant_system.strategy.dynamic_demo import DynamicRebalanceStrategy
-from quant_system.strategy.dual_ma import DualMAStrategy
-
-STRATEGY_MAP: Dict[str, Type[BaseStrategy]] = {
-    "DynamicRebalance": DynamicRebalanceStrategy,
-    "DualMA": DualMAStrategy,
-}
+# Strategy Registry (策略与交易所适配器均按配置名延迟导入)
+from quant_system.strategy.registry import STRATEGIES
 
 import argparse
 
@@ -42,15 +39,15 @@ class TradingSystem:
         
         # 3. Components
         self.event_engine = EventEngine()
-        self.exchange = OkxExchangeAdapter(self.event_engine, self.config['exchange'])
+        self.exchange = create_exchange(self.event_engine, self.config['exchange'])
         
         # 4. Strategy Factory
         strat_conf = self.config['strategy']
         strat_name = strat_conf['name']
-        strat_cls = STRATEGY_MAP.get(strat_name)
-        
-        if not strat_cls:
-            self.logger.error(f"Unknown Strategy: {strat_name}")
+        try:
+            strat_cls = STRATEGIES.get(strat_name)
+        except (ValueError, ImportError) as e:
+            self.logger.error(f"Unknown Strategy: {strat_name} ({e})")
             sys.exit(1)
             
         self.strategy = strat_cls(
@@ -59,27 +56,23 @@ class TradingSystem:
             strat_conf['symbols']
         )
         
+        # 5. Pre-trade Risk (optional, per account)
+        self.risk = None
+        if self.config.get('risk'):
+            self.risk = RiskEngine(self.config['risk'])
+            self.strategy.risk = self.risk
+        
+        # 6. Order/Trade Journal (optional, system.journal_dir)
+        self.journal = Journal.from_config(self.system_config, f"{account_name}.{strat_name}")
+        self.strategy.journal = self.journal
+        # 7. Strategy/Signal Checkpoint (optional, system.checkpoint_dir)
+        self.strategy.checkpoint = Checkpoint.from_config(self.system_config, f"{account_name}.{strat_name}")
+        
         self.is_running = True
 
     def setup_logging(self):
-        from datetime import datetime
-        import os
-        
-        # Ensure logs directory exists
-        log_dir = "logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-
-        log_level = self.system_config.get('log_level', 'INFO')
-        log_filename = f"{log_dir}/TWS_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        
-        logging.basicConfig(
-            level=getattr(logging, log_level.upper()),
-            format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
-            handlers=[
-                logging.FileHandler(log_filename)
-            ]
-        )
+        # 异步日志管线: 事件循环线程只入队，写盘在后台线程完成
+        self.log_pipeline = setup_logging(self.system_config)
 
     async def run(self):
         """Main Loop"""
@@ -88,7 +81,11 @@ class TradingSystem:
         # 1. Start Event Engine
         self.event_engine.start()
         
-        # 2. Connect Exchange
+        # 2. Restore from Journal (before connecting; reconciliation only covers the gap)
+        if self.journal:
+            self.strategy.restore_from_journal()
+        
+        # 3. Connect Exchange
         try:
             await self.exchange.connect()
             
@@ -108,22 +105,29 @@ class TradingSystem:
             self.logger.critical(f"Initialization Failed: {e}")
             sys.exit(1)
 
-        # 3. Start Strategy
+        # 4. Start Strategy
         await self.strategy.start()
         self.logger.info("Strategy Started.")
 
-        # 4. Wait for Shutdown
+        # 5. Wait for Shutdown
         while self.is_running:
             await asyncio.sleep(1)
 
-        # 5. Cleanup
+        # 6. Cleanup
         await self.shutdown()
 
     async def shutdown(self):
         self.logger.info("Shutting down...")
         await self.strategy.stop()
+        if self.journal:
+            self.journal.close()
+            self.logger.info(f"Journal Stats: {self.journal.stats()}")
+        if self.risk:
+            self.logger.info(f"Risk Stats: {self.risk.stats()}")
+        self.logger.info(f"Order Stream Stats: {self.exchange.order_stream_stats()}")
         await self.exchange.close()
         self.event_engine.stop()
+        self.logger.info(f"Logging Stats: {self.log_pipeline.stats()}")
         self.logger.info("Shutdown Complete.")
 
     def stop_signal(self):
@@ -132,11 +136,21 @@ class TradingSystem:
 def main():
     parser = argparse.ArgumentParser(description="TWS Quant System")
     parser.add_argument("--config", default="config.json", help="Path to config file")
-    parser.add_argument("--account", required=True, help="Account ID to run (e.g. account1)")
+    parser.add_argument("--account", action="append", help="Account ID to run (e.g. account1); repeatable with --host")
+    parser.add_argument("--host", action="store_true", help="Run multiple accounts in one process (all accounts if --account is omitted)")
     
     args = parser.parse_args()
 
-    system = TradingSystem(args.config, args.account)
+    if args.host:
+        from quant_system.host import TradingHost
+        config = ConfigLoader(args.config).load()
+        # 先安装日志管线: 宿主构建期间 (交易所/策略初始化) 的日志同样进入配置的输出
+        setup_logging(config.get('system', {}))
+        system = TradingHost(config, args.account)
+    else:
+        if not args.account or len(args.account) != 1:
+            parser.error("exactly one --account is required (use --host for multiple accounts)")
+        system = TradingSystem(args.config, args.account[0])
 
     def handle_sig(sig, frame):
         print(f"\nReceived Signal {sig}, stopping...")
@@ -145,7 +159,7 @@ def main():
     signal.signal(signal.SIGINT, handle_sig)
     signal.signal(signal.SIGTERM, handle_sig)
     
-    asyncio.run(system.run())
+    run_loop(system.run(), system.system_config.get('event_loop_policy'))
 
 if __name__ == "__main__":
     main()
@@ -1,19 +1,44 @@
+import asyncio
 import logging
+import time
+import uuid
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Type, Union
 
+import numpy as np
+
+from quant_system.core.bar import BarAggregator
+from quant_system.core.checkpoint import Checkpoint
 from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.fixed import to_ticks_array, from_ticks_array
+from quant_system.core.journal import Journal, RecordType, order_to_dict, order_from_dict
+from quant_system.core.position import PositionBook
+from quant_system.core.risk import RiskEngine
+from quant_system.core.signal import Indicator, SignalHandle, SignalRegistry, SignalView
+from quant_system.core.state import OrderStateMachine, STATE_CODES
 from quant_system.core.types import (
-    TickData, OrderData, OrderRequest, TradeData,
+    TickData, BarData, OrderData, OrderRequest, TradeData, PositionData,
     Exchange, Direction, Offset, OrderType, OrderStatus
 )
 from quant_system.exchange.base import BaseExchange
+from quant_system.strategy.reconciler import Reconciler
+from quant_system.strategy.warmup import WarmupService
 
 class BaseStrategy(ABC):
     """
     策略抽象基类 (User API)
     原则: 提供极简的接口，隐藏底层 EventQueue 和 Exchange 细节
     """
+    MIN_DIFF = 0.0001 # 小于此值的仓位差额视为误差，不发单
+    # self.orders 中保留的已结束订单数 (终态或对账时已消失)，更早的删除; 快照与重启耗时因此有界
+    max_closed_orders: int = 1000
+
+    # K 线订阅: 周期列表 (如 ("1m", "100t"))，由引擎共享的 BarAggregator 合成，收盘时回调 on_bar
+    bar_timeframes: Tuple[str, ...] = ()
+    bar_backfill: int = 0 # 启动时回填的历史 K 线根数 (仅时间周期，0 为不回填)
+    # 共享指标的启动预热: 用该周期 K 线的收盘价填充尚未就绪的指标 (默认 None 不预热)
+    # 只适用于窗口按该周期定义的指标; 按 tick 数定义的窗口 (如演示用的 DualMA 5/10) 用 K 线收盘价填充会改变其含义
+    warmup_timeframe: Optional[str] = None
     
     def __init__(self, engine: EventEngine, exchange: BaseExchange, symbols: List[str]):
         self.engine = engine
@@ -22,31 +47,138 @@ class BaseStrategy(ABC):
         self.logger = logging.getLogger(self.__class__.__name__)
         
         # 内部状态
-        self.orders: Dict[str, OrderData] = {} # order_id -> Order
+        self.orders: Dict[str, OrderData] = {} # order_id -> Order (活跃 + 最近结束的)
         self.active_orders: Dict[str, OrderData] = {}
+        self._closed: Dict[str, None] = {} # 已结束订单的 order_id (按结束先后)
+        
+        # 持仓簿: 每个 symbol 独立记账 (多/空腿, 均价, 盈亏, 冻结)
+        self.positions = PositionBook(symbols)
+        self.target_pos: Dict[str, float] = {} # symbol -> 目标仓位
+        
+        # 在途订单: 已发出但交易所尚未回报 (计入持仓簿的在途/冻结数量，防止重复发单)
+        self._unacked: Dict[int, OrderRequest] = {}   # id(req) -> req (send_order 尚未返回)
+        self._inflight: Dict[str, OrderRequest] = {}  # order_id -> req (已返回 ID，尚未收到回报)
         
-        self.pos: float = 0.0  # 当前净仓位 (Net Position)
-        self.target_pos: float = 0.0 # 目标仓位
+        # 目标合并: 每个 symbol 只保留最新目标，由一个执行任务串行处理
+        self._pending_targets: Dict[str, Tuple[float, float]] = {}
+        self._exec_tasks: Dict[str, asyncio.Task] = {}
+        
+        self.reconciler: Optional[Reconciler] = None
+        # K 线合成器 (可选，由外部注入; 未注入时按事件引擎共享)
+        self.bars: Optional[BarAggregator] = None
+        # 共享指标注册表 (可选，由外部注入; 未注入时按事件引擎共享)
+        self.signal_registry: Optional[SignalRegistry] = None
+        self.signal_view: Optional[SignalView] = None # 注册表在其它引擎上求值时 (宿主模式) 句柄经账户视图读值
+        self._signal_handles: List[SignalHandle] = []
+        self.risk: Optional[RiskEngine] = None # 事前风控 (可选，由外部注入，可多策略共享)
+        self.journal: Optional[Journal] = None # 订单/成交日志 (可选，由外部注入，每个策略独立)
+        self.checkpoint: Optional[Checkpoint] = None # 策略/指标状态检查点 (可选，由外部注入，每个策略独立)
+        # 记账来源: 交易所推送逐笔成交时按成交明细 (实际成交价) 更新持仓，否则按订单累计成交量的差额
+        self.fill_accounting = exchange.emits_trades
+        self._restored = False
         
         self.logger.info(f"Strategy Initialized for {symbols}")
 
+    @property
+    def pos(self) -> float:
+        """首个 symbol 的净仓位 (单币种策略的便捷写法)"""
+        return self.positions.net(self.symbols[0]) if self.symbols else 0.0
+
+    @pos.setter
+    def pos(self, value: float) -> None:
+        """强制覆盖首个 symbol 的净仓位 (兼容 self.pos = ... 的写法; 各腿持仓均价保持不变)"""
+        symbol = self.symbols[0]
+        book = self.positions
+        idx = book.slot(symbol)
+        book.set_leg(symbol, Direction.LONG, max(value, 0.0), float(book.long_price[idx]))
+        book.set_leg(symbol, Direction.SHORT, max(-value, 0.0), float(book.short_price[idx]))
+
+    def get_pos(self, symbol: str) -> float:
+        """指定 symbol 的净仓位 (Long - Short)"""
+        return self.positions.net(symbol)
+
     async def start(self):
         """
         启动策略
         """
-        self.engine.register(EventType.TICK, self._on_tick_wrapper)
-        self.engine.register(EventType.ORDER_STATUS, self._on_order_status_wrapper)
-        # 注册恢复事件
-        self.engine.register(EventType.RECOVERY, self._on_recovery_wrapper)
+        self.on_init()
+        # 按 symbol 订阅: 总线只把本策略合约的事件分发过来
+        for symbol in self.symbols:
+            self.engine.register(EventType.TICK, self._on_tick_wrapper, symbol)
+            self.engine.register(EventType.ORDER_STATUS, self._on_order_status_wrapper, symbol)
+        if self.journal and not self.journal.is_open:
+            self.restore_from_journal()
+        if self._listens_trades:
+            for symbol in self.symbols:
+                self.engine.register(EventType.TRADE, self._on_trade_wrapper, symbol)
+        # 挂载共享对账器 (由其统一监听恢复事件)
+        self.reconciler = Reconciler.for_exchange(self.engine, self.exchange)
+        self.reconciler.attach(self)
+        if self._restored:
+            # 状态已由日志重建，REST 对账只补齐停机期间的增量
+            self.reconciler.request()
+        
+        # 合约规格写入持仓簿 (下单步长/最小量用于目标仓位执行)
+        registry = self.exchange.instruments
+        for symbol in self.symbols:
+            # 行情/回报带 instrument_id，持仓簿与风控按 ID 下标定位 slot
+            iid = registry.intern(symbol)
+            self.positions.bind_id(symbol, iid)
+            if self.risk:
+                self.risk.bind_id(symbol, iid)
+            inst = registry.get(symbol)
+            if inst:
+                self.positions.set_instrument(inst)
+                if self.risk:
+                    self.risk.set_instrument(inst)
+        if self.risk:
+            self.risk.attach(self.engine)
+
+        # 检查点恢复 (策略状态 + 指标窗口)，之后只为仍未就绪的指标拉取历史预热
+        if self.checkpoint:
+            self._restore_checkpoint()
+        if self.warmup_timeframe and self._signal_handles:
+            await WarmupService(self.exchange, self.warmup_timeframe).warmup(self.signal_registry, self.symbols)
+
+        if self.bar_timeframes:
+            if self.bars is None:
+                self.bars = BarAggregator.for_engine(self.engine, self.exchange)
+            for symbol in self.symbols:
+                self.engine.register(EventType.BAR, self._on_bar_wrapper, symbol)
+                for tf in self.bar_timeframes:
+                    self.bars.acquire(symbol, tf)
+            if self.bar_backfill:
+                await self.bars.backfill(self.exchange, self.bar_backfill)
         
         await self.exchange.subscribe(self.symbols)
         self.on_start()
+        if self.checkpoint:
+            self.checkpoint.start(self.checkpoint_state)
 
     async def stop(self):
         """停止策略"""
-        self.engine.unregister(EventType.TICK, self._on_tick_wrapper)
-        self.engine.unregister(EventType.ORDER_STATUS, self._on_order_status_wrapper)
-        self.engine.unregister(EventType.RECOVERY, self._on_recovery_wrapper)
+        for symbol in self.symbols:
+            self.engine.unregister(EventType.TICK, self._on_tick_wrapper, symbol)
+            self.engine.unregister(EventType.ORDER_STATUS, self._on_order_status_wrapper, symbol)
+            if self._listens_trades:
+                self.engine.unregister(EventType.TRADE, self._on_trade_wrapper, symbol)
+            if self.bar_timeframes and self.bars:
+                self.engine.unregister(EventType.BAR, self._on_bar_wrapper, symbol)
+                for tf in self.bar_timeframes:
+                    self.bars.release(symbol, tf)
+        if self.journal and self.journal.is_open:
+            self.journal.snapshot(self.snapshot_state())
+        if self.reconciler:
+            self.reconciler.detach(self)
+        if self.checkpoint:
+            self.checkpoint.stop(self.checkpoint_state())
+        for handle in self._signal_handles:
+            self.signal_registry.release(handle)
+        self._signal_handles.clear()
+        for task in self._exec_tasks.values():
+            task.cancel()
+        self._exec_tasks.clear()
+        self._pending_targets.clear()
         self.on_stop()
 
     # --- 用户接口 ---
@@ -57,127 +189,395 @@ class BaseStrategy(ABC):
 
     def on_order_status(self, order: OrderData):
         pass
+
+    def on_trade(self, trade: TradeData):
+        """逐笔成交回调 (持仓簿已按该笔成交更新)"""
+        pass
+
+    def on_bar(self, bar: BarData):
+        """K 线收盘回调 (仅 bar_timeframes 中的周期)"""
+        pass
+
+    def use_signal(self, cls: Type[Indicator], symbol: str, *params) -> SignalHandle:
+        """
+        获取共享指标的只读句柄 (同一 (类, 参数, symbol) 在所有策略间只计算一次)
+        行情回调中读取 handle.value 即为本 tick 的值; 策略停止时自动归还
+        """
+        if self.signal_registry is None:
+            self.signal_registry = SignalRegistry.for_engine(self.engine)
+        handle = self.signal_registry.acquire(cls, symbol, *params, view=self.signal_view)
+        self._signal_handles.append(handle)
+        return handle
+
+    def get_bars(self, symbol: str, timeframe: str) -> List[BarData]:
+        """已收盘的 K 线 (含启动时回填的历史，旧 -> 新)"""
+        return self.bars.history(symbol, timeframe) if self.bars else []
     
     async def on_recovery(self):
         """
         [New in 7.4] 灾难恢复钩子
         在系统完成自动对账(持仓/挂单)后触发。
+        同一次重连的多次 RECOVERY 会被防抖合并，这里只触发一次。
         """
         pass
     
+    def on_init(self):
+        """启动时最先调用 (获取共享指标等): 之后才恢复检查点与预热"""
+        pass
+
     def on_start(self):
         pass
+
+    # --- 检查点 (Checkpoint) ---
+
+    def get_state(self) -> Dict:
+        """策略自定义状态 (可 JSON 序列化的独立副本)，写入检查点; 子类按需重写"""
+        return {}
+
+    def set_state(self, state: Dict):
+        """由检查点恢复策略自定义状态 (在订阅行情之前调用)"""
+        pass
+
+    def checkpoint_state(self) -> Dict:
+        """检查点内容: 策略自定义状态 + 本策略 symbols 上的共享指标状态"""
+        signals = self.signal_registry.snapshot(self.symbols) if self._signal_handles else {}
+        return {"strategy": self.get_state(), "signals": signals}
+
+    def _restore_checkpoint(self):
+        snap = self.checkpoint.load()
+        if not snap:
+            return
+        state = snap["state"]
+        self.set_state(state.get("strategy") or {})
+        restored = 0
+        # 过期的指标状态不恢复 (由预热重建)
+        if self._signal_handles and self.checkpoint.is_fresh(snap):
+            restored = self.signal_registry.restore(state.get("signals") or {})
+        self.logger.info(f"Checkpoint Restored: age={time.time() - snap['ts']:.0f}s signals={restored}")
     
     def on_stop(self):
         pass
 
+    # --- 日志恢复 (Journal) ---
+
+    def snapshot_state(self) -> Dict:
+        """导出可持久化的策略状态 (持仓簿各腿 + 订单)，返回独立副本"""
+        book = self.positions
+        positions = {}
+        for sym in book.symbols:
+            idx = book.slot(sym)
+            positions[sym] = [
+                float(book.long_volume[idx]), float(book.long_price[idx]),
+                float(book.short_volume[idx]), float(book.short_price[idx]),
+                float(book.realized_pnl[idx]),
+            ]
+        # self.orders 只含活跃订单与最近 max_closed_orders 个已结束订单，快照大小有界
+        return {
+            "positions": positions,
+            "orders": [order_to_dict(o) for o in self.orders.values()],
+            "active": list(self.active_orders),
+            "target_pos": dict(self.target_pos),
+        }
+
+    def _restore_state(self, state: Dict):
+        """从快照恢复持仓簿与订单，并按活跃挂单重建冻结/在途数量"""
+        book = self.positions
+        for sym, (long_vol, long_price, short_vol, short_price, realized) in state["positions"].items():
+            book.set_leg(sym, Direction.LONG, long_vol, long_price)
+            book.set_leg(sym, Direction.SHORT, short_vol, short_price)
+            book.realized_pnl[book.slot(sym)] = realized
+        self.orders = {d["order_id"]: order_from_dict(d) for d in state["orders"]}
+        self.active_orders = {oid: self.orders[oid] for oid in state["active"] if oid in self.orders}
+        self._closed = {}
+        for oid in [oid for oid in self.orders if oid not in self.active_orders]:
+            self._retire(oid)
+        self.target_pos.update(state.get("target_pos", {}))
+        for sym in book.symbols:
+            book.clear_working(sym)
+        for o in self.active_orders.values():
+            self._track_working(o.symbol, o.direction, o.offset, o.volume - o.traded)
+
+    def restore_from_journal(self) -> int:
+        """
+        由日志重建状态 (快照 + 尾部重放)，并打开日志开始记录
+        应在连接交易所之前调用; start() 时若尚未恢复会自动调用。
+        :return: 重放的记录数
+        """
+        t0 = time.perf_counter()
+        state, records = self.journal.recover()
+        if state:
+            self._restore_state(state)
+
+        # 订单回报批量校验 (非法流转 / 成交量回退的记录不重放)
+        orders = [obj for kind, obj in records if kind == RecordType.ORDER]
+        ids: Dict[str, int] = {}
+        valid = OrderStateMachine.validate_streams(
+            np.fromiter((ids.setdefault(o.order_id, len(ids)) for o in orders), dtype=np.int64, count=len(orders)),
+            np.fromiter((STATE_CODES[o.status] for o in orders), dtype=np.int64, count=len(orders)),
+            np.fromiter((o.traded for o in orders), dtype=np.float64, count=len(orders)),
+        )
+        skipped = len(orders) - int(valid.sum())
+
+        requested = set()
+        i = 0
+        for kind, obj in records:
+            if kind == RecordType.ORDER:
+                if valid[i]:
+                    self._apply_order(obj)
+                i += 1
+            elif kind == RecordType.TRADE:
+                if self.fill_accounting:
+                    self._update_pos(obj, obj.volume)
+            elif kind == RecordType.REQUEST:
+                requested.add(obj[0])
+        # 交易所已接受但没有任何回报落盘的订单: 结果未知，交给对账
+        unknown = len(requested - self.orders.keys())
+
+        self.journal.open()
+        self._restored = bool(state or records)
+        self.logger.info(
+            f"Journal Restored in {(time.perf_counter() - t0) * 1000:.1f}ms: snapshot={state is not None} "
+            f"records={len(records)} active={len(self.active_orders)} unknown={unknown} invalid={skipped}"
+        )
+        return len(records)
+
+    def _journal_snapshot_if_due(self):
+        if self.journal.needs_snapshot:
+            self.journal.snapshot(self.snapshot_state())
+
     # --- 恢复逻辑 (Reconciliation) ---
 
-    async def _on_recovery_wrapper(self, event: Event):
-        """处理恢复事件"""
-        self.logger.warning("Recovery Event Received! Starting Reconciliation...")
-        
+    async def _apply_reconciliation(self, positions: List[PositionData], open_orders: List[OrderData]):
+        """
+        应用对账结果 (由共享 Reconciler 调用)
+        查询结果为所有策略共用，这里只取本策略的 symbols。
+        """
         # 1. 对账持仓
-        await self._reconcile_position()
+        self._reconcile_position(positions)
         
         # 2. 对账挂单
-        await self._reconcile_open_orders()
+        self._reconcile_open_orders(open_orders)
         
         # 3. 用户钩子
         await self.on_recovery()
         self.logger.info("Reconciliation Complete.")
 
-    async def _reconcile_position(self):
-        """强制同步持仓"""
-        active_positions = await self.exchange.query_position()
-        # 筛选本策略关心的
-        net_pos = 0.0
-        for p in active_positions:
-            if p.symbol in self.symbols:
-                # 简单累加 (Hedge Mode: Long - Short)
-                # PositionData has direction, volume
-                if p.direction == Direction.LONG:
-                    net_pos += p.volume
-                elif p.direction == Direction.SHORT:
-                    net_pos -= p.volume
-                    
-        old_pos = self.pos
-        self.pos = net_pos # 强制覆盖
-        if abs(old_pos - net_pos) > 0.0001:
-            self.logger.warning(f"Position Reconciled: Local {old_pos} -> Remote {net_pos}")
-
-    async def _reconcile_open_orders(self):
-        """强制同步挂单"""
-        open_orders = await self.exchange.query_open_orders()
+    def _reconcile_position(self, positions: List[PositionData]):
+        """强制同步持仓 (按 symbol 覆盖持仓簿的多/空腿)"""
+        remote: Dict[str, Dict[Direction, PositionData]] = {s: {} for s in self.symbols}
+        for p in positions:
+            if p.symbol in remote:
+                remote[p.symbol][p.direction] = p
         
-        # 重建 active_orders
-        # 注意: 这里会丢失部分历史订单的本地缓存(prev_traded)，但为了正确性必须重置
-        
-        current_ids = set()
+        for symbol, legs in remote.items():
+            old_pos = self.positions.net(symbol)
+            for leg in (Direction.LONG, Direction.SHORT):
+                p = legs.get(leg)
+                if p:
+                    self.positions.set_leg(symbol, leg, p.volume, p.price)
+                else:
+                    self.positions.set_leg(symbol, leg, 0.0, 0.0)
+            
+            new_pos = self.positions.net(symbol)
+            if abs(old_pos - new_pos) > 0.0001:
+                self.logger.warning(f"Position Reconciled: {symbol} Local {old_pos} -> Remote {new_pos}")
+
+    def _reconcile_open_orders(self, open_orders: List[OrderData]):
+        """
+        增量同步挂单 (Diff)
+        - 远端未变化的订单不做任何改动
+        - 远端有变化/新出现的订单覆盖本地
+        - 本地活跃但远端已消失的订单移出 active_orders，self.orders 中保留最后已知状态 (prev_traded 不丢失)
+        """
+        remote: Dict[str, OrderData] = {}
         for o in open_orders:
             if o.symbol in self.symbols:
-                self.active_orders[o.order_id] = o
-                self.orders[o.order_id] = o # 更新缓存
-                current_ids.add(o.order_id)
+                remote[o.order_id] = o
         
-        # 清理不在列表中的
-        to_remove = []
-        for oid in self.active_orders:
-            if oid not in current_ids:
-                to_remove.append(oid)
+        changed = 0
+        for oid, o in remote.items():
+            local = self.orders.get(oid)
+            if (
+                local is None
+                or local.status != o.status
+                or local.traded != o.traded
+                or local.price != o.price
+                or local.volume != o.volume
+            ):
+                self.orders[oid] = o
+                self.active_orders[oid] = o
+                changed += 1
+            elif oid not in self.active_orders:
+                self.active_orders[oid] = local
+                changed += 1
+            self._closed.pop(oid, None)
         
-        for oid in to_remove:
+        # 清理远端已不存在的
+        vanished = [oid for oid in self.active_orders if oid not in remote]
+        for oid in vanished:
             del self.active_orders[oid]
-            # 标记为未知关闭? 暂时不动 active_orders 以外的 self.orders
-            
-        self.logger.info(f"Open Orders Reconciled. Active: {len(self.active_orders)}")
+            self._retire(oid)
+        
+        # 按当前挂单 + 在途订单重建冻结/在途数量
+        for oid in [oid for oid in self._inflight if oid in self.orders]:
+            del self._inflight[oid]
+        for symbol in self.symbols:
+            self.positions.clear_working(symbol)
+        for o in self.active_orders.values():
+            self._track_working(o.symbol, o.direction, o.offset, o.volume - o.traded)
+        for r in list(self._unacked.values()) + list(self._inflight.values()):
+            self._track_working(r.symbol, r.direction, r.offset, r.volume)
+        
+        self.logger.info(f"Open Orders Reconciled. Active: {len(self.active_orders)} Changed: {changed} Vanished: {len(vanished)}")
 
-    async def set_target_position(self, target: float, symbol: str, price: float):
+    def request_target_position(self, target: float, symbol: str, price: float) -> None:
+        """
+        提交目标仓位 (同步, 供 on_tick 调用)
+        同一 symbol 的多次请求只保留最新一次；每个 symbol 只有一个执行任务，
+        上一轮发单完成后才会处理下一个目标，避免行情驱动下的重复发单。
+        """
+        self._pending_targets[symbol] = (target, price)
+        task = self._exec_tasks.get(symbol)
+        if task is None or task.done():
+            self._exec_tasks[symbol] = asyncio.create_task(self._execution_loop(symbol))
+
+    async def _execution_loop(self, symbol: str):
+        """单 symbol 执行任务: 循环处理最新目标直到没有新请求"""
+        try:
+            while symbol in self._pending_targets:
+                target, price = self._pending_targets.pop(symbol)
+                await self.set_target_positions({symbol: target}, {symbol: price})
+        except Exception as e:
+            self.logger.error(f"Execution failed for {symbol}: {e}", exc_info=True)
+        finally:
+            if self._exec_tasks.get(symbol) is asyncio.current_task():
+                del self._exec_tasks[symbol]
+
+    async def set_target_position(self, target: float, symbol: str, price: float) -> List[str]:
         """
         核心方法: 设置目标仓位
-        由执行逻辑判断如果不一致，发单去追
+        由执行逻辑判断如果不一致，发单去追 (单 symbol 版本的 set_target_positions)
         """
-        self.target_pos = target
-        diff = target - self.pos
-        
-        if abs(diff) < 0.0001: # 忽略微小误差
-            return
+        return await self.set_target_positions({symbol: target}, {symbol: price})
 
-        # 简单的自动执行逻辑 (One Step)
-        # 复杂情况(如反手)需要分两步，这里依赖 tick 驱动下一次
-        
-        direction = Direction.LONG
-        offset = Offset.NONE
-        volume = abs(diff)
-        
-        # 决策逻辑 (假设单币种策略)
-        if self.pos >= 0:
-            if target > self.pos:
-                # 加仓多
-                direction = Direction.LONG
-                offset = Offset.OPEN
-            elif target < self.pos:
-                # 减仓多 or 反手
-                direction = Direction.SHORT
-                offset = Offset.CLOSE # 先平多
-                if target < 0:
-                    volume = self.pos # 仅平掉现有，剩下的反手交给下一次 Check
-        
-        elif self.pos < 0:
-            if target < self.pos:
-                # 加仓空
-                direction = Direction.SHORT
-                offset = Offset.OPEN
-            elif target > self.pos:
-                # 减仓空 or 反手
-                direction = Direction.LONG
-                offset = Offset.CLOSE # 先平空
-                if target > 0:
-                    volume = abs(self.pos)
-        
-        # 执行
-        self.logger.info(f"Rebalance: Pos {self.pos} -> Target {target}. Action: {direction} {offset} {volume}@{price}")
-        await self._send_order(symbol, direction, offset, price, volume)
+    async def set_target_positions(
+        self,
+        targets: Union[Dict[str, float], np.ndarray],
+        prices: Union[Dict[str, float], np.ndarray, None] = None,
+    ) -> List[str]:
+        """
+        组合目标仓位 (Portfolio Target Execution)
+        一次向量化计算所有 symbol 的差额，合并为一个批次发出。
+
+        :param targets: {symbol: 目标净仓位}，或按 self.positions.symbols 顺序排列的数组 (NaN 表示不调整)
+        :param prices: 委托价格 (同上两种形式)；缺省使用最新行情价
+        :return: 已发出订单的 order_id 列表
+        :raises ValueError: targets 含持仓簿之外的 symbol，或数组形状不符 (prices 中多余的 symbol 忽略)
+
+        执行规则 (Hedge Mode, 多空腿分别追目标):
+        - 差额基于 "预期持仓" = 可平持仓 + 在途开仓 (挂单与已发未回报的订单都计入)
+        - 目标 > 0: 多腿追到目标，空腿全部平掉；目标 < 0 反之
+        - 反手在同一周期内拆成 "平仓 + 开仓" 两笔，平仓在前
+        - 需要减仓但可平数量不足 (缺口来自在途开仓) 时，撤掉该腿的开仓挂单
+        - 差额按 Instrument.volume_tick 取整 (平仓腿向零取整，不超过可平数量)，小于 min_volume 的差额丢弃
+        """
+        book = self.positions
+        n = len(book)
+        # 只查找不分配: 未知 symbol 不能写进持仓簿 (否则之后数组形式的调用形状对不上)
+        if isinstance(targets, dict):
+            unknown = [sym for sym in targets if book.find(sym) < 0]
+            if unknown:
+                raise ValueError(f"targets contain symbols not traded by this strategy: {unknown}")
+            target = np.full(n, np.nan)
+            for sym, t in targets.items():
+                target[book.find(sym)] = t
+        else:
+            target = np.asarray(targets, dtype=np.float64)
+            if target.shape != (n,):
+                raise ValueError(f"targets must have shape ({n},), got {target.shape}")
+
+        price = book.last_price[:n].copy()
+        if isinstance(prices, dict):
+            for sym, p in prices.items():
+                idx = book.find(sym)
+                if idx >= 0:
+                    price[idx] = p
+        elif prices is not None:
+            price = np.asarray(prices, dtype=np.float64)
+            if price.shape != (n,):
+                raise ValueError(f"prices must have shape ({n},), got {price.shape}")
+
+        valid = ~np.isnan(target) & (price > 0)
+        for idx in np.nonzero(valid)[0]:
+            self.target_pos[book.symbols[idx]] = float(target[idx])
+        target = np.where(valid, target, 0.0)
+
+        # 1. 多/空腿差额 (相对预期持仓)
+        avail_long = np.maximum(book.long_volume[:n] - book.long_frozen[:n], 0.0)
+        avail_short = np.maximum(book.short_volume[:n] - book.short_frozen[:n], 0.0)
+        d_long = np.maximum(target, 0.0) - (avail_long + book.long_pending[:n])
+        d_short = np.maximum(-target, 0.0) - (avail_short + book.short_pending[:n])
+
+        # 平仓量不超过可平数量; 超出部分来自在途开仓单 -> 撤单
+        close_long = np.minimum(np.maximum(-d_long, 0.0), avail_long)
+        close_short = np.minimum(np.maximum(-d_short, 0.0), avail_short)
+        cancel_long = valid & (-d_long - close_long > self.MIN_DIFF) & (book.long_pending[:n] > 0)
+        cancel_short = valid & (-d_short - close_short > self.MIN_DIFF) & (book.short_pending[:n] > 0)
+
+        # 2. 步长取整 (整数步长精确换算) + 最小下单量过滤
+        units, scale = book.volume_units[:n], book.volume_scale[:n]
+        has_tick = units > 0
+        min_vol = np.maximum(book.min_volume[:n], self.MIN_DIFF)
+
+        def quantize(vol: np.ndarray, toward_zero: bool = False) -> np.ndarray:
+            lots = to_ticks_array(vol, units, scale)
+            rounded = from_ticks_array(lots, units, scale)
+            if toward_zero:
+                # 就近取整进位的退回一个步长 (容差吸收浮点累加误差)
+                over = rounded - vol > 1e-9 * np.maximum(vol, 1.0)
+                rounded = np.where(over, from_ticks_array(lots - 1, units, scale), rounded)
+            vol = np.where(has_tick, rounded, vol)
+            return np.where(valid & (vol >= min_vol), vol, 0.0)
+
+        # 3. 生成订单: 先平后开
+        legs = (
+            (quantize(close_long, True), Direction.SHORT, Offset.CLOSE),     # 卖出平多
+            (quantize(close_short, True), Direction.LONG, Offset.CLOSE),     # 买入平空
+            (quantize(np.maximum(d_long, 0.0)), Direction.LONG, Offset.OPEN),   # 开多
+            (quantize(np.maximum(d_short, 0.0)), Direction.SHORT, Offset.OPEN), # 开空
+        )
+        reqs: List[OrderRequest] = []
+        for vol, direction, offset in legs:
+            for idx in np.nonzero(vol > 0)[0]:
+                reqs.append(self._make_request(
+                    book.symbols[idx], direction, offset, float(price[idx]), float(vol[idx])
+                ))
+
+        cancels = [
+            (book.symbols[idx], leg)
+            for mask, leg in ((cancel_long, Direction.LONG), (cancel_short, Direction.SHORT))
+            for idx in np.nonzero(mask)[0]
+        ]
+        if cancels:
+            await self._cancel_working_opens(cancels)
+
+        if not reqs:
+            return []
+
+        self.logger.info("Rebalance: %d orders across %d symbols", len(reqs), len({r.symbol for r in reqs}))
+        return [oid for oid in await self._send_orders(reqs) if oid]
+
+    async def _cancel_working_opens(self, legs: List[Tuple[str, Direction]]):
+        """撤销指定 (symbol, 腿) 上的开仓挂单"""
+        wanted = set(legs)
+        tasks = [
+            self.exchange.cancel_order(o.order_id, o.symbol)
+            for o in self.active_orders.values()
+            if o.offset != Offset.CLOSE and (o.symbol, o.direction) in wanted
+        ]
+        if tasks:
+            self.logger.info(f"Cancelling {len(tasks)} working open orders against new targets")
+            await asyncio.gather(*tasks)
 
     # --- 交易便捷指令 ---
 
@@ -195,8 +595,8 @@ class BaseStrategy(ABC):
 
     # --- 内部逻辑 ---
 
-    async def _send_order(self, symbol, direction, offset, price, volume) -> str:
-        req = OrderRequest(
+    def _make_request(self, symbol, direction, offset, price, volume) -> OrderRequest:
+        return OrderRequest(
             symbol=symbol,
             exchange=Exchange.OKX, 
             direction=direction,
@@ -205,63 +605,186 @@ class BaseStrategy(ABC):
             price=price,
             volume=volume
         )
-        order_id = await self.exchange.send_order(req)
-        return order_id
+
+    async def _send_order(self, symbol, direction, offset, price, volume) -> str:
+        req = self._make_request(symbol, direction, offset, price, volume)
+        order_ids = await self._send_orders([req])
+        return order_ids[0]
+
+    async def _send_orders(self, reqs: List[OrderRequest]) -> List[str]:
+        """
+        批量发单 (一次提交给交易所)
+        1. 逐笔过事前风控，被拒订单以 REJECTED 回报推送，不会发往交易所
+        2. 通过的订单发出前即计入在途数量；返回后未成功的订单回滚
+        :return: 与 reqs 一一对应的 order_id (失败/拒单为空字符串)
+        """
+        order_ids = [""] * len(reqs)
+        accepted: List[int] = []
+        for i, r in enumerate(reqs):
+            if self.risk is not None:
+                code = self.risk.check(r.symbol, r.direction, r.volume, r.price, self.positions.projected(r.symbol))
+                if code:
+                    self._reject(r, code)
+                    continue
+            accepted.append(i)
+            self._unacked[id(r)] = r
+            self._track_working(r.symbol, r.direction, r.offset, r.volume)
+
+        if not accepted:
+            return order_ids
+
+        batch = [reqs[i] for i in accepted]
+        sent = [""] * len(batch)
+        try:
+            sent = await self.exchange.send_orders(batch)
+        finally:
+            for r, oid in zip(batch, sent):
+                self._unacked.pop(id(r), None)
+                if not oid or oid in self.orders:
+                    # 发送失败 / 回报先于返回到达 (已按回报计入)，回滚在途数量
+                    self._track_working(r.symbol, r.direction, r.offset, -r.volume)
+                else:
+                    self._inflight[oid] = r
+
+        for i, oid in zip(accepted, sent):
+            order_ids[i] = oid
+            if oid and self.journal:
+                self.journal.record_request(oid, reqs[i])
+        return order_ids
+
+    def _reject(self, req: OrderRequest, code: int):
+        """风控拒单: CREATED -> REJECTED，并作为订单回报推送"""
+        order = OrderData(
+            symbol=req.symbol,
+            exchange=req.exchange,
+            order_id=f"risk-{uuid.uuid4().hex[:16]}",
+            exchange_order_id="",
+            direction=req.direction,
+            offset=req.offset,
+            type=req.type,
+            price=req.price,
+            volume=req.volume,
+            traded=0.0,
+            status=OrderStatus.CREATED,
+            timestamp=time.time()
+        )
+        order.status = OrderStateMachine.transition(order.status, OrderStatus.REJECTED)
+        self.logger.warning("Risk Rejected [%s]: %s %s %s %s@%s", RiskEngine.REASONS[code], req.symbol, req.direction, req.offset, req.volume, req.price)
+        self.engine.put(Event(EventType.ORDER_STATUS, order))
 
     def _on_tick_wrapper(self, event: Event):
         tick: TickData = event.data
-        if tick.symbol in self.symbols:
+        idx = self.positions.locate(tick.instrument_id, tick.symbol)
+        if idx >= 0:
+            self.positions.mark_slot(idx, tick.last_price)
             self.on_tick(tick)
 
     def _on_order_status_wrapper(self, event: Event):
         order: OrderData = event.data
-        
+        if order.symbol not in self.positions:
+            return
+        self._apply_order(order)
+        if self.journal:
+            self.journal.record_order(order)
+            self._journal_snapshot_if_due()
+        self.on_order_status(order)
+
+    def _on_bar_wrapper(self, event: Event):
+        bar: BarData = event.data
+        # 同一 symbol 的各周期共用一个订阅，这里只取本策略的周期
+        if bar.timeframe in self.bar_timeframes:
+            self.on_bar(bar)
+
+    @property
+    def _listens_trades(self) -> bool:
+        return self.fill_accounting or self.journal is not None
+
+    def _on_trade_wrapper(self, event: Event):
+        trade: TradeData = event.data
+        if trade.symbol not in self.positions:
+            return
+        if self.fill_accounting:
+            self._update_pos(trade, trade.volume)
+        if self.journal:
+            self.journal.record_trade(trade)
+            self._journal_snapshot_if_due()
+        self.on_trade(trade)
+
+    def _apply_order(self, order: OrderData):
+        """订单回报计入本地状态 (实时回报与日志重放共用)"""
         # 计算成交差额更新仓位
         prev_order = self.orders.get(order.order_id)
         prev_traded = prev_order.traded if prev_order else 0.0
         new_traded = order.traded
         delta = new_traded - prev_traded
         
-        if delta > 0:
-            self._update_pos(order.direction, order.offset, delta)
+        if delta > 0 and not self.fill_accounting:
+            self._update_pos(order, delta, self._fill_price(prev_order, order, delta))
+        
+        # 挂单剩余量变化 -> 在途/冻结数量
+        if prev_order is None:
+            req = self._inflight.pop(order.order_id, None)
+            prev_remaining = req.volume if req else 0.0
+        else:
+            prev_remaining = prev_order.volume - prev_order.traded if prev_order.is_active() else 0.0
+        remaining = order.volume - order.traded if order.is_active() else 0.0
+        if remaining != prev_remaining:
+            self._track_working(order.symbol, order.direction, order.offset, remaining - prev_remaining)
             
         self.orders[order.order_id] = order
         
         if order.is_active():
             self.active_orders[order.order_id] = order
-        elif order.order_id in self.active_orders:
-            del self.active_orders[order.order_id]
-            
-        self.on_order_status(order)
+            self._closed.pop(order.order_id, None)
+        else:
+            self.active_orders.pop(order.order_id, None)
+            self._retire(order.order_id)
 
-    def _update_pos(self, direction: Direction, offset: Offset, volume: float):
-        """根据成交更新净仓位"""
-        if direction == Direction.LONG:
-            if offset == Offset.OPEN:
-                self.pos += volume
-            else: # CLOSE (Sell Long to Close)
-                 # 实际上 Close Long 是 Direction.SHORT + Offset.CLOSE? 
-                 # 不，用户习惯: buy/sell pair. sell 是平多.
-                 # 检查 BaseStrategy.sell implementation: Direction.SHORT, Offset.CLOSE.
-                 pass
-        
-        # 修正: 统一按 Direction/Offset 逻辑
-        # Long/Open -> +
-        # Short/Close -> + (买入平空)
-        # Short/Open -> -
-        # Long/Close -> - (卖出平多)
-        
-        change = 0.0
-        if direction == Direction.LONG:
-            if offset == Offset.OPEN:
-                change = volume
-            elif offset == Offset.CLOSE:
-                change = volume # Cover Short -> Pos increases (e.g. -1 to 0)
-        elif direction == Direction.SHORT:
-            if offset == Offset.OPEN:
-                change = -volume
-            elif offset == Offset.CLOSE:
-                change = -volume # Sell Long -> Pos decreases (e.g. 1 to 0)
-                
-        self.pos += change
-        self.logger.info(f"Position Update: {change} -> Current: {self.pos}")
+    def _retire(self, order_id: str):
+        """
+        订单结束 (终态，或对账时已从远端消失): 记入已结束队列，超出 max_closed_orders 时删除最早结束的订单
+        保留最近的已结束订单用于识别迟到的重复回报 (成交差额不重复计入)
+        """
+        closed = self._closed
+        closed.pop(order_id, None)
+        closed[order_id] = None
+        while len(closed) > self.max_closed_orders:
+            oid = next(iter(closed))
+            del closed[oid]
+            self.orders.pop(oid, None)
+
+    def _update_pos(self, order: Union[OrderData, TradeData], volume: float, price: Optional[float] = None):
+        """
+        根据成交更新持仓簿 (逐笔成交，或订单累计成交量的差额)
+        Long/Open -> 加多, Short/Close -> 平多 (卖出平多)
+        Short/Open -> 加空, Long/Close -> 平空 (买入平空)
+        :param price: 成交价 (默认取 order.price: TradeData 为成交价，OrderData 为委托价)
+        """
+        price = order.price if price is None else price
+        change = self.positions.on_fill(order.symbol, order.direction, order.offset, volume, price)
+        self.logger.info("Position Update: %s %s -> Current: %s", order.symbol, change, self.positions.net(order.symbol))
+
+    @staticmethod
+    def _fill_price(prev: Optional[OrderData], order: OrderData, delta: float) -> float:
+        """
+        本次成交差额的成交价: 由前后两次成交均价反推; 交易所未提供均价时退回委托价
+        """
+        if order.avg_price <= 0:
+            return order.price
+        if prev is None or prev.traded <= 0 or prev.avg_price <= 0:
+            return order.avg_price
+        return (order.avg_price * order.traded - prev.avg_price * prev.traded) / delta
+
+    def _track_working(self, symbol: str, direction: Direction, offset: Offset, delta: float):
+        """
+        挂单剩余量计入持仓簿
+        - 开仓单: 计入该方向腿的在途数量
+        - 平仓单: 冻结在被平的腿上
+        """
+        if delta == 0:
+            return
+        if offset == Offset.CLOSE:
+            leg = Direction.SHORT if direction == Direction.LONG else Direction.LONG
+            self.positions.freeze(symbol, leg, delta)
+        else:
+            self.positions.add_pending(symbol, direction, delta)
@@ -3,7 +3,7 @@ from quant_system.core.event import EventEngine
 from quant_system.core.types import TickData, OrderData
 from quant_system.strategy.base import BaseStrategy
 from quant_system.exchange.base import BaseExchange
-from quant_system.core.signal import DualMASignal
+from quant_system.core.signal import DualMA
 
 class DualMAStrategy(BaseStrategy):
     """
@@ -13,22 +13,25 @@ class DualMAStrategy(BaseStrategy):
     def __init__(self, engine: EventEngine, exchange: BaseExchange, symbols: List[str]):
         super().__init__(engine, exchange, symbols)
         
-        # 1. 初始化 Signal (Alpha Layer)
-        # 为每个币种创建一个独立的信号实例
+        # 信号句柄 (启动时从共享注册表获取，随后由检查点恢复; 窗口按 tick 计，不用 K 线预热)
         self.signals = {}
-        for s in symbols:
-            self.signals[s] = DualMASignal(fast_window=5, slow_window=10) # 短周期演示
             
         # 资金管理参数
         self.lot_size = 1.0 # 每次固定下单量
+
+    def on_init(self):
+        # 1. 获取 Signal (Alpha Layer)
+        # 同一进程中参数相同的双均线只计算一次，所有策略共用 (只读句柄)
+        for s in self.symbols:
+            self.signals[s] = self.use_signal(DualMA, s, 5, 10) # 短周期演示
         
     def on_tick(self, tick: TickData):
-        # 2. 将数据喂给对应的 Signal
+        # 2. 读取对应 Signal 的本 tick 值 (注册表已在策略回调之前更新)
         signal = self.signals.get(tick.symbol)
         if not signal:
             return
             
-        sig_val = signal.on_tick(tick) # 获取最新 Alpha 值 (-1, 0, 1)
+        sig_val = signal.value # 最新 Alpha 值 (-1, 0, 1)
         
         # 3. 组合管理 (Portfolio Logic)
         # 简单逻辑: 信号 1 -> 持仓 1; 信号 -1 -> 持仓 -1
@@ -40,11 +43,8 @@ class DualMAStrategy(BaseStrategy):
             target = -self.lot_size
             
         # 4. 执行 (Execution Layer)
-        # 使用 create_task 避免阻塞 tick loop? Set_target_position is async.
-        # on_tick is sync wrapper, but set_target_position is async.
-        # We need to spawn a task.
-        import asyncio
-        asyncio.create_task(self.set_target_position(target, tick.symbol, tick.last_price))
+        # 每个 tick 都会提交目标，由基类合并为每个 symbol 一个执行任务，并扣除在途订单
+        self.request_target_position(target, tick.symbol, tick.last_price)
 
     def on_order_status(self, order: OrderData):
         pass
@@ -1,7 +1,6 @@
 from typing import List
 from quant_system.strategy.base import BaseStrategy
 from quant_system.core.types import TickData, OrderData
-import asyncio
 
 class DynamicRebalanceStrategy(BaseStrategy):
     def __init__(self, engine, exchange, symbols: List[str]):
@@ -26,6 +25,14 @@ class DynamicRebalanceStrategy(BaseStrategy):
         # 这里的 on_start 是同步的, 我们假设外部已经做好了初始化
         pass
 
+    def get_state(self):
+        return {"level": self.level, "last_rebalance_price": self.last_rebalance_price, "is_running": self.is_running}
+
+    def set_state(self, state):
+        self.level = state.get("level", self.level)
+        self.last_rebalance_price = state.get("last_rebalance_price", self.last_rebalance_price)
+        self.is_running = state.get("is_running", self.is_running)
+
     def on_tick(self, tick: TickData):
         if not self.is_running:
             return
@@ -39,7 +46,7 @@ class DynamicRebalanceStrategy(BaseStrategy):
             # 为了演示，我们假设初始开 10 张
             if self.pos == 0:
                 self.logger.info("Initial Entry: 10 contracts Long")
-                asyncio.create_task(self.set_target_position(10, self.symbol, tick.last_price))
+                self.request_target_position(10, self.symbol, tick.last_price)
             return
 
         # 2. 检查价格波动
@@ -52,7 +59,7 @@ class DynamicRebalanceStrategy(BaseStrategy):
             new_target = self.pos * (1 + self.base_pos_rate) # 仓位增加 10%
             self.logger.info(f"📈 Price UP {pct_change:.2%}. Level -> {self.level}. Target -> {new_target:.2f}")
             
-            asyncio.create_task(self.set_target_position(new_target, self.symbol, tick.last_price))
+            self.request_target_position(new_target, self.symbol, tick.last_price)
             triggered = True
             
         elif pct_change <= -self.price_threshold: # 下跌 1%
@@ -60,7 +67,7 @@ class DynamicRebalanceStrategy(BaseStrategy):
             new_target = self.pos * (1 - self.base_pos_rate) # 仓位减少 10%
             self.logger.info(f"📉 Price DOWN {pct_change:.2%}. Level -> {self.level}. Target -> {new_target:.2f}")
             
-            asyncio.create_task(self.set_target_position(new_target, self.symbol, tick.last_price))
+            self.request_target_position(new_target, self.symbol, tick.last_price)
             triggered = True
             
         if triggered:
@@ -70,4 +77,4 @@ class DynamicRebalanceStrategy(BaseStrategy):
         if abs(self.level) >= 2:
             self.logger.info(f"🛑 Level Reached Limit ({self.level}). Stopping Strategy & Closing All.")
             self.is_running = False
-            asyncio.create_task(self.set_target_position(0, self.symbol, tick.last_price))
+            self.request_target_position(0, self.symbol, tick.last_price)
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import weakref
+from typing import TYPE_CHECKING, List, Optional
+
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.exchange.base import BaseExchange
+
+if TYPE_CHECKING:
+    from quant_system.strategy.base import BaseStrategy
+
+class Reconciler:
+    """
+    共享对账器 (Shared Reconciliation)
+    每个交易所实例只有一个对账器，挂载在其上的所有策略共用一次 REST 查询结果。
+
+    - 防抖: debounce 窗口内的多次 RECOVERY 合并为一次对账 (WS 抖动时不会反复全量拉取)
+    - 合并: 对账进行中再次收到 RECOVERY，本轮结束后只补跑一次
+    - 限定: 仅查询已挂载策略关心的 symbols
+    - 分发: 一次查询结果扇出给所有策略，由策略自行做增量 diff
+    - 失败: 任一查询失败则整轮跳过，策略状态保持不变
+    """
+
+    debounce: float = 0.5 # 防抖窗口 (秒)
+
+    _instances: "weakref.WeakKeyDictionary[BaseExchange, Reconciler]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, engine: EventEngine, exchange: BaseExchange):
+        self.engine = engine
+        self.exchange = exchange
+        self.logger = logging.getLogger("Reconciler")
+
+        self._strategies: List["BaseStrategy"] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+        self._dirty = False
+
+        self.runs = 0 # 实际执行的对账次数 (统计用)
+        self.failures = 0 # 因查询失败而跳过的次数
+
+    @classmethod
+    def for_exchange(cls, engine: EventEngine, exchange: BaseExchange) -> "Reconciler":
+        """获取 (或创建) 交易所实例对应的共享对账器"""
+        reconciler = cls._instances.get(exchange)
+        if reconciler is None:
+            reconciler = cls(engine, exchange)
+            cls._instances[exchange] = reconciler
+        return reconciler
+
+    def attach(self, strategy: "BaseStrategy") -> None:
+        """挂载策略 (首个策略挂载时注册 RECOVERY 事件)"""
+        if strategy in self._strategies:
+            return
+        if not self._strategies:
+            self.engine.register(EventType.RECOVERY, self._on_recovery)
+        self._strategies.append(strategy)
+
+    def detach(self, strategy: "BaseStrategy") -> None:
+        """卸载策略 (最后一个策略卸载时注销事件)"""
+        if strategy not in self._strategies:
+            return
+        self._strategies.remove(strategy)
+        if not self._strategies:
+            self.engine.unregister(EventType.RECOVERY, self._on_recovery)
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    def request(self) -> None:
+        """
+        请求一次对账 (防抖)
+        窗口期内重复调用只会推迟执行时间，不会增加查询次数。
+        """
+        if self._timer:
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(self.debounce, self._fire)
+
+    def _on_recovery(self, event: Event) -> None:
+        self.request()
+
+    def _fire(self) -> None:
+        self._timer = None
+        if self._task and not self._task.done():
+            # 对账进行中: 标记脏位，本轮结束后补跑
+            self._dirty = True
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            self._dirty = False
+            await self.reconcile()
+            if not self._dirty:
+                break
+
+    async def reconcile(self) -> None:
+        """立即执行一次对账: 一次查询，扇出到所有策略"""
+        strategies = list(self._strategies)
+        if not strategies:
+            return
+
+        # 去重且保持顺序
+        symbols = list(dict.fromkeys(sym for s in strategies for sym in s.symbols))
+
+        self.runs += 1
+        self.logger.warning(f"Recovery: Reconciling {len(symbols)} symbols for {len(strategies)} strategies...")
+
+        try:
+            positions, open_orders = await asyncio.gather(
+                self.exchange.query_position(symbols),
+                self.exchange.query_open_orders(symbols),
+            )
+        except Exception as e:
+            # 查询失败不能当作 "没有持仓 / 挂单" 下发，否则会清空策略状态; 本轮跳过，等待下一次 RECOVERY
+            self.failures += 1
+            self.logger.error(f"Reconcile query failed, skipping this round: {e}")
+            return
+
+        for s in strategies:
+            try:
+                await s._apply_reconciliation(positions, open_orders)
+            except Exception as e:
+                self.logger.error(f"Reconcile failed for {s.__class__.__name__}: {e}", exc_info=True)
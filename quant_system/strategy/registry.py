@@ -0,0 +1,9 @@
+from quant_system.utils.registry import LazyRegistry
+
+# 策略注册表: 配置中的 strategy.name -> 实现类 (按需导入)
+# 也可直接在配置中写 "my_package.my_module:MyStrategy"
+STRATEGIES = LazyRegistry("strategy", {
+    "DynamicRebalance": "quant_system.strategy.dynamic_demo:DynamicRebalanceStrategy",
+    "DualMA": "quant_system.strategy.dual_ma:DualMAStrategy",
+    "Demo": "quant_system.strategy.demo:DemoStrategy",
+})
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Mapping, Sequence
+
+import numpy as np
+
+from quant_system.core.signal import BaseSignal, SignalRegistry
+from quant_system.exchange.base import BaseExchange
+
+class WarmupService:
+    """
+    启动预热 (Bulk History Warmup)
+    按指标所需的历史长度拉取最近的 K 线 (exchange.query_bars，分页由适配器完成，各 symbol 并发)，
+    取收盘价一次性填充指标窗口 (各节点的 warmup 为向量化计算，不逐个价格回放)，策略启动后即可交易，
+    不必等待 slow_window 个实时 tick。
+
+    历史以 K 线收盘价代替逐笔价格，窗口按 "根" 计; timeframe 应与策略的信号节奏相近。
+    """
+    def __init__(self, exchange: BaseExchange, timeframe: str = "1m"):
+        self.exchange = exchange
+        self.timeframe = timeframe
+        self.logger = logging.getLogger("Warmup")
+
+    async def fetch_closes(self, lookbacks: Mapping[str, int]) -> Dict[str, np.ndarray]:
+        """并发拉取各 symbol 最近 lookback 根 K 线的收盘价 (旧 -> 新; 失败的 symbol 为空数组)"""
+        symbols = [s for s, n in lookbacks.items() if n > 0]
+        results = await asyncio.gather(
+            *[self.exchange.query_bars(s, self.timeframe, lookbacks[s]) for s in symbols], return_exceptions=True
+        )
+        closes: Dict[str, np.ndarray] = {}
+        for symbol, bars in zip(symbols, results):
+            if isinstance(bars, BaseException):
+                self.logger.error(f"Warmup fetch failed for {symbol}: {bars!r}")
+                bars = []
+            closes[symbol] = np.fromiter((b.close for b in bars), dtype=np.float64, count=len(bars))
+        return closes
+
+    async def warmup(self, registry: SignalRegistry, symbols: Sequence[str]) -> Dict[str, int]:
+        """
+        预热注册表中尚未就绪的指标 (已由检查点恢复或其它策略预热过的 symbol 跳过)
+        :return: symbol -> 使用的历史价格数
+        """
+        t0 = time.perf_counter()
+        closes = await self.fetch_closes({s: registry.lookback(s) for s in symbols})
+        for symbol, prices in closes.items():
+            if len(prices):
+                registry.warmup(symbol, prices)
+        if closes:
+            self.logger.info(
+                f"Warmed up {len(closes)} symbols from {self.timeframe} bars in {(time.perf_counter() - t0) * 1000:.0f}ms"
+            )
+        return {s: len(p) for s, p in closes.items()}
+
+    async def warmup_signals(self, signals: Mapping[str, BaseSignal]) -> Dict[str, int]:
+        """预热策略自行持有的信号 (symbol -> BaseSignal)"""
+        closes = await self.fetch_closes({s: sig.lookback for s, sig in signals.items()})
+        for symbol, prices in closes.items():
+            if len(prices):
+                signals[symbol].warmup(prices)
+        return {s: len(p) for s, p in closes.items()}
@@ -0,0 +1,30 @@
+from collections import deque
+from typing import Deque, Hashable, Set
+
+class BoundedSet:
+    """
+    有界去重集合 (Bounded Seen-Set)
+    按加入顺序保留最近 maxlen 个元素，超出时淘汰最早的; 用于推送流的 ID 去重 (重连重放/多路重复)。
+    """
+    __slots__ = ("maxlen", "_items", "_order")
+
+    def __init__(self, maxlen: int = 10000):
+        self.maxlen = maxlen
+        self._items: Set[Hashable] = set()
+        self._order: Deque[Hashable] = deque()
+
+    def add(self, item: Hashable) -> bool:
+        """加入元素; 已存在时返回 False"""
+        if item in self._items:
+            return False
+        self._items.add(item)
+        self._order.append(item)
+        if len(self._order) > self.maxlen:
+            self._items.discard(self._order.popleft())
+        return True
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,196 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+LOG_FORMAT = "%(asctime)s [%(name)s] %(levelname)s: %(message)s"
+
+_STOP = object()
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    事件循环线程上的唯一 Handler: 只把 LogRecord 放入有界队列，从不阻塞。
+    队列满 (磁盘卡顿导致写线程跟不上) 时丢弃并计数，而不是拖慢行情分发。
+    """
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 在调用方线程合并 msg % args (参数可能是随后会被修改的对象)，
+        # 时间格式化 / 异常栈渲染 / 写盘全部留给写线程
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class BatchFileHandler(RotatingFileHandler):
+    """按批写入的滚动文件: 一批记录只 flush 一次 (文件大小自行累计，避免逐条 tell())"""
+    def __init__(self, filename: str, maxBytes: int = 0, backupCount: int = 0):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding="utf-8")
+        self._size = os.path.getsize(filename) if os.path.exists(filename) else 0
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self._size = 0
+
+    def emit_batch(self, records: List[logging.LogRecord]) -> None:
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            for record in records:
+                if record.levelno < self.level:
+                    continue
+                try:
+                    line = self.format(record) + self.terminator
+                    size = len(line.encode("utf-8"))
+                    if self.maxBytes > 0 and self._size + size > self.maxBytes and self._size > 0:
+                        self.doRollover()
+                    self.stream.write(line)
+                    self._size += size
+                except Exception:
+                    self.handleError(record)
+            self.stream.flush()
+        finally:
+            self.release()
+
+class JsonFormatter(logging.Formatter):
+    """结构化日志 (JSONL): 每条记录一行 JSON，extra={"data": {...}} 原样输出"""
+    def format(self, record: logging.LogRecord) -> str:
+        item: Dict[str, Any] = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        data = getattr(record, "data", None)
+        if data is not None:
+            item["data"] = data
+        if record.exc_info:
+            item["exc"] = self.formatException(record.exc_info)
+        return json.dumps(item, ensure_ascii=False, default=str)
+
+class LogWriter(threading.Thread):
+    """
+    后台写线程: 阻塞等待第一条记录，再非阻塞取尽 (最多 batch_size 条) 后批量写入各 sink
+    """
+    def __init__(self, log_queue: "queue.Queue", handlers: List[BatchFileHandler], batch_size: int = 512):
+        super().__init__(name="LogWriter", daemon=True)
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.written = 0
+        self.batches = 0
+
+    def run(self) -> None:
+        q = self.queue
+        stopping = False
+        while not stopping:
+            record = q.get()
+            if record is _STOP:
+                break
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    record = q.get_nowait()
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+            for handler in self.handlers:
+                handler.emit_batch(batch)
+            self.written += len(batch)
+            self.batches += 1
+
+class LoggingPipeline:
+    """已安装的日志管线 (queue -> 写线程 -> 文件 sinks)"""
+    def __init__(self, queue_handler: DroppingQueueHandler, writer: LogWriter):
+        self.queue_handler = queue_handler
+        self.writer = writer
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "written": self.writer.written,
+            "batches": self.writer.batches,
+            "dropped": self.queue_handler.dropped,
+        }
+
+    def stop(self) -> None:
+        """写完队列中剩余记录后停止写线程 (幂等)"""
+        root = logging.getLogger()
+        if self.queue_handler in root.handlers:
+            root.removeHandler(self.queue_handler)
+        if self.writer.is_alive():
+            self.writer.queue.put(_STOP)
+            self.writer.join(timeout=5)
+        for handler in self.writer.handlers:
+            handler.close()
+
+_pipeline: Optional[LoggingPipeline] = None
+
+def setup_logging(system_config: Dict[str, Any], prefix: str = "TWS") -> LoggingPipeline:
+    """
+    安装异步日志管线 (替换 root logger 上已有的 handlers)
+
+    system 配置:
+    - log_level: 日志级别 (默认 INFO)
+    - log_dir: 日志目录 (默认 logs)
+    - log_max_bytes / log_backup_count: 单文件上限与保留份数 (默认 100MB x 5)
+    - log_jsonl: 额外输出结构化 JSONL 文件 (默认关闭)
+    - log_queue_size: 队列容量，满时丢弃 (默认 100000)
+    - log_batch_size: 写线程单批最大条数 (默认 512)
+    """
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.stop()
+
+    log_dir = system_config.get("log_dir", "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    max_bytes = int(system_config.get("log_max_bytes", 100 * 1024 * 1024))
+    backups = int(system_config.get("log_backup_count", 5))
+
+    text = BatchFileHandler(f"{log_dir}/{prefix}_{stamp}.log", maxBytes=max_bytes, backupCount=backups)
+    text.setFormatter(logging.Formatter(LOG_FORMAT))
+    handlers = [text]
+    if system_config.get("log_jsonl"):
+        jsonl = BatchFileHandler(f"{log_dir}/{prefix}_{stamp}.jsonl", maxBytes=max_bytes, backupCount=backups)
+        jsonl.setFormatter(JsonFormatter())
+        handlers.append(jsonl)
+
+    log_queue: "queue.Queue" = queue.Queue(maxsize=int(system_config.get("log_queue_size", 100000)))
+    queue_handler = DroppingQueueHandler(log_queue)
+    writer = LogWriter(log_queue, handlers, int(system_config.get("log_batch_size", 512)))
+    writer.start()
+
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, system_config.get("log_level", "INFO").upper()))
+
+    _pipeline = LoggingPipeline(queue_handler, writer)
+    return _pipeline
+
+def shutdown_logging() -> None:
+    """停止日志管线并写完剩余记录"""
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.stop()
+        _pipeline = None
+
+atexit.register(shutdown_logging)
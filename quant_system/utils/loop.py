@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import sys
+from typing import Any, Callable, Coroutine, Optional, Tuple
+
+logger = logging.getLogger("EventLoop")
+
+LoopFactory = Callable[[], asyncio.AbstractEventLoop]
+
+POLICIES = ("asyncio", "uvloop")
+
+def select_loop(policy: Optional[str] = None) -> Tuple[str, Optional[LoopFactory]]:
+    """
+    按 system.event_loop_policy 选择事件循环实现
+    :return: (实际使用的实现名, loop 工厂; None 表示标准 asyncio)
+    uvloop 未安装 (或平台不支持) 时回退到 asyncio 并告警
+    """
+    policy = (policy or "asyncio").lower()
+    if policy == "uvloop":
+        try:
+            import uvloop
+            return "uvloop", uvloop.new_event_loop
+        except ImportError:
+            logger.warning("event_loop_policy=uvloop but uvloop is not installed (pip install tws-quant[perf]); falling back to asyncio")
+    elif policy != "asyncio":
+        logger.warning(f"Unknown event_loop_policy: {policy}; falling back to asyncio")
+    return "asyncio", None
+
+def describe_loop(name: str) -> str:
+    """实现名 + 版本 (用于启动日志)"""
+    if name == "uvloop":
+        import uvloop
+        return f"uvloop {uvloop.__version__}"
+    return f"asyncio (Python {sys.version.split()[0]})"
+
+def run(main: Coroutine[Any, Any, Any], policy: Optional[str] = None) -> Any:
+    """
+    以选定的事件循环运行入口协程 (替代 asyncio.run)
+    """
+    name, factory = select_loop(policy)
+    logger.info(f"Event loop: {describe_loop(name)}")
+    if factory is None:
+        return asyncio.run(main)
+
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=factory) as runner:
+            return runner.run(main)
+
+    loop = factory()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
@@ -0,0 +1,42 @@
+import importlib
+from typing import Any, Dict, List, Optional, Union
+
+class LazyRegistry:
+    """
+    按名称延迟加载的注册表
+    条目登记为 "package.module:Attr" 字符串，首次 get() 时才导入对应模块 (之后缓存)，
+    避免启动时加载用不到的重量级依赖 (ccxt / numpy 等)。
+    未登记的名称若本身是 "module:Attr" 路径，也可直接加载 (用户自定义策略)。
+    """
+    def __init__(self, kind: str, entries: Optional[Dict[str, Union[str, Any]]] = None):
+        self.kind = kind
+        self._entries: Dict[str, Union[str, Any]] = dict(entries or {})
+
+    def register(self, name: str, target: Union[str, Any]) -> None:
+        """登记一个条目 (导入路径或已加载的对象)"""
+        self._entries[name] = target
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def get(self, name: str) -> Any:
+        target = self._entries.get(name)
+        if target is None:
+            if ":" not in name:
+                raise ValueError(f"Unknown {self.kind}: {name} (available: {', '.join(self._entries)})")
+            target = name
+        if isinstance(target, str):
+            target = self._load(target)
+            self._entries[name] = target
+        return target
+
+    def _load(self, path: str) -> Any:
+        module_name, _, attr = path.partition(":")
+        module = importlib.import_module(module_name)
+        try:
+            return getattr(module, attr)
+        except AttributeError:
+            raise ValueError(f"Invalid {self.kind} path: {path}") from None
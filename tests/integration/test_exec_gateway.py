@@ -0,0 +1,123 @@
+import pytest
+import asyncio
+import os
+import tempfile
+from quant_system.core.event import EventEngine, EventType
+from quant_system.core.types import OrderRequest, Exchange, Direction, OrderType, Offset, OrderStatus
+from quant_system.exchange.factory import create_exchange
+from quant_system.exchange.gateway_adapter import GatewayError
+from quant_system.ipc.exec_gateway import ExecutionGateway
+from quant_system.strategy.base import BaseStrategy
+from quant_system.strategy.reconciler import Reconciler
+
+class IdleStrategy(BaseStrategy):
+    def on_tick(self, tick):
+        pass
+
+@pytest.mark.asyncio
+async def test_strategy_trades_through_exec_gateway():
+    """
+    集成测试: 策略 -> GatewayExchangeAdapter -> Unix Socket -> 执行网关 -> Mock
+    订单回报经网关推送回策略，持仓查询经网关转发
+    """
+    path = os.path.join(tempfile.mkdtemp(), "exec.sock")
+    # Mock 自行生成行情撮合 (market_data=True)，行情不外发
+    gateway = ExecutionGateway({"name": "mock", "latency_ms": 10, "market_data": True}, path)
+    await gateway.start()
+
+    engine = EventEngine()
+    engine.start()
+    client = create_exchange(engine, {"name": "gateway", "path": path})
+    statuses = []
+    engine.register(EventType.ORDER_STATUS, lambda e: statuses.append(e.data.status))
+    try:
+        await client.connect()
+        strategy = IdleStrategy(engine, client, ["BTC-USDT-SWAP"])
+        await strategy.start()
+
+        ids = await strategy.set_target_position(2.0, "BTC-USDT-SWAP", 1e9)
+        assert len(ids) == 1 and ids[0]
+
+        await asyncio.sleep(1.2)
+        assert OrderStatus.FILLED in statuses
+        assert strategy.get_pos("BTC-USDT-SWAP") == 2.0
+
+        positions = await client.query_position(["BTC-USDT-SWAP"])
+        assert [(p.direction, p.volume) for p in positions] == [(Direction.LONG, 2.0)]
+        assert await client.query_open_orders() == []
+
+        await strategy.stop()
+    finally:
+        await client.close()
+        engine.stop()
+        await gateway.stop()
+
+@pytest.mark.asyncio
+async def test_gateway_unavailable_fails_orders():
+    """网关断开后发单返回空 id (策略侧按发单失败处理); 查询抛出 GatewayError，对账跳过本轮而不是清空状态"""
+    path = os.path.join(tempfile.mkdtemp(), "exec.sock")
+    gateway = ExecutionGateway({"name": "mock", "latency_ms": 10}, path)
+    await gateway.start()
+
+    engine = EventEngine()
+    engine.start()
+    client = create_exchange(engine, {"name": "gateway", "path": path, "request_timeout": 1.0})
+    await client.connect()
+    await gateway.stop()
+    await asyncio.sleep(0.1)
+
+    req = OrderRequest(symbol="BTC-USDT-SWAP", exchange=Exchange.MOCK, direction=Direction.LONG,
+                       type=OrderType.LIMIT, volume=1.0, price=100.0, offset=Offset.OPEN)
+    assert await client.send_orders([req]) == [""]
+
+    with pytest.raises(GatewayError):
+        await client.query_open_orders(["BTC-USDT-SWAP"])
+    strategy = IdleStrategy(engine, client, ["BTC-USDT-SWAP"])
+    strategy.positions.on_fill("BTC-USDT-SWAP", Direction.LONG, Offset.OPEN, 1.0, 100.0)
+    reconciler = Reconciler.for_exchange(engine, client)
+    reconciler.attach(strategy)
+    await reconciler.reconcile()
+    assert reconciler.failures == 1
+    assert strategy.get_pos("BTC-USDT-SWAP") == 1.0
+
+    await client.close()
+    engine.stop()
+
+@pytest.mark.asyncio
+async def test_reconnects_after_gateway_restart():
+    """网关重启: 进行中的请求立即失败; 客户端退避重连、重新订阅并推送 RECOVERY，之后可继续交易"""
+    path = os.path.join(tempfile.mkdtemp(), "exec.sock")
+    conf = {"name": "mock", "latency_ms": 10, "market_data": True}
+    gateway = ExecutionGateway(conf, path)
+    await gateway.start()
+
+    engine = EventEngine()
+    engine.start()
+    client = create_exchange(engine, {"name": "gateway", "path": path, "request_timeout": 30.0, "reconnect_delay": 0.1})
+    recoveries = []
+    engine.register(EventType.RECOVERY, lambda e: recoveries.append(e))
+    try:
+        await client.connect()
+        strategy = IdleStrategy(engine, client, ["BTC-USDT-SWAP"])
+        await strategy.start()
+
+        pending = asyncio.get_running_loop().create_future()
+        client._pending[-1] = pending
+        await gateway.stop()
+        await asyncio.sleep(0.05)
+        assert pending.done() and isinstance(pending.exception(), ConnectionError) # 不等到 request_timeout
+
+        gateway = ExecutionGateway(conf, path)
+        await gateway.start()
+        await asyncio.sleep(1.0)
+        assert client.reconnects == 1 and recoveries
+
+        await strategy.set_target_position(1.0, "BTC-USDT-SWAP", 1e9)
+        await asyncio.sleep(1.2)
+        assert strategy.get_pos("BTC-USDT-SWAP") == 1.0 # 回报经重新订阅送达
+
+        await strategy.stop()
+    finally:
+        await client.close()
+        engine.stop()
+        await gateway.stop()
@@ -0,0 +1,141 @@
+import pytest
+import asyncio
+from quant_system.core.bar import BarAggregator
+from quant_system.core.event import Event, EventType
+from quant_system.core.signal import Price, RollingMean
+from quant_system.core.types import Exchange, TickData
+from quant_system.host import TradingHost
+
+def _config():
+    mock = {"name": "mock", "latency_ms": 20}
+    return {
+        "system": {"market_data": mock},
+        "accounts": {
+            "acc_a": {
+                "exchange": dict(mock),
+                "strategies": [
+                    {"name": "DualMA", "symbols": ["BTC-USDT-SWAP"]},
+                    {"name": "DualMA", "symbols": ["ETH-USDT-SWAP"]},
+                ],
+            },
+            "acc_b": {
+                "exchange": dict(mock),
+                "strategy": {"name": "DualMA", "symbols": ["BTC-USDT-SWAP"]},
+                "risk": {"max_order_volume": 1},
+            },
+        },
+    }
+
+@pytest.mark.asyncio
+async def test_host_fans_out_shared_market_data():
+    """
+    集成测试: 两个账户、三个策略共用一路行情
+    - 行情源只订阅 symbol 并集
+    - 每个账户只收到自己订阅的 symbol
+    - 账户交易所不自行生成行情
+    """
+    host = TradingHost(_config())
+    seen = {acc.name: set() for acc in host.accounts}
+    for acc in host.accounts:
+        for strategy in acc.strategies:
+            strategy.on_tick = lambda tick, name=acc.name: seen[name].add(tick.symbol)
+
+    await host.start()
+    try:
+        assert sorted(host.hub.symbols) == ["BTC-USDT-SWAP", "ETH-USDT-SWAP"]
+        assert host.accounts[1].risk is host.accounts[1].strategies[0].risk
+        assert not host.accounts[0].exchange._task
+
+        await asyncio.sleep(1.2)
+
+        assert seen["acc_a"] == {"BTC-USDT-SWAP", "ETH-USDT-SWAP"}
+        assert seen["acc_b"] == {"BTC-USDT-SWAP"}
+    finally:
+        await host.shutdown()
+
+@pytest.mark.asyncio
+async def test_host_account_orders_fill_on_shared_ticks():
+    """账户交易所按共享行情撮合自己的订单，成交只影响本账户"""
+    host = TradingHost(_config())
+    await host.start()
+    try:
+        acc_a, acc_b = host.accounts
+        strategy = acc_b.strategies[0]
+        strategy.on_tick = lambda tick: None
+        # 其它策略的信号交易不影响本用例; 这里只验证 acc_b 手动下单的隔离
+        for other in acc_a.strategies:
+            other.on_tick = lambda tick: None
+        await strategy.set_target_position(1.0, "BTC-USDT-SWAP", 1e9)
+
+        await asyncio.sleep(1.5)
+
+        assert strategy.get_pos("BTC-USDT-SWAP") == 1.0
+        assert acc_a.strategies[0].get_pos("BTC-USDT-SWAP") == 0.0
+        assert not await acc_a.exchange.query_position()
+    finally:
+        await host.shutdown()
+
+@pytest.mark.asyncio
+async def test_host_aggregates_bars_once_on_hub():
+    """K 线只在行情引擎上合成一次，收盘的 BAR 转发到各账户的策略"""
+    host = TradingHost(_config())
+    bars = {acc.name: [] for acc in host.accounts}
+    for acc in host.accounts:
+        for strategy in acc.strategies:
+            strategy.bar_timeframes = ("1t",)
+            strategy.on_tick = lambda tick: None
+            strategy.on_bar = lambda bar, name=acc.name: bars[name].append((bar.symbol, bar.end))
+
+    await host.start()
+    try:
+        for acc in host.accounts:
+            assert BarAggregator._instances.get(acc.engine) is None
+            assert all(s.bars is host.hub.bars for s in acc.strategies)
+
+        await asyncio.sleep(1.2)
+
+        emitted = host.hub.bars.history("BTC-USDT-SWAP", "1t")
+        assert emitted
+        btc = [(b.symbol, b.end) for b in emitted]
+        assert [b for b in bars["acc_b"] if b[0] == "BTC-USDT-SWAP"] == btc[:len(bars["acc_b"])]
+        assert {s for s, _ in bars["acc_a"]} == {"BTC-USDT-SWAP", "ETH-USDT-SWAP"}
+        assert {s for s, _ in bars["acc_b"]} == {"BTC-USDT-SWAP"}
+    finally:
+        await host.shutdown()
+
+@pytest.mark.asyncio
+async def test_host_strategies_read_signals_of_their_own_tick():
+    """行情中心成批处理 tick 时，各账户策略在 on_tick 中读到的指标值仍对应自己正在处理的 tick"""
+    host = TradingHost(_config())
+    seen = []
+    for acc in host.accounts:
+        for strategy in acc.strategies:
+            symbol = strategy.symbols[0]
+            price = strategy.use_signal(Price, symbol)
+            mean = strategy.use_signal(RollingMean, symbol, 2)
+
+            def on_tick(tick, strategy=strategy, price=price, mean=mean):
+                seen.append((strategy, tick.last_price, price.value, mean.value))
+            strategy.on_tick = on_tick
+
+    await host.start()
+    try:
+        await asyncio.sleep(0.1)
+        seen.clear()
+        # 一批 tick 不让出执行权地压入行情引擎: 行情引擎会先处理完整批，账户引擎才开始处理
+        for i in range(20):
+            tick = TickData(symbol="BTC-USDT-SWAP", exchange=Exchange.MOCK, timestamp=0.0,
+                            last_price=100.0 + i, volume=1.0, bid_price_1=99.5 + i, ask_price_1=100.5 + i)
+            host.hub.engine.put(Event(EventType.TICK, tick))
+        await asyncio.sleep(0.2)
+
+        btc = [s for acc in host.accounts for s in acc.strategies if s.symbols[0] == "BTC-USDT-SWAP"]
+        for strategy in btc:
+            rows = [r[1:] for r in seen if r[0] is strategy]
+            assert [r[0] for r in rows if 100.0 <= r[0] < 120.0] == [100.0 + i for i in range(20)]
+            for k, (last, price, mean) in enumerate(rows):
+                assert price == last
+                if k:
+                    assert mean == pytest.approx((rows[k - 1][0] + last) / 2)
+    finally:
+        await host.shutdown()
@@ -0,0 +1,55 @@
+import pytest
+import asyncio
+import time
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.types import TickData, Exchange
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.strategy.base import BaseStrategy
+
+class CountingMock(MockExchangeAdapter):
+    def __init__(self, engine):
+        super().__init__(engine, config={"latency_ms": 50})
+        self.sent = []
+
+    async def send_order(self, req):
+        self.sent.append(req)
+        return await super().send_order(req)
+
+class ChaseStrategy(BaseStrategy):
+    """每个 tick 都提交同一个目标 (模拟行情驱动的再平衡)"""
+    def on_tick(self, tick: TickData):
+        self.request_target_position(1.0, tick.symbol, tick.ask_price_1 + 100)
+
+@pytest.mark.asyncio
+async def test_tick_flood_sends_single_order():
+    """
+    集成测试: 高频 tick 驱动下，在途订单被计入，整个过程只发出一笔订单
+    """
+    engine = EventEngine()
+    engine.start()
+    mock = CountingMock(engine)
+    await mock.connect()
+
+    symbol = "BTC-USDT-SWAP"
+    strategy = ChaseStrategy(engine, mock, [symbol])
+    await strategy.start()
+
+    # 在订单回报之前灌入大量 tick
+    for i in range(50):
+        engine.put(Event(EventType.TICK, TickData(
+            symbol=symbol, exchange=Exchange.MOCK, timestamp=time.time(),
+            last_price=10000 + i, volume=1, bid_price_1=9999 + i, ask_price_1=10001 + i
+        )))
+        await asyncio.sleep(0)
+
+    # 等待撮合 (Mock 500ms 一个 tick)
+    await asyncio.sleep(1.5)
+
+    assert len(mock.sent) == 1
+    assert strategy.get_pos(symbol) == 1.0
+    assert not strategy._inflight
+    assert strategy.positions.long_pending[strategy.positions.slot(symbol)] == 0
+
+    await strategy.stop()
+    await mock.close()
+    engine.stop()
@@ -0,0 +1,22 @@
+import json
+
+from quant_system.loadtest import run
+
+def test_load_harness_reports_json(tmp_path):
+    """小规模压测: 两级速率，结果 JSON 含吞吐、延迟分位数与资源占用"""
+    out = tmp_path / "bench.json"
+    report = run([
+        "--strategies", "2", "--symbols", "10", "--start-rate", "500", "--max-rate", "800",
+        "--step-seconds", "0.5", "--warmup", "0.2", "--order-every", "5", "-o", str(out),
+    ])
+    assert json.loads(out.read_text()) == json.loads(json.dumps(report))
+    assert [s["target_rate"] for s in report["steps"]] == [500, 750]
+
+    step = report["steps"][0]
+    assert step["sustained"] and report["max_sustainable_rate"] >= 500
+    assert step["delivered_rate"] > 400 and step["dispatches_per_sec"] > 800
+    assert step["orders_per_sec"] > 0 and step["fills_per_sec"] > 0
+    assert step["tick_to_strategy"]["n"] > 0 and step["tick_to_order"]["p99_us"] > 0
+    assert {"p50_us", "p99_us", "p999_us"} <= set(report["tick_to_order"])
+    assert step["cpu_percent"] > 0 and step["rss_mb"] > 0
+    assert report["config"]["strategies"] == 2 and report["host"]["event_loop"] == "asyncio"
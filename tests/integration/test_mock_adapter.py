@@ -54,3 +54,40 @@ async def test_mock_exchange_lifecycle():
     
     await mock.close()
     engine.stop()
+
+@pytest.mark.asyncio
+async def test_mock_fill_emits_trade_before_order():
+    """
+    集成测试: 撮合成交先推送 TradeData (实际成交价 + 手续费)，再推送订单终态
+    """
+    engine = EventEngine()
+    engine.start()
+    mock = MockExchangeAdapter(engine, config={"latency_ms": 10, "tick_interval": 0.05, "fee_rate": 0.001})
+    await mock.connect()
+    await mock.subscribe(["BTC-USDT-SWAP"])
+
+    seen = []
+    engine.register(EventType.TRADE, lambda e: seen.append(("trade", e.data)))
+    engine.register(EventType.ORDER_STATUS, lambda e: seen.append(("order", e.data)))
+
+    req = OrderRequest(
+        symbol="BTC-USDT-SWAP", exchange=Exchange.MOCK, direction=Direction.LONG,
+        offset=Offset.OPEN, type=OrderType.LIMIT, price=20000.0, volume=2.0
+    )
+    order_id = await mock.send_order(req)
+    await asyncio.sleep(0.5)
+
+    kinds = [k for k, _ in seen]
+    assert kinds == ["order", "trade", "order"]
+    trade = seen[1][1]
+    assert trade.order_id == order_id
+    assert (trade.price, trade.volume) == (20000.0, 2.0)
+    assert trade.fee == pytest.approx(40.0)
+    assert seen[2][1].status == OrderStatus.FILLED
+
+    # 同一 trade_id 重复推送被丢弃
+    assert not mock._emit_trade(trade)
+    assert mock.duplicate_trades == 1
+
+    await mock.close()
+    engine.stop()
@@ -0,0 +1,137 @@
+import pytest
+import asyncio
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.types import OrderData, OrderStatus, Direction, Offset, OrderType, Exchange
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.strategy.demo import DemoStrategy
+from quant_system.strategy.reconciler import Reconciler
+
+class CountingMock(MockExchangeAdapter):
+    """记录 REST 查询次数与参数的 Mock"""
+    def __init__(self, engine):
+        super().__init__(engine, config={"latency_ms": 10})
+        self.queries = []
+
+    async def query_position(self, symbols=None):
+        self.queries.append(("position", symbols))
+        return await super().query_position(symbols)
+
+    async def query_open_orders(self, symbols=None):
+        self.queries.append(("orders", symbols))
+        return await super().query_open_orders(symbols)
+
+class IdleStrategy(DemoStrategy):
+    def on_tick(self, tick):
+        pass
+
+def make_order(order_id: str, symbol: str, traded: float, status: OrderStatus) -> OrderData:
+    return OrderData(
+        symbol=symbol, exchange=Exchange.MOCK,
+        order_id=order_id, exchange_order_id="",
+        direction=Direction.LONG, offset=Offset.OPEN, type=OrderType.LIMIT,
+        price=100, volume=2, traded=traded,
+        status=status, timestamp=0
+    )
+
+@pytest.mark.asyncio
+async def test_recovery_debounced_and_shared():
+    """
+    集成测试: 抖动连接下的多次 RECOVERY 只触发一次查询，且结果扇出给所有策略
+    """
+    engine = EventEngine()
+    engine.start()
+    mock = CountingMock(engine)
+    await mock.connect()
+
+    s1 = IdleStrategy(engine, mock, ["BTC-USDT-SWAP"])
+    s2 = IdleStrategy(engine, mock, ["ETH-USDT-SWAP"])
+    await s1.start()
+    await s2.start()
+
+    reconciler = Reconciler.for_exchange(engine, mock)
+    reconciler.debounce = 0.05
+    assert s1.reconciler is s2.reconciler is reconciler
+
+    for _ in range(5):
+        engine.put(Event(EventType.RECOVERY, None))
+    await asyncio.sleep(0.3)
+
+    # 一次对账 = 一次持仓查询 + 一次挂单查询，且只包含策略关心的 symbols
+    assert reconciler.runs == 1
+    assert len(mock.queries) == 2
+    for _, symbols in mock.queries:
+        assert sorted(symbols) == ["BTC-USDT-SWAP", "ETH-USDT-SWAP"]
+
+    await s1.stop()
+    await s2.stop()
+    await mock.close()
+    engine.stop()
+
+def test_open_orders_diff_keeps_history():
+    """单元: 增量对账只改动有变化的订单，并保留消失订单的历史成交"""
+    engine = EventEngine()
+    mock = MockExchangeAdapter(engine)
+    strategy = IdleStrategy(engine, mock, ["BTC-USDT-SWAP"])
+
+    unchanged = make_order("a", "BTC-USDT-SWAP", 0, OrderStatus.SUBMITTED)
+    vanished = make_order("b", "BTC-USDT-SWAP", 1, OrderStatus.PARTIALLY_FILLED)
+    for o in (unchanged, vanished):
+        strategy.orders[o.order_id] = o
+        strategy.active_orders[o.order_id] = o
+
+    remote = [
+        make_order("a", "BTC-USDT-SWAP", 0, OrderStatus.SUBMITTED),         # 未变化
+        make_order("c", "BTC-USDT-SWAP", 1, OrderStatus.PARTIALLY_FILLED),  # 新出现
+        make_order("d", "ETH-USDT-SWAP", 0, OrderStatus.SUBMITTED),         # 不属于本策略
+    ]
+    strategy._reconcile_open_orders(remote)
+
+    assert strategy.active_orders["a"] is unchanged
+    assert "c" in strategy.active_orders
+    assert "d" not in strategy.orders
+    assert "b" not in strategy.active_orders
+    assert strategy.orders["b"].traded == 1
+
+class FlakyMock(CountingMock):
+    """挂单查询失败一次的 Mock"""
+    fail = True
+
+    async def query_open_orders(self, symbols=None):
+        if self.fail:
+            self.fail = False
+            raise ConnectionError("rate limited")
+        return await super().query_open_orders(symbols)
+
+@pytest.mark.asyncio
+async def test_failed_query_skips_round():
+    """查询失败时不下发空结果 (策略的挂单保持不变)，之后的 RECOVERY 正常对账"""
+    engine = EventEngine()
+    engine.start()
+    mock = FlakyMock(engine)
+    await mock.connect()
+
+    strategy = IdleStrategy(engine, mock, ["BTC-USDT-SWAP"])
+    other = IdleStrategy(engine, mock, ["BTC-USDT-SWAP"])
+    await strategy.start()
+    await other.start()
+    order = make_order("a", "BTC-USDT-SWAP", 0, OrderStatus.SUBMITTED)
+    strategy.orders["a"] = order
+    strategy.active_orders["a"] = order
+
+    reconciler = Reconciler.for_exchange(engine, mock)
+    reconciler.debounce = 0.05
+    engine.put(Event(EventType.RECOVERY, None))
+    await asyncio.sleep(0.2)
+    assert reconciler.failures == 1
+    assert strategy.active_orders == {"a": order}
+    assert mock.queries[0] == ("position", ["BTC-USDT-SWAP"])
+
+    engine.put(Event(EventType.RECOVERY, None))
+    await asyncio.sleep(0.2)
+    assert reconciler.runs == 2 and reconciler.failures == 1
+    assert "a" not in strategy.active_orders # 交易所确认已不存在
+
+    await strategy.stop()
+    await other.stop()
+    await mock.close()
+    engine.stop()
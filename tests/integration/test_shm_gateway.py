@@ -0,0 +1,88 @@
+import pytest
+import asyncio
+import uuid
+from quant_system.core.event import EventEngine
+from quant_system.exchange.factory import create_exchange
+from quant_system.ipc.gateway import MarketDataGateway
+from quant_system.strategy.base import BaseStrategy
+
+class RecordingStrategy(BaseStrategy):
+    def __init__(self, engine, exchange, symbols):
+        super().__init__(engine, exchange, symbols)
+        self.ticks = []
+
+    def on_tick(self, tick):
+        self.ticks.append(tick)
+
+@pytest.mark.asyncio
+async def test_gateway_to_shm_adapter():
+    """
+    集成测试: Mock 行情 -> 网关 -> 共享内存 -> ShmExchangeAdapter -> 策略
+    交易委托给仅交易模式的 Mock，并按共享内存中的行情撮合
+    """
+    ring = f"tws_test_{uuid.uuid4().hex[:8]}"
+    symbols = ["BTC-USDT-SWAP", "ETH-USDT-SWAP"]
+    gateway = MarketDataGateway({"name": "mock"}, symbols, ring_name=ring, capacity=64)
+    await gateway.start()
+
+    engine = EventEngine()
+    engine.start()
+    exchange = create_exchange(engine, {
+        "name": "shm", "ring": ring,
+        "trading": {"name": "mock", "latency_ms": 20},
+    })
+    try:
+        await exchange.connect()
+        strategy = RecordingStrategy(engine, exchange, ["BTC-USDT-SWAP"])
+        await strategy.start()
+
+        await asyncio.sleep(1.2)
+        assert gateway.published >= 4
+        assert strategy.ticks
+        assert {t.symbol for t in strategy.ticks} == {"BTC-USDT-SWAP"}
+
+        await strategy.set_target_position(1.0, "BTC-USDT-SWAP", 1e9)
+        await asyncio.sleep(1.2)
+        assert strategy.get_pos("BTC-USDT-SWAP") == 1.0
+        # 订单回报统计与跟踪器来自交易连接
+        assert exchange.order_tracker is exchange.trading.order_tracker
+        assert exchange.order_stream_stats() == exchange.trading.order_stream_stats()
+        assert exchange.order_stream_stats()["dispatched"] >= 2
+
+        await strategy.stop()
+    finally:
+        await exchange.close()
+        engine.stop()
+        await gateway.stop()
+
+@pytest.mark.asyncio
+async def test_gateway_restart_reattaches():
+    """网关重启 (共享内存被重建) 后读端自动附加到新段，策略继续收到行情"""
+    ring = f"tws_test_{uuid.uuid4().hex[:8]}"
+    symbols = ["BTC-USDT-SWAP"]
+    gateway = MarketDataGateway({"name": "mock"}, symbols, ring_name=ring, capacity=64)
+    await gateway.start()
+
+    engine = EventEngine()
+    engine.start()
+    exchange = create_exchange(engine, {"name": "shm", "ring": ring, "reattach_interval": 0.1})
+    try:
+        await exchange.connect()
+        strategy = RecordingStrategy(engine, exchange, symbols)
+        await strategy.start()
+        await asyncio.sleep(1.2)
+        assert strategy.ticks
+
+        await gateway.stop()
+        gateway = MarketDataGateway({"name": "mock"}, symbols, ring_name=ring, capacity=64)
+        await gateway.start()
+        strategy.ticks.clear()
+        await asyncio.sleep(1.5)
+        assert exchange._reader.reattaches == 1
+        assert strategy.ticks
+
+        await strategy.stop()
+    finally:
+        await exchange.close()
+        engine.stop()
+        await gateway.stop()
@@ -0,0 +1,113 @@
+import pytest
+
+from quant_system.core.bar import BarAggregator, parse_timeframe, TIME, TICKS, VOLUME
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.types import BarData, Exchange, TickData
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.strategy.base import BaseStrategy
+
+def tick(ts: float, price: float, volume: float = 1.0, symbol: str = "BTC") -> Event:
+    return Event(EventType.TICK, TickData(
+        symbol=symbol, exchange=Exchange.MOCK, timestamp=ts, last_price=price,
+        volume=volume, bid_price_1=price, ask_price_1=price))
+
+def make_engine():
+    """同步驱动: 直接调用 _process，推送的 BAR 事件收集到列表"""
+    engine = EventEngine()
+    bars = []
+    engine.put = lambda event: bars.append(event.data)
+    return engine, bars
+
+def test_parse_timeframe():
+    assert parse_timeframe("1m") == (TIME, 60)
+    assert parse_timeframe("4h") == (TIME, 14400)
+    assert parse_timeframe("100t") == (TICKS, 100)
+    assert parse_timeframe("0.5v") == (VOLUME, 0.5)
+    for bad in ("", "m", "0m", "1x", "abc"):
+        with pytest.raises(ValueError):
+            parse_timeframe(bad)
+
+def test_time_bars_close_on_next_interval_and_sweep():
+    engine, bars = make_engine()
+    agg = BarAggregator(engine)
+    agg.acquire("BTC", "1m")
+    for ts, price in [(60.5, 100.0), (70.0, 103.0), (80.0, 99.0), (119.9, 101.0)]:
+        engine._process(tick(ts, price))
+    assert bars == [] and agg.current("BTC", "1m").close == 101.0
+
+    engine._process(tick(245.0, 102.0)) # 跳过两个无成交区间: 只收盘一根
+    assert bars == [BarData("BTC", Exchange.MOCK, "1m", 60.0, 120.0, 100.0, 103.0, 99.0, 101.0, 4.0, 4)]
+
+    assert agg.sweep(now=300.5) == 0 # grace 内不收盘
+    assert agg.sweep(now=301.0) == 1
+    assert bars[-1].start == 240.0 and bars[-1].close == 102.0 and bars[-1].count == 1
+    # 迟到的 tick 计入下一个区间，不会重开已收盘的区间
+    engine._process(tick(299.0, 98.0))
+    assert agg.current("BTC", "1m").start == 300.0 and agg.late_ticks == 1
+    assert agg.history("BTC", "1m") == bars
+
+def test_tick_and_volume_bars_with_cumulative_volume():
+    engine, bars = make_engine()
+    agg = BarAggregator(engine, cumulative_volume=True)
+    agg.acquire("BTC", "3t")
+    agg.acquire("BTC", "10v")
+    # 24h 累计量: 1000 (基准) -> +4 -> +6 -> 回落 (窗口滚动，记 0) -> +5
+    for i, (price, cum) in enumerate([(1.0, 1000.0), (2.0, 1004.0), (3.0, 1010.0), (4.0, 1008.0), (5.0, 1013.0)]):
+        engine._process(tick(float(i), price, cum))
+    by_tf = {tf: [b for b in bars if b.timeframe == tf] for tf in ("3t", "10v")}
+    assert [(b.open, b.close, b.count, b.volume) for b in by_tf["3t"]] == [(1.0, 3.0, 3, 10.0)]
+    assert [(b.open, b.high, b.close, b.volume, b.start, b.end) for b in by_tf["10v"]] == [(1.0, 3.0, 3.0, 10.0, 0.0, 2.0)]
+    assert agg.current("BTC", "3t").volume == 5.0 and agg.current("BTC", "10v").count == 2
+
+class BarStrategy(BaseStrategy):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.seen = []
+
+    def on_tick(self, tick):
+        pass
+
+    def on_bar(self, bar):
+        self.seen.append((bar.symbol, bar.timeframe, bar.close))
+
+class BackfillExchange(MockExchangeAdapter):
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.queries = []
+
+    async def query_bars(self, symbol, timeframe, limit=100):
+        self.queries.append((symbol, timeframe, limit))
+        # 最后一根尚未结束，不进入历史
+        return [BarData(symbol, Exchange.MOCK, timeframe, t, t + 60, 1.0, 1.0, 1.0, 1.0) for t in (0.0, 60.0, 1e12)]
+
+@pytest.mark.asyncio
+async def test_series_shared_across_strategies():
+    """同一 (symbol, timeframe) 只合成一次: 多个策略共用 series，回填只查询一次"""
+    engine = EventEngine()
+    exchange = BackfillExchange(engine)
+    fast = type("Fast", (BarStrategy,), {"bar_timeframes": ("1m", "2t"), "bar_backfill": 50})(engine, exchange, ["BTC", "ETH"])
+    slow = type("Slow", (BarStrategy,), {"bar_timeframes": ("1m",), "bar_backfill": 50})(engine, exchange, ["BTC"])
+    await fast.start()
+    await slow.start()
+
+    agg = fast.bars
+    assert slow.bars is agg and agg.stats()["series"] == 4
+    assert sorted(exchange.queries) == [("BTC", "1m", 50), ("ETH", "1m", 50)]
+    assert [b.start for b in slow.get_bars("BTC", "1m")] == [0.0, 60.0]
+
+    for ts, price in [(120.0, 10.0), (130.0, 11.0), (180.0, 12.0)]:
+        engine._process(tick(ts, price))
+    events = []
+    engine.put = events.append
+    engine._process(tick(240.0, 13.0))
+    for e in events:
+        engine._process(e)
+    # 240s 的 tick 同时收盘 1m (180s 区间) 与 2t; 每个策略只收到自己订阅的周期
+    assert fast.seen == [("BTC", "1m", 12.0), ("BTC", "2t", 13.0)]
+    assert slow.seen == [("BTC", "1m", 12.0)]
+    assert agg.bars_emitted == 4 and len(agg.history("BTC", "1m")) == 4
+
+    await slow.stop()
+    assert agg.stats()["series"] == 4 # fast 仍在使用 BTC 1m
+    await fast.stop()
+    assert agg.stats()["series"] == 0 and not engine._symbol_handlers
@@ -0,0 +1,150 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from quant_system.core.checkpoint import Checkpoint
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.signal import SignalRegistry, DualMASignal, DualMA, ZScore
+from quant_system.core.types import Exchange, TickData
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.strategy.dual_ma import DualMAStrategy
+from quant_system.strategy.dynamic_demo import DynamicRebalanceStrategy
+from quant_system.strategy.warmup import WarmupService
+
+def tick(price: float, symbol: str = "BTC") -> Event:
+    return Event(EventType.TICK, TickData(
+        symbol=symbol, exchange=Exchange.MOCK, timestamp=0.0, last_price=price,
+        volume=1.0, bid_price_1=price, ask_price_1=price))
+
+def prices(n: int, seed: int = 3):
+    rng = random.Random(seed)
+    p = [100.0]
+    for _ in range(n - 1):
+        p.append(p[-1] + rng.choice([-1.0, -0.5, 0.5, 1.0]))
+    return p
+
+def build(engine=None):
+    registry = SignalRegistry(engine or EventEngine())
+    return registry, registry.acquire(DualMA, "BTC", 5, 20), registry.acquire(ZScore, "BTC", 20)
+
+def test_vectorized_warmup_matches_tick_replay():
+    history = prices(300)
+    live, dual, z = build()
+    for p in history:
+        live.engine._process(tick(p))
+
+    warm, dual2, z2 = build()
+    assert warm.lookback("BTC") == 20
+    warm.warmup("BTC", np.array(history))
+    assert warm.lookback("BTC") == 0 and dual2.ready and z2.ready
+    assert dual2.value == dual.value
+    assert z2.value == pytest.approx(z.value, rel=1e-9)
+
+    signal = DualMASignal(5, 20)
+    for p in history:
+        signal.on_tick(tick(p).data)
+    fresh = DualMASignal(5, 20)
+    fresh.warmup(np.array(history))
+    assert fresh.value == signal.value and list(fresh.prices) == list(signal.prices)
+
+def test_signal_state_roundtrip():
+    """检查点恢复后的后续求值与不中断运行一致"""
+    history = prices(200)
+    live, dual, z = build()
+    for p in history[:120]:
+        live.engine._process(tick(p))
+    states = json.loads(json.dumps(live.snapshot(["BTC"])))
+
+    restored, dual2, z2 = build()
+    assert restored.restore(states) == len(restored)
+    for p in history[120:]:
+        live.engine._process(tick(p))
+        restored.engine._process(tick(p))
+        assert dual2.value == dual.value
+        assert z2.value == pytest.approx(z.value, rel=1e-9)
+
+def test_checkpoint_file(tmp_path):
+    cp = Checkpoint(str(tmp_path), "acc.demo", max_age=60)
+    assert cp.load() is None
+    cp.save({"strategy": {"level": 2}})
+    snap = cp.load()
+    assert snap["state"] == {"strategy": {"level": 2}} and cp.is_fresh(snap)
+    with open(cp.path, "w") as f:
+        f.write('{"ts": 1, "sta') # 写了一半: 忽略
+    assert cp.load() is None
+    assert Checkpoint.from_config({}, "x") is None
+
+class WarmDualMA(DualMAStrategy):
+    warmup_timeframe = "1m"
+
+class CountingMock(MockExchangeAdapter):
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.bar_queries = []
+
+    async def query_bars(self, symbol, timeframe, limit=100):
+        self.bar_queries.append((symbol, timeframe, limit))
+        return await super().query_bars(symbol, timeframe, limit)
+
+@pytest.mark.asyncio
+async def test_strategy_ready_on_start_and_restores_from_checkpoint(tmp_path):
+    """首次启动: 从模拟交易所的历史 K 线预热; 重启: 由检查点恢复，不再拉取历史"""
+    engine = EventEngine()
+    exchange = CountingMock(engine)
+    strategy = WarmDualMA(engine, exchange, ["BTC-USDT-SWAP", "ETH-USDT-SWAP"])
+    strategy.checkpoint = Checkpoint(str(tmp_path), "acc.dual")
+    await strategy.start()
+    assert sorted(exchange.bar_queries) == [("BTC-USDT-SWAP", "1m", 10), ("ETH-USDT-SWAP", "1m", 10)]
+    assert all(h.ready for h in strategy.signals.values())
+    values = {s: h.value for s, h in strategy.signals.items()}
+    await strategy.stop()
+    assert strategy.checkpoint.saves == 1 and len(strategy.signal_registry) == 0
+
+    engine2 = EventEngine()
+    exchange2 = CountingMock(engine2)
+    restarted = WarmDualMA(engine2, exchange2, ["BTC-USDT-SWAP", "ETH-USDT-SWAP"])
+    restarted.checkpoint = Checkpoint(str(tmp_path), "acc.dual")
+    await restarted.start()
+    assert exchange2.bar_queries == []
+    assert {s: h.value for s, h in restarted.signals.items()} == values
+    await restarted.stop()
+
+    # 检查点过期: 只恢复策略状态，指标重新预热
+    stale = WarmDualMA(engine2, exchange2, ["BTC-USDT-SWAP"])
+    stale.checkpoint = Checkpoint(str(tmp_path), "acc.dual", max_age=-1)
+    await stale.start()
+    assert exchange2.bar_queries == [("BTC-USDT-SWAP", "1m", 10)]
+    await stale.stop()
+
+    # 默认不预热
+    cold = DualMAStrategy(engine2, exchange2, ["ETH-USDT-SWAP"])
+    await cold.start()
+    assert exchange2.bar_queries == [("BTC-USDT-SWAP", "1m", 10)]
+    assert not cold.signals["ETH-USDT-SWAP"].ready
+    await cold.stop()
+
+@pytest.mark.asyncio
+async def test_strategy_state_survives_restart(tmp_path):
+    engine = EventEngine()
+    strategy = DynamicRebalanceStrategy(engine, MockExchangeAdapter(engine), ["BTC"])
+    strategy.checkpoint = Checkpoint(str(tmp_path), "acc.dyn")
+    await strategy.start()
+    strategy.level, strategy.last_rebalance_price = -1, 98000.5
+    await strategy.stop()
+
+    restarted = DynamicRebalanceStrategy(engine, MockExchangeAdapter(engine), ["BTC"])
+    restarted.checkpoint = Checkpoint(str(tmp_path), "acc.dyn")
+    await restarted.start()
+    assert (restarted.level, restarted.last_rebalance_price, restarted.is_running) == (-1, 98000.5, True)
+    await restarted.stop()
+
+@pytest.mark.asyncio
+async def test_warmup_private_signals():
+    engine = EventEngine()
+    exchange = MockExchangeAdapter(engine)
+    signals = {"BTC": DualMASignal(3, 8), "ETH": DualMASignal(2, 4)}
+    counts = await WarmupService(exchange).warmup_signals(signals)
+    assert counts == {"BTC": 8, "ETH": 4}
+    assert len(signals["BTC"].prices) == 8 and signals["ETH"].value in (1.0, -1.0)
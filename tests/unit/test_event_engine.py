@@ -60,3 +60,28 @@ async def test_async_handler():
         pytest.fail("Async handler failed to trigger")
 
     engine.stop()
+
+def test_symbol_routing():
+    """按 symbol 订阅的回调只收到该 symbol 的事件; 全量订阅者照常收到全部"""
+    engine = EventEngine()
+    seen = {"all": [], "A": [], "B": []}
+
+    class Payload:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+    engine.register(EventType.TICK, lambda e: seen["all"].append(e.data.symbol))
+    engine.register(EventType.TICK, lambda e: seen["A"].append(e.data.symbol), "A")
+    handler_b = lambda e: seen["B"].append(e.data.symbol)
+    engine.register(EventType.TICK, handler_b, "B")
+    engine.register(EventType.TICK, handler_b, "B") # 重复注册被忽略
+
+    for symbol in ("A", "B", "C", "B"):
+        engine._process(Event(EventType.TICK, Payload(symbol)))
+    engine._process(Event(EventType.TICK, None)) # 无 symbol 的载荷只分发给全量订阅者
+    assert seen == {"all": ["A", "B", "C", "B"], "A": ["A"], "B": ["B", "B"]}
+
+    engine.unregister(EventType.TICK, handler_b, "B")
+    engine._process(Event(EventType.TICK, Payload("B")))
+    assert seen["B"] == ["B", "B"]
+    assert (EventType.TICK, "B") not in engine._symbol_handlers
@@ -0,0 +1,22 @@
+import asyncio
+import sys
+import pytest
+from quant_system.utils.loop import run, select_loop
+
+def test_default_and_unknown_policy_use_asyncio():
+    assert select_loop(None) == ("asyncio", None)
+    assert select_loop("asyncio") == ("asyncio", None)
+    assert select_loop("trio") == ("asyncio", None)
+
+def test_uvloop_falls_back_when_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "uvloop", None) # import uvloop -> ImportError
+    assert select_loop("uvloop") == ("asyncio", None)
+
+def test_run_uses_selected_loop():
+    pytest.importorskip("uvloop")
+
+    async def loop_type():
+        return type(asyncio.get_running_loop()).__module__
+
+    assert run(loop_type(), "uvloop").startswith("uvloop")
+    assert run(loop_type(), "asyncio").startswith("asyncio")
@@ -0,0 +1,63 @@
+import random
+from decimal import Decimal, ROUND_HALF_EVEN
+
+import numpy as np
+import pytest
+
+from quant_system.core.fixed import tick_fraction, to_ticks, from_ticks, to_ticks_array, from_ticks_array
+from quant_system.core.types import Instrument, Exchange, ProductType
+
+TICKS = ["0.1", "0.01", "0.0001", "0.00000001", "0.5", "0.25", "0.005", "1", "5", "10", "0.0000025"]
+
+def decimal_ticks(value: float, tick: str) -> int:
+    return int((Decimal(repr(value)) / Decimal(tick)).to_integral_value(ROUND_HALF_EVEN))
+
+def samples(tick: str, rng: random.Random, n: int = 400):
+    """随机值 + 刻意构造的半格/网格点 (最容易出错的位置)"""
+    t = Decimal(tick)
+    out = []
+    for _ in range(n):
+        k = rng.randint(0, 10 ** 7)
+        out.append(float(k * t))                         # 网格点
+        out.append(float(k * t + t / 2))                 # 恰好半格
+        out.append(rng.uniform(0, 10 ** 6) * float(t))   # 任意值
+    return out
+
+def test_tick_fraction():
+    assert tick_fraction(0.1) == (1, 10)
+    assert tick_fraction(0.25) == (25, 100)
+    assert tick_fraction(5.0) == (5, 1)
+    assert tick_fraction(1e-8) == (1, 10 ** 8)
+    assert tick_fraction(0.0) == (0, 1)
+
+@pytest.mark.parametrize("tick", TICKS)
+def test_quantization_matches_decimal(tick):
+    """性质: to_ticks == Decimal 五成双取整; from_ticks == float(n * tick) (正确舍入)"""
+    rng = random.Random(tick)
+    units, scale = tick_fraction(float(tick))
+    values = samples(tick, rng)
+    expected = [decimal_ticks(v, tick) for v in values]
+
+    assert [to_ticks(v, units, scale) for v in values] == expected
+    assert to_ticks_array(np.array(values), units, scale).tolist() == expected
+    for n in expected:
+        assert from_ticks(n, units, scale) == float(n * Decimal(tick))
+    assert from_ticks_array(np.array(expected), units, scale).tolist() == [float(n * Decimal(tick)) for n in expected]
+
+def test_instrument_rounding_is_exact():
+    inst = Instrument(symbol="X", exchange=Exchange.OKX, product_type=ProductType.PERP,
+                      contract_size=1.0, price_tick=0.1, volume_tick=0.01)
+    assert inst.round_price(0.3) == 0.3                  # 旧实现: 0.30000000000000004
+    assert inst.round_price(95000.123) == 95000.1
+    assert inst.round_volume(0.07) == 0.07
+    assert inst.price_to_ticks(0.3) == 3 and inst.ticks_to_price(3) == 0.3
+    assert inst.volume_to_lots(1.005) == 100             # 1.005 的 float 略小于半格
+    # 同一网格上的价格比较即整数比较
+    assert inst.price_to_ticks(100.2) > inst.price_to_ticks(100.14999)
+
+def test_array_per_element_fractions():
+    """订单批次: 每个元素有自己的步长"""
+    units = np.array([1, 25, 0])
+    scale = np.array([10, 100, 1])
+    lots = to_ticks_array(np.array([0.35, 0.375, 7.7]), units, scale)
+    assert lots.tolist() == [4, 2, 0] # 0.35 的 float 略大于半格 -> 4; 0.375/0.25 = 1.5 -> 2; 无步长 -> 0
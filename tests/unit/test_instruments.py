@@ -0,0 +1,61 @@
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.instruments import InstrumentRegistry, SlotIndex
+from quant_system.core.types import Instrument, Exchange, ProductType, TickData
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.strategy.base import BaseStrategy
+
+def make_inst(symbol: str) -> Instrument:
+    return Instrument(symbol=symbol, exchange=Exchange.MOCK, product_type=ProductType.PERP,
+                      contract_size=1.0, price_tick=0.1)
+
+class RecordingStrategy(BaseStrategy):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ticks = []
+
+    def on_tick(self, tick):
+        self.ticks.append(tick.symbol)
+
+def test_registry_assigns_dense_stable_ids():
+    reg = InstrumentRegistry()
+    assert reg.intern("B") == 0
+    reg["A"] = make_inst("A")
+    assert reg.add(make_inst("B")) == 0 # 已分配的 ID 不变
+    assert reg.intern("C") == 2
+    assert reg.symbols == ["B", "A", "C"]
+    assert reg.by_id(0).symbol == "B" and reg.by_id(2) is None
+    # 仍是 symbol -> Instrument 的 dict (只含有元数据的合约)
+    assert set(reg) == {"A", "B"} and "C" not in reg and reg.get("A").symbol == "A"
+
+def test_slot_index():
+    index = SlotIndex()
+    index.bind(5, 0)
+    index.bind(-1, 3) # 未分配的 ID 被忽略
+    assert index.get(5) == 0
+    assert index.get(2) == -1 and index.get(99) == -1 and index.get(-1) == -1
+
+def test_ids_flow_from_adapter_to_position_book():
+    """适配器写入 instrument_id，共享注册表的账户之间 ID 一致，策略按 ID 定位持仓 slot"""
+    engine = EventEngine()
+    feed = MockExchangeAdapter(engine, config={"instruments": {"X": {"price_tick": 0.1}, "Y": {"price_tick": 0.1}}})
+    account = MockExchangeAdapter(engine)
+    account.share_instruments(feed)
+    assert account.instruments is feed.instruments
+
+    strategy = RecordingStrategy(engine, account, ["Y"])
+    iid = account.instruments.intern("Y")
+    strategy.positions.bind_id("Y", iid)
+    assert strategy.positions.locate(iid, "Y") == strategy.positions.slot("Y")
+
+    strategy._on_tick_wrapper(Event(EventType.TICK, TickData(
+        symbol="Y", exchange=Exchange.MOCK, timestamp=1.0, last_price=101.0,
+        volume=1.0, bid_price_1=100.5, ask_price_1=101.5, instrument_id=iid)))
+    # 未带 ID 的行情退回按 symbol 查找; 不在簿内的合约被忽略
+    strategy._on_tick_wrapper(Event(EventType.TICK, TickData(
+        symbol="Y", exchange=Exchange.MOCK, timestamp=2.0, last_price=102.0,
+        volume=1.0, bid_price_1=101.5, ask_price_1=102.5)))
+    strategy._on_tick_wrapper(Event(EventType.TICK, TickData(
+        symbol="X", exchange=Exchange.MOCK, timestamp=3.0, last_price=1.0,
+        volume=1.0, bid_price_1=1.0, ask_price_1=1.0, instrument_id=feed.instruments.intern("X"))))
+    assert strategy.ticks == ["Y", "Y"]
+    assert strategy.positions.last_price[strategy.positions.slot("Y")] == 102.0
@@ -0,0 +1,43 @@
+from quant_system.core.types import (
+    OrderRequest, OrderData, PositionData, Instrument,
+    Exchange, Direction, Offset, OrderType, OrderStatus, ProductType
+)
+from quant_system.ipc import protocol as P
+from quant_system.ipc.protocol import Packer, Unpacker
+
+def _roundtrip(items, pack_item, unpack_item):
+    p = Packer()
+    P.pack_list(p, items, pack_item)
+    return P.unpack_list(Unpacker(bytes(p.buf)), unpack_item)
+
+def test_request_roundtrip():
+    reqs = [
+        OrderRequest(symbol="BTC/USDT:USDT", exchange=Exchange.OKX, direction=Direction.SHORT,
+                     type=OrderType.LIMIT, volume=0.25, price=95000.1, offset=Offset.CLOSE,
+                     client_order_id="abc123"),
+        OrderRequest(symbol="ETH/USDT:USDT", exchange=Exchange.MOCK, direction=Direction.LONG,
+                     type=OrderType.MARKET, volume=3.0),
+    ]
+    assert _roundtrip(reqs, P.pack_request, P.unpack_request) == reqs
+
+def test_order_position_instrument_roundtrip():
+    order = OrderData(
+        symbol="BTC/USDT:USDT", exchange=Exchange.OKX, order_id="id-1", exchange_order_id="998877",
+        direction=Direction.LONG, offset=Offset.OPEN, type=OrderType.LIMIT,
+        price=100.5, volume=2.0, traded=1.0, status=OrderStatus.PARTIALLY_FILLED, timestamp=1700000000.25
+    )
+    pos = PositionData(symbol="BTC/USDT:USDT", exchange=Exchange.OKX, direction=Direction.SHORT,
+                       volume=1.5, price=99.0, pnl=-3.0, frozen=0.5)
+    inst = Instrument(symbol="BTC/USDT:USDT", exchange=Exchange.OKX, product_type=ProductType.PERP,
+                      contract_size=0.01, price_tick=0.1, min_volume=0.01, volume_tick=0.01)
+
+    assert _roundtrip([order], P.pack_order, P.unpack_order) == [order]
+    assert _roundtrip([pos], P.pack_position, P.unpack_position) == [pos]
+    assert _roundtrip([inst], P.pack_instrument, P.unpack_instrument) == [inst]
+
+def test_request_encoding_is_compact():
+    p = Packer()
+    P.pack_request(p, OrderRequest(symbol="BTC/USDT:USDT", exchange=Exchange.OKX, direction=Direction.LONG,
+                                   type=OrderType.LIMIT, volume=1.0, price=1.0))
+    # 1+13 (symbol) + 1 (empty client id) + 4 enums + 2 doubles
+    assert len(p.buf) == 35
@@ -0,0 +1,124 @@
+import os
+
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.journal import Journal, RecordType, encode_record, decode_records
+from quant_system.core.types import (
+    OrderData, OrderRequest, TradeData, OrderStatus, Direction, Offset, OrderType, Exchange
+)
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.strategy.base import BaseStrategy
+
+SYMBOL = "BTC-USDT-SWAP"
+
+class IdleStrategy(BaseStrategy):
+    def on_tick(self, tick):
+        pass
+
+def make_order(order_id: str, traded: float, status: OrderStatus, offset: Offset = Offset.OPEN) -> OrderData:
+    return OrderData(
+        symbol=SYMBOL, exchange=Exchange.MOCK, order_id=order_id, exchange_order_id="",
+        direction=Direction.LONG, offset=offset, type=OrderType.LIMIT,
+        price=100.0, volume=2.0, traded=traded, status=status, timestamp=1.0
+    )
+
+def test_record_roundtrip_and_torn_tail():
+    req = OrderRequest(symbol=SYMBOL, exchange=Exchange.OKX, direction=Direction.SHORT,
+                       type=OrderType.LIMIT, volume=1.5, price=99.0, offset=Offset.CLOSE)
+    trade = TradeData(symbol=SYMBOL, exchange=Exchange.OKX, order_id="o1", trade_id="t1",
+                      direction=Direction.LONG, offset=Offset.OPEN, price=100.0, volume=0.5, timestamp=2.0)
+    order = make_order("o1", 1.0, OrderStatus.PARTIALLY_FILLED)
+    data = (
+        encode_record(RecordType.REQUEST, ("o1", req))
+        + encode_record(RecordType.ORDER, order)
+        + encode_record(RecordType.TRADE, trade)
+    )
+
+    records, valid = decode_records(data)
+    assert valid == len(data)
+    assert records == [(RecordType.REQUEST, ("o1", req)), (RecordType.ORDER, order), (RecordType.TRADE, trade)]
+
+    # 写了一半的尾部 / 损坏的记录在恢复时被丢弃
+    torn = data + encode_record(RecordType.ORDER, order)[:-3]
+    records, valid = decode_records(torn)
+    assert len(records) == 3 and valid == len(data)
+
+    corrupt = bytearray(data)
+    corrupt[-1] ^= 0xFF
+    records, _ = decode_records(bytes(corrupt))
+    assert len(records) == 2
+
+def test_recover_truncates_torn_segment(tmp_path):
+    journal = Journal(str(tmp_path), "acc")
+    journal.open()
+    journal.record_order(make_order("o1", 0, OrderStatus.SUBMITTED))
+    journal.close()
+
+    path = journal._segment_path(0)
+    with open(path, "ab") as f:
+        f.write(b"\x10\x00\x00")
+
+    reopened = Journal(str(tmp_path), "acc")
+    _, records = reopened.recover()
+    assert len(records) == 1
+    assert os.path.getsize(path) == len(encode_record(RecordType.ORDER, records[0][1]))
+    reopened.open()
+    reopened.close()
+    assert os.path.exists(reopened._segment_path(1))
+
+def test_strategy_restores_from_snapshot_and_tail(tmp_path):
+    """快照 + 尾部重放后，持仓簿、挂单与冻结/在途数量与崩溃前一致 (按订单累计成交量记账)"""
+    engine = EventEngine()
+    mock = MockExchangeAdapter(engine, config={"emit_trades": False})
+    strategy = IdleStrategy(engine, mock, [SYMBOL])
+    strategy.journal = Journal(str(tmp_path), "acc", snapshot_every=2)
+    assert strategy.restore_from_journal() == 0
+
+    updates = [
+        make_order("a", 0, OrderStatus.SUBMITTED),
+        make_order("a", 2, OrderStatus.FILLED),             # 第 2 条触发快照
+        make_order("b", 0, OrderStatus.SUBMITTED),
+        make_order("c", 1, OrderStatus.PARTIALLY_FILLED),
+        make_order("d", 1, OrderStatus.PARTIALLY_FILLED, Offset.CLOSE),
+    ]
+    for o in updates:
+        strategy._on_order_status_wrapper(Event(EventType.ORDER_STATUS, o))
+    strategy.journal.close() # 模拟崩溃: 停止时不再写快照
+    assert strategy.journal.snapshots == 2
+
+    restored = IdleStrategy(engine, mock, [SYMBOL])
+    restored.journal = Journal(str(tmp_path), "acc", snapshot_every=2)
+    assert restored.restore_from_journal() == 1 # 只重放最后一次快照之后的尾部
+    restored.journal.close()
+
+    book, old = restored.positions, strategy.positions
+    idx = book.slot(SYMBOL)
+    for field in ("long_volume", "long_price", "long_frozen", "long_pending", "short_volume", "realized_pnl"):
+        assert getattr(book, field)[idx] == getattr(old, field)[idx], field
+    assert restored.get_pos(SYMBOL) == 3.0
+    assert set(restored.active_orders) == {"b", "c", "d"}
+    assert restored.orders["a"].status == OrderStatus.FILLED
+    assert restored._restored
+
+def test_closed_orders_are_bounded(tmp_path):
+    """已结束订单只保留最近 max_closed_orders 个: self.orders 与快照不随历史订单数增长"""
+    engine = EventEngine()
+    mock = MockExchangeAdapter(engine, config={"emit_trades": False})
+    strategy = IdleStrategy(engine, mock, [SYMBOL])
+    strategy.max_closed_orders = 3
+
+    strategy._apply_order(make_order("live", 0, OrderStatus.SUBMITTED))
+    for i in range(10):
+        strategy._apply_order(make_order(f"f{i}", 2, OrderStatus.FILLED))
+    assert list(strategy.orders) == ["live", "f7", "f8", "f9"]
+    assert strategy.get_pos(SYMBOL) == 20.0
+
+    # 最近结束的订单收到迟到的重复回报: 不重复计入
+    strategy._apply_order(make_order("f9", 2, OrderStatus.FILLED))
+    assert strategy.get_pos(SYMBOL) == 20.0
+
+    state = strategy.snapshot_state()
+    assert [d["order_id"] for d in state["orders"]] == ["live", "f7", "f8", "f9"]
+    restored = IdleStrategy(engine, mock, [SYMBOL])
+    restored.max_closed_orders = 2
+    restored._restore_state(state)
+    assert list(restored.orders) == ["live", "f8", "f9"] and list(restored.active_orders) == ["live"]
@@ -0,0 +1,71 @@
+import json
+import logging
+import queue
+import pytest
+from quant_system.utils import logger as log_mod
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    log_mod.shutdown_logging()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    for h in handlers:
+        root.addHandler(h)
+    root.setLevel(level)
+
+def test_pipeline_writes_text_and_jsonl(tmp_path, root_logger):
+    pipeline = log_mod.setup_logging({"log_dir": str(tmp_path), "log_jsonl": True}, prefix="T")
+    log = logging.getLogger("Unit")
+    payload = {"v": 1}
+    log.info("Order %s @ %s", "id-1", 100.5)
+    log.debug("dropped by level %s", payload)
+    log.warning("state %s", payload, extra={"data": {"k": "v"}})
+    payload["v"] = 2 # 消息在入队时合并，之后修改参数不影响已记录内容
+    log_mod.shutdown_logging()
+
+    text = next(tmp_path.glob("T_*.log")).read_text(encoding="utf-8")
+    assert "[Unit] INFO: Order id-1 @ 100.5" in text
+    assert "dropped by level" not in text
+
+    lines = [json.loads(l) for l in next(tmp_path.glob("T_*.jsonl")).read_text().splitlines()]
+    assert [l["msg"] for l in lines] == ["Order id-1 @ 100.5", "state {'v': 1}"]
+    assert lines[1]["data"] == {"k": "v"}
+    assert pipeline.stats()["written"] == 2
+
+def test_batch_handler_rotates(tmp_path):
+    handler = log_mod.BatchFileHandler(str(tmp_path / "r.log"), maxBytes=200, backupCount=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    records = [logging.LogRecord("x", logging.INFO, __file__, 1, "m" * 50, None, None) for _ in range(10)]
+    handler.emit_batch(records)
+    handler.close()
+    assert (tmp_path / "r.log.1").exists() and (tmp_path / "r.log.2").exists()
+    assert not (tmp_path / "r.log.3").exists()
+    assert all(p.stat().st_size <= 200 for p in tmp_path.iterdir())
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = log_mod.DroppingQueueHandler(queue.Queue(maxsize=2))
+    for i in range(5):
+        handler.emit(logging.LogRecord("x", logging.INFO, __file__, 1, "m%d", (i,), None))
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().msg == "m0"
+
+def test_host_mode_logs_construction(tmp_path, root_logger, monkeypatch):
+    """--host: 日志管线在构建宿主之前安装，交易所/策略初始化的日志写入配置的日志文件"""
+    from quant_system import main as main_mod
+    config = {
+        "system": {"log_dir": str(tmp_path / "logs")},
+        "accounts": {"a": {"exchange": {"name": "mock"}, "strategy": {"name": "DualMA", "symbols": ["BTC-USDT-SWAP"]}}},
+    }
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    monkeypatch.setattr("sys.argv", ["tws", "--host", "--config", str(path)])
+    monkeypatch.setattr(main_mod.signal, "signal", lambda *args: None)
+    monkeypatch.setattr(main_mod, "run_loop", lambda coro, policy=None: coro.close())
+
+    main_mod.main()
+    log_mod.shutdown_logging()
+    text = next((tmp_path / "logs").glob("TWS_*.log")).read_text(encoding="utf-8")
+    assert "Strategy Initialized for ['BTC-USDT-SWAP']" in text
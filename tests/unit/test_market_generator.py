@@ -0,0 +1,67 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from quant_system.core.event import EventEngine, EventType
+from quant_system.exchange.generator import MarketDataGenerator
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+
+SYMBOLS = ["BTC-USDT-SWAP", "ETH-USDT-SWAP", "SOL-USDT-SWAP"]
+
+def test_block_is_seeded_and_well_formed():
+    a = MarketDataGenerator(seed=42).tick_block(SYMBOLS, 100, start=1000.0, interval=0.5, instrument_ids=[7, 8, 9])
+    b = MarketDataGenerator(seed=42).tick_block(SYMBOLS, 100, start=1000.0, interval=0.5, instrument_ids=[7, 8, 9])
+    assert a == b and len(a) == 300
+    assert [t.symbol for t in a[:4]] == SYMBOLS + SYMBOLS[:1]
+    assert (a[0].timestamp, a[3].timestamp, a[-1].timestamp) == (1000.0, 1000.5, 1049.5)
+    assert [t.instrument_id for t in a[:3]] == [7, 8, 9]
+    assert all(t.bid_price_1 < t.last_price < t.ask_price_1 and t.volume > 0 for t in a)
+    assert a[0].last_price == pytest.approx(10000.0, rel=0.01)
+    assert MarketDataGenerator(seed=43).tick_block(SYMBOLS, 100, start=1000.0) != a
+
+def test_gbm_with_jumps_statistics():
+    gen = MarketDataGenerator(seed=1, volatility=0.001, jump_intensity=0.01, jump_scale=0.02, spread_bps=2.0)
+    ticks = gen.tick_block(["X"], 100000)
+    last = np.array([t.last_price for t in ticks])
+    returns = np.diff(np.log(last))
+    # 扩散部分 + 跳跃: 方差约为 σ² + λ·s²，尾部远厚于正态
+    assert returns.var() == pytest.approx(0.001 ** 2 + 0.01 * 0.02 ** 2, rel=0.1)
+    assert np.mean(np.abs(returns) > 0.006) == pytest.approx(0.01, rel=0.25)
+    spread_bps = np.array([(t.ask_price_1 - t.bid_price_1) / t.last_price for t in ticks]) * 1e4
+    assert spread_bps.mean() == pytest.approx(2.0, rel=0.05) and spread_bps.min() >= 1.0 - 1e-9
+    assert np.mean([t.volume for t in ticks]) == pytest.approx(1.0, rel=0.1)
+
+def test_paths_continue_across_blocks_and_get_tick():
+    gen = MarketDataGenerator(seed=3, jump_intensity=0.0)
+    block = gen.tick_block(["BTC"], 50)
+    tick = gen.get_tick("BTC")
+    assert tick.last_price == pytest.approx(block[-1].last_price, rel=0.002)
+    history = gen.history("BTC", 20)
+    assert len(history) == 20 and history[-1] == tick.last_price
+    assert gen.history("BTC", 20) == history
+
+@pytest.mark.asyncio
+async def test_mock_streams_at_configured_rate():
+    """tick_rate: realtime 按墙钟限速; realtime=False 尽快推送，时间戳按目标速率推进"""
+    symbols = [f"S{i}-USDT-SWAP" for i in range(500)]
+    for realtime, rate in [(True, 20000.0), (False, 1000.0)]:
+        engine = EventEngine()
+        engine.start()
+        ticks = []
+        engine.register(EventType.TICK, lambda e: ticks.append(e.data))
+        mock = MockExchangeAdapter(engine, {"tick_rate": rate, "realtime": realtime, "generator": {"seed": 5}})
+        await mock.subscribe(symbols)
+        await mock.connect()
+        await asyncio.sleep(0.5)
+        await mock.close()
+        engine.stop()
+
+        if realtime:
+            assert 5000 <= len(ticks) <= 12000
+        else:
+            assert len(ticks) > 20000 # 远超墙钟下的 500 个
+            span = ticks[-1].timestamp - ticks[0].timestamp
+            assert span == pytest.approx(len(ticks) / rate, rel=0.05)
+        assert {t.symbol for t in ticks[:500]} == set(symbols)
+        assert ticks[0].instrument_id == mock.instruments.intern(ticks[0].symbol)
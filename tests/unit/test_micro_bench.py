@@ -0,0 +1,34 @@
+import json
+
+from benchmarks import micro
+
+def _data(results, calibration):
+    return {"host": {}, "results_ns": results, "calibration_ns": calibration}
+
+def test_compare_normalizes_by_calibration():
+    baseline = _data({"a": 100.0, "b": 100.0, "c": 100.0}, {"a": 1000.0, "b": 1000.0, "c": 1000.0})
+    # 机器整体慢一倍 (校准也慢一倍): a 不算退化; b 相对变慢 1.5 倍; c 变快; d 为新增
+    current = _data({"a": 200.0, "b": 300.0, "c": 100.0, "d": 5.0}, {"a": 2000.0, "b": 2000.0, "c": 2000.0, "d": 1.0})
+    rows = {r["name"]: r for r in micro.compare(current, baseline, threshold=0.25)}
+    assert (rows["a"]["ratio"], rows["a"]["status"]) == (1.0, "ok")
+    assert (rows["b"]["ratio"], rows["b"]["status"]) == (1.5, "REGRESSION")
+    assert rows["c"]["status"] == "IMPROVED" and rows["d"]["status"] == "NEW"
+    assert {r["name"]: r["status"] for r in micro.compare(current, baseline, raw=True)}["a"] == "REGRESSION"
+
+def test_run_save_compare_cli(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    args = ["-k", "state", "--min-time", "0.001", "--repeat", "2", "--baseline", str(baseline)]
+    assert micro.main(["save"] + args) == 0
+    saved = json.loads(baseline.read_text())
+    assert list(saved["results_ns"]) == ["state.transition"] and saved["calibration_ns"]["state.transition"] > 0
+
+    # 基线快 10 倍 -> 当前结果判为退化，退出码 1
+    saved["results_ns"]["state.transition"] /= 10
+    baseline.write_text(json.dumps(saved))
+    assert micro.main(["compare"] + args) == 1
+    assert micro.main(["compare", "--threshold", "100"] + args) == 0
+
+def test_all_cases_run():
+    data = micro.run_suite(min_time=0.0005, repeat=1)
+    assert list(data["results_ns"]) == list(micro.CASES)
+    assert all(v > 0 for v in data["results_ns"].values())
@@ -0,0 +1,85 @@
+import json
+import os
+
+import ccxt.pro as ccxt
+import pytest
+
+from quant_system.core.event import EventEngine, EventType
+from quant_system.core.types import OrderStatus
+from quant_system.exchange.okx_adapter import OkxExchangeAdapter
+from quant_system.exchange.okx_fast import FastOkx, OkxFrameParser
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "fixtures", "okx_ws_frames.json")
+
+class FakeClient:
+    """记录 resolve 调用的 WS 客户端替身"""
+    def __init__(self):
+        self.resolved = []
+
+    def resolve(self, result, message_hash):
+        self.resolved.append((message_hash, result))
+
+@pytest.fixture(scope="module")
+def frames():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return json.load(f)
+
+def _load_markets(api, frames):
+    api.set_markets([api.parse_market(raw) for raw in frames["instruments"]])
+    return api
+
+def test_parity_with_ccxt_normalization(frames):
+    """录制帧: 快速解析 == CCXT parse_ticker/parse_order/order_to_trade + 适配器转换 (逐字段)"""
+    api = _load_markets(ccxt.okx({"options": {"defaultType": "swap"}}), frames)
+    adapter = OkxExchangeAdapter(EventEngine(), {})
+    parser = OkxFrameParser.from_markets(api.markets, api.commonCurrencies)
+
+    for message in frames["tickers"]:
+        expected = [adapter._parse_tick_data(api.parse_ticker(row)) for row in message["data"]]
+        assert parser.tickers(message) == expected
+
+    n_trades = 0
+    for message in frames["orders"]:
+        ccxt_orders = [api.parse_order(row) for row in message["data"]]
+        expected_orders = [adapter._parse_order_data(o) for o in ccxt_orders]
+        expected_trades = [adapter._parse_trade_data(api.order_to_trade(o)) for o in ccxt_orders if o["info"]["tradeId"]]
+        orders, trades = parser.orders(message)
+        assert orders == expected_orders
+        assert trades == expected_trades
+        n_trades += len(trades)
+    assert n_trades == 4
+    assert parser.errors == 0
+
+def test_bad_rows_are_skipped(frames):
+    parser = OkxFrameParser({"BTC-USDT-SWAP": "BTC/USDT:USDT"})
+    message = json.loads(json.dumps(frames["tickers"][0]))
+    message["data"].append({"instId": "DOGE-USDT-SWAP", "ts": "1", "last": "1", "vol24h": "1", "bidPx": "1", "askPx": "1"})
+    message["data"].append({"instId": "BTC-USDT-SWAP", "ts": "1", "last": "", "vol24h": "1", "bidPx": "1", "askPx": "1"})
+    assert len(parser.tickers(message)) == 1
+    assert parser.errors == 2
+
+def test_adapter_fast_path_emits_events(frames):
+    """fast_parse 模式: 帧回调直接推送 TICK / TRADE / ORDER_STATUS，watch_* 只收到空结果"""
+    engine = EventEngine()
+    adapter = OkxExchangeAdapter(engine, {"fast_parse": True})
+    assert isinstance(adapter.api, FastOkx)
+    _load_markets(adapter.api, frames)
+    adapter._install_fast_parser()
+
+    events = []
+    engine.put = events.append
+    client = FakeClient()
+    for message in frames["tickers"] + frames["orders"]:
+        adapter.api.handle_message(client, message)
+
+    kinds = [e.type for e in events]
+    assert kinds.count(EventType.TICK) == 3
+    assert kinds.count(EventType.TRADE) == 4
+    assert kinds.count(EventType.ORDER_STATUS) == 7
+    # 成交先于同一帧的订单状态
+    assert kinds[3:6] == [EventType.ORDER_STATUS, EventType.TRADE, EventType.ORDER_STATUS]
+    assert events[-1].data.status == OrderStatus.FILLED
+    ids = adapter.instruments.ids
+    assert all(e.data.instrument_id == ids[e.data.symbol] for e in events)
+    assert ("tickers::BTC/USDT:USDT", {}) in client.resolved
+    assert all(len(result) == 0 for _, result in client.resolved)
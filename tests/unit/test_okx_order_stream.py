@@ -0,0 +1,108 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from quant_system.core.event import EventEngine, EventType
+from quant_system.exchange.okx_adapter import OkxExchangeAdapter
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "fixtures", "okx_ws_frames.json")
+
+class FakeClient:
+    def resolve(self, result, message_hash):
+        pass
+
+class ReplayApi:
+    """
+    用真实的 ccxt.pro.okx 处理录制帧 (handle_orders 写入 ArrayCacheBySymbolById)，
+    watch_orders 按 newUpdates 语义返回本轮有变化的条目; 可选地模拟旧行为 (每次返回整个缓存)
+    """
+    def __init__(self, api, batches, full_cache: bool = False):
+        self.api = api
+        self.batches = list(batches)
+        self.full_cache = full_cache
+        self.adapter = None
+
+    async def watch_orders(self):
+        if not self.batches:
+            self.adapter._active = False
+            return []
+        client = FakeClient()
+        for message in self.batches.pop(0):
+            self.api.handle_message(client, message)
+        cache = self.api.orders
+        if self.full_cache:
+            return list(cache)
+        return self.api.filter_by_symbol_since_limit(cache, None, None, cache.getLimit(None, None), True)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("full_cache", [False, True])
+async def test_orders_loop_dispatches_deltas_once(full_cache):
+    """只推送有变化的订单快照; 即使上游返回整个缓存，重复快照也在解析前跳过"""
+    with open(FIXTURE, encoding="utf-8") as f:
+        frames = json.load(f)
+    engine = EventEngine()
+    adapter = OkxExchangeAdapter(engine, {"orders_cache_size": 3})
+    api = adapter.api
+    api.set_markets([api.parse_market(raw) for raw in frames["instruments"]])
+    assert api.options["ordersLimit"] == 3 and api.newUpdates
+
+    orders = frames["orders"]
+    replay = ReplayApi(api, [orders[:2], orders[2:3], orders[3:5], orders[5:]], full_cache=full_cache)
+    replay.adapter = adapter
+    adapter._api = replay
+    adapter._active = True
+    events = []
+    engine.put = events.append
+
+    await asyncio.wait_for(adapter._watch_orders_loop(), timeout=5)
+
+    dispatched = [e.data for e in events if e.type == EventType.ORDER_STATUS]
+    # 第一批的 live + partially_filled 合并为同一订单的最新快照; 缓存上限 3 (有界)
+    assert len(api.orders) <= 3
+    assert [(o.order_id, o.status.name) for o in dispatched] == [
+        ("1509871230001", "PARTIALLY_FILLED"),
+        ("1509871230001", "FILLED"),
+        ("1509871230003", "PARTIALLY_FILLED"),
+        ("1509871230002", "CANCELLED"),       # 缓存中更新过的条目移到末尾
+        ("1509871230004", "FILLED"),
+    ]
+    stats = adapter.order_stream_stats()
+    assert stats["dispatched"] == 5
+    assert stats["received"] == stats["dispatched"] + stats["skipped"] + stats["duplicates"] + stats["out_of_order"]
+    assert (stats["skipped"] > 0) == full_cache
+
+class PagedOrdersApi:
+    """按 after 游标分页返回挂单的假 API"""
+    def __init__(self, orders, fail: bool = False):
+        self.orders = orders
+        self.fail = fail
+        self.calls = []
+
+    async def fetch_open_orders(self, symbol=None, since=None, limit=None, params={}):
+        self.calls.append((symbol, params.get("after")))
+        if self.fail:
+            raise ConnectionError("rate limited")
+        ids = [o["id"] for o in self.orders]
+        start = ids.index(params["after"]) + 1 if "after" in params else 0
+        return self.orders[start:start + limit]
+
+@pytest.mark.asyncio
+async def test_query_open_orders_single_account_query():
+    """挂单整个账户翻页查询后本地过滤，请求数与 symbol 数无关; 失败时抛出而不是返回空列表"""
+    symbols = [f"S{i}/USDT:USDT" for i in range(250)]
+    orders = [
+        {"id": str(i), "symbol": symbols[i % 5], "status": "open", "side": "buy", "info": {},
+         "price": 1.0, "amount": 1.0, "filled": 0.0, "timestamp": 0}
+        for i in range(120)
+    ]
+    adapter = OkxExchangeAdapter(EventEngine(), {})
+    adapter._api = api = PagedOrdersApi(orders)
+    result = await adapter.query_open_orders(symbols[:2] + symbols[10:])
+    assert api.calls == [(None, None), (None, "99")]
+    assert sorted(int(o.order_id) for o in result) == [i for i in range(120) if i % 5 < 2]
+
+    adapter._api = PagedOrdersApi(orders, fail=True)
+    with pytest.raises(ConnectionError):
+        await adapter.query_open_orders(symbols)
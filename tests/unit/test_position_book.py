@@ -0,0 +1,51 @@
+import pytest
+from quant_system.core.position import PositionBook
+from quant_system.core.types import Direction, Offset
+
+def test_hedge_legs_and_pnl():
+    """验证多空腿独立记账、均价与已实现盈亏"""
+    book = PositionBook(["BTC", "ETH"])
+
+    book.on_fill("BTC", Direction.LONG, Offset.OPEN, 1, 100)
+    book.on_fill("BTC", Direction.LONG, Offset.OPEN, 1, 110)
+    book.on_fill("BTC", Direction.SHORT, Offset.OPEN, 2, 120)
+    idx = book.slot("BTC")
+    assert book.long_price[idx] == pytest.approx(105)
+    assert book.net("BTC") == 0
+    assert book.net("ETH") == 0
+
+    # 卖出平多 1 张 @ 115 -> 已实现 +10
+    change = book.on_fill("BTC", Direction.SHORT, Offset.CLOSE, 1, 115)
+    assert change == -1
+    assert book.realized_pnl[idx] == pytest.approx(10)
+
+    # 买入平空 2 张 @ 100 -> 已实现 +40
+    book.on_fill("BTC", Direction.LONG, Offset.CLOSE, 2, 100)
+    assert book.realized_pnl[idx] == pytest.approx(50)
+    assert book.net("BTC") == 1
+
+    # 浮动盈亏按最新价标记
+    book.mark("BTC", 125)
+    assert book.unrealized_pnl[idx] == pytest.approx(20)
+    legs = book.get("BTC")
+    assert len(legs) == 1 and legs[0].direction == Direction.LONG
+
+def test_over_close_and_growth():
+    """超额平仓被截断; 超出初始容量自动扩容"""
+    book = PositionBook(capacity=1)
+    book.on_fill("A", Direction.LONG, Offset.OPEN, 1, 10)
+    assert book.on_fill("A", Direction.SHORT, Offset.CLOSE, 5, 10) == -1
+    assert book.net("A") == 0
+
+    for i in range(40):
+        book.on_fill(f"S{i}", Direction.SHORT, Offset.OPEN, i + 1, 1)
+    assert book.net("S39") == -40
+    assert list(book.nets()[1:4]) == [-1, -2, -3]
+
+def test_one_way_offset_none():
+    """单向持仓 (Offset.NONE): 先平反向腿，剩余反手开仓"""
+    book = PositionBook(["X"])
+    book.on_fill("X", Direction.LONG, Offset.NONE, 2, 10)
+    book.on_fill("X", Direction.SHORT, Offset.NONE, 3, 12)
+    assert book.net("X") == -1
+    assert book.realized_pnl[book.slot("X")] == pytest.approx(4)
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+import pytest
+from quant_system.exchange.factory import EXCHANGES
+from quant_system.strategy.registry import STRATEGIES
+from quant_system.utils.registry import LazyRegistry
+
+def test_resolves_by_name_and_path():
+    from quant_system.strategy.dual_ma import DualMAStrategy
+    assert STRATEGIES.get("DualMA") is DualMAStrategy
+    assert STRATEGIES.get("quant_system.strategy.dual_ma:DualMAStrategy") is DualMAStrategy
+    assert "okx" in EXCHANGES and "mock" in EXCHANGES
+
+def test_unknown_names():
+    registry = LazyRegistry("strategy", {"A": "json:dumps"})
+    with pytest.raises(ValueError, match="Unknown strategy: B"):
+        registry.get("B")
+    with pytest.raises(ValueError, match="Invalid strategy path"):
+        registry.get("json:nope")
+
+def test_main_import_is_lazy():
+    """main 模块导入时不加载 ccxt 与策略 (numpy)"""
+    code = "import sys, quant_system.main; print('ccxt' in sys.modules, 'numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.split() == ["False", "False"]
@@ -0,0 +1,85 @@
+import pytest
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.risk import RiskEngine
+from quant_system.core.types import (
+    Direction, Exchange, Instrument, OrderStatus, ProductType, TickData
+)
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.strategy.demo import DemoStrategy
+
+def make_tick(symbol: str, price: float) -> Event:
+    return Event(EventType.TICK, TickData(
+        symbol=symbol, exchange=Exchange.MOCK, timestamp=0,
+        last_price=price, volume=1, bid_price_1=price, ask_price_1=price
+    ))
+
+def test_limit_checks():
+    """验证各项限额与拒单计数"""
+    risk = RiskEngine({
+        "max_order_volume": 5,
+        "max_position": 8,
+        "max_notional": 1000,
+        "price_band": 0.05,
+        "symbols": {"ETH": {"max_order_volume": 1}},
+    })
+    risk.set_instrument(Instrument("BTC", Exchange.MOCK, ProductType.PERP, contract_size=10, price_tick=0.1))
+    risk._on_tick(make_tick("BTC", 20))
+
+    assert risk.check("BTC", Direction.LONG, 2, 20, 0) == RiskEngine.OK
+    assert risk.check("BTC", Direction.LONG, 6, 20, 0) == RiskEngine.ORDER_SIZE
+    assert risk.check("ETH", Direction.LONG, 2, 20, 0) == RiskEngine.ORDER_SIZE
+    assert risk.check("BTC", Direction.LONG, 5, 20, 5) == RiskEngine.POSITION
+    # 减仓方向不受持仓上限约束
+    assert risk.check("BTC", Direction.SHORT, 5, 20, 12) == RiskEngine.OK
+    # 5 * 21 * 10 > 1000
+    assert risk.check("BTC", Direction.LONG, 5, 21, 0) == RiskEngine.NOTIONAL
+    assert risk.check("BTC", Direction.LONG, 1, 22, 0) == RiskEngine.PRICE_BAND
+
+    risk.kill("test")
+    assert risk.check("BTC", Direction.LONG, 1, 20, 0) == RiskEngine.KILL_SWITCH
+    risk.resume()
+
+    stats = risk.stats()
+    assert stats["PASSED"] == 2
+    assert stats["ORDER_SIZE"] == 2
+    assert stats["KILL_SWITCH"] == 1
+
+def test_rate_throttle():
+    risk = RiskEngine({"max_orders_per_sec": 3})
+    codes = [risk.check("BTC", Direction.LONG, 1, 10, 0) for _ in range(5)]
+    assert codes == [0, 0, 0, RiskEngine.RATE, RiskEngine.RATE]
+
+def test_fractional_rate():
+    """速率小于 1 笔/秒: 桶容量为 1，首笔放行，之后每 1/rate 秒补一个令牌"""
+    risk = RiskEngine({"max_orders_per_sec": 0.5})
+    assert [risk.check("BTC", Direction.LONG, 1, 10, 0) for _ in range(2)] == [0, RiskEngine.RATE]
+    risk._last_refill -= 2.0 # 过去 2 秒
+    assert [risk.check("BTC", Direction.LONG, 1, 10, 0) for _ in range(2)] == [0, RiskEngine.RATE]
+
+@pytest.mark.asyncio
+async def test_rejected_order_reaches_strategy():
+    """被拒订单不发往交易所，以 REJECTED 回报推送给策略"""
+    engine = EventEngine()
+    engine.start()
+    mock = MockExchangeAdapter(engine, config={"latency_ms": 10})
+
+    sent = []
+    async def send_orders(reqs):
+        sent.extend(reqs)
+        return ["x"] * len(reqs)
+    mock.send_orders = send_orders
+
+    strategy = DemoStrategy(engine, mock, ["BTC"])
+    strategy.risk = RiskEngine({"max_order_volume": 1})
+    engine.register(EventType.ORDER_STATUS, strategy._on_order_status_wrapper)
+
+    order_id = await strategy.buy("BTC", 100, 2)
+    import asyncio
+    await asyncio.sleep(0.05)
+
+    assert order_id == ""
+    assert sent == []
+    rejected = list(strategy.orders.values())
+    assert len(rejected) == 1 and rejected[0].status == OrderStatus.REJECTED
+    assert strategy.positions.long_pending[0] == 0
+    engine.stop()
@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+import pytest
+
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.signal import (
+    SignalRegistry, DualMASignal, DualMA, Price, RollingMean, RollingStd, ZScore
+)
+from quant_system.core.types import Exchange, TickData
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.strategy.dual_ma import DualMAStrategy
+
+def tick(price: float, symbol: str = "BTC") -> Event:
+    return Event(EventType.TICK, TickData(
+        symbol=symbol, exchange=Exchange.MOCK, timestamp=0.0, last_price=price,
+        volume=1.0, bid_price_1=price, ask_price_1=price))
+
+def random_walk(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    price = 50000.0
+    for _ in range(n):
+        price += rng.gauss(0, 25)
+        yield price
+
+def test_nodes_deduplicated_into_dag():
+    registry = SignalRegistry(EventEngine())
+    handles = [registry.acquire(DualMA, "BTC", 5, 10) for _ in range(3)]
+    assert len({id(h._node) for h in handles}) == 1
+    assert len(registry) == 4 # Price, RollingMean(5), RollingMean(10), DualMA
+
+    z = registry.acquire(ZScore, "BTC", 10) # 复用 Price 与 RollingMean(10)
+    assert len(registry) == 6
+    registry.acquire(Price, "ETH")
+    assert len(registry) == 7
+
+    for h in handles:
+        registry.release(h)
+    assert len(registry) == 5 # RollingMean(5) / DualMA 已无人使用; RollingMean(10) 仍被 RollingStd/ZScore 依赖
+    registry.release(z)
+    assert len(registry) == 1
+
+def test_values_match_reference():
+    """按拓扑序每 tick 求值一次，结果与独立实现 / numpy 一致"""
+    engine = EventEngine()
+    registry = SignalRegistry(engine)
+    dual = registry.acquire(DualMA, "BTC", 5, 10)
+    mean = registry.acquire(RollingMean, "BTC", 20)
+    std = registry.acquire(RollingStd, "BTC", 20)
+    z = registry.acquire(ZScore, "BTC", 20)
+    reference = DualMASignal(5, 10)
+
+    prices = []
+    for price in random_walk(500):
+        prices.append(price)
+        engine._process(tick(price))
+        assert dual.value == reference.on_tick(tick(price).data)
+        if len(prices) >= 20:
+            window = np.array(prices[-20:])
+            assert mean.ready and std.ready and z.ready
+            assert mean.value == pytest.approx(window.mean(), rel=1e-12)
+            assert std.value == pytest.approx(window.std(), rel=1e-6)
+            assert z.value == pytest.approx((price - window.mean()) / window.std(), rel=1e-6, abs=1e-9)
+        else:
+            assert not z.ready
+    # 其它 symbol 的行情不触发求值
+    engine._process(tick(1.0, "ETH"))
+    assert registry.evaluations == 500 * len(registry)
+
+def test_strategies_share_signals():
+    """三个相同的策略: 指标只有一份，每个 tick 的求值次数与策略数无关，策略回调读到本 tick 的值"""
+    engine = EventEngine()
+    exchange = MockExchangeAdapter(engine)
+    strategies = [DualMAStrategy(engine, exchange, ["BTC"]) for _ in range(3)]
+    targets = []
+    for s in strategies:
+        s.on_init()
+        s.request_target_position = lambda target, symbol, price: targets.append(target)
+        engine.register(EventType.TICK, s._on_tick_wrapper, "BTC")
+
+    registry = SignalRegistry.for_engine(engine)
+    assert all(s.signal_registry is registry for s in strategies)
+    assert len(registry) == 4
+
+    for price in [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 11, 10, 9, 8, 7]:
+        engine._process(tick(float(price)))
+    assert registry.evaluations == 17 * 4
+    # 第 10 个 tick 起快线在上 (1.0)，回落到快线下穿后转空; 三个策略看到的一致
+    assert targets[27:30] == [1.0] * 3 and targets[-3:] == [-1.0] * 3
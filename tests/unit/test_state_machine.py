@@ -1,6 +1,7 @@
+import numpy as np
 import pytest
-from quant_system.core.state import OrderStateMachine, InvalidStateTransitionError
-from quant_system.core.types import OrderStatus
+from quant_system.core.state import OrderStateMachine, OrderTracker, InvalidStateTransitionError, STATE_CODES
+from quant_system.core.types import OrderData, OrderStatus, Direction, Offset, OrderType, Exchange
 
 def test_valid_transitions():
     """测试合法的状态流转路径"""
@@ -43,3 +44,64 @@ def test_invalid_transitions():
     # 虽然物理上可能极快，但逻辑上我们要求先有 Submitted 事件
     with pytest.raises(InvalidStateTransitionError):
         OrderStateMachine.transition(OrderStatus.CREATED, OrderStatus.FILLED)
+
+def test_bitmask_table_matches_transition_sets():
+    """位掩码表与流转定义一致 (含同状态更新)"""
+    for cur in OrderStatus:
+        for new in OrderStatus:
+            expected = cur == new or new in OrderStateMachine._transitions[cur]
+            assert OrderStateMachine.check_transition(cur, new) == expected
+            assert OrderStateMachine.check_code(STATE_CODES[cur], STATE_CODES[new]) == expected
+
+def test_validate_many_and_streams():
+    codes = lambda *states: np.array([STATE_CODES[s] for s in states])
+    S = OrderStatus
+    ok = OrderStateMachine.validate_many(codes(S.SUBMITTED, S.FILLED), codes(S.FILLED, S.SUBMITTED))
+    assert ok.tolist() == [True, False]
+
+    # 两个订单交错: b 的成交量回退、a 在终态后又收到 SUBMITTED
+    keys = np.array([0, 1, 0, 1, 1, 0])
+    states = codes(S.SUBMITTED, S.SUBMITTED, S.FILLED, S.PARTIALLY_FILLED, S.PARTIALLY_FILLED, S.SUBMITTED)
+    traded = np.array([0, 0, 2, 1.5, 1.0, 2])
+    valid = OrderStateMachine.validate_streams(keys, states, traded)
+    assert valid.tolist() == [True, True, True, True, False, False]
+
+def test_order_tracker_counts_duplicates_and_out_of_order():
+    def update(status, traded):
+        return OrderData(
+            symbol="BTC-USDT-SWAP", exchange=Exchange.MOCK, order_id="o1", exchange_order_id="",
+            direction=Direction.LONG, offset=Offset.OPEN, type=OrderType.LIMIT,
+            price=100, volume=2, traded=traded, status=status, timestamp=0
+        )
+
+    tracker = OrderTracker(max_terminal=1)
+    assert tracker.on_update(update(OrderStatus.SUBMITTED, 0)) == OrderTracker.ACCEPT
+    assert tracker.on_update(update(OrderStatus.SUBMITTED, 0)) == OrderTracker.DUPLICATE
+    assert tracker.on_update(update(OrderStatus.PARTIALLY_FILLED, 1)) == OrderTracker.ACCEPT
+    assert tracker.on_update(update(OrderStatus.PARTIALLY_FILLED, 0.5)) == OrderTracker.OUT_OF_ORDER
+    assert tracker.on_update(update(OrderStatus.FILLED, 2)) == OrderTracker.ACCEPT
+    assert tracker.on_update(update(OrderStatus.SUBMITTED, 0)) == OrderTracker.OUT_OF_ORDER
+    assert tracker.stats() == {"accepted": 3, "duplicates": 1, "out_of_order": 2}
+
+def test_order_tracker_accepts_amendments_and_bounds_state():
+    def update(order_id, status, traded, price=100, volume=2):
+        return OrderData(
+            symbol="BTC-USDT-SWAP", exchange=Exchange.MOCK, order_id=order_id, exchange_order_id="",
+            direction=Direction.LONG, offset=Offset.OPEN, type=OrderType.LIMIT,
+            price=price, volume=volume, traded=traded, status=status, timestamp=0
+        )
+
+    tracker = OrderTracker(max_orders=2)
+    assert tracker.on_update(update("o1", OrderStatus.SUBMITTED, 0)) == OrderTracker.ACCEPT
+    # 改单: 状态与成交量不变，只改价格/数量
+    assert tracker.on_update(update("o1", OrderStatus.SUBMITTED, 0, price=101)) == OrderTracker.ACCEPT
+    assert tracker.on_update(update("o1", OrderStatus.SUBMITTED, 0, price=101, volume=3)) == OrderTracker.ACCEPT
+    assert tracker.on_update(update("o1", OrderStatus.SUBMITTED, 0, price=101, volume=3)) == OrderTracker.DUPLICATE
+
+    # 一直没有终态的订单也按 LRU 淘汰: o1 最近被更新过，淘汰的是 o2
+    tracker.on_update(update("o2", OrderStatus.SUBMITTED, 0))
+    tracker.on_update(update("o1", OrderStatus.PARTIALLY_FILLED, 1, price=101, volume=3))
+    tracker.on_update(update("o3", OrderStatus.SUBMITTED, 0))
+    assert len(tracker) == 2
+    assert tracker.on_update(update("o1", OrderStatus.PARTIALLY_FILLED, 1, price=101, volume=3)) == OrderTracker.DUPLICATE
+    assert tracker.on_update(update("o2", OrderStatus.SUBMITTED, 0)) == OrderTracker.ACCEPT
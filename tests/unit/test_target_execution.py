@@ -0,0 +1,147 @@
+import pytest
+import numpy as np
+from quant_system.core.event import EventEngine
+from quant_system.core.types import Direction, Offset, OrderType, Exchange
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.strategy.demo import DemoStrategy
+
+class RecordingMock(MockExchangeAdapter):
+    """只记录批量请求，不做撮合"""
+    def __init__(self, engine, config=None):
+        super().__init__(engine, config)
+        self.batches = []
+
+    async def send_orders(self, reqs):
+        self.batches.append(reqs)
+        return [f"id{i}" for i in range(len(reqs))]
+
+class IdleStrategy(DemoStrategy):
+    def on_tick(self, tick):
+        pass
+
+def make_strategy(symbols, instruments=None):
+    mock = RecordingMock(EventEngine(), config={"instruments": instruments or {}})
+    strategy = IdleStrategy(mock.event_engine, mock, symbols)
+    for s in symbols:
+        inst = mock.instruments.get(s)
+        if inst:
+            strategy.positions.set_instrument(inst)
+    return strategy, mock
+
+@pytest.mark.asyncio
+async def test_reversal_in_one_batch():
+    """反手: 同一批次内先平多再开空"""
+    strategy, mock = make_strategy(["BTC"])
+    strategy.positions.on_fill("BTC", Direction.LONG, Offset.OPEN, 2, 100)
+
+    await strategy.set_target_position(-1, "BTC", 101)
+
+    assert len(mock.batches) == 1
+    actions = [(r.direction, r.offset, r.volume) for r in mock.batches[0]]
+    assert actions == [(Direction.SHORT, Offset.CLOSE, 2), (Direction.SHORT, Offset.OPEN, 1)]
+
+@pytest.mark.asyncio
+async def test_vectorized_targets_with_lot_filters():
+    """数组目标: 按步长取整，小于最小下单量的差额被丢弃，未变化的 symbol 不发单"""
+    instruments = {
+        "A": {"volume_tick": 1.0, "min_volume": 1.0},
+        "B": {"volume_tick": 0.1, "min_volume": 0.1},
+        "C": {"volume_tick": 1.0, "min_volume": 1.0},
+    }
+    strategy, mock = make_strategy(["A", "B", "C"], instruments)
+    strategy.positions.on_fill("C", Direction.LONG, Offset.OPEN, 3, 10)
+
+    ids = await strategy.set_target_positions(
+        np.array([0.4, -0.26, 3.0]),
+        np.array([10.0, 20.0, 30.0]),
+    )
+
+    reqs = mock.batches[0]
+    assert len(ids) == len(reqs) == 1
+    assert reqs[0].symbol == "B"
+    assert (reqs[0].direction, reqs[0].offset) == (Direction.SHORT, Offset.OPEN)
+    assert reqs[0].volume == pytest.approx(0.3)
+    assert strategy.target_pos["A"] == 0.4
+
+@pytest.mark.asyncio
+async def test_shape_mismatch_raises():
+    strategy, _ = make_strategy(["A", "B"])
+    with pytest.raises(ValueError):
+        await strategy.set_target_positions(np.zeros(3))
+
+@pytest.mark.asyncio
+async def test_working_orders_are_netted():
+    """挂单中的开仓计入预期持仓; 目标反转时撤掉在途开仓而不是平不存在的仓位"""
+    strategy, mock = make_strategy(["BTC"])
+    cancelled = []
+
+    async def cancel_order(order_id, symbol):
+        cancelled.append(order_id)
+    mock.cancel_order = cancel_order
+
+    await strategy.set_target_position(2, "BTC", 100)
+    assert [r.volume for r in mock.batches[0]] == [2]
+
+    # 同一目标再次提交: 在途 2 张已覆盖，不再发单
+    await strategy.set_target_position(2, "BTC", 100)
+    assert len(mock.batches) == 1
+
+    # 回报到达 (挂单中)
+    from quant_system.core.event import Event, EventType
+    from quant_system.core.types import OrderData, OrderStatus
+    strategy._on_order_status_wrapper(Event(EventType.ORDER_STATUS, OrderData(
+        symbol="BTC", exchange=Exchange.MOCK, order_id="id0", exchange_order_id="",
+        direction=Direction.LONG, offset=Offset.OPEN, type=OrderType.LIMIT,
+        price=100, volume=2, traded=0, status=OrderStatus.SUBMITTED, timestamp=0
+    )))
+    assert strategy.positions.long_pending[0] == 2
+
+    # 目标改为 0: 无可平持仓，撤掉开仓挂单
+    await strategy.set_target_position(0, "BTC", 100)
+    assert cancelled == ["id0"]
+    assert len(mock.batches) == 1
+
+@pytest.mark.asyncio
+async def test_unknown_symbols_and_price_shape():
+    """未知 symbol 不写入持仓簿: targets 中报错，prices 中忽略; 数组 prices 同样校验形状"""
+    strategy, mock = make_strategy(["A", "B"])
+    with pytest.raises(ValueError):
+        await strategy.set_target_positions({"A": 1.0, "X": 1.0})
+    await strategy.set_target_positions({"A": 1.0}, {"A": 10.0, "X": 5.0})
+    assert strategy.positions.symbols == ["A", "B"]
+    assert [(r.symbol, r.price) for r in mock.batches[0]] == [("A", 10.0)]
+
+    with pytest.raises(ValueError):
+        await strategy.set_target_positions(np.array([1.0, 1.0]), np.array([10.0, 20.0, 30.0]))
+    # 形状正确的数组调用不受之前字典调用影响
+    await strategy.set_target_positions(np.array([1.0, 2.0]), np.array([10.0, 20.0]))
+    assert [(r.symbol, r.volume) for r in mock.batches[1]] == [("B", 2.0)]
+
+@pytest.mark.asyncio
+async def test_close_legs_round_toward_zero():
+    """平仓量向零取整，不会超过可平数量 (开仓量仍就近取整)"""
+    strategy, mock = make_strategy(["A"], {"A": {"volume_tick": 0.1, "min_volume": 0.1}})
+    strategy.positions.on_fill("A", Direction.LONG, Offset.OPEN, 0.37, 10)
+
+    await strategy.set_target_positions({"A": -0.26}, {"A": 10.0})
+    actions = [(r.direction, r.offset, r.volume) for r in mock.batches[0]]
+    assert actions[0] == (Direction.SHORT, Offset.CLOSE, pytest.approx(0.3))
+    assert actions[1] == (Direction.SHORT, Offset.OPEN, pytest.approx(0.3))
+
+def test_okx_close_orders_target_the_closed_leg():
+    """OKX posSide 指向被平的腿: 卖出平多 -> long，买入平空 -> short"""
+    from quant_system.core.types import OrderRequest
+    from quant_system.exchange.okx_adapter import OkxExchangeAdapter
+    adapter = OkxExchangeAdapter(EventEngine(), {})
+    cases = {
+        (Direction.LONG, Offset.OPEN): ("buy", "long"),
+        (Direction.SHORT, Offset.OPEN): ("sell", "short"),
+        (Direction.SHORT, Offset.CLOSE): ("sell", "long"),
+        (Direction.LONG, Offset.CLOSE): ("buy", "short"),
+    }
+    for (direction, offset), expected in cases.items():
+        params = adapter._build_order(OrderRequest(
+            symbol="BTC-USDT-SWAP", exchange=Exchange.OKX, direction=direction,
+            type=OrderType.LIMIT, volume=1, price=100, offset=offset,
+        ))
+        assert (params["side"], params["params"]["posSide"]) == expected
@@ -0,0 +1,97 @@
+import multiprocessing
+import uuid
+import pytest
+from quant_system.core.types import TickData, Exchange
+from quant_system.ipc.tick_ring import TickRingWriter, TickRingReader, open_reader
+
+def _tick(i: int, symbol: str = "BTC/USDT:USDT") -> TickData:
+    return TickData(
+        symbol=symbol, exchange=Exchange.OKX, timestamp=1700000000.0 + i,
+        last_price=100.0 + i, volume=float(i), bid_price_1=99.5 + i, ask_price_1=100.5 + i,
+        funding_rate=0.0001
+    )
+
+@pytest.fixture
+def ring_name():
+    return f"tws_test_{uuid.uuid4().hex[:8]}"
+
+def test_roundtrip(ring_name):
+    writer = TickRingWriter(ring_name, capacity=8)
+    reader = TickRingReader(ring_name)
+    try:
+        assert reader.poll() == []
+        for i in range(3):
+            writer.write(_tick(i))
+        assert reader.poll() == [_tick(0), _tick(1), _tick(2)]
+        assert reader.poll() == []
+    finally:
+        reader.close()
+        writer.close()
+
+def test_slow_reader_skips_overwritten(ring_name):
+    """读端落后超过容量: 跳到最早仍有效的记录并统计丢失数"""
+    writer = TickRingWriter(ring_name, capacity=4)
+    reader = TickRingReader(ring_name)
+    try:
+        for i in range(10):
+            writer.write(_tick(i))
+        ticks = reader.poll()
+        assert [t.volume for t in ticks] == [6.0, 7.0, 8.0, 9.0]
+        assert reader.overruns == 6
+    finally:
+        reader.close()
+        writer.close()
+
+def test_rejects_bad_input(ring_name):
+    with pytest.raises(ValueError):
+        TickRingWriter(ring_name, capacity=3)
+    writer = TickRingWriter(ring_name, capacity=4)
+    try:
+        with pytest.raises(ValueError):
+            writer.write(_tick(0, symbol="X" * 40))
+    finally:
+        writer.close()
+    assert open_reader(ring_name) is None
+
+def _child_read(name, queue):
+    reader = TickRingReader(name, from_start=True)
+    queue.put([(t.symbol, t.last_price) for t in reader.poll()])
+    reader.close()
+
+def test_cross_process_reader(ring_name):
+    """子进程读取后退出，不应删除写端的共享内存"""
+    writer = TickRingWriter(ring_name, capacity=8)
+    try:
+        writer.write(_tick(1, "ETH/USDT:USDT"))
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_child_read, args=(ring_name, queue))
+        proc.start()
+        assert queue.get(timeout=20) == [("ETH/USDT:USDT", 101.0)]
+        proc.join(timeout=20)
+
+        reader = TickRingReader(ring_name, from_start=True)
+        assert len(reader.poll()) == 1
+        reader.close()
+    finally:
+        writer.close()
+
+def test_writer_restart_and_reader_reattach(ring_name):
+    """写端崩溃遗留的共享内存可被新写端接管; 读端按 generation 发现新段并重新附加"""
+    crashed = TickRingWriter(ring_name, capacity=8)
+    reader = TickRingReader(ring_name)
+    crashed.write(_tick(0))
+    assert reader.poll() == [_tick(0)]
+    assert not reader.reattach() # 仍是同一段
+    crashed.close(unlink=False) # 崩溃: 未清理
+
+    writer = TickRingWriter(ring_name, capacity=8)
+    try:
+        writer.write(_tick(1))
+        assert reader.poll() == [] # 旧段不再前进
+        assert reader.reattach() and reader.reattaches == 1
+        assert reader.generation == writer.generation
+        assert reader.poll() == [_tick(1)]
+    finally:
+        reader.close()
+        writer.close()
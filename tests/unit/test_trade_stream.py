@@ -0,0 +1,76 @@
+import pytest
+
+from quant_system.core.event import EventEngine, Event, EventType
+from quant_system.core.types import OrderRequest, OrderData, OrderStatus, TradeData, Direction, Offset, OrderType, Exchange
+from quant_system.exchange.mock_adapter import MockExchangeAdapter
+from quant_system.exchange.okx_adapter import OkxExchangeAdapter
+from quant_system.strategy.base import BaseStrategy
+from quant_system.utils.dedup import BoundedSet
+
+SYMBOL = "BTC-USDT-SWAP"
+
+class IdleStrategy(BaseStrategy):
+    def on_tick(self, tick):
+        pass
+
+def test_bounded_set_evicts_oldest():
+    seen = BoundedSet(maxlen=2)
+    assert seen.add("a") and seen.add("b")
+    assert not seen.add("a")
+    assert seen.add("c")
+    assert "a" not in seen and len(seen) == 2
+    assert seen.add("a") # 已淘汰的 ID 重新出现时视为新元素
+
+def test_okx_side_mapping_inverts_build_order():
+    """解析回报的 (方向, 开平) 与下单时的 side/posSide 映射互逆"""
+    adapter = OkxExchangeAdapter(EventEngine(), {})
+    for direction in (Direction.LONG, Direction.SHORT):
+        for offset in (Offset.OPEN, Offset.CLOSE):
+            req = OrderRequest(symbol=SYMBOL, exchange=Exchange.OKX, direction=direction,
+                               type=OrderType.LIMIT, volume=1, price=100, offset=offset)
+            params = adapter._build_order(req)
+            assert adapter._parse_side(params["side"], params["params"]["posSide"]) == (direction, offset)
+
+    trade = adapter._parse_trade_data({
+        "id": "t1", "order": "o1", "symbol": SYMBOL, "side": "sell", "price": "101.5", "amount": 3,
+        "timestamp": 1700000000000, "fee": {"cost": 0.12, "currency": "USDT"}, "info": {"posSide": "long"},
+    })
+    assert (trade.direction, trade.offset) == (Direction.SHORT, Offset.CLOSE)
+    assert (trade.price, trade.volume, trade.fee, trade.fee_currency) == (101.5, 3.0, 0.12, "USDT")
+
+def test_fills_drive_positions():
+    """交易所推送逐笔成交时，持仓按成交价记账，订单回报不再重复计入"""
+    engine = EventEngine()
+    strategy = IdleStrategy(engine, MockExchangeAdapter(engine), [SYMBOL])
+    assert strategy.fill_accounting
+
+    for i, price in enumerate((100.0, 102.0)):
+        strategy._on_trade_wrapper(Event(EventType.TRADE, TradeData(
+            symbol=SYMBOL, exchange=Exchange.MOCK, order_id="o1", trade_id=f"t{i}",
+            direction=Direction.LONG, offset=Offset.OPEN, price=price, volume=1.0, timestamp=0.0
+        )))
+    assert strategy.get_pos(SYMBOL) == 2.0
+    assert strategy.positions.long_price[strategy.positions.slot(SYMBOL)] == 101.0
+
+def test_order_fills_use_average_price():
+    """无逐笔成交时按订单累计成交量记账: 成交价由成交均价反推，未提供均价时退回委托价"""
+    engine = EventEngine()
+    strategy = IdleStrategy(engine, MockExchangeAdapter(engine, {"emit_trades": False}), [SYMBOL])
+    assert not strategy.fill_accounting
+
+    def report(order_id, traded, avg_price, status=OrderStatus.PARTIALLY_FILLED):
+        strategy._apply_order(OrderData(
+            symbol=SYMBOL, exchange=Exchange.MOCK, order_id=order_id, exchange_order_id="",
+            direction=Direction.LONG, offset=Offset.OPEN, type=OrderType.LIMIT, price=110.0,
+            volume=4.0, traded=traded, status=status, timestamp=0.0, avg_price=avg_price,
+        ))
+
+    book, idx = strategy.positions, strategy.positions.slot(SYMBOL)
+    report("o1", 1.0, 100.0)
+    report("o1", 3.0, 102.0) # 新增 2 @ 103
+    assert book.long_volume[idx] == 3.0 and book.long_price[idx] == pytest.approx(102.0)
+    report("o2", 1.0, 0.0, OrderStatus.FILLED) # 交易所未提供均价
+    assert book.long_price[idx] == pytest.approx((306.0 + 110.0) / 4)
+
+    strategy.pos = -2.0 # 兼容直接赋值
+    assert strategy.pos == -2.0 and book.long_volume[idx] == 0.0